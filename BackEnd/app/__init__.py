@@ -1,3 +1,4 @@
+import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -5,8 +6,9 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_socketio import SocketIO
 from app.config import Config
+from app.services.replicas import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 socketio = SocketIO(cors_allowed_origins="*")
@@ -16,12 +18,81 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Pool / SQLite pragmas sesuai dialect
+    from app.utils.database import configure_sqlite, engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
-    CORS(app, origins=app.config['CORS_ORIGINS'])
+    CORS(app, origins=app.config['CORS_ORIGINS'], expose_headers=['X-Last-Write', 'X-Read-Source'])
     jwt.init_app(app)
-    socketio.init_app(app)
+
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
+
+    # Single writer untuk insert volume tinggi (telemetry) di SQLite
+    from app.services.write_queue import write_queue
+    write_queue.init_app(app)
+
+    # Change data capture: event perubahan robot/booking/mission/sensor_data setelah commit
+    from app.services.change_stream import change_stream
+    change_stream.init_app(app)
+
+    # Read replica: SELECT di endpoint @read_replica ke replica yang cukup fresh
+    from app.services.replicas import replica_router
+    replica_router.init_app(app)
+
+    # Audit log aksi robot ditulis di belakang (bulk, spill ke file kalau DB down)
+    from app.services.operation_log import operation_log
+    operation_log.init_app(app)
+
+    # Katalog modul sertifikasi (cache + ETag)
+    from app.services.certification import module_catalog
+    module_catalog.init_app(app)
+    from app.services.certificates import cert_index
+    cert_index.init_app(app)
+
+    # Pipeline pembayaran: antrian charge ke gateway + webhook + rekonsiliasi
+    from app.services.payments import payment_processor
+    payment_processor.init_app(app)
+
+    # Transisi status booking terjadwal (index next_transition_at)
+    from app.services.booking_lifecycle import booking_lifecycle
+    booking_lifecycle.init_app(app)
+
+    # Harga sewa dinamis (tabel tarif per model/hari)
+    from app.services.pricing import pricing_engine
+    pricing_engine.init_app(app)
+
+    # Cube analitik utilisasi/revenue (refresh incremental + query NumPy)
+    from app.services.analytics_cube import analytics_cube
+    analytics_cube.init_app(app)
+
+    # Replay timeline misi (k-way merge telemetry + index seek sparse)
+    from app.services.mission_replay import mission_replay
+    mission_replay.init_app(app)
+
+    # SocketIO: async mode + message queue untuk broadcast antar worker
+    from app.services.socketio_queue import client_manager
+    socketio_options = {'async_mode': app.config['SOCKETIO_ASYNC_MODE']}
+    message_queue = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    manager = client_manager(message_queue)
+    if manager is not None:
+        socketio_options['client_manager'] = manager
+    elif message_queue:
+        socketio_options['message_queue'] = message_queue
+    socketio.init_app(app, **socketio_options)
+
+    # Structured logging (JSON, non-blocking) + correlation ID
+    from app.services.structured_logging import structured_logging
+    structured_logging.init_app(app)
+
+    # Request metrics (/metrics) + on-demand profiling
+    from app.services.instrumentation import instrumentation
+    instrumentation.init_app(app)
+    from app.services.slow_queries import slow_query_log
+    slow_query_log.init_app(app)
 
     # Register blueprints
     from app.routes.auth import bp as auth_bp
@@ -36,33 +107,54 @@ def create_app(config_class=Config):
     from app.routes.bookings import bp as bookings_bp
     app.register_blueprint(bookings_bp, url_prefix='/api/bookings')
 
+    from app.routes.payments import bp as payments_bp
+    app.register_blueprint(payments_bp, url_prefix='/api/payments')
+
     from app.routes.certification import bp as cert_bp
     app.register_blueprint(cert_bp, url_prefix='/api/certification')
 
     from app.routes.dashboard import bp as dashboard_bp
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
 
+    from app.routes.spatial import bp as spatial_bp
+    app.register_blueprint(spatial_bp, url_prefix='/api/spatial')
+
+    from app.routes.heatmap import bp as heatmap_bp
+    app.register_blueprint(heatmap_bp, url_prefix='/api/heatmap')
+
+    from app.routes.missions import bp as missions_bp
+    app.register_blueprint(missions_bp, url_prefix='/api/missions')
+
+    from app.routes.metrics import bp as metrics_bp
+    app.register_blueprint(metrics_bp)
+
+    # Robot command queue + SocketIO handlers
+    from app.services.command_queue import command_queue
+    command_queue.init_app(app, socketio)
+    from app.routes import robot_events  # noqa: F401
+    from app.routes import replay_events  # noqa: F401
+
     # JWT error handlers for better debugging
+    jwt_logger = logging.getLogger('app.jwt')
+
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
-        print(f"[JWT] Token expired - Header: {jwt_header}, Payload: {jwt_payload}")
+        jwt_logger.info('Token expired', extra={'sampled': True, 'sub': jwt_payload.get('sub')})
         return {'error': 'Token has expired', 'message': 'Please login again'}, 401
 
     @jwt.invalid_token_loader
     def invalid_token_callback(error):
-        print(f"[JWT] Invalid token - Error: {error}")
-        import traceback
-        traceback.print_exc()
+        jwt_logger.warning('Invalid token', extra={'error': str(error)})
         return {'error': 'Invalid token', 'message': str(error)}, 422
 
     @jwt.unauthorized_loader
     def missing_token_callback(error):
-        print(f"[JWT] Missing token - Error: {error}")
+        jwt_logger.info('Missing token', extra={'sampled': True, 'error': str(error)})
         return {'error': 'Authorization required', 'message': 'Missing token in request'}, 401
 
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_payload):
-        print(f"[JWT] Token revoked - Header: {jwt_header}, Payload: {jwt_payload}")
+        jwt_logger.warning('Token revoked', extra={'sub': jwt_payload.get('sub')})
         return {'error': 'Token has been revoked', 'message': 'Please login again'}, 401
 
     return app
@@ -14,6 +14,88 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, '..', 'instance', 'sealen.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool (per worker; total koneksi = workers x (pool size + overflow))
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get('SQLALCHEMY_POOL_SIZE', 5))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', 10))
+    SQLALCHEMY_POOL_RECYCLE = int(os.environ.get('SQLALCHEMY_POOL_RECYCLE', 1800))  # detik
+    SQLALCHEMY_POOL_TIMEOUT = int(os.environ.get('SQLALCHEMY_POOL_TIMEOUT', 30))
+    SQLALCHEMY_POOL_PRE_PING = os.environ.get('SQLALCHEMY_POOL_PRE_PING', 'true').lower() == 'true'
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'edge')  # edge | durable | none
+    SQLITE_PRAGMAS = os.environ.get('SQLITE_PRAGMAS')  # override, contoh: "synchronous=FULL,mmap_size=0"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    # Single writer: insert volume tinggi (telemetry) digabung jadi satu transaksi per batch
+    WRITE_QUEUE_ENABLED = os.environ.get('WRITE_QUEUE_ENABLED')  # default: aktif untuk file SQLite
+    WRITE_QUEUE_MAX_BATCH = int(os.environ.get('WRITE_QUEUE_MAX_BATCH', 256))  # item per transaksi
+    WRITE_QUEUE_MAX_ROWS = int(os.environ.get('WRITE_QUEUE_MAX_ROWS', 20000))  # baris per transaksi
+    WRITE_QUEUE_MAX_DELAY_MS = float(os.environ.get('WRITE_QUEUE_MAX_DELAY_MS', 2))  # tunggu item berikutnya
+    WRITE_QUEUE_TIMEOUT = float(os.environ.get('WRITE_QUEUE_TIMEOUT', 30))  # detik, caller menunggu commit
+    # Read replica untuk endpoint read-only (comma separated URL; kosong = semua ke primary)
+    REPLICA_DATABASE_URLS = os.environ.get('REPLICA_DATABASE_URLS', '')
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))  # detik; lebih dari ini replica dilewati
+    REPLICA_HEARTBEAT_INTERVAL = float(os.environ.get('REPLICA_HEARTBEAT_INTERVAL', 1))  # detik
+    # OperationLog write-behind: request kontrol tidak menunggu commit audit log
+    OPERATION_LOG_BUFFER_ENABLED = os.environ.get('OPERATION_LOG_BUFFER_ENABLED', 'true').lower() == 'true'
+    OPERATION_LOG_FLUSH_ROWS = int(os.environ.get('OPERATION_LOG_FLUSH_ROWS', 500))  # flush kalau buffer sebesar ini
+    OPERATION_LOG_FLUSH_INTERVAL_MS = float(os.environ.get('OPERATION_LOG_FLUSH_INTERVAL_MS', 1000))
+    OPERATION_LOG_MAX_PENDING = int(os.environ.get('OPERATION_LOG_MAX_PENDING', 100000))  # lebih -> langsung ke file
+    OPERATION_LOG_SPILL_PATH = os.environ.get('OPERATION_LOG_SPILL_PATH')  # default: instance/operation_log.spill.jsonl
+    # Katalog modul sertifikasi di-cache per worker; TTL membatasi basi setelah modul diubah di worker lain
+    CERT_CATALOG_TTL = float(os.environ.get('CERT_CATALOG_TTL', 60))  # detik
+    # Index verifikasi sertifikat di memori: refresh incremental dari updated_at + reload penuh berkala
+    CERT_INDEX_REFRESH_INTERVAL = float(os.environ.get('CERT_INDEX_REFRESH_INTERVAL', 2))  # detik
+    CERT_INDEX_OVERLAP = float(os.environ.get('CERT_INDEX_OVERLAP', 5))  # detik, untuk commit yang terlambat
+    CERT_INDEX_FULL_RELOAD_INTERVAL = float(os.environ.get('CERT_INDEX_FULL_RELOAD_INTERVAL', 300))  # detik
+    # Pembayaran: 'async' (request langsung 202, charge di worker) atau 'sync' (menunggu gateway)
+    PAYMENT_PROCESSING = os.environ.get('PAYMENT_PROCESSING', 'async')
+    PAYMENT_WORKERS = int(os.environ.get('PAYMENT_WORKERS', 4))
+    PAYMENT_BATCH_SIZE = int(os.environ.get('PAYMENT_BATCH_SIZE', 50))  # charge per round-trip gateway
+    PAYMENT_BATCH_WAIT_MS = float(os.environ.get('PAYMENT_BATCH_WAIT_MS', 20))
+    PAYMENT_RECONCILE_INTERVAL = float(os.environ.get('PAYMENT_RECONCILE_INTERVAL', 30))  # detik, 0 = mati
+    PAYMENT_RECONCILE_AFTER = float(os.environ.get('PAYMENT_RECONCILE_AFTER', 10))  # detik tanpa webhook
+    PAYMENT_WEBHOOK_SECRET = os.environ.get('PAYMENT_WEBHOOK_SECRET')  # wajib untuk POST /api/payments/webhook
+    # Gateway lokal (stand-in)
+    PAYMENT_GATEWAY_LATENCY_MS = float(os.environ.get('PAYMENT_GATEWAY_LATENCY_MS', 200))  # per round-trip
+    PAYMENT_GATEWAY_SETTLE_MS = float(os.environ.get('PAYMENT_GATEWAY_SETTLE_MS', 500))
+    PAYMENT_GATEWAY_FAILURE_RATE = float(os.environ.get('PAYMENT_GATEWAY_FAILURE_RATE', 0))
+    PAYMENT_GATEWAY_WEBHOOK_DROP_RATE = float(os.environ.get('PAYMENT_GATEWAY_WEBHOOK_DROP_RATE', 0))
+    # Lifecycle booking: pending kedaluwarsa, rental active/completed sesuai start/end date
+    BOOKING_SCHEDULER_ENABLED = os.environ.get('BOOKING_SCHEDULER_ENABLED', 'true').lower() == 'true'
+    BOOKING_TICK_INTERVAL = float(os.environ.get('BOOKING_TICK_INTERVAL', 5))  # detik
+    BOOKING_TICK_BATCH = int(os.environ.get('BOOKING_TICK_BATCH', 1000))  # booking per UPDATE batch
+    BOOKING_PENDING_TTL_MINUTES = float(os.environ.get('BOOKING_PENDING_TTL_MINUTES', 60))  # belum dibayar -> cancelled
+    BOOKING_PAYMENT_GRACE_MINUTES = float(os.environ.get('BOOKING_PAYMENT_GRACE_MINUTES', 10))
+    # Harga sewa dinamis: tarif dasar per model_type ("CleanBot=1500000,Vision AI=2000000")
+    RENTAL_BASE_RATES = {
+        name.strip(): float(rate) for name, rate in
+        (item.split('=', 1) for item in os.environ.get('RENTAL_BASE_RATES', '').split(',') if '=' in item)
+    }
+    RENTAL_DEFAULT_DAILY_RATE = float(os.environ.get('RENTAL_DEFAULT_DAILY_RATE', 1500000))  # model tanpa tarif
+    RENTAL_PRICING_HORIZON_DAYS = int(os.environ.get('RENTAL_PRICING_HORIZON_DAYS', 400))  # tabel tarif ke depan
+    RENTAL_PRICING_LOOKBACK_DAYS = int(os.environ.get('RENTAL_PRICING_LOOKBACK_DAYS', 31))  # tabel tarif ke belakang
+    RENTAL_PRICING_TTL = float(os.environ.get('RENTAL_PRICING_TTL', 300))  # detik
+    # Export laporan admin (CSV/Parquet) dibaca per chunk dari server-side cursor
+    EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', 5000))
+    # Cube analitik (hari x robot x model_type x location x booking_type), refresh incremental dari updated_at
+    ANALYTICS_CUBE_ENABLED = os.environ.get('ANALYTICS_CUBE_ENABLED', 'true').lower() == 'true'
+    ANALYTICS_CUBE_REFRESH_INTERVAL = float(os.environ.get('ANALYTICS_CUBE_REFRESH_INTERVAL', 60))  # detik
+    ANALYTICS_CUBE_FULL_REBUILD_INTERVAL = float(os.environ.get('ANALYTICS_CUBE_FULL_REBUILD_INTERVAL', 86400))
+    ANALYTICS_CUBE_OVERLAP = float(os.environ.get('ANALYTICS_CUBE_OVERLAP', 30))  # detik, untuk commit terlambat
+    ANALYTICS_CUBE_SYNC_INTERVAL = float(os.environ.get('ANALYTICS_CUBE_SYNC_INTERVAL', 2))  # cube -> memori worker
+    # Change data capture: event perubahan (table, pk, kolom) setelah commit session ORM. Default mati:
+    # cache in-process (pricing, sertifikat) berlangganan tabelnya sendiri dan tetap jalan tanpa ini
+    CDC_ENABLED = os.environ.get('CDC_ENABLED', 'false').lower() == 'true'
+    CDC_TABLES = [name.strip() for name in os.environ.get('CDC_TABLES', 'robot,booking,mission,sensor_data').split(',')
+                  if name.strip()]
+    CDC_BUFFER_SIZE = int(os.environ.get('CDC_BUFFER_SIZE', 10000))  # event terakhir untuk catch-up (since)
+    CDC_SUBSCRIBER_QUEUE = int(os.environ.get('CDC_SUBSCRIBER_QUEUE', 10000))  # lebih -> event terlama dibuang
+    CDC_LOG_PATH = os.environ.get('CDC_LOG_PATH')  # log append-only JSON lines (opsional, dipakai semua worker)
+    # Replay timeline misi (sensor_data + ml_decision + operation_log), index sparse waktu -> offset per misi
+    REPLAY_INDEX_STRIDE = int(os.environ.get('REPLAY_INDEX_STRIDE', 500))  # event per checkpoint seek
+    REPLAY_FETCH_ROWS = int(os.environ.get('REPLAY_FETCH_ROWS', 1000))  # baris per halaman per stream
+    REPLAY_INDEX_CACHE = int(os.environ.get('REPLAY_INDEX_CACHE', 64))  # misi di cache LRU per worker
+    REPLAY_INDEX_TTL = float(os.environ.get('REPLAY_INDEX_TTL', 30))  # detik, misi yang belum selesai
+    REPLAY_MAX_GAP = float(os.environ.get('REPLAY_MAX_GAP', 5))  # detik; jeda lebih lama dipadatkan saat playback
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
@@ -22,4 +104,34 @@ class Config:
     
     # CORS Configuration
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',')
+    
+    # Mission Planning
+    ROBOT_FULL_CHARGE_RANGE_M = float(os.environ.get('ROBOT_FULL_CHARGE_RANGE_M', 20000))  # jarak tempuh baterai penuh
+    ROUTE_BATTERY_RESERVE = float(os.environ.get('ROUTE_BATTERY_RESERVE', 0.2))  # fraksi baterai yang disisakan
+    
+    # SocketIO (gunicorn.conf.py men-set gevent + message queue untuk multi-worker)
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')  # threading | gevent | eventlet
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')  # local:///tmp/dir | redis://... | amqp://...
+    
+    # Robot Control
+    ROBOT_COMMAND_LOOPBACK = os.environ.get('ROBOT_COMMAND_LOOPBACK', 'true').lower() == 'true'  # ack lokal kalau robot tidak terhubung
+    ROBOT_COMMAND_ACK_TIMEOUT = float(os.environ.get('ROBOT_COMMAND_ACK_TIMEOUT', 5))
+    ROBOT_SOCKET_TOKEN = os.environ.get('ROBOT_SOCKET_TOKEN')
+    
+    # Instrumentation
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token untuk scrape /metrics (wajib, tanpa token 503)
+    PROFILE_HEADER = os.environ.get('PROFILE_HEADER', 'X-Profile')  # profil request on-demand (admin)
+    SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', 'true').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+    SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'  # plan untuk fingerprint baru
 
+    # Logging (JSON ke stdout lewat queue + background thread)
+    LOG_ENABLED = os.environ.get('LOG_ENABLED', 'true').lower() == 'true'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json | text
+    LOG_REQUESTS = os.environ.get('LOG_REQUESTS', 'true').lower() == 'true'  # access log per request
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '0.1'))  # untuk event volume tinggi
+    LOG_ERROR_RATE = float(os.environ.get('LOG_ERROR_RATE', '5'))  # error/detik per template pesan
+    LOG_ERROR_BURST = int(os.environ.get('LOG_ERROR_BURST', '20'))
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
@@ -1,21 +1,28 @@
 from app.models.user import User, Role, Permission, RolePermission
-from app.models.certificate import Certificate, CertificationModule, UserCertificationProgress
+from app.models.certificate import (
+    Certificate, CertificateCounter, CertificationModule, UserCertificationProgress, UserCertificationSummary
+)
 from app.models.product import Product
 from app.models.robot import Robot
 from app.models.booking import Booking, Payment
 from app.models.mission import Mission, OperationLog, SensorData, MLDecision, Maintenance
-from app.models.waste import Waste
+from app.models.waste import Waste, WasteDensityCell
 from app.models.feedback import Feedback
 from app.models.ai_model import AIModel, TrainingData
+from app.models.replication import ReplicationHeartbeat
+from app.models.analytics import AnalyticsCubeCell, AnalyticsCubeState
 
 __all__ = [
     'User', 'Role', 'Permission', 'RolePermission',
-    'Certificate', 'CertificationModule', 'UserCertificationProgress',
+    'Certificate', 'CertificateCounter', 'CertificationModule', 'UserCertificationProgress',
+    'UserCertificationSummary',
     'Product', 'Robot',
     'Booking', 'Payment',
     'Mission', 'OperationLog', 'SensorData', 'MLDecision', 'Maintenance',
-    'Waste', 'Feedback',
-    'AIModel', 'TrainingData'
+    'Waste', 'WasteDensityCell', 'Feedback',
+    'AIModel', 'TrainingData',
+    'ReplicationHeartbeat',
+    'AnalyticsCubeCell', 'AnalyticsCubeState'
 ]
 
 
@@ -0,0 +1,38 @@
+from app import db
+from datetime import datetime
+
+
+# Cube analitik: agregat per hari x robot x model_type x location x booking_type
+class AnalyticsCubeCell(db.Model):
+    __tablename__ = 'analytics_cube'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    robot_id = db.Column(db.Integer, nullable=False, default=0)  # 0 = tanpa robot (purchase)
+    model_type = db.Column(db.String(100), nullable=False, default='')
+    location = db.Column(db.String(255), nullable=False, default='')
+    booking_type = db.Column(db.String(50), nullable=False)  # 'rental', 'purchase', 'mission'
+    bookings = db.Column(db.Integer, nullable=False, default=0)  # booking yang mulai hari itu
+    booked_days = db.Column(db.Float, nullable=False, default=0)  # robot-hari tersewa (pecahan per hari)
+    revenue = db.Column(db.Numeric(15, 2), nullable=False, default=0)  # payment completed (paid_at)
+    missions = db.Column(db.Integer, nullable=False, default=0)
+    mission_hours = db.Column(db.Float, nullable=False, default=0)
+    area_covered = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # km²
+    waste_collected = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # kg
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0, server_default='0', index=True)  # urutan commit
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'robot_id', 'model_type', 'location', 'booking_type', name='unique_cube_cell'),
+        db.Index('ix_analytics_cube_day', 'day'),
+    )
+
+
+# Satu baris: watermark refresh incremental + waktu rebuild penuh terakhir + counter versi cell
+class AnalyticsCubeState(db.Model):
+    __tablename__ = 'analytics_cube_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    watermark = db.Column(db.DateTime)  # perubahan sumber (updated_at) sampai titik ini sudah masuk cube
+    rebuilt_at = db.Column(db.DateTime)
+    version = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')  # versi cell terakhir
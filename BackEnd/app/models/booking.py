@@ -16,8 +16,9 @@ class Booking(db.Model):
     location = db.Column(db.String(255))
     status = db.Column(db.String(50), default='pending', index=True)  # 'pending', 'confirmed', 'active', 'completed', 'cancelled'
     total_cost = db.Column(db.Numeric(15, 2), nullable=False)
+    next_transition_at = db.Column(db.DateTime, index=True)  # dikelola services/booking_lifecycle.py
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     user = db.relationship('User', back_populates='bookings')
@@ -50,11 +51,23 @@ class Payment(db.Model):
     booking_id = db.Column(db.Integer, db.ForeignKey('booking.booking_id', ondelete='CASCADE'), nullable=False, index=True)
     amount = db.Column(db.Numeric(15, 2), nullable=False)
     method = db.Column(db.String(50), nullable=False)  # 'credit-card', 'e-wallet', 'bank-transfer'
-    status = db.Column(db.String(50), default='pending', index=True)  # 'pending', 'completed', 'failed', 'refunded'
+    status = db.Column(db.String(50), default='pending', index=True)  # 'pending', 'processing', 'completed', 'failed', 'refunded'
     paid_at = db.Column(db.DateTime)
     transaction_id = db.Column(db.String(255), unique=True)
+    idempotency_key = db.Column(db.String(100))  # dari header Idempotency-Key, unik per booking
+    gateway_reference = db.Column(db.String(100), index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    failure_reason = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('booking_id', 'idempotency_key', name='unique_payment_idempotency'),
+        # Maksimal satu payment terbuka/lunas per booking (partial index, dijaga database)
+        db.Index('uq_payment_active_booking', 'booking_id', unique=True,
+                 sqlite_where=db.text("status IN ('pending', 'processing', 'completed')"),
+                 postgresql_where=db.text("status IN ('pending', 'processing', 'completed')")),
+    )
     
     # Relationships
     booking = db.relationship('Booking', back_populates='payments')
@@ -68,6 +81,7 @@ class Payment(db.Model):
             'status': self.status,
             'paid_at': self.paid_at.isoformat() if self.paid_at else None,
             'transaction_id': self.transaction_id,
+            'failure_reason': self.failure_reason,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -13,6 +13,7 @@ class Certificate(db.Model):
     status = db.Column(db.String(50), default='active', index=True)  # 'active', 'expired', 'revoked'
     cert_number = db.Column(db.String(100), unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     user = db.relationship('User', back_populates='certificates')
@@ -29,6 +30,14 @@ class Certificate(db.Model):
         }
 
 
+class CertificateCounter(db.Model):
+    """Counter nomor sertifikat; blok nomor dialokasikan atomik (upsert ... RETURNING)"""
+    __tablename__ = 'certificate_counter'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
 class CertificationModule(db.Model):
     __tablename__ = 'certification_module'
     
@@ -83,3 +92,16 @@ class UserCertificationProgress(db.Model):
         }
 
 
+class UserCertificationSummary(db.Model):
+    """Ringkasan progress per user (denormalisasi), dihitung ulang setiap write progress"""
+    __tablename__ = 'user_certification_summary'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
+    module_count = db.Column(db.Integer, nullable=False, default=0)  # jumlah modul saat dihitung
+    completed_modules = db.Column(db.Integer, nullable=False, default=0)
+    progress_sum = db.Column(db.Integer, nullable=False, default=0)
+    overall_progress = db.Column(db.Integer, nullable=False, default=0)  # progress_sum // module_count
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = db.relationship('User', back_populates='certification_summary')
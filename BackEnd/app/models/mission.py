@@ -14,11 +14,12 @@ class Mission(db.Model):
     start_time = db.Column(db.DateTime)
     end_time = db.Column(db.DateTime)
     area_coords = db.Column(db.JSON)  # JSONB untuk fleksibilitas
-    status = db.Column(db.String(50), default='planned', index=True)  # 'planned', 'active', 'completed', 'cancelled'
+    planned_route = db.Column(db.JSON)  # hasil route planner (waypoints + statistik)
+    status = db.Column(db.String(50), default='planned', index=True)  # 'planned', 'assigned', 'active', 'completed', 'cancelled'
     area_covered = db.Column(db.Numeric(10, 2), default=0)  # km²
     waste_collected = db.Column(db.Numeric(10, 2), default=0)  # kg
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     robot = db.relationship('Robot', back_populates='missions')
@@ -39,6 +40,7 @@ class Mission(db.Model):
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'area_coords': self.area_coords if isinstance(self.area_coords, dict) else json.loads(self.area_coords) if self.area_coords else None,
+            'planned_route': self.planned_route if isinstance(self.planned_route, dict) else json.loads(self.planned_route) if self.planned_route else None,
             'status': self.status,
             'area_covered': float(self.area_covered) if self.area_covered else 0,
             'waste_collected': float(self.waste_collected) if self.waste_collected else 0,
@@ -58,6 +60,9 @@ class OperationLog(db.Model):
     results = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Timeline per misi (replay): scan terurut waktu tanpa sort
+    __table_args__ = (db.Index('ix_operation_log_mission_time', 'mission_id', 'timestamp'),)
+    
     # Relationships
     mission = db.relationship('Mission', back_populates='operation_logs')
     robot = db.relationship('Robot', back_populates='operation_logs')
@@ -103,6 +108,8 @@ class SensorData(db.Model):
     # Waste Detection
     waste_detected = db.Column(db.JSON)
     
+    __table_args__ = (db.Index('ix_sensor_data_mission_time', 'mission_id', 'timestamp'),)
+    
     # Relationships
     robot = db.relationship('Robot', back_populates='sensor_data')
     mission = db.relationship('Mission', back_populates='sensor_data')
@@ -149,6 +156,8 @@ class MLDecision(db.Model):
     confidence_score = db.Column(db.Numeric(5, 4))
     reward_value = db.Column(db.Numeric(10, 4))
     
+    __table_args__ = (db.Index('ix_ml_decision_mission_time', 'mission_id', 'timestamp'),)
+    
     # Relationships
     robot = db.relationship('Robot', back_populates='ml_decisions')
     mission = db.relationship('Mission', back_populates='ml_decisions')
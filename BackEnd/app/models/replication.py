@@ -0,0 +1,10 @@
+from app import db
+from datetime import datetime
+
+
+class ReplicationHeartbeat(db.Model):
+    """Satu baris per primary; ditulis berkala di primary, dibaca di replica untuk mengukur lag"""
+    __tablename__ = 'replication_heartbeat'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    beat_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
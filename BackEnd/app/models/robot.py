@@ -1,4 +1,6 @@
 from app import db
+from app.utils.geo import GEOHASH_COLLATION, encode_geohash, position_latlon
+from sqlalchemy.orm import validates
 from datetime import datetime
 import json
 
@@ -14,6 +16,8 @@ class Robot(db.Model):
     battery_lvl = db.Column(db.Integer, default=100)
     location = db.Column(db.String(255))
     current_position = db.Column(db.JSON)  # {latitude, longitude, depth}
+    geohash = db.Column(db.String(12).with_variant(db.String(12, collation=GEOHASH_COLLATION), 'postgresql'),
+                        index=True)  # diturunkan dari current_position
     firmware_version = db.Column(db.String(50))
     owner_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), index=True)
     last_maint = db.Column(db.DateTime)
@@ -29,6 +33,12 @@ class Robot(db.Model):
     operation_logs = db.relationship('OperationLog', back_populates='robot', cascade='all, delete-orphan')
     maintenance_records = db.relationship('Maintenance', back_populates='robot', cascade='all, delete-orphan')
     
+    @validates('current_position')
+    def _sync_geohash(self, key, value):
+        latlon = position_latlon(value)
+        self.geohash = encode_geohash(*latlon) if latlon else None
+        return value
+    
     def to_dict(self):
         return {
             'robot_id': self.robot_id,
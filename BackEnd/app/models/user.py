@@ -55,6 +55,8 @@ class User(db.Model):
     role = db.relationship('Role', back_populates='users')
     certificates = db.relationship('Certificate', back_populates='user', cascade='all, delete-orphan')
     certification_progress = db.relationship('UserCertificationProgress', back_populates='user', cascade='all, delete-orphan')
+    certification_summary = db.relationship('UserCertificationSummary', back_populates='user', uselist=False,
+                                            cascade='all, delete-orphan')
     bookings = db.relationship('Booking', back_populates='user', cascade='all, delete-orphan')
     missions = db.relationship('Mission', back_populates='operator', foreign_keys='Mission.operator_id')
     feedbacks = db.relationship('Feedback', back_populates='user', cascade='all, delete-orphan')
@@ -1,4 +1,6 @@
 from app import db
+from app.utils.geo import GEOHASH_COLLATION, encode_geohash, position_latlon
+from sqlalchemy.orm import validates
 from datetime import datetime
 import json
 
@@ -11,6 +13,8 @@ class Waste(db.Model):
     waste_type = db.Column(db.String(100), nullable=False, index=True)
     weight = db.Column(db.Numeric(10, 2), nullable=False)
     location = db.Column(db.JSON)  # {latitude, longitude, depth}
+    geohash = db.Column(db.String(12).with_variant(db.String(12, collation=GEOHASH_COLLATION), 'postgresql'),
+                        index=True)  # diturunkan dari location, untuk spatial query
     detected_at = db.Column(db.DateTime, nullable=False)
     collected = db.Column(db.Boolean, default=False)
     collected_at = db.Column(db.DateTime)
@@ -19,6 +23,12 @@ class Waste(db.Model):
     # Relationships
     mission = db.relationship('Mission', back_populates='wastes')
     
+    @validates('location')
+    def _sync_geohash(self, key, value):
+        latlon = position_latlon(value)
+        self.geohash = encode_geohash(*latlon) if latlon else None
+        return value
+    
     def to_dict(self):
         return {
             'waste_id': self.waste_id,
@@ -32,3 +42,32 @@ class Waste(db.Model):
         }
 
 
+# Agregat incremental waste per cell grid (tile zoom BASE_ZOOM) per hari
+class WasteDensityCell(db.Model):
+    __tablename__ = 'waste_density_cell'
+    
+    BASE_ZOOM = 20  # ~38m per cell di ekuator
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cell_x = db.Column(db.Integer, nullable=False)
+    cell_y = db.Column(db.Integer, nullable=False)
+    waste_type = db.Column(db.String(100), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total_weight = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('cell_x', 'cell_y', 'waste_type', 'day', name='unique_density_cell'),
+        db.Index('ix_waste_density_cell_day', 'day'),
+    )
+    
+    def to_dict(self):
+        return {
+            'cell_x': self.cell_x,
+            'cell_y': self.cell_y,
+            'waste_type': self.waste_type,
+            'day': self.day.isoformat() if self.day else None,
+            'count': self.count,
+            'total_weight': float(self.total_weight) if self.total_weight else 0
+        }
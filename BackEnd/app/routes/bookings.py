@@ -2,10 +2,13 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
 from app import db
-from app.models.booking import Booking, Payment
+from app.models.booking import Booking
 from app.models.user import User
 from app.models.product import Product
 from app.models.robot import Robot
+from app.services import payments
+from app.services.payments import payment_processor
+from app.services.pricing import MAX_QUOTE_RANGES, PricingError, parse_count, parse_duration, pricing_engine
 
 bp = Blueprint('bookings', __name__)
 
@@ -52,7 +55,10 @@ def create_booking():
         
         # Calculate end_date and duration for rental
         if booking_type == 'rental':
-            duration_days = data.get('duration_days', 1)
+            try:
+                duration_days = parse_duration(data.get('duration_days', 1))
+            except PricingError as e:
+                return jsonify({'error': str(e)}), 400
             end_date = start_date + timedelta(days=duration_days)
         else:
             duration_days = None
@@ -73,10 +79,12 @@ def create_booking():
             product = Product.query.get_or_404(product_id)
             total_cost = float(product.price)
         else:
-            # Rental pricing (simplified)
+            # Rental: tarif dinamis per model/musim/utilisasi + diskon durasi
             robot = Robot.query.get_or_404(robot_id)
-            price_per_day = 1500000  # Default rental price
-            total_cost = price_per_day * duration_days
+            try:
+                total_cost = pricing_engine.quote(robot.model_type, start_date, duration_days)['total_cost']
+            except PricingError as e:
+                return jsonify({'error': str(e)}), 400
         
         # Create booking
         booking = Booking(
@@ -105,6 +113,55 @@ def create_booking():
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/quote', methods=['POST'])
+@jwt_required()
+def quote_rental():
+    """
+    Quote harga sewa untuk banyak rentang sekaligus (kalender booking).
+    Body: robot_id atau model_type, lalu salah satu:
+      - ranges: [{start_date, duration_days}, ...]
+      - start_date + duration_days + count: `count` tanggal mulai berurutan
+    Tambahkan daily=true untuk tarif harian per tanggal.
+    """
+    try:
+        data = request.get_json() or {}
+        model_type = data.get('model_type')
+        if data.get('robot_id'):
+            model_type = Robot.query.get_or_404(data['robot_id']).model_type
+        if not model_type:
+            return jsonify({'error': 'robot_id or model_type is required'}), 400
+
+        # Jumlah rentang dicek sebelum list dibangun
+        if 'ranges' in data:
+            ranges = data['ranges']
+            if not isinstance(ranges, list) or len(ranges) > MAX_QUOTE_RANGES:
+                return jsonify({'error': f'ranges must be a list of at most {MAX_QUOTE_RANGES} items'}), 400
+            starts = [datetime.fromisoformat(item['start_date'].replace('Z', '+00:00')) for item in ranges]
+            durations = [parse_duration(item.get('duration_days', 1)) for item in ranges]
+        else:
+            first = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+            count = parse_count(data.get('count', 1))
+            starts = [first + timedelta(days=i) for i in range(count)]
+            durations = [parse_duration(data.get('duration_days', 1))] * count
+
+        result = {
+            'model_type': model_type,
+            'quotes': pricing_engine.quote_many(model_type, starts, durations)
+        }
+        if data.get('daily') and starts:
+            span = (max(starts) - min(starts)).days + max(durations)
+            result['daily_rates'] = [
+                {'date': day, 'rate': rate, 'utilisation': utilisation}
+                for day, rate, utilisation in pricing_engine.daily_rates(model_type, min(starts), span)
+            ]
+        return jsonify(result), 200
+
+    except (PricingError, KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/<int:booking_id>', methods=['GET'])
 @jwt_required()
 def get_booking(booking_id):
@@ -126,7 +183,7 @@ def get_booking(booking_id):
 @bp.route('/<int:booking_id>/payment', methods=['POST'])
 @jwt_required()
 def create_payment(booking_id):
-    """Create payment for booking"""
+    """Create payment for booking (pending; diproses gateway di background)"""
     try:
         user_id = int(get_jwt_identity())  # Convert string to int
         booking = Booking.query.get_or_404(booking_id)
@@ -135,28 +192,47 @@ def create_payment(booking_id):
         if booking.user_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        data = request.get_json()
-        
-        # Create payment
-        payment = Payment(
-            booking_id=booking_id,
-            amount=booking.total_cost,
-            method=data.get('method', 'credit-card'),
-            status='completed',  # Simulated - always success
-            paid_at=datetime.utcnow(),
-            transaction_id=f'TXN{booking_id}{int(datetime.utcnow().timestamp())}'
-        )
+        data = request.get_json(silent=True) or {}
         
-        # Update booking status
-        booking.status = 'confirmed'
+        # Retry dengan Idempotency-Key yang sama mengembalikan payment yang sama
+        idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+        if idempotency_key is not None and not 0 < len(str(idempotency_key)) <= 100:
+            return jsonify({'error': 'Idempotency-Key must be 1-100 characters'}), 400
         
-        db.session.add(payment)
+        payment, outcome = payments.create_payment(
+            db.session, booking, data.get('method', 'credit-card'),
+            str(idempotency_key) if idempotency_key is not None else None
+        )
+        if outcome == 'conflict':
+            db.session.rollback()
+            return jsonify({
+                'error': 'Booking is not awaiting payment',
+                'payment': payment.to_dict() if payment else None
+            }), 409
+        
+        if outcome == 'replayed':
+            db.session.rollback()
+            response = jsonify({'message': 'Payment already submitted', 'payment': payment.to_dict()})
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response, 200
+        
+        # Commit dulu: transaksi tidak ditahan selama menunggu gateway
         db.session.commit()
+        if payment_processor.mode == 'sync':
+            payment_processor.process_now(db.session, payment)
+            db.session.commit()
+        else:
+            payment_processor.submit([payment.payment_id])
         
+        if payment.status == 'completed':
+            return jsonify({'message': 'Payment successful', 'payment': payment.to_dict()}), 201
+        if payment.status == 'failed':
+            return jsonify({'error': 'Payment failed', 'payment': payment.to_dict()}), 402
         return jsonify({
-            'message': 'Payment successful',
-            'payment': payment.to_dict()
-        }), 201
+            'message': 'Payment pending',
+            'payment': payment.to_dict(),
+            'status_url': f'/api/payments/{payment.payment_id}'
+        }), 202
         
     except Exception as e:
         db.session.rollback()
@@ -1,22 +1,32 @@
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
 from app import db
-from app.models.user import User
-from app.models.certificate import Certificate, CertificationModule, UserCertificationProgress
+from app.models.certificate import CertificationModule
+from app.services.certificates import (
+    CERT_TYPE, MAX_VALID_DAYS, active_certificate, cert_index, issue_certificate, issue_certificates,
+    resolve_user_ids
+)
+from app.services.certification import (
+    certify_if_complete, complete_all_modules, module_catalog, progress_overview, save_progress
+)
+from app.services.replicas import read_replica
+from app.utils.auth import role_required
 
 bp = Blueprint('certification', __name__)
+logger = logging.getLogger(__name__)
 
 
 @bp.route('/modules', methods=['GET'])
+@read_replica
 def get_modules():
-    """Get all certification modules"""
+    """Get all certification modules (cached, ETag)"""
     try:
-        modules = CertificationModule.query.order_by(CertificationModule.order_index).all()
-        
-        return jsonify({
-            'modules': [module.to_dict() for module in modules]
-        }), 200
+        catalog = module_catalog.get()
+        response = Response(catalog.payload, status=200, mimetype='application/json')
+        response.set_etag(catalog.etag)
+        response.headers['Cache-Control'] = 'no-cache'  # client selalu revalidasi, 304 kalau belum berubah
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -28,57 +38,21 @@ def get_progress():
     """Get user certification progress"""
     try:
         user_id = int(get_jwt_identity())  # Convert string to int
-        print(f"Getting progress for user_id: {user_id}")
+        logger.debug('Getting progress', extra={'user_id': user_id})
 
-        progress = UserCertificationProgress.query.filter_by(user_id=user_id).all()
-        modules = CertificationModule.query.order_by(CertificationModule.order_index).all()
+        # Ringkasan + progress per modul (satu query) digabung dengan katalog cache
+        response_data = progress_overview(db.session, user_id)
 
-        print(f"Found {len(progress)} progress records and {len(modules)} modules")
-        
-        # Create progress map
-        progress_map = {p.module_id: p for p in progress}
-        
-        # Calculate overall progress
-        total_progress = 0
-        completed_modules = 0
-        
-        result = []
-        for module in modules:
-            module_progress = progress_map.get(module.id)
-            if module_progress:
-                total_progress += module_progress.progress_percentage
-                if module_progress.completed:
-                    completed_modules += 1
-                result.append({
-                    **module.to_dict(),
-                    'completed': module_progress.completed,
-                    'progress_percentage': module_progress.progress_percentage
-                })
-            else:
-                result.append({
-                    **module.to_dict(),
-                    'completed': False,
-                    'progress_percentage': 0
-                })
-        
-        overall_progress = total_progress // len(modules) if modules else 0
-        
-        response_data = {
-            'modules': result,
-            'overall_progress': overall_progress,
-            'completed_modules': completed_modules,
-            'total_modules': len(modules),
-            'is_certified': overall_progress == 100
-        }
-
-        print(f"Returning progress data: overall={overall_progress}%, completed={completed_modules}/{len(modules)}")
+        logger.debug('Returning progress data', extra={
+            'overall_progress': response_data['overall_progress'],
+            'completed_modules': response_data['completed_modules'],
+            'total_modules': response_data['total_modules']
+        })
 
         return jsonify(response_data), 200
 
     except Exception as e:
-        print(f"Error in get_progress: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error in get_progress')
         return jsonify({'error': str(e)}), 500
 
 
@@ -114,52 +88,14 @@ def update_progress(module_id):
 
         completed = bool(data.get('completed', False))
         
-        # Get or create progress
-        progress = UserCertificationProgress.query.filter_by(
-            user_id=user_id,
-            module_id=module_id
-        ).first()
-        
-        if not progress:
-            progress = UserCertificationProgress(
-                user_id=user_id,
-                module_id=module_id,
-                progress_percentage=progress_percentage,
-                completed=completed
-            )
-            db.session.add(progress)
-        else:
-            progress.progress_percentage = progress_percentage
-            progress.completed = completed
-            if completed and not progress.completed_at:
-                progress.completed_at = datetime.utcnow()
-        
+        # Upsert progress + cek kelulusan (satu transaksi, jumlah query konstan)
+        progress = save_progress(db.session, user_id, module_id, progress_percentage, completed)
+        certify_if_complete(db.session, user_id)
         db.session.commit()
         
-        # Check if all modules completed
-        user = User.query.get(user_id)
-        all_progress = UserCertificationProgress.query.filter_by(user_id=user_id).all()
-        all_completed = all(
-            p.completed for p in all_progress
-            if p.module_id in [m.id for m in CertificationModule.query.all()]
-        )
-        
-        if all_completed and not user.is_certified:
-            user.is_certified = True
-            # Create certificate
-            cert = Certificate(
-                user_id=user_id,
-                cert_type='Operator Certification',
-                issued_date=datetime.utcnow(),
-                status='active',
-                cert_number=f'SEAL-{user_id}-{int(datetime.utcnow().timestamp())}'
-            )
-            db.session.add(cert)
-            db.session.commit()
-        
         return jsonify({
             'message': 'Progress updated',
-            'progress': progress.to_dict()
+            'progress': progress
         }), 200
         
     except Exception as e:
@@ -173,45 +109,14 @@ def complete_certification():
     """Complete certification (simulate completion)"""
     try:
         user_id = int(get_jwt_identity())  # Convert string to int
-        user = User.query.get(user_id)
         
-        # Get all modules
-        modules = CertificationModule.query.order_by(CertificationModule.order_index).all()
+        # Mark all modules as completed (INSERT ... SELECT ... ON CONFLICT)
+        complete_all_modules(db.session, user_id)
         
-        # Mark all as completed
-        for module in modules:
-            progress = UserCertificationProgress.query.filter_by(
-                user_id=user_id,
-                module_id=module.id
-            ).first()
-            
-            if not progress:
-                progress = UserCertificationProgress(
-                    user_id=user_id,
-                    module_id=module.id,
-                    progress_percentage=100,
-                    completed=True,
-                    completed_at=datetime.utcnow()
-                )
-                db.session.add(progress)
-            else:
-                progress.progress_percentage = 100
-                progress.completed = True
-                if not progress.completed_at:
-                    progress.completed_at = datetime.utcnow()
-        
-        # Update user
-        user.is_certified = True
-        
-        # Create certificate
-        cert = Certificate(
-            user_id=user_id,
-            cert_type='Operator Certification',
-            issued_date=datetime.utcnow(),
-            status='active',
-            cert_number=f'SEAL-{user_id}-{int(datetime.utcnow().timestamp())}'
-        )
-        db.session.add(cert)
+        # Update user + create certificate (sudah certified: pakai sertifikat aktif)
+        cert = certify_if_complete(db.session, user_id)
+        if cert is None:
+            cert = active_certificate(db.session, user_id) or issue_certificate(db.session, user_id)
         db.session.commit()
         
         return jsonify({
@@ -223,3 +128,65 @@ def complete_certification():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+
+@bp.route('/verify/<cert_number>', methods=['GET'])
+def verify_certificate(cert_number):
+    """Verifikasi publik nomor sertifikat (index di memori, tanpa query database)"""
+    try:
+        result = cert_index.lookup(cert_number.strip().upper())
+        if result is None:
+            return jsonify({'cert_number': cert_number, 'valid': False, 'error': 'Certificate not found'}), 404
+
+        response = jsonify(result)
+        response.headers['Cache-Control'] = 'public, max-age=10'  # revoke terlihat cepat
+        return response, 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/certificates/batch', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def issue_certificates_batch():
+    """Terbitkan sertifikat untuk banyak user sekaligus (satu transaksi)"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Request body is required'}), 400
+
+        user_ids = data.get('user_ids') or []
+        emails = data.get('emails') or []
+        if not isinstance(user_ids, list) or not isinstance(emails, list) or not (user_ids or emails):
+            return jsonify({'error': 'user_ids or emails (list) is required'}), 400
+
+        try:
+            user_ids = [int(user_id) for user_id in user_ids]
+        except (ValueError, TypeError):
+            return jsonify({'error': 'user_ids must be numbers'}), 400
+
+        valid_days = data.get('valid_days')  # null / tidak ada = tanpa kedaluwarsa
+        if valid_days is not None and (
+            not isinstance(valid_days, int) or isinstance(valid_days, bool)
+            or not 1 <= valid_days <= MAX_VALID_DAYS
+        ):
+            return jsonify({'error': f'valid_days must be an integer between 1 and {MAX_VALID_DAYS}'}), 400
+
+        if emails:
+            user_ids += resolve_user_ids(db.session, emails)
+        certificates, skipped = issue_certificates(
+            db.session, user_ids, cert_type=data.get('cert_type') or CERT_TYPE, valid_days=valid_days
+        )
+        db.session.commit()
+
+        return jsonify({
+            'message': f'{len(certificates)} certificates issued',
+            'issued': len(certificates),
+            'skipped': skipped,
+            'certificates': certificates
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
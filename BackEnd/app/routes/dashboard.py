@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
 from app import db
@@ -7,12 +7,16 @@ from app.models.mission import Mission, OperationLog
 from app.models.waste import Waste
 from app.models.user import User
 from app.models.booking import Booking
+from app.services.analytics_cube import analytics_cube
+from app.services.exports import Export, ExportError
+from app.services.replicas import read_replica, replica_router
 from app.utils.auth import role_required
 
 bp = Blueprint('dashboard', __name__)
 
 
 @bp.route('/overview', methods=['GET'])
+@read_replica
 @jwt_required()
 @role_required('admin')
 def get_overview():
@@ -68,6 +72,7 @@ def get_overview():
 
 
 @bp.route('/robots/status', methods=['GET'])
+@read_replica
 @jwt_required()
 @role_required('admin')
 def get_robots_status():
@@ -109,6 +114,7 @@ def get_robots_status():
 
 
 @bp.route('/analytics/performance', methods=['GET'])
+@read_replica
 @jwt_required()
 @role_required('admin')
 def get_performance_analytics():
@@ -133,7 +139,54 @@ def get_performance_analytics():
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/analytics/cube', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def query_analytics_cube():
+    """
+    Roll-up / slice cube analitik.
+    Query: group_by=model_type,location,... (robot_id, model_type, location, booking_type),
+    grain=day|week|month|year, from/to (tanggal, to eksklusif), measures=revenue,booked_days,...,
+    filter per dimensi: model_type=CleanBot,Vision AI&location=...&booking_type=...&robot_id=...
+    """
+    try:
+        def listed(name):
+            value = request.args.get(name)
+            return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+        start = request.args.get('from')
+        end = request.args.get('to')
+        result = analytics_cube.query(
+            group_by=listed('group_by'),
+            grain=request.args.get('grain'),
+            start=datetime.fromisoformat(start).date() if start else None,
+            end=datetime.fromisoformat(end).date() if end else None,
+            filters={name: listed(name) for name in ('robot_id', 'model_type', 'location', 'booking_type')},
+            measures=listed('measures')
+        )
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/analytics/cube/refresh', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def refresh_analytics_cube():
+    """Refresh cube sekarang (body: {"full": true} untuk rebuild penuh)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        return jsonify(analytics_cube.refresh(full=bool(data.get('full')) or None)), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/activity-log', methods=['GET'])
+@read_replica
 @jwt_required()
 @role_required('admin')
 def get_activity_log():
@@ -164,6 +217,7 @@ def get_activity_log():
 
 
 @bp.route('/bookings', methods=['GET'])
+@read_replica
 @jwt_required()
 @role_required('admin')
 def get_all_bookings():
@@ -185,3 +239,37 @@ def get_all_bookings():
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/exports/<dataset>', methods=['GET'])
+@read_replica
+@jwt_required()
+@role_required('admin')
+def export_dataset(dataset):
+    """
+    Stream export laporan (bookings, payments, missions, waste) sebagai file.
+    Query: format=csv|parquet, compression=gzip (csv) atau snappy|zstd|gzip|none (parquet),
+    from/to (ISO datetime, to eksklusif), status.
+    """
+    try:
+        start = request.args.get('from')
+        end = request.args.get('to')
+        export = Export(
+            dataset,
+            fmt=request.args.get('format', 'csv'),
+            compression=request.args.get('compression'),
+            start=datetime.fromisoformat(start) if start else None,
+            end=datetime.fromisoformat(end) if end else None,
+            status=request.args.get('status'),
+            chunk_rows=current_app.config.get('EXPORT_CHUNK_ROWS', 5000)
+        )
+        export.engine = replica_router.engine_for(export.query) or db.engine
+
+        return Response(stream_with_context(iter(export)), mimetype=export.mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{export.filename}"'
+        })
+
+    except ExportError as e:
+        return jsonify({'error': str(e)}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid date: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify, Response
+from flask_jwt_extended import jwt_required
+from datetime import date, timedelta
+from app.services.heatmap import BASE_ZOOM, render_tile
+
+bp = Blueprint('heatmap', __name__)
+
+WINDOWS = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}
+
+
+def _parse_window(args):
+    """Time window dari ?window=7d atau ?start=YYYY-MM-DD&end=YYYY-MM-DD"""
+    window = args.get('window')
+    if window:
+        if window not in WINDOWS:
+            raise ValueError(f'window must be one of {", ".join(WINDOWS)}')
+        end = date.today()
+        return end - timedelta(days=WINDOWS[window] - 1), end
+
+    start = args.get('start')
+    end = args.get('end')
+    return (
+        date.fromisoformat(start) if start else None,
+        date.fromisoformat(end) if end else None
+    )
+
+
+@bp.route('/tiles/<int:z>/<int:x>/<int:y>', methods=['GET'])
+@jwt_required()
+def get_tile(z, x, y):
+    """Get waste density heatmap tile"""
+    try:
+        if z < 0 or z > BASE_ZOOM:
+            return jsonify({'error': f'z must be between 0 and {BASE_ZOOM}'}), 400
+        if x >= (1 << z) or y >= (1 << z):
+            return jsonify({'error': 'Tile out of range'}), 400
+
+        try:
+            start, end = _parse_window(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        payload = render_tile(z, x, y, request.args.get('waste_type'), start, end)
+        return Response(payload, status=200, mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
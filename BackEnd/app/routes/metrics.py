@@ -0,0 +1,230 @@
+import hmac
+
+from flask import Blueprint, current_app, request, jsonify, Response
+from flask_jwt_extended import jwt_required
+from app.services.analytics_cube import analytics_cube
+from app.services.booking_lifecycle import booking_lifecycle
+from app.services.certificates import cert_index
+from app.services.change_stream import change_stream
+from app.services.exports import export_metrics
+from app.services.instrumentation import profile_store, registry
+from app.services.mission_replay import mission_replay
+from app.services.operation_log import operation_log
+from app.services.payments import payment_processor
+from app.services.pricing import pricing_engine
+from app.services.replicas import replica_router
+from app.services.slow_queries import slow_query_log
+from app.utils.auth import role_required
+
+bp = Blueprint('metrics', __name__)
+
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus exposition (Bearer METRICS_TOKEN; ditolak kalau token belum dikonfigurasi)"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return jsonify({'error': 'Metrics endpoint is not configured'}), 503
+    if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    return Response(registry.exposition(), mimetype='text/plain; version=0.0.4')
+
+
+@bp.route('/api/metrics/profiles', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def list_profiles():
+    """List on-demand request profiles"""
+    try:
+        return jsonify({'profiles': profile_store.list()}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/profiles/<int:profile_id>', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_profile(profile_id):
+    """Get profile output (text)"""
+    try:
+        profile = profile_store.get(profile_id)
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
+
+        if request.args.get('format') == 'json':
+            return jsonify(profile), 200
+        return Response(profile['output'], mimetype='text/plain')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/slow-queries', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def list_slow_queries():
+    """Slow query per fingerprint (sort: total_ms, max_ms, mean_ms, count)"""
+    try:
+        sort = request.args.get('sort', 'total_ms')
+        if sort not in ('total_ms', 'max_ms', 'mean_ms', 'count'):
+            return jsonify({'error': 'Invalid sort'}), 400
+        limit = min(request.args.get('limit', 50, type=int), 500)
+
+        return jsonify({
+            'threshold_ms': slow_query_log.threshold * 1000,
+            'queries': slow_query_log.summary(sort=sort, limit=limit)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/slow-queries/<fingerprint>', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_slow_query(fingerprint):
+    """Detail fingerprint termasuk EXPLAIN plan"""
+    try:
+        entry = slow_query_log.get(fingerprint)
+        if not entry:
+            return jsonify({'error': 'Fingerprint not found'}), 404
+
+        return jsonify(entry), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/slow-queries', methods=['DELETE'])
+@jwt_required()
+@role_required('admin')
+def reset_slow_queries():
+    """Reset statistik slow query"""
+    try:
+        slow_query_log.reset()
+        return jsonify({'message': 'Slow query log reset'}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/replicas', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_replicas():
+    """Status read replica: lag, health, jumlah baca replica vs primary"""
+    try:
+        return jsonify(replica_router.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/operation-log', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_operation_log_status():
+    """Status buffer write-behind OperationLog: pending, spill file, jumlah flush"""
+    try:
+        return jsonify(operation_log.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/payments', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_payment_pipeline_status():
+    """Status pipeline pembayaran: antrian, batch charge, webhook, rekonsiliasi"""
+    try:
+        return jsonify(payment_processor.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/booking-lifecycle', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_booking_lifecycle_status():
+    """Status scheduler transisi booking: jumlah tick, transisi, durasi tick terakhir"""
+    try:
+        return jsonify(booking_lifecycle.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/pricing', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_pricing_status():
+    """Status tabel tarif sewa: model, horizon, umur tabel, jumlah build/quote"""
+    try:
+        return jsonify(pricing_engine.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/analytics-cube', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_analytics_cube_status():
+    """Status cube analitik: jumlah cell di memori, versi terakhir, durasi refresh/query terakhir"""
+    try:
+        return jsonify(analytics_cube.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/cdc', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_change_stream_status():
+    """Status change data capture: seq terakhir, subscriber (antrian, event terbuang), biaya publish per commit"""
+    try:
+        return jsonify(change_stream.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/replay', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_mission_replay_status():
+    """Status replay misi: index seek yang di-cache, jumlah build/hit, latency event pertama setelah seek"""
+    try:
+        return jsonify(mission_replay.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/exports', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_export_status():
+    """Throughput export laporan: total + export terakhir (baris, byte, detik, baris/detik)"""
+    try:
+        return jsonify(export_metrics.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/metrics/certificate-index', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_certificate_index_status():
+    """Status index verifikasi sertifikat: jumlah entry, watermark, durasi refresh"""
+    try:
+        return jsonify(cert_index.status()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
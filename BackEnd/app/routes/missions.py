@@ -0,0 +1,179 @@
+import json
+import math
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from app import db
+from app.models.mission import Mission, SensorData
+from app.services.fleet_scheduler import apply_assignments, fleet_scheduler
+from app.services.mission_replay import ReplayError, check_playback, mission_replay
+from app.services.replicas import read_replica, replica_router
+from app.services.route_planner import MAX_HOTSPOTS, MAX_WINDOW_DAYS, MIN_RESOLUTION_M, AreaError, plan_mission
+from app.utils.auth import role_required
+
+bp = Blueprint('missions', __name__)
+
+
+@bp.route('/schedule', methods=['POST'])
+@jwt_required()
+@role_required('admin', 'operator')
+def schedule_missions():
+    """Assign planned missions to robots across the fleet"""
+    try:
+        data = request.get_json(silent=True) or {}
+
+        if data.get('reload'):
+            fleet_scheduler.load()
+        assignments, unassigned = fleet_scheduler.plan()
+
+        applied = 0
+        if not data.get('dry_run', False):
+            applied = apply_assignments(assignments)
+
+        return jsonify({
+            'assignments': assignments,
+            'unassigned': unassigned,
+            'applied': applied
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/<int:mission_id>', methods=['GET'])
+@jwt_required()
+def get_mission(mission_id):
+    """Get mission details"""
+    try:
+        mission = Mission.query.get_or_404(mission_id)
+        return jsonify(mission.to_dict()), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/<int:mission_id>/plan', methods=['POST'])
+@jwt_required()
+@role_required('admin', 'operator')
+def plan_mission_route(mission_id):
+    """Plan coverage/collection route for a mission"""
+    try:
+        data = request.get_json(silent=True) or {}
+        mission = Mission.query.get_or_404(mission_id)
+
+        options = {}
+        window_days = None
+        try:
+            for key in ('resolution_m', 'hotspot_block_m'):
+                if key in data:
+                    value = float(data[key])
+                    # Grid ikut dibatasi jumlah cell-nya di plan_route (AreaError)
+                    if not MIN_RESOLUTION_M <= value < math.inf:
+                        return jsonify({'error': f'{key} must be at least {MIN_RESOLUTION_M:g} m'}), 400
+                    options[key] = value
+            if 'max_hotspots' in data:
+                max_hotspots = data['max_hotspots']
+                if isinstance(max_hotspots, bool) or int(max_hotspots) != float(max_hotspots):
+                    raise ValueError(max_hotspots)
+                if not 0 <= int(max_hotspots) <= MAX_HOTSPOTS:
+                    return jsonify({'error': f'max_hotspots must be between 0 and {MAX_HOTSPOTS}'}), 400
+                options['max_hotspots'] = int(max_hotspots)
+            if data.get('window_days') is not None:
+                window_days = data['window_days']
+                # bool adalah int, 1.5 tidak boleh dibulatkan diam-diam
+                if isinstance(window_days, bool) or int(window_days) != float(window_days):
+                    raise ValueError(window_days)
+                window_days = int(window_days)
+                if not 1 <= window_days <= MAX_WINDOW_DAYS:
+                    return jsonify({'error': f'window_days must be between 1 and {MAX_WINDOW_DAYS}'}), 400
+        except (TypeError, ValueError, OverflowError):
+            return jsonify({'error': 'Invalid planning parameter'}), 400
+
+        try:
+            plan = plan_mission(
+                mission,
+                waste_type=data.get('waste_type'),
+                window_days=window_days,
+                **options
+            )
+        except AreaError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if data.get('save', True):
+            mission.planned_route = plan
+            db.session.commit()
+
+        return jsonify({
+            'mission_id': mission.mission_id,
+            'plan': plan
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+def _replay_engine():
+    return replica_router.engine_for(select(SensorData.id)) or db.engine
+
+
+@bp.route('/<int:mission_id>/replay/index', methods=['GET'])
+@read_replica
+@jwt_required()
+@role_required('admin', 'operator')
+def get_mission_replay_index(mission_id):
+    """Ringkasan timeline replay: jumlah event per sumber, awal/akhir, durasi, checkpoint seek"""
+    try:
+        if db.session.get(Mission, mission_id) is None:
+            return jsonify({'error': 'Mission not found'}), 404
+        return jsonify(mission_replay.summary(mission_id, _replay_engine())), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/<int:mission_id>/replay', methods=['GET'])
+@read_replica
+@jwt_required()
+@role_required('admin', 'operator')
+def replay_mission(mission_id):
+    """
+    Stream timeline misi (sensor_data + ml_decision + operation_log) sebagai NDJSON.
+    Query: at (detik sejak event pertama) atau offset, speed (0 = secepatnya, 1 = real time),
+    max_gap (detik), limit, raw=true (ikut camera_data/lidar_data).
+    """
+    try:
+        if db.session.get(Mission, mission_id) is None:
+            return jsonify({'error': 'Mission not found'}), 404
+
+        args = request.args
+        speed = float(args.get('speed', 0))
+        max_gap = float(args['max_gap']) if 'max_gap' in args else None
+        check_playback(speed, max_gap)
+        engine = _replay_engine()
+        total = mission_replay.index(mission_id, engine).total
+        events = mission_replay.events(
+            mission_id,
+            at=float(args['at']) if 'at' in args else None,
+            offset=int(args['offset']) if 'offset' in args else None,
+            limit=int(args['limit']) if 'limit' in args else None,
+            raw=args.get('raw', 'false').lower() == 'true',
+            engine=engine
+        )
+
+        def generate():
+            for frame in mission_replay.frames(events, speed=speed, max_gap=max_gap):
+                yield ''.join(json.dumps(item, separators=(',', ':'), default=str) + '\n' for item in frame)
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+            'X-Replay-Events': str(total),
+            'X-Accel-Buffering': 'no'  # playback real time: jangan di-buffer proxy
+        })
+
+    except ReplayError as e:
+        return jsonify({'error': str(e)}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,57 @@
+import json
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models.booking import Payment
+from app.services.payments import payment_processor
+
+bp = Blueprint('payments', __name__)
+
+
+@bp.route('/<int:payment_id>', methods=['GET'])
+@jwt_required()
+def get_payment(payment_id):
+    """Get payment status (polling setelah 202 dari POST /bookings/<id>/payment)"""
+    try:
+        user_id = int(get_jwt_identity())  # Convert string to int
+        payment = db.session.get(Payment, payment_id)
+        if not payment:
+            return jsonify({'error': 'Payment not found'}), 404
+        
+        # Check ownership
+        if payment.booking.user_id != user_id:
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        return jsonify({
+            'payment': payment.to_dict(),
+            'booking_status': payment.booking.status
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/webhook', methods=['POST'])
+def payment_webhook():
+    """Callback gateway: {"events": [...]}, HMAC SHA-256 raw body di header X-Gateway-Signature"""
+    try:
+        if not payment_processor.webhook_secret:
+            return jsonify({'error': 'Payment webhook is not configured'}), 503
+
+        body = request.get_data()
+        if not payment_processor.verify_signature(body, request.headers.get('X-Gateway-Signature')):
+            return jsonify({'error': 'Invalid signature'}), 401
+        
+        try:
+            events = json.loads(body).get('events')
+        except (ValueError, AttributeError):
+            events = None
+        if not isinstance(events, list):
+            return jsonify({'error': 'events (list) is required'}), 400
+        
+        # Idempotent: event yang sama dua kali tidak mengubah apa pun
+        applied = payment_processor.handle_events(events)
+        return jsonify({'received': len(events), 'applied': applied}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
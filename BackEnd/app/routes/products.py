@@ -2,11 +2,13 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.product import Product
+from app.services.replicas import read_replica
 
 bp = Blueprint('products', __name__)
 
 
 @bp.route('', methods=['GET'])
+@read_replica
 def get_products():
     """Get product catalog"""
     try:
@@ -27,6 +29,7 @@ def get_products():
 
 
 @bp.route('/<int:product_id>', methods=['GET'])
+@read_replica
 def get_product(product_id):
     """Get product details"""
     try:
@@ -0,0 +1,121 @@
+"""
+SocketIO event handler untuk replay timeline misi (dashboard).
+
+Protokol:
+  client -> server  'replay_start'  {mission_id, token, at? | offset?, speed?, max_gap?}
+  server -> client  'replay_started' {replay_id, mission_id}
+  server -> client  'replay_events' {replay_id, mission_id, events: [...]}   (satu frame)
+  server -> client  'replay_end'    {replay_id, mission_id, offset}
+  client -> server  'replay_seek'   {at | offset}   lanjut dengan mission/speed yang sama
+  client -> server  'replay_stop'   {}
+  server -> client  'replay_error'  {error}
+
+`token` = JWT access token (admin/operator). Satu replay aktif per koneksi: start/seek
+baru menghentikan replay sebelumnya di frame berikutnya. Seek tetap bisa setelah
+replay_end; state koneksi yang sudah putus dibersihkan saat replay berikutnya dimulai.
+"""
+import itertools
+
+from flask import current_app, request
+from flask_jwt_extended import decode_token
+from flask_socketio import emit
+from app import db, socketio
+from app.models.mission import Mission
+from app.models.user import User
+from app.services.mission_replay import ReplayError, check_playback, mission_replay
+
+REPLAY_ROLES = ('admin', 'operator')
+
+# sid -> parameter replay terakhir (mission_id, speed, max_gap, replay_id, active)
+_replays = {}
+_replay_ids = itertools.count(1)
+
+
+def _authorized(token):
+    try:
+        user_id = decode_token(token)['sub']
+    except Exception:
+        return False
+    user = db.session.get(User, int(user_id))
+    return user is not None and user.role is not None and user.role.role_name in REPLAY_ROLES
+
+
+def _number(data, key, cast):
+    value = data.get(key)
+    return None if value is None else cast(value)
+
+
+def _start(sid, mission_id, speed, max_gap, at=None, offset=None):
+    replay_id = next(_replay_ids)
+    events = mission_replay.events(mission_id, at=at, offset=offset)
+    for stale in [key for key in _replays if not socketio.server.manager.is_connected(key, '/')]:
+        _replays.pop(stale, None)
+    _replays[sid] = {'mission_id': mission_id, 'speed': speed, 'max_gap': max_gap, 'replay_id': replay_id,
+                     'active': True}
+    app = current_app._get_current_object()
+    socketio.start_background_task(_play, app, sid, replay_id, mission_id, events, speed, max_gap)
+    return replay_id
+
+
+def _play(app, sid, replay_id, mission_id, events, speed, max_gap):
+    position = None
+    with app.app_context():
+        for frame in mission_replay.frames(events, speed=speed, max_gap=max_gap, sleep=socketio.sleep):
+            current = _replays.get(sid)
+            if current is None or current['replay_id'] != replay_id or not current['active'] or \
+                    not socketio.server.manager.is_connected(sid, '/'):
+                return
+            socketio.emit('replay_events', {'replay_id': replay_id, 'mission_id': mission_id, 'events': frame},
+                          to=sid)
+            position = frame[-1]['offset']
+    current = _replays.get(sid)
+    if current is not None and current['replay_id'] == replay_id:
+        current['active'] = False
+        socketio.emit('replay_end', {'replay_id': replay_id, 'mission_id': mission_id, 'offset': position}, to=sid)
+
+
+@socketio.on('replay_start')
+def on_replay_start(data):
+    data = data or {}
+    if not _authorized(data.get('token')):
+        emit('replay_error', {'error': 'Unauthorized'})
+        return
+
+    try:
+        mission_id = int(data.get('mission_id'))
+        speed = float(data.get('speed', 1))
+        max_gap = _number(data, 'max_gap', float)
+        check_playback(speed, max_gap)
+        if db.session.get(Mission, mission_id) is None:
+            emit('replay_error', {'error': 'Mission not found'})
+            return
+        replay_id = _start(request.sid, mission_id, speed, max_gap,
+                           at=_number(data, 'at', float), offset=_number(data, 'offset', int))
+    except (TypeError, ValueError, ReplayError) as e:
+        emit('replay_error', {'error': str(e)})
+        return
+    emit('replay_started', {'replay_id': replay_id, 'mission_id': mission_id})
+
+
+@socketio.on('replay_seek')
+def on_replay_seek(data):
+    data = data or {}
+    current = _replays.get(request.sid)
+    if current is None:
+        emit('replay_error', {'error': 'No active replay'})
+        return
+
+    try:
+        replay_id = _start(request.sid, current['mission_id'], current['speed'], current['max_gap'],
+                           at=_number(data, 'at', float), offset=_number(data, 'offset', int))
+    except (TypeError, ValueError, ReplayError) as e:
+        emit('replay_error', {'error': str(e)})
+        return
+    emit('replay_started', {'replay_id': replay_id, 'mission_id': current['mission_id']})
+
+
+@socketio.on('replay_stop')
+def on_replay_stop(data=None):
+    current = _replays.get(request.sid)
+    if current is not None:
+        current['active'] = False
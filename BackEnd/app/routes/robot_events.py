@@ -0,0 +1,74 @@
+"""
+SocketIO event handler untuk robot / simulator.
+
+Protokol:
+  client -> server  'robot_join'  {robot_id | robot_ids, token?}
+  server -> client  'robot_command' {command_id, robot_id, action, params}
+  client -> server  'robot_ack'   {command_id, ok, state?: {battery, position}}
+  server -> client  'robot_error' {error, command_id?}  (token salah, ack untuk robot lain, state invalid)
+"""
+from flask import current_app, request
+from flask_socketio import join_room, leave_room, emit
+from app import socketio
+from app.services.command_queue import apply_command_result, command_queue, parse_robot_state
+
+# sid -> set(robot_id) untuk cleanup saat disconnect. Satu koneksi boleh
+# mewakili banyak robot (gateway / simulator).
+_robot_sessions = {}
+
+
+@socketio.on('robot_join')
+def on_robot_join(data):
+    data = data or {}
+    token = current_app.config.get('ROBOT_SOCKET_TOKEN')
+    if token and data.get('token') != token:
+        emit('robot_error', {'error': 'Invalid robot token'})
+        return
+
+    try:
+        robot_ids = data.get('robot_ids') or [data.get('robot_id')]
+        robot_ids = [int(robot_id) for robot_id in robot_ids]
+    except (TypeError, ValueError):
+        emit('robot_error', {'error': 'robot_id is required'})
+        return
+
+    joined = _robot_sessions.setdefault(request.sid, set())
+    for robot_id in robot_ids:
+        join_room(f'robot_{robot_id}')
+        joined.add(robot_id)
+        command_queue.robot_connected(robot_id)
+    emit('robot_joined', {'robot_ids': robot_ids})
+
+
+@socketio.on('robot_ack')
+def on_robot_ack(data):
+    data = data or {}
+    try:
+        command_id = int(data.get('command_id'))
+    except (TypeError, ValueError):
+        return
+
+    # Hanya koneksi yang sudah robot_join untuk robot command ini yang boleh meng-ack
+    command = command_queue.get(command_id)
+    if command is None or command.robot_id not in _robot_sessions.get(request.sid, ()):
+        emit('robot_error', {'error': 'Unknown command', 'command_id': command_id})
+        return
+    try:
+        state = parse_robot_state(data.get('state'))
+    except ValueError as e:
+        emit('robot_error', {'error': str(e), 'command_id': command_id})
+        return
+
+    command = command_queue.ack(command_id, ok=bool(data.get('ok', True)), result=data.get('result'))
+    if command is not None:
+        apply_command_result(command, state)
+
+
+@socketio.on('disconnect')
+def on_disconnect():
+    robot_ids = _robot_sessions.pop(request.sid, set())
+    still_connected = set().union(*_robot_sessions.values()) if _robot_sessions else set()
+    for robot_id in robot_ids:
+        leave_room(f'robot_{robot_id}')
+        if robot_id not in still_connected:
+            command_queue.robot_disconnected(robot_id)
@@ -1,12 +1,25 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.robot import Robot
 from app.models.user import User
 from app.models.mission import SensorData
+from app.services.command_queue import command_queue
+from app.services.operation_log import operation_log
+from app.services.replicas import read_replica
+from app.services.telemetry import TelemetryError, ingest_samples
 from app.utils.auth import role_required
 
 bp = Blueprint('robots', __name__)
+logger = logging.getLogger(__name__)
+
+
+def log_command(command):
+    """Audit trail command kontrol (write-behind, request tidak menunggu commit log)"""
+    operation_log.record(f'command_{command.action}', robot_id=command.robot_id,
+                         parameters={**command.params, 'user_id': get_jwt_identity()},
+                         results={'command_id': command.command_id, 'status': command.status})
 
 
 @bp.route('', methods=['GET'])
@@ -44,9 +57,64 @@ def get_robots():
         }), 200
 
     except Exception as e:
-        print(f"Error in get_robots: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error in get_robots')
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def create_robots():
+    """Register robot(s). Body: robot object atau {robots: [...]}"""
+    try:
+        data = request.get_json() or {}
+        items = data.get('robots') if isinstance(data.get('robots'), list) else [data]
+        
+        robots = []
+        for item in items:
+            if not item.get('robot_name'):
+                return jsonify({'error': 'robot_name is required'}), 400
+            robots.append(Robot(
+                robot_name=item['robot_name'],
+                model=item.get('model'),
+                model_type=item.get('model_type'),
+                status=item.get('status', 'offline'),
+                battery_lvl=item.get('battery_lvl', 100),
+                location=item.get('location'),
+                current_position=item.get('current_position'),
+                firmware_version=item.get('firmware_version'),
+                owner_id=item.get('owner_id')
+            ))
+        
+        db.session.add_all(robots)
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'{len(robots)} robot(s) registered',
+            'robots': [robot.to_dict() for robot in robots]
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/telemetry', methods=['POST'])
+@jwt_required()
+@role_required('admin', 'operator')
+def ingest_telemetry():
+    """Batch ingest telemetry from robots / gateway / simulator"""
+    try:
+        data = request.get_json() or {}
+        
+        try:
+            result = ingest_samples(data.get('samples', []))
+        except TelemetryError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(result), 201
+        
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
@@ -94,28 +162,49 @@ def get_robot_status(robot_id):
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/<int:robot_id>/telemetry', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_robot_telemetry(robot_id):
+    """Get recent telemetry samples"""
+    try:
+        Robot.query.get_or_404(robot_id)
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        
+        samples = SensorData.query.filter_by(robot_id=robot_id)\
+            .order_by(SensorData.timestamp.desc()).limit(limit).all()
+        
+        return jsonify({
+            'robot_id': robot_id,
+            'samples': [sample.to_dict() for sample in samples]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/<int:robot_id>/control/start', methods=['POST'])
 @jwt_required()
 @role_required('admin', 'operator')
 def start_robot(robot_id):
-    """Start robot simulation"""
+    """Queue start command"""
     try:
         robot = Robot.query.get_or_404(robot_id)
         
         if robot.status == 'active':
             return jsonify({'error': 'Robot is already active'}), 400
         
-        robot.status = 'active'
-        db.session.commit()
+        command = command_queue.enqueue(robot_id, 'start')
+        log_command(command)
         
         return jsonify({
-            'message': 'Robot started successfully',
+            'message': 'Start command queued',
             'robot_id': robot.robot_id,
-            'status': robot.status
-        }), 200
+            'command_id': command.command_id,
+            'status': command.status
+        }), 202
         
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -123,21 +212,21 @@ def start_robot(robot_id):
 @jwt_required()
 @role_required('admin', 'operator')
 def stop_robot(robot_id):
-    """Stop robot simulation"""
+    """Queue stop command (cancels pending commands)"""
     try:
         robot = Robot.query.get_or_404(robot_id)
         
-        robot.status = 'offline'
-        db.session.commit()
+        command = command_queue.enqueue(robot_id, 'stop')
+        log_command(command)
         
         return jsonify({
-            'message': 'Robot stopped successfully',
+            'message': 'Stop command queued',
             'robot_id': robot.robot_id,
-            'status': robot.status
-        }), 200
+            'command_id': command.command_id,
+            'status': command.status
+        }), 202
         
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -145,33 +234,70 @@ def stop_robot(robot_id):
 @jwt_required()
 @role_required('admin', 'operator')
 def manual_control(robot_id):
-    """Manual control command (simulated)"""
+    """Queue manual control command"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         robot = Robot.query.get_or_404(robot_id)
         
         if robot.status != 'active':
             return jsonify({'error': 'Robot is not active'}), 400
         
-        # Simulate command execution
         action = data.get('action')
-        direction = data.get('direction')
-        speed = data.get('speed', 0)
+        if not action:
+            return jsonify({'error': 'action is required'}), 400
         
-        # Update robot state (simulated)
-        if action == 'move' and speed:
-            robot.battery_lvl = max(0, robot.battery_lvl - 1)  # Simulate battery drain
-        
-        db.session.commit()
+        command = command_queue.enqueue(robot_id, action, {
+            'direction': data.get('direction'),
+            'speed': data.get('speed', 0)
+        })
+        log_command(command)
         
         return jsonify({
-            'message': 'Command executed',
+            'message': 'Command queued',
             'robot_id': robot.robot_id,
-            'command_id': f'cmd_{robot_id}_{int(__import__("time").time())}'
+            'command_id': command.command_id,
+            'status': command.status
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/<int:robot_id>/control/commands/<int:command_id>', methods=['GET'])
+@jwt_required()
+@role_required('admin', 'operator')
+def get_command(robot_id, command_id):
+    """Get command delivery/ack status"""
+    try:
+        command = command_queue.get(command_id)
+        if not command or command.robot_id != robot_id:
+            return jsonify({'error': 'Command not found'}), 404
+        
+        return jsonify(command.to_dict()), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/control/latency', methods=['GET'])
+@jwt_required()
+@role_required('admin', 'operator')
+def get_control_latency():
+    """Get control latency (enqueue -> ack) per robot"""
+    try:
+        robot_id = request.args.get('robot_id', type=int)
+        if robot_id is not None:
+            return jsonify({
+                'robot_id': robot_id,
+                'queue_depth': command_queue.queue_depth(robot_id),
+                'latency': command_queue.latency(robot_id)
+            }), 200
+        
+        return jsonify({
+            'latency': command_queue.latency()
         }), 200
         
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -191,6 +317,8 @@ def switch_mode(robot_id):
         
         # Store mode in robot model or separate table (simplified here)
         # For now, we'll just return success
+        operation_log.record('mode_switch', robot_id=robot.robot_id,
+                             parameters={'mode': mode, 'user_id': get_jwt_identity()})
         
         return jsonify({
             'message': f'Mode switched to {mode}',
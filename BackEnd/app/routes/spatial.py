@@ -0,0 +1,133 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.models.robot import Robot
+from app.services.spatial import query_waste_in_bbox, query_waste_nearby, robot_index
+
+bp = Blueprint('spatial', __name__)
+
+MAX_RADIUS_M = 50000
+
+
+def _parse_bbox(args):
+    try:
+        min_lat = float(args['min_lat'])
+        min_lon = float(args['min_lon'])
+        max_lat = float(args['max_lat'])
+        max_lon = float(args['max_lon'])
+    except (KeyError, TypeError, ValueError):
+        return None, 'min_lat, min_lon, max_lat and max_lon are required numbers'
+    if min_lat > max_lat or min_lon > max_lon:
+        return None, 'Invalid bounding box'
+    return (min_lat, min_lon, max_lat, max_lon), None
+
+
+def _parse_center(args):
+    """Titik pusat dari lat/lon, atau dari posisi robot_id"""
+    robot_id = args.get('robot_id', type=int)
+    if robot_id is not None:
+        center = robot_index.position(robot_id)
+        if not center:
+            if not Robot.query.get(robot_id):
+                return None, 'Robot not found'
+            return None, 'Robot has no known position'
+        return center, None
+    try:
+        return (float(args['lat']), float(args['lon'])), None
+    except (KeyError, TypeError, ValueError):
+        return None, 'lat and lon (or robot_id) are required'
+
+
+def _parse_collected(args):
+    collected = args.get('collected')
+    if collected is None:
+        return None
+    return collected.lower() == 'true'
+
+
+@bp.route('/waste/nearby', methods=['GET'])
+@jwt_required()
+def waste_nearby():
+    """Get waste within radius (meters) of a point or robot"""
+    try:
+        center, error = _parse_center(request.args)
+        if error:
+            return jsonify({'error': error}), 400
+
+        radius = request.args.get('radius', 500, type=float)
+        if radius <= 0 or radius > MAX_RADIUS_M:
+            return jsonify({'error': f'radius must be between 0 and {MAX_RADIUS_M}'}), 400
+
+        limit = request.args.get('limit', 1000, type=int)
+        results = query_waste_nearby(center[0], center[1], radius, limit=limit,
+                                     collected=_parse_collected(request.args))
+
+        return jsonify({
+            'center': {'latitude': center[0], 'longitude': center[1]},
+            'radius': radius,
+            'waste': [{**waste.to_dict(), 'distance': round(distance, 2)} for waste, distance in results]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/waste/within', methods=['GET'])
+@jwt_required()
+def waste_within():
+    """Get waste inside a bounding box"""
+    try:
+        bbox, error = _parse_bbox(request.args)
+        if error:
+            return jsonify({'error': error}), 400
+
+        limit = request.args.get('limit', 1000, type=int)
+        wastes = query_waste_in_bbox(*bbox, limit=limit, collected=_parse_collected(request.args))
+
+        return jsonify({
+            'waste': [waste.to_dict() for waste in wastes]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/robots/nearby', methods=['GET'])
+@jwt_required()
+def robots_nearby():
+    """Get robots within radius (meters) of a point"""
+    try:
+        center, error = _parse_center(request.args)
+        if error:
+            return jsonify({'error': error}), 400
+
+        radius = request.args.get('radius', 500, type=float)
+        if radius <= 0 or radius > MAX_RADIUS_M:
+            return jsonify({'error': f'radius must be between 0 and {MAX_RADIUS_M}'}), 400
+
+        results = robot_index.nearby(center[0], center[1], radius)
+        return jsonify({
+            'center': {'latitude': center[0], 'longitude': center[1]},
+            'radius': radius,
+            'robots': [{'robot_id': robot_id, 'distance': round(distance, 2)} for robot_id, distance in results]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/robots/within', methods=['GET'])
+@jwt_required()
+def robots_within():
+    """Get robots inside a bounding box (e.g. a bay)"""
+    try:
+        bbox, error = _parse_bbox(request.args)
+        if error:
+            return jsonify({'error': error}), 400
+
+        robot_ids = robot_index.within_bbox(*bbox)
+        return jsonify({
+            'robot_ids': robot_ids
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,558 @@
+"""
+Cube analitik utilisasi & revenue.
+
+Tabel `analytics_cube` menyimpan agregat per hari x robot x model_type x location x
+booking_type ('rental', 'purchase', 'mission'):
+
+    bookings         booking (bukan cancelled) yang mulai hari itu
+    booked_days      robot-hari tersewa (rental confirmed/active/completed, pecahan per hari)
+    revenue          payment completed, menurut hari paid_at
+    missions, mission_hours, area_covered, waste_collected   menurut hari start_time
+
+Refresh incremental: baris booking/payment/mission dengan `updated_at` >= watermark
+(dikurangi `ANALYTICS_CUBE_OVERLAP`) menentukan hari yang terpengaruh; hanya hari-hari
+itu yang dihitung ulang dari sumber, dan hanya cell yang nilainya berubah yang di-upsert
+(cell yang hilang di-nol-kan). Perubahan yang tidak terlihat dari nilai baru (tanggal
+booking dipindah, baris dihapus, robot ganti model/lokasi) dibereskan rebuild penuh
+setiap `ANALYTICS_CUBE_FULL_REBUILD_INTERVAL`.
+
+Query tidak menyentuh tabel sumber: cube dimuat ke array NumPy per worker (sinkron
+incremental dari `analytics_cube.version`), di-slice dengan mask lalu di-roll-up
+dengan kode grup mixed-radix + bincount. Setiap tulis cell mengambil versi baru dari
+counter di baris `analytics_cube_state` (UPDATE ... version + 1 mengunci baris itu
+sampai commit), jadi urutan versi = urutan commit walau refresher jalan di beberapa
+worker; sinkron cukup mengambil cell dengan `version` > versi terakhir yang dimuat.
+Timestamp tidak dipakai untuk ini: dicap sebelum commit, jadi transaksi yang commit
+belakangan bisa membawa timestamp lebih tua dan terlewat.
+"""
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, insert, or_, select, update
+
+from app.models.analytics import AnalyticsCubeCell, AnalyticsCubeState
+from app.models.booking import Booking, Payment
+from app.models.mission import Mission
+from app.models.robot import Robot
+from app.utils.sql import upsert
+
+logger = logging.getLogger(__name__)
+
+MEASURES = ('bookings', 'booked_days', 'revenue', 'missions', 'mission_hours', 'area_covered', 'waste_collected')
+DIMENSIONS = ('robot_id', 'model_type', 'location', 'booking_type')
+GRAINS = ('day', 'week', 'month', 'year')
+BOOKED_STATUSES = ('confirmed', 'active', 'completed')
+STATE_ID = 1
+MERGE_GAP_DAYS = 7          # run hari terpengaruh yang berdekatan dihitung ulang sekaligus
+REBUILD_WINDOW_DAYS = 92    # rebuild penuh per jendela, satu transaksi per jendela
+_PRECISION = (0, 6, 2, 0, 6, 2, 2)  # desimal per measure, sama dengan kolom tabel
+
+_cube = AnalyticsCubeCell.__table__
+_state = AnalyticsCubeState.__table__
+_booking = Booking.__table__
+_payment = Payment.__table__
+_mission = Mission.__table__
+_robot = Robot.__table__
+
+_BOOKINGS, _BOOKED_DAYS, _REVENUE, _MISSIONS, _MISSION_HOURS, _AREA, _WASTE = range(len(MEASURES))
+_DIM_COLUMN = {'robot_id': 1, 'model_type': 2, 'location': 3, 'booking_type': 4}
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _midnight(ordinal):
+    return datetime.combine(date.fromordinal(ordinal), datetime.min.time())
+
+
+def _touched_days(start, end=None):
+    """Ordinal hari yang disentuh rentang [start, end)"""
+    first = start.date().toordinal()
+    if end is None or end <= start:
+        return range(first, first + 1)
+    return range(first, (end - timedelta(microseconds=1)).date().toordinal() + 1)
+
+
+def _runs(days, gap=MERGE_GAP_DAYS):
+    """Ordinal hari -> list rentang [a, b) berurutan; celah < gap hari digabung"""
+    runs = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] < gap:
+            runs[-1][1] = day + 1
+        else:
+            runs.append([day, day + 1])
+    return [tuple(run) for run in runs]
+
+
+def aggregate(session, first, last):
+    """Hitung cell cube untuk hari [first, last) langsung dari tabel sumber; return dict key -> list measure"""
+    window_start, window_end = _midnight(first), _midnight(last)
+    cells = {}
+
+    def cell(day, robot_id, model_type, location, booking_type):
+        key = (day, robot_id or 0, model_type or '', location or '', booking_type)
+        values = cells.get(key)
+        if values is None:
+            values = cells[key] = [0.0] * len(MEASURES)
+        return values
+
+    location = func.coalesce(_booking.c.location, _robot.c.location, '')
+    bookings = session.execute(
+        select(_booking.c.robot_id, _robot.c.model_type, location, _booking.c.booking_type, _booking.c.status,
+               _booking.c.start_date, _booking.c.end_date)
+        .select_from(_booking.outerjoin(_robot, _robot.c.robot_id == _booking.c.robot_id))
+        .where(_booking.c.status != 'cancelled', _booking.c.start_date < window_end,
+               or_(_booking.c.start_date >= window_start, _booking.c.end_date > window_start))
+    )
+    for robot_id, model_type, where, booking_type, status, start, end in bookings:
+        day = start.date().toordinal()
+        if first <= day < last:
+            cell(day, robot_id, model_type, where, booking_type)[_BOOKINGS] += 1
+        if booking_type != 'rental' or status not in BOOKED_STATUSES or end is None:
+            continue
+        for day in _touched_days(start, end):
+            if first <= day < last:
+                midnight = _midnight(day)
+                overlap = min(end, midnight + timedelta(days=1)) - max(start, midnight)
+                cell(day, robot_id, model_type, where, booking_type)[_BOOKED_DAYS] += overlap.total_seconds() / 86400
+
+    payments = session.execute(
+        select(_payment.c.amount, _payment.c.paid_at, _booking.c.robot_id, _robot.c.model_type, location,
+               _booking.c.booking_type)
+        .select_from(_payment.join(_booking, _booking.c.booking_id == _payment.c.booking_id)
+                     .outerjoin(_robot, _robot.c.robot_id == _booking.c.robot_id))
+        .where(_payment.c.status == 'completed', _payment.c.paid_at >= window_start,
+               _payment.c.paid_at < window_end)
+    )
+    for amount, paid_at, robot_id, model_type, where, booking_type in payments:
+        cell(paid_at.date().toordinal(), robot_id, model_type, where, booking_type)[_REVENUE] += float(amount or 0)
+
+    missions = session.execute(
+        select(_mission.c.robot_id, _robot.c.model_type, _robot.c.location, _mission.c.start_time,
+               _mission.c.end_time, _mission.c.area_covered, _mission.c.waste_collected)
+        .select_from(_mission.join(_robot, _robot.c.robot_id == _mission.c.robot_id))
+        .where(_mission.c.status != 'cancelled', _mission.c.start_time >= window_start,
+               _mission.c.start_time < window_end)
+    )
+    for robot_id, model_type, where, start, end, area, waste in missions:
+        values = cell(start.date().toordinal(), robot_id, model_type, where, 'mission')
+        values[_MISSIONS] += 1
+        if end is not None and end > start:
+            values[_MISSION_HOURS] += (end - start).total_seconds() / 3600
+        values[_AREA] += float(area or 0)
+        values[_WASTE] += float(waste or 0)
+    return cells
+
+
+def next_version(session):
+    """Naikkan counter versi cell di baris state; lock baris bertahan sampai commit transaksi pemanggil"""
+    updated = session.execute(
+        update(_state).where(_state.c.id == STATE_ID).values(version=_state.c.version + 1)
+    ).rowcount
+    if not updated:
+        session.execute(insert(_state).values(id=STATE_ID, version=1))
+    return session.execute(select(_state.c.version).where(_state.c.id == STATE_ID)).scalar_one()
+
+
+def rebuild_days(session, first, last, now=None):
+    """Hitung ulang hari [first, last) dan upsert cell yang berubah; return jumlah cell yang ditulis"""
+    now = now or datetime.utcnow()
+    cells = aggregate(session, first, last)
+
+    key_columns = (_cube.c.day, _cube.c.robot_id, _cube.c.model_type, _cube.c.location, _cube.c.booking_type)
+    existing = session.execute(
+        select(*key_columns, *(_cube.c[name] for name in MEASURES))
+        .where(_cube.c.day >= date.fromordinal(first), _cube.c.day < date.fromordinal(last))
+    )
+    current = {}
+    for row in existing:
+        current[(row[0].toordinal(), *row[1:5])] = [float(value or 0) for value in row[5:]]
+
+    rows = []
+    for key in cells.keys() | current.keys():
+        values = [round(value, digits) for value, digits in zip(cells.get(key, [0.0] * len(MEASURES)), _PRECISION)]
+        old = current.get(key)
+        if old is None and not any(values):
+            continue
+        if old is not None and all(abs(a - b) < 1e-6 for a, b in zip(values, old)):
+            continue
+        rows.append({
+            'day': date.fromordinal(key[0]), 'robot_id': key[1], 'model_type': key[2], 'location': key[3],
+            'booking_type': key[4], **dict(zip(MEASURES, values)), 'updated_at': now
+        })
+
+    if rows:
+        version = next_version(session)
+        for row in rows:
+            row['version'] = version
+        session.execute(upsert(
+            session.get_bind().dialect.name, _cube, None,
+            index_elements=['day', 'robot_id', 'model_type', 'location', 'booking_type'],
+            set_=lambda excluded: {**{name: excluded[name] for name in MEASURES},
+                                   'updated_at': excluded.updated_at, 'version': excluded.version}
+        ), rows)
+    return len(rows)
+
+
+def changed_days(session, since):
+    """Ordinal hari yang terpengaruh perubahan sumber dengan updated_at >= since"""
+    days = set()
+    for start, end in session.execute(
+            select(_booking.c.start_date, _booking.c.end_date).where(_booking.c.updated_at >= since)):
+        days.update(_touched_days(start, end))
+    # Revenue ikut dimensi booking (robot/location), jadi booking yang berubah menyentuh hari paid_at-nya juga
+    paid = session.execute(
+        select(_payment.c.paid_at).select_from(_payment.join(_booking, _booking.c.booking_id == _payment.c.booking_id))
+        .where(_payment.c.paid_at.is_not(None), or_(_payment.c.updated_at >= since, _booking.c.updated_at >= since))
+    ).scalars()
+    days.update(paid_at.date().toordinal() for paid_at in paid)
+    started = session.execute(
+        select(_mission.c.start_time).where(_mission.c.updated_at >= since, _mission.c.start_time.is_not(None))
+    ).scalars()
+    days.update(start.date().toordinal() for start in started)
+    return days
+
+
+def source_day_range(session):
+    """(hari pertama, hari terakhir + 1) dari semua sumber dan cube, atau None kalau kosong"""
+    bounds = []
+    for low, high in ((_booking.c.start_date, func.coalesce(_booking.c.end_date, _booking.c.start_date)),
+                      (_payment.c.paid_at, _payment.c.paid_at),
+                      (_mission.c.start_time, _mission.c.start_time),
+                      (_cube.c.day, _cube.c.day)):
+        bounds.extend(session.execute(select(func.min(low), func.max(high))).one())
+    ordinals = [value.toordinal() for value in bounds if value is not None]
+    return (min(ordinals), max(ordinals) + 1) if ordinals else None
+
+
+class AnalyticsCube:
+
+    def __init__(self):
+        self.enabled = True
+        self.interval = 60.0
+        self.full_rebuild_interval = 86400.0
+        self.overlap = timedelta(seconds=30)
+        self.sync_interval = 2.0
+        self._app = None
+        self._thread = None
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # Store NumPy: keys (n x 5: day ordinal, robot_id, kode model_type, kode location, kode booking_type)
+        self._keys = np.zeros((0, 5), dtype=np.int64)
+        self._values = np.zeros((0, len(MEASURES)))
+        self._index = {}
+        self._codes = {name: {} for name in ('model_type', 'location', 'booking_type')}
+        self._labels = {name: [] for name in self._codes}
+        self._robots = np.zeros((0, 2), dtype=np.int64)  # robot_id, kode model_type
+        self._period_cache = {}
+        self._version = None
+        self._synced_at = None
+        self.stats = {'refreshes': 0, 'full_rebuilds': 0, 'days_recomputed': 0, 'cells_written': 0,
+                      'last_refresh_ms': None, 'last_refresh_at': None, 'syncs': 0, 'queries': 0,
+                      'last_query_ms': None}
+
+    def init_app(self, app):
+        self._app = app
+        self.enabled = app.config.get('ANALYTICS_CUBE_ENABLED', True)
+        self.interval = app.config.get('ANALYTICS_CUBE_REFRESH_INTERVAL', 60.0)
+        self.full_rebuild_interval = app.config.get('ANALYTICS_CUBE_FULL_REBUILD_INTERVAL', 86400.0)
+        self.overlap = timedelta(seconds=app.config.get('ANALYTICS_CUBE_OVERLAP', 30.0))
+        self.sync_interval = app.config.get('ANALYTICS_CUBE_SYNC_INTERVAL', 2.0)
+        if self.enabled:
+            app.before_request(self._ensure_refresher)
+
+    # ------------------------------------------------------------------
+    # Refresh (tabel sumber -> analytics_cube)
+    # ------------------------------------------------------------------
+    def refresh(self, full=None, now=None):
+        """
+        Refresh cube; full=None -> penuh kalau belum pernah dibangun atau rebuild terakhir
+        lebih lama dari full_rebuild_interval. Return dict ringkasan.
+        """
+        from app import db
+        from app.services.write_queue import write_queue
+
+        with self._refresh_lock:
+            started = time.perf_counter()
+            now = now or datetime.utcnow()
+            try:
+                state = db.session.execute(select(_state).where(_state.c.id == STATE_ID)).first()
+                if full is None:
+                    full = state is None or state.watermark is None or state.rebuilt_at is None or \
+                        (now - state.rebuilt_at).total_seconds() >= self.full_rebuild_interval
+                if full:
+                    span = source_day_range(db.session)
+                    runs = [(day, min(day + REBUILD_WINDOW_DAYS, span[1]))
+                            for day in range(span[0], span[1], REBUILD_WINDOW_DAYS)] if span else []
+                else:
+                    runs = _runs(changed_days(db.session, state.watermark - self.overlap))
+            finally:
+                db.session.remove()
+
+            written = 0
+            for first, last in runs:
+                written += write_queue.run(lambda session: rebuild_days(session, first, last),
+                                           rows=last - first)
+            write_queue.run(lambda session: self._save_state(session, now, full), rows=1)
+
+            self.stats['refreshes'] += 1
+            self.stats['full_rebuilds'] += bool(full)
+            self.stats['days_recomputed'] += sum(last - first for first, last in runs)
+            self.stats['cells_written'] += written
+            self.stats['last_refresh_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self.stats['last_refresh_at'] = now.isoformat()
+        self.sync(force=True)
+        return {'full': bool(full), 'ranges': len(runs), 'days': sum(last - first for first, last in runs),
+                'cells_written': written, 'elapsed_ms': self.stats['last_refresh_ms']}
+
+    def _save_state(self, session, now, full):
+        values = {'watermark': now}
+        if full:
+            values['rebuilt_at'] = now
+        updated = session.execute(
+            update(_state).where(_state.c.id == STATE_ID, or_(_state.c.watermark.is_(None), _state.c.watermark < now))
+            .values(**values)
+        ).rowcount
+        if not updated and session.execute(select(_state.c.id).where(_state.c.id == STATE_ID)).first() is None:
+            session.execute(insert(_state).values(id=STATE_ID, **values))
+
+    def _ensure_refresher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name='analytics-cube', daemon=True)
+                self._thread.start()
+
+    def _refresh_loop(self):
+        with self._app.app_context():
+            while True:
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception('analytics cube refresh failed')
+                time.sleep(self.interval)
+
+    # ------------------------------------------------------------------
+    # Store NumPy (analytics_cube -> memori worker)
+    # ------------------------------------------------------------------
+    def sync(self, force=False):
+        """Muat cell yang berubah sejak sinkron terakhir (semua kalau belum pernah)"""
+        from app import db
+
+        if not force and self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        query = select(_cube.c.day, _cube.c.robot_id, _cube.c.model_type, _cube.c.location, _cube.c.booking_type,
+                       *(_cube.c[name] for name in MEASURES), _cube.c.version)
+        if self._version is not None:
+            query = query.where(_cube.c.version > self._version)
+        with db.engine.connect() as conn:
+            rows = conn.execute(query).all()
+            robots = conn.execute(select(_robot.c.robot_id, _robot.c.model_type)).all() \
+                if rows or self._synced_at is None else None
+
+        with self._lock:
+            new_keys, new_values = [], []
+            size = len(self._keys)
+            for row in rows:
+                key = (row[0].toordinal(), row[1], self._code('model_type', row[2]), self._code('location', row[3]),
+                       self._code('booking_type', row[4]))
+                values = [float(value or 0) for value in row[5:-1]]
+                position = self._index.get(key)
+                if position is None:
+                    self._index[key] = size + len(new_keys)
+                    new_keys.append(key)
+                    new_values.append(values)
+                else:
+                    self._values[position] = values
+                if self._version is None or row[-1] > self._version:
+                    self._version = row[-1]
+            if new_keys:
+                self._keys = np.concatenate([self._keys, np.array(new_keys, dtype=np.int64)])
+                self._values = np.concatenate([self._values, np.array(new_values)])
+            if robots is not None:
+                self._robots = np.array([(robot_id, self._code('model_type', model_type))
+                                         for robot_id, model_type in robots], dtype=np.int64).reshape(-1, 2)
+        self._synced_at = time.monotonic()
+        self.stats['syncs'] += 1
+
+    def _code(self, dimension, value):
+        codes = self._codes[dimension]
+        code = codes.get(value or '')
+        if code is None:
+            code = codes[value or ''] = len(codes)
+            self._labels[dimension].append(value or '')
+        return code
+
+    # ------------------------------------------------------------------
+    # Query (slice + roll-up)
+    # ------------------------------------------------------------------
+    def query(self, group_by=(), grain=None, start=None, end=None, filters=None, measures=None):
+        """
+        Roll-up cube. group_by: subset DIMENSIONS; grain: None/'day'/'week'/'month'/'year';
+        start/end: date (end eksklusif); filters: dict dimensi -> list nilai; measures: subset MEASURES.
+        `utilisation` (booked_days / robot x hari) ikut dihitung kalau group_by hanya robot_id/model_type
+        dan tidak ada filter location.
+        """
+        started = time.perf_counter()
+        group_by = list(group_by or ())
+        measures = list(measures or MEASURES)
+        filters = {name: values for name, values in (filters or {}).items() if values}
+        for name in [*group_by, *filters]:
+            if name not in DIMENSIONS:
+                raise ValueError(f'Unknown dimension {name!r}')
+        unknown = [name for name in measures if name not in MEASURES]
+        if unknown:
+            raise ValueError(f'Unknown measure {unknown[0]!r}')
+        if grain is not None and grain not in GRAINS:
+            raise ValueError(f'Unknown grain {grain!r}')
+
+        self.sync()
+        with self._lock:
+            keys, values = self._keys, self._values
+            periods = self._periods(grain) if grain is not None else None
+            robots = self._robots
+            mask = None
+            if start is not None:
+                mask = keys[:, 0] >= start.toordinal()
+            if end is not None:
+                mask = (keys[:, 0] < end.toordinal()) if mask is None else mask & (keys[:, 0] < end.toordinal())
+            for name, wanted in filters.items():
+                if name == 'robot_id':
+                    codes = [int(value) for value in wanted]
+                else:
+                    codes = [self._codes[name][value] for value in wanted if value in self._codes[name]]
+                matched = np.isin(keys[:, _DIM_COLUMN[name]], codes)
+                mask = matched if mask is None else mask & matched
+                if name in ('robot_id', 'model_type'):
+                    robots = robots[np.isin(robots[:, 0 if name == 'robot_id' else 1], codes)]
+            if mask is not None:
+                keys, values = keys[mask], values[mask]
+                periods = periods[mask] if periods is not None else None
+            labels = {name: list(items) for name, items in self._labels.items()}
+
+        columns = []  # (nama, array kode per cell)
+        if grain is not None:
+            columns.append(('period', periods))
+        columns.extend((name, keys[:, _DIM_COLUMN[name]]) for name in group_by)
+        group_keys, inverse = self._group(columns, len(keys))
+        groups = len(next(iter(group_keys.values()))) if group_keys else (1 if len(keys) else 0)
+        sums = {name: np.bincount(inverse, weights=values[:, MEASURES.index(name)], minlength=groups)[:groups]
+                for name in set(measures) | {'booked_days'}}
+
+        utilisation = None
+        if len(keys) and set(group_by) <= {'robot_id', 'model_type'} and 'location' not in filters:
+            first_day = start.toordinal() if start is not None else int(keys[:, 0].min())
+            last_day = end.toordinal() if end is not None else int(keys[:, 0].max()) + 1
+            utilisation = self._utilisation(group_keys, groups, sums['booked_days'], robots, grain,
+                                            first_day, last_day)
+
+        rows = []
+        for group in range(groups):
+            row = {}
+            for name, codes in group_keys.items():
+                code = int(codes[group])
+                if name == 'period':
+                    row[name] = self._bucket_label(code, grain)
+                elif name == 'robot_id':
+                    row[name] = code
+                else:
+                    row[name] = labels[name][code]
+            for name in measures:
+                value = float(sums[name][group])
+                row[name] = int(round(value)) if name in ('bookings', 'missions') else round(value, 2)
+            if utilisation is not None:
+                row['utilisation'] = round(float(utilisation[group]), 4)
+            rows.append(row)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stats['queries'] += 1
+        self.stats['last_query_ms'] = round(elapsed, 3)
+        return {'grain': grain, 'group_by': group_by, 'rows': rows, 'cells_scanned': len(keys),
+                'elapsed_ms': round(elapsed, 3)}
+
+    @staticmethod
+    def _group(columns, size):
+        """
+        Kode grup mixed-radix dari kolom-kolom dimensi. Return (dict nama -> kode per grup,
+        index grup per cell). Ruang grup kecil -> bincount langsung (tanpa sort), besar -> np.unique.
+        """
+        if not columns or not size:
+            return {}, np.zeros(size, dtype=np.int64)
+        combined = np.zeros(size, dtype=np.int64)
+        spans = []
+        for _, column in columns:
+            low = int(column.min())
+            span = int(column.max()) - low + 1
+            combined = combined * span + (column - low)
+            spans.append((low, span))
+        total = int(np.prod([span for _, span in spans], dtype=np.float64))
+        if total <= max(4 * size, 1 << 16):
+            present = np.flatnonzero(np.bincount(combined, minlength=total))
+            lookup = np.zeros(total, dtype=np.int64)
+            lookup[present] = np.arange(len(present))
+            inverse = lookup[combined]
+        else:
+            present, inverse = np.unique(combined, return_inverse=True)
+
+        group_keys = {}
+        remainder = present.copy()
+        for (name, _), (low, span) in zip(reversed(columns), reversed(spans)):
+            group_keys[name] = remainder % span + low
+            remainder //= span
+        return {name: group_keys[name] for name, _ in columns}, inverse
+
+    def _periods(self, grain):
+        """Kode bucket per cell untuk grain ini (di-cache sampai ada cell baru); dipanggil di bawah lock"""
+        periods = self._period_cache.get(grain)
+        if periods is None or len(periods) != len(self._keys):
+            periods = self._period_cache[grain] = self._bucket(self._keys[:, 0], grain)
+        return periods
+
+    @staticmethod
+    def _bucket(days, grain):
+        """Ordinal hari -> kode bucket (ordinal hari pertama untuk day/week, bulan/tahun sejak 1970)"""
+        if grain == 'day':
+            return days
+        if grain == 'week':
+            return days - (days - 1) % 7  # ordinal 1 (0001-01-01) hari Senin
+        calendar = (days - _EPOCH).astype('datetime64[D]')
+        return calendar.astype('datetime64[M]' if grain == 'month' else 'datetime64[Y]').astype(np.int64)
+
+    @staticmethod
+    def _bucket_label(code, grain):
+        if grain in ('day', 'week'):
+            return date.fromordinal(code).isoformat()
+        return str(np.datetime64(code, 'M' if grain == 'month' else 'Y'))
+
+    def _utilisation(self, group_keys, groups, booked_days, robots, grain, first_day, last_day):
+        """booked_days / (jumlah robot di grup x jumlah hari bucket di dalam [first_day, last_day))"""
+        if grain is None:
+            days = np.full(groups, last_day - first_day)
+        else:
+            buckets, counts = np.unique(self._bucket(np.arange(first_day, last_day), grain), return_counts=True)
+            position = np.clip(np.searchsorted(buckets, group_keys['period']), 0, len(buckets) - 1)
+            days = np.where(buckets[position] == group_keys['period'], counts[position], 0)
+
+        fleet = np.full(groups, len(robots))
+        if 'robot_id' in group_keys:
+            fleet = np.isin(group_keys['robot_id'], robots[:, 0]).astype(np.int64)
+        elif 'model_type' in group_keys:
+            models = group_keys['model_type']
+            per_model = np.bincount(robots[:, 1], minlength=int(models.max()) + 1)
+            fleet = per_model[models]
+        capacity = fleet * days
+        return np.divide(booked_days, capacity, out=np.zeros(groups), where=capacity > 0)
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'cells': len(self._keys),
+            'version': self._version,
+            'memory_bytes': int(self._keys.nbytes + self._values.nbytes),
+            'stats': dict(self.stats)
+        }
+
+
+analytics_cube = AnalyticsCube()
@@ -0,0 +1,230 @@
+"""
+Lifecycle booking: transisi status terjadwal.
+
+    pending   --(created_at + BOOKING_PENDING_TTL_MINUTES, belum dibayar)--> cancelled
+    confirmed --(start_date, rental)--> active
+    active    --(end_date)--> completed
+
+Setiap booking menyimpan waktu transisi berikutnya di kolom ber-index
+`next_transition_at` (NULL untuk status akhir dan purchase yang sudah confirmed).
+Nilainya dihitung ulang oleh mapper event setiap status/tanggal berubah lewat ORM,
+dan oleh `transition_bookings()` untuk update set-based (mis. konfirmasi pembayaran).
+
+Satu tick hanya membaca booking dengan `next_transition_at <= now` lewat range scan
+index (LIMIT `BOOKING_TICK_BATCH`), menghitung status baru di memori lalu menulis
+satu UPDATE executemany per batch. Biaya per tick sebanding dengan jumlah booking
+yang jatuh tempo, bukan ukuran tabel. Booking pending yang pembayarannya masih
+diproses ditunda `BOOKING_PAYMENT_GRACE_MINUTES`. Booking yang selesai/batal
+melepas robotnya di fleet scheduler (perubahan diterapkan setelah commit).
+
+Update bersyarat (`status` lama), jadi beberapa worker boleh menjalankan tick bersamaan.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, case, event, inspect, literal, null, select, update
+
+from app.models.booking import Booking, Payment
+
+logger = logging.getLogger(__name__)
+
+PENDING_TTL = timedelta(minutes=60)
+PAYMENT_GRACE = timedelta(minutes=10)
+OPEN_PAYMENT_STATUSES = ('pending', 'processing')
+MAX_HOPS = 3
+_STAT_FOR = {'cancelled': 'expired', 'active': 'activated', 'completed': 'completed'}
+
+_booking = Booking.__table__
+_payment = Payment.__table__
+
+
+def next_transition(status, booking_type, start_date, end_date, created_at, pending_ttl=PENDING_TTL):
+    """Return (waktu transisi berikutnya, status tujuan) atau (None, None) untuk status akhir"""
+    if status == 'pending':
+        return (created_at or datetime.utcnow()) + pending_ttl, 'cancelled'
+    if status == 'confirmed' and booking_type == 'rental' and start_date is not None:
+        return start_date, 'active'
+    if status == 'active' and end_date is not None:
+        return end_date, 'completed'
+    return None, None
+
+
+def _next_transition_sql(status, now, pending_ttl):
+    """Ekspresi SQL `next_transition_at` untuk booking yang dipindah ke `status` (aturan sama dengan di atas)"""
+    if status == 'pending':
+        return literal(now + pending_ttl)
+    if status == 'confirmed':
+        return case((_booking.c.booking_type == 'rental', _booking.c.start_date), else_=null())
+    if status == 'active':
+        return _booking.c.end_date
+    return null()
+
+
+def _queue_fleet_changes(session, bookings):
+    """
+    Booking di-update tanpa ORM: kabari fleet scheduler (diterapkan setelah commit).
+    bookings: iterable (booking_id, robot_id, start_date, end_date, status baru)
+    """
+    changes = [('booking', booking_id, (robot_id, start_date, end_date, status))
+               for booking_id, robot_id, start_date, end_date, status in bookings if robot_id]
+    if changes:
+        session.info.setdefault('fleet_scheduler_changes', []).extend(changes)
+
+
+def transition_bookings(session, where, status, now=None):
+    """
+    Pindahkan booking yang memenuhi `where` ke `status` dengan satu UPDATE ... RETURNING
+    (next_transition_at ikut dihitung). Return jumlah booking yang berubah.
+    """
+    now = now or datetime.utcnow()
+    rows = session.execute(
+        update(_booking).where(where)
+        .values(status=status, next_transition_at=_next_transition_sql(status, now, booking_lifecycle.pending_ttl),
+                updated_at=now)
+        .returning(_booking.c.booking_id, _booking.c.robot_id, _booking.c.start_date, _booking.c.end_date,
+                   _booking.c.status)
+    ).all()
+    _queue_fleet_changes(session, rows)
+    return len(rows)
+
+
+def refresh_next_transitions(session, now=None):
+    """Hitung ulang next_transition_at semua booking (setelah bulk load); pending mendapat TTL baru dari now"""
+    now = now or datetime.utcnow()
+    session.execute(
+        update(_booking).values(next_transition_at=case(
+            (_booking.c.status == 'pending', literal(now + booking_lifecycle.pending_ttl)),
+            (_booking.c.status == 'confirmed',
+             case((_booking.c.booking_type == 'rental', _booking.c.start_date), else_=null())),
+            (_booking.c.status == 'active', _booking.c.end_date),
+            else_=null()
+        ))
+    )
+
+
+class BookingLifecycle:
+
+    def __init__(self):
+        self.enabled = True
+        self.interval = 5.0
+        self.batch_size = 1000
+        self.max_batches = 100
+        self.pending_ttl = PENDING_TTL
+        self.payment_grace = PAYMENT_GRACE
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {'ticks': 0, 'transitions': 0, 'expired': 0, 'activated': 0, 'completed': 0,
+                      'deferred': 0, 'last_tick_ms': None, 'last_tick_at': None}
+
+    def init_app(self, app):
+        self._app = app
+        self.enabled = app.config.get('BOOKING_SCHEDULER_ENABLED', True)
+        self.interval = app.config.get('BOOKING_TICK_INTERVAL', 5.0)
+        self.batch_size = app.config.get('BOOKING_TICK_BATCH', 1000)
+        self.pending_ttl = timedelta(minutes=app.config.get('BOOKING_PENDING_TTL_MINUTES', 60))
+        self.payment_grace = timedelta(minutes=app.config.get('BOOKING_PAYMENT_GRACE_MINUTES', 10))
+        if self.enabled:
+            app.before_request(self._ensure_scheduler)
+
+    def tick(self, now=None):
+        """Proses semua booking yang jatuh tempo (per batch, maksimal max_batches); return jumlah transisi"""
+        from app.services.write_queue import write_queue
+
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        total = 0
+        for _ in range(self.max_batches):
+            processed, transitions = write_queue.run(lambda session: self._tick_batch(session, now),
+                                                     rows=self.batch_size)
+            total += transitions
+            if processed < self.batch_size:
+                break
+        self.stats['ticks'] += 1
+        self.stats['last_tick_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.stats['last_tick_at'] = now.isoformat()
+        return total
+
+    def status(self):
+        return {'enabled': self.enabled, 'interval': self.interval, 'batch_size': self.batch_size,
+                'stats': dict(self.stats)}
+
+    def _tick_batch(self, session, now):
+        """Satu batch: range scan index next_transition_at, satu UPDATE executemany"""
+        rows = session.execute(
+            select(_booking.c.booking_id, _booking.c.status, _booking.c.booking_type, _booking.c.robot_id,
+                   _booking.c.start_date, _booking.c.end_date, _booking.c.created_at)
+            .where(_booking.c.next_transition_at <= now)
+            .order_by(_booking.c.next_transition_at).limit(self.batch_size)
+        ).all()
+        if not rows:
+            return 0, 0
+
+        pending = [row.booking_id for row in rows if row.status == 'pending']
+        paying = set(session.execute(
+            select(_payment.c.booking_id).where(_payment.c.booking_id.in_(pending),
+                                                _payment.c.status.in_(OPEN_PAYMENT_STATUSES))
+        ).scalars()) if pending else set()
+
+        params, changed = [], []
+        for row in rows:
+            status, due = row.status, None
+            if row.status == 'pending' and row.booking_id in paying:
+                due = now + self.payment_grace
+                self.stats['deferred'] += 1
+            else:
+                # Bisa lebih dari satu langkah (mis. confirmed -> active -> completed kalau end_date sudah lewat)
+                for _ in range(MAX_HOPS):
+                    due, target = next_transition(status, row.booking_type, row.start_date, row.end_date,
+                                                  row.created_at, self.pending_ttl)
+                    if target is None or due > now:
+                        break
+                    status, due = target, None
+                    self.stats[_STAT_FOR[target]] += 1
+            params.append({'b_id': row.booking_id, 'b_old': row.status, 'b_status': status, 'b_next': due})
+            if status != row.status:
+                changed.append((row.booking_id, row.robot_id, row.start_date, row.end_date, status))
+
+        session.execute(
+            update(_booking).where(_booking.c.booking_id == bindparam('b_id'), _booking.c.status == bindparam('b_old'))
+            .values(status=bindparam('b_status'), next_transition_at=bindparam('b_next'), updated_at=now),
+            params
+        )
+        _queue_fleet_changes(session, changed)
+        self.stats['transitions'] += len(changed)
+        return len(rows), len(changed)
+
+    def _ensure_scheduler(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._scheduler_loop, name='booking-lifecycle', daemon=True)
+                self._thread.start()
+
+    def _scheduler_loop(self):
+        with self._app.app_context():
+            while True:
+                try:
+                    self.tick()
+                except Exception:
+                    logger.exception('booking lifecycle tick failed')
+                time.sleep(self.interval)
+
+
+booking_lifecycle = BookingLifecycle()
+
+
+@event.listens_for(Booking, 'before_insert')
+@event.listens_for(Booking, 'before_update')
+def _set_next_transition(mapper, connection, target):
+    state = inspect(target)
+    if state.persistent and not any(state.attrs[name].history.has_changes()
+                                    for name in ('status', 'booking_type', 'start_date', 'end_date')):
+        return
+    target.next_transition_at, _ = next_transition(
+        target.status or 'pending', target.booking_type, target.start_date, target.end_date, target.created_at,
+        booking_lifecycle.pending_ttl
+    )
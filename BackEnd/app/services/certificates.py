@@ -0,0 +1,263 @@
+"""
+Penerbitan dan verifikasi sertifikat operator.
+
+- Nomor sertifikat berurutan dari tabel `certificate_counter`: satu blok nomor
+  dialokasikan dengan satu upsert ... RETURNING (atomik, bebas tabrakan
+  antar worker), format `SEAL-00000001`.
+- `issue_certificates()` mensertifikasi banyak user dalam satu transaksi dengan
+  jumlah statement konstan (cek eligibility, alokasi nomor, bulk insert, update user).
+- `cert_index` menyimpan cert_number -> (status, expiry) di memori untuk endpoint
+  verifikasi publik. Thread refresher membaca baris dengan `updated_at` >= watermark
+  (dikurangi overlap untuk transaksi yang commit terlambat) dan me-load ulang penuh
+  secara berkala (sertifikat yang terhapus). Perubahan dari proses ini (termasuk
+  insert/update Core) datang lewat change stream dan diterapkan langsung setelah commit.
+"""
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from app.models.certificate import Certificate, CertificateCounter
+from app.models.user import User
+from app.services.change_stream import change_stream
+from app.utils.sql import upsert
+
+logger = logging.getLogger(__name__)
+
+CERT_TYPE = 'Operator Certification'
+CERT_PREFIX = 'SEAL'
+COUNTER_NAME = 'certificate'
+IN_BATCH = 5000  # batas jumlah bound parameter per IN (...)
+MAX_VALID_DAYS = 36500  # masa berlaku maksimum; None = tanpa kedaluwarsa
+
+_cert_table = Certificate.__table__
+_counter_table = CertificateCounter.__table__
+
+
+def format_cert_number(value):
+    return f'{CERT_PREFIX}-{value:08d}'
+
+
+def allocate_cert_numbers(session, count):
+    """Alokasikan `count` nomor berurutan; return list cert_number"""
+    if count <= 0:
+        return []
+    stmt = upsert(
+        session.get_bind().dialect.name, _counter_table, [{'name': COUNTER_NAME, 'value': count}],
+        index_elements=['name'],
+        set_=lambda excluded: {'value': _counter_table.c.value + excluded.value}
+    ).returning(_counter_table.c.value)
+    last = session.execute(stmt).scalar_one()
+    return [format_cert_number(value) for value in range(last - count + 1, last + 1)]
+
+
+def issue_certificate(session, user_id, cert_type=CERT_TYPE, valid_days=None):
+    now = datetime.utcnow()
+    cert = Certificate(
+        user_id=user_id,
+        cert_type=cert_type,
+        issued_date=now,
+        expiry_date=now + timedelta(days=valid_days) if valid_days is not None else None,
+        status='active',
+        cert_number=allocate_cert_numbers(session, 1)[0]
+    )
+    session.add(cert)
+    return cert
+
+
+def active_certificate(session, user_id):
+    return session.execute(
+        select(Certificate).where(Certificate.user_id == user_id, Certificate.status == 'active')
+        .order_by(Certificate.issued_date.desc()).limit(1)
+    ).scalar()
+
+
+def _chunks(values, size=IN_BATCH):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def resolve_user_ids(session, emails):
+    """Email -> user_id (email yang tidak dikenal dilewati)"""
+    user_ids = []
+    for chunk in _chunks(sorted(set(emails))):
+        user_ids.extend(session.execute(select(User.user_id).where(User.email.in_(chunk))).scalars())
+    return user_ids
+
+
+def issue_certificates(session, user_ids, cert_type=CERT_TYPE, valid_days=None):
+    """
+    Sertifikasi banyak user dalam satu transaksi (commit oleh caller).
+    User yang tidak ada atau sudah punya sertifikat aktif dengan tipe yang sama dilewati.
+    Return (list dict sertifikat baru, jumlah user yang dilewati).
+    """
+    requested = sorted(set(int(user_id) for user_id in user_ids))
+    holders = select(Certificate.user_id).where(Certificate.cert_type == cert_type, Certificate.status == 'active')
+    eligible = []
+    for chunk in _chunks(requested):
+        eligible.extend(session.execute(
+            select(User.user_id).where(User.user_id.in_(chunk), User.user_id.not_in(holders))
+            .order_by(User.user_id)
+        ).scalars())
+    if not eligible:
+        return [], len(requested)
+
+    now = datetime.utcnow()
+    expiry = now + timedelta(days=valid_days) if valid_days is not None else None
+    rows = [{
+        'user_id': user_id,
+        'cert_type': cert_type,
+        'issued_date': now,
+        'expiry_date': expiry,
+        'status': 'active',
+        'cert_number': cert_number,
+        'created_at': now,
+        'updated_at': now
+    } for user_id, cert_number in zip(eligible, allocate_cert_numbers(session, len(eligible)))]
+
+    inserted = session.execute(insert(_cert_table).returning(_cert_table.c.cert_id, _cert_table.c.cert_number), rows)
+    cert_ids = {cert_number: cert_id for cert_id, cert_number in inserted}
+    for chunk in _chunks(eligible):
+        session.execute(
+            update(User).where(User.user_id.in_(chunk)).values(is_certified=True)
+            .execution_options(synchronize_session=False)
+        )
+    certificates = [Certificate(cert_id=cert_ids.get(row['cert_number']), **row).to_dict() for row in rows]
+    return certificates, len(requested) - len(eligible)
+
+
+class CertificateIndex:
+    """cert_number -> (status, expiry_date) untuk verifikasi tanpa query database"""
+
+    def __init__(self):
+        self.refresh_interval = 2.0
+        self.full_reload_interval = 300.0
+        self.overlap = timedelta(seconds=5)
+        self._entries = {}
+        self._watermark = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+        self._subscription = None
+        self.stats = {'refreshes': 0, 'full_reloads': 0, 'last_refresh_ms': None, 'last_refreshed_at': None}
+
+    def init_app(self, app):
+        self._app = app
+        self.refresh_interval = app.config.get('CERT_INDEX_REFRESH_INTERVAL', 2.0)
+        self.full_reload_interval = app.config.get('CERT_INDEX_FULL_RELOAD_INTERVAL', 300.0)
+        self.overlap = timedelta(seconds=app.config.get('CERT_INDEX_OVERLAP', 5.0))
+        if self._subscription is None:
+            self._subscription = change_stream.subscribe(callback=self._on_changes, tables=('certificate',))
+
+    def lookup(self, cert_number, timeout=10.0):
+        """Return dict status verifikasi, atau None kalau nomor tidak dikenal"""
+        self._ensure_refresher()
+        if not self._loaded.wait(timeout):
+            raise RuntimeError('certificate index not loaded yet')
+        entry = self._entries.get(cert_number)
+        if entry is None:
+            return None
+        status, expiry = entry
+        expired = expiry is not None and expiry <= datetime.utcnow()
+        return {
+            'cert_number': cert_number,
+            'valid': status == 'active' and not expired,
+            'status': 'expired' if status == 'active' and expired else status,
+            'expiry_date': expiry.isoformat() if expiry else None
+        }
+
+    def apply(self, rows, advance=True):
+        """rows: iterable (cert_number, status, expiry_date, updated_at)"""
+        with self._lock:
+            for cert_number, status, expiry, updated_at in rows:
+                if cert_number is None:
+                    continue
+                self._entries[cert_number] = (sys.intern(status or ''), expiry)
+                # Watermark hanya dari database; commit lokal bisa lebih baru dari commit worker lain
+                if advance and updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+
+    def _on_changes(self, events):
+        """Commit lokal: baca ulang sertifikat yang berubah (per cert_id, atau updated_at untuk event per statement)"""
+        from app import db
+
+        if not self._loaded.is_set():
+            return  # load penuh pertama membacanya juga
+        query = select(_cert_table.c.cert_number, _cert_table.c.status, _cert_table.c.expiry_date,
+                       _cert_table.c.updated_at)
+        if any(change['pk'] is None for change in events):
+            queries = [query if self._watermark is None else
+                       query.where(_cert_table.c.updated_at >= self._watermark - self.overlap)]
+        else:
+            cert_ids = sorted({change['pk'] for change in events if change['op'] != 'delete'})
+            queries = [query.where(_cert_table.c.cert_id.in_(chunk)) for chunk in _chunks(cert_ids)]
+        # Connection sendiri: callback jalan di after_commit session pemanggil
+        with db.engine.connect() as conn:
+            for statement in queries:
+                self.apply(conn.execute(statement).all(), advance=False)
+
+    def refresh(self, full=False):
+        """Load penuh (pertama kali / berkala) atau incremental dari updated_at"""
+        from app import db
+
+        started = time.perf_counter()
+        full = full or not self._loaded.is_set() or self._watermark is None
+        query = select(_cert_table.c.cert_number, _cert_table.c.status, _cert_table.c.expiry_date,
+                       _cert_table.c.updated_at)
+        if not full:
+            query = query.where(_cert_table.c.updated_at >= self._watermark - self.overlap)
+        try:
+            rows = db.session.execute(query).all()
+        finally:
+            db.session.remove()
+
+        if full:
+            entries = {}
+            watermark = None
+            for cert_number, status, expiry, updated_at in rows:
+                if cert_number is not None:
+                    entries[cert_number] = (sys.intern(status or ''), expiry)
+                if updated_at is not None and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+            with self._lock:
+                self._entries = entries
+                self._watermark = watermark
+            self.stats['full_reloads'] += 1
+        else:
+            self.apply(rows)
+        self._loaded.set()
+        self.stats['refreshes'] += 1
+        self.stats['last_refresh_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.stats['last_refreshed_at'] = datetime.utcnow().isoformat()
+
+    def status(self):
+        return {'entries': len(self._entries), 'watermark': self._watermark.isoformat() if self._watermark else None,
+                **self.stats}
+
+    def _ensure_refresher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name='certificate-index', daemon=True)
+                self._thread.start()
+
+    def _refresh_loop(self):
+        last_full = 0.0
+        with self._app.app_context():
+            while True:
+                full = time.monotonic() - last_full >= self.full_reload_interval
+                try:
+                    self.refresh(full=full)
+                    if full:
+                        last_full = time.monotonic()
+                except Exception:
+                    logger.exception('certificate index refresh failed')
+                time.sleep(self.refresh_interval)
+
+
+cert_index = CertificateIndex()
@@ -0,0 +1,216 @@
+"""
+Progress sertifikasi operator secara set-based.
+
+- Progress ditulis dengan INSERT ... ON CONFLICT (user_id, module_id) pada
+  constraint `unique_user_module`; "selesaikan semua modul" adalah satu
+  INSERT ... SELECT dari tabel modul.
+- Setiap write progress menghitung ulang baris `user_certification_summary`
+  (overall %, jumlah modul selesai) dengan satu INSERT ... SELECT agregat.
+- Kelulusan diputuskan oleh satu UPDATE bersyarat dari ringkasan tersebut: user
+  ditandai certified hanya kalau semua modul selesai dan belum certified,
+  sehingga dua request bersamaan tidak menerbitkan dua sertifikat.
+- Katalog modul di-cache di memori (list dict + JSON + ETag). Di-invalidate lewat
+  change stream setelah commit yang mengubah `certification_module`; TTL membatasi
+  basi di worker lain.
+
+Semua fungsi memakai session caller; commit dilakukan caller (satu transaksi).
+Jumlah query per panggilan konstan, tidak bergantung jumlah modul.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, case, func, literal, or_, select, true, update
+
+from app.models.certificate import CertificationModule, UserCertificationProgress, UserCertificationSummary
+from app.models.user import User
+from app.services.certificates import issue_certificate
+from app.services.change_stream import change_stream
+from app.utils.sql import upsert
+
+CATALOG_TTL_S = 60.0
+
+_progress = UserCertificationProgress.__table__
+_summary = UserCertificationSummary.__table__
+
+CatalogEntry = namedtuple('CatalogEntry', 'modules payload etag loaded_at')
+
+
+class ModuleCatalog:
+    """Katalog modul terurut (order_index) yang sudah di-serialize; versi = ETag (hash isi)"""
+
+    def __init__(self, ttl=CATALOG_TTL_S):
+        self.ttl = ttl
+        self._entry = None
+        self._generation = 0
+        self._subscription = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('CERT_CATALOG_TTL', CATALOG_TTL_S)
+        if self._subscription is None:
+            self._subscription = change_stream.subscribe(callback=lambda events: self.invalidate(),
+                                                         tables=('certification_module',))
+        self.invalidate()
+
+    def get(self):
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+
+        generation = self._generation
+        modules = [module.to_dict() for module in
+                   CertificationModule.query.order_by(CertificationModule.order_index).all()]
+        payload = json.dumps({'modules': modules}, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        entry = CatalogEntry(modules, payload, hashlib.sha1(payload).hexdigest()[:16], time.monotonic())
+        with self._lock:
+            # Jangan simpan hasil load yang dimulai sebelum invalidasi terakhir
+            if generation == self._generation:
+                self._entry = entry
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entry = None
+
+
+module_catalog = ModuleCatalog()
+
+
+def _upsert_progress(session, rows, now):
+    return upsert(
+        session.get_bind().dialect.name, _progress, rows,
+        index_elements=['user_id', 'module_id'],
+        set_=lambda excluded: {
+            'progress_percentage': excluded.progress_percentage,
+            'completed': excluded.completed,
+            'completed_at': func.coalesce(_progress.c.completed_at, excluded.completed_at),
+            'updated_at': now
+        }
+    )
+
+
+def save_progress(session, user_id, module_id, progress_percentage, completed):
+    """Upsert progress satu modul; return dict progress (format to_dict)"""
+    now = datetime.utcnow()
+    row = {
+        'user_id': user_id,
+        'module_id': module_id,
+        'progress_percentage': progress_percentage,
+        'completed': completed,
+        'completed_at': now if completed else None,
+        'created_at': now,
+        'updated_at': now
+    }
+    stmt = _upsert_progress(session, [row], now).returning(*_progress.c)
+    saved = session.execute(stmt).mappings().one()
+    refresh_summary(session, user_id)
+    return UserCertificationProgress(**saved).to_dict()
+
+
+def complete_all_modules(session, user_id):
+    """Tandai semua modul selesai untuk user (satu INSERT ... SELECT)"""
+    now = datetime.utcnow()
+    modules = select(
+        literal(user_id, Integer).label('user_id'),
+        CertificationModule.id.label('module_id'),
+        literal(100, Integer).label('progress_percentage'),
+        true().label('completed'),
+        literal(now, DateTime).label('completed_at'),
+        literal(now, DateTime).label('created_at'),
+        literal(now, DateTime).label('updated_at')
+    ).where(true())
+    session.execute(_upsert_progress(session, modules, now))
+    refresh_summary(session, user_id)
+
+
+def refresh_summary(session, user_id=None):
+    """Hitung ulang ringkasan progress satu user (atau semua user kalau None) dengan satu upsert agregat"""
+    now = datetime.utcnow()
+    module_count = select(func.count()).select_from(CertificationModule).scalar_subquery()
+    progress_sum = func.coalesce(func.sum(_progress.c.progress_percentage), 0)
+    query = select(
+        _progress.c.user_id.label('user_id'),
+        module_count.label('module_count'),
+        func.count(case((_progress.c.completed.is_(True), 1))).label('completed_modules'),
+        progress_sum.label('progress_sum'),
+        case((module_count > 0, progress_sum // module_count), else_=0).label('overall_progress'),
+        literal(now, DateTime).label('updated_at')
+    ).select_from(
+        _progress.join(CertificationModule, CertificationModule.id == _progress.c.module_id)
+    ).where(
+        _progress.c.user_id == user_id if user_id is not None else true()
+    ).group_by(_progress.c.user_id)
+
+    session.execute(upsert(
+        session.get_bind().dialect.name, _summary, query,
+        index_elements=['user_id'],
+        set_=lambda excluded: {
+            'module_count': excluded.module_count,
+            'completed_modules': excluded.completed_modules,
+            'progress_sum': excluded.progress_sum,
+            'overall_progress': excluded.overall_progress,
+            'updated_at': excluded.updated_at
+        }
+    ))
+
+
+def progress_overview(session, user_id):
+    """Progress user untuk GET /progress: satu query (ringkasan + progress per modul) + katalog cache"""
+    catalog = module_catalog.get()
+    rows = session.execute(
+        select(
+            _summary.c.module_count, _summary.c.completed_modules, _summary.c.overall_progress,
+            _progress.c.module_id, _progress.c.completed, _progress.c.progress_percentage
+        ).select_from(
+            _summary.outerjoin(_progress, _progress.c.user_id == _summary.c.user_id)
+        ).where(_summary.c.user_id == user_id)
+    ).all()
+
+    per_module = {row.module_id: row for row in rows if row.module_id is not None}
+    modules = [{
+        **module,
+        'completed': bool(per_module[module['id']].completed) if module['id'] in per_module else False,
+        'progress_percentage': per_module[module['id']].progress_percentage if module['id'] in per_module else 0
+    } for module in catalog.modules]
+
+    total_modules = len(catalog.modules)
+    if rows and rows[0].module_count == total_modules:
+        overall_progress, completed_modules = rows[0].overall_progress, rows[0].completed_modules
+    else:
+        # Belum ada ringkasan, atau katalog berubah sejak ringkasan dihitung
+        overall_progress = sum(module['progress_percentage'] for module in modules) // total_modules \
+            if total_modules else 0
+        completed_modules = sum(1 for module in modules if module['completed'])
+
+    return {
+        'modules': modules,
+        'overall_progress': overall_progress,
+        'completed_modules': completed_modules,
+        'total_modules': total_modules,
+        'is_certified': overall_progress == 100
+    }
+
+
+def certify_if_complete(session, user_id):
+    """Set user certified + terbitkan sertifikat kalau semua modul selesai; return Certificate atau None"""
+    complete = select(_summary.c.user_id).where(
+        _summary.c.user_id == user_id,
+        _summary.c.module_count > 0,
+        _summary.c.completed_modules == _summary.c.module_count
+    ).exists()
+
+    result = session.execute(
+        update(User).where(
+            User.user_id == user_id,
+            or_(User.is_certified.is_(None), User.is_certified.is_(False)),
+            complete
+        ).values(is_certified=True).execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return None
+    return issue_certificate(session, user_id)
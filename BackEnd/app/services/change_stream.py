@@ -0,0 +1,388 @@
+"""
+Change data capture (CDC) dari session SQLAlchemy.
+
+Perubahan pada tabel `CDC_TABLES` (default robot, booking, mission, sensor_data)
+dikumpulkan selama flush ke `session.info`:
+
+- insert/update/delete lewat unit of work (mapper event): satu event per baris
+  dengan primary key; update membawa nama kolom yang benar-benar berubah
+  (update tanpa perubahan kolom dilewati).
+- DML langsung lewat `session.execute` (mis. `insert(SensorData)` executemany di
+  telemetry, `update(_booking)` di booking lifecycle): event per baris kalau primary
+  key ada di parameter, selain itu satu event per statement (`pk` null, `rows` =
+  jumlah baris untuk insert, null untuk update/delete ber-WHERE).
+
+Perubahan baris yang sama dalam satu transaksi digabung (insert + update = insert,
+insert + delete = tidak ada event). Setelah commit, event diberi nomor urut `seq`
+lalu dipublish ke subscriber in-process (callback inline atau antrian `Subscription`),
+disimpan di ring buffer `CDC_BUFFER_SIZE` untuk catch-up (`since(seq)`) dan opsional
+di-append ke `CDC_LOG_PATH` (JSON lines, satu `write()` O_APPEND per commit, jadi file
+bisa dipakai bersama oleh semua worker). Rollback membuang perubahan. Tulisan lewat
+engine/connection langsung (di luar session) tidak tertangkap.
+
+Subscriber yang menyebut `tables` selalu menerima perubahan tabel itu, juga kalau tabelnya
+tidak ada di `CDC_TABLES` atau `CDC_ENABLED=false` (invalidasi cache in-process memakai
+jalur ini); ring buffer, log dan subscriber tanpa `tables` hanya melihat `CDC_TABLES`.
+
+Event: {"seq", "tx", "ts", "table", "op", "pk", "columns"} (+ "rows" untuk event per statement).
+`seq` per worker; commit yang bersamaan bisa dikirim ke subscriber tidak berurutan.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapper, Session
+
+from app.services.instrumentation import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLES = ('robot', 'booking', 'mission', 'sensor_data')
+LOG_CHECK_INTERVAL = 1.0  # detik; file log yang di-rotate dari luar dibuka ulang
+
+CDC_EVENTS = registry.counter('cdc_events_total', 'Change events published', ('table', 'op'))
+CDC_PUBLISH_DURATION = registry.histogram(
+    'cdc_publish_seconds', 'Time spent publishing change events per commit', (),
+    (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05))
+
+
+class Subscription:
+    """Consumer change event: callback inline (harus cepat) atau antrian yang dibaca lewat get()"""
+
+    def __init__(self, stream, tables=None, callback=None, maxlen=10000):
+        self.stream = stream
+        self.tables = frozenset(tables) if tables else None
+        self.callback = callback
+        self.dropped = 0  # event terbuang karena antrian penuh -> consumer perlu resync
+        self._events = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+
+    def get(self, timeout=None, max_events=None):
+        """Ambil event yang tertunda (menunggu sampai timeout kalau kosong); return list"""
+        with self._cond:
+            if not self._events and timeout != 0:
+                self._cond.wait(timeout)
+            count = len(self._events) if max_events is None else min(max_events, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def pending(self):
+        return len(self._events)
+
+    def close(self):
+        self.stream.unsubscribe(self)
+
+    def _deliver(self, events):
+        if self.tables is not None:
+            events = [change for change in events if change['table'] in self.tables]
+        if not events:
+            return
+        if self.callback is not None:
+            self.callback(events)
+            return
+        with self._cond:
+            self.dropped += max(0, len(self._events) + len(events) - self._events.maxlen)
+            self._events.extend(events)
+            self._cond.notify_all()
+
+
+class ChangeStream:
+
+    def __init__(self):
+        self.enabled = False
+        self.tables = frozenset(DEFAULT_TABLES)
+        self.queue_size = 10000
+        self.log_path = None
+        self._subscribed_tables = frozenset()  # ditangkap walau di luar CDC_TABLES / CDC mati
+        self._seq = 0
+        self._tx = 0
+        self._recent = deque(maxlen=10000)
+        self._subscribers = ()
+        self._lock = threading.Lock()
+        self._log_fd = None
+        self._log_inode = None
+        self._log_checked = 0.0
+        self.stats = {'commits': 0, 'events': 0, 'publish_s': 0.0, 'callback_errors': 0,
+                      'log_bytes': 0, 'log_errors': 0}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('CDC_ENABLED', False)
+        self.tables = frozenset(app.config.get('CDC_TABLES') or DEFAULT_TABLES)
+        self.queue_size = app.config.get('CDC_SUBSCRIBER_QUEUE', 10000)
+        self._recent = deque(self._recent, maxlen=app.config.get('CDC_BUFFER_SIZE', 10000))
+        self.log_path = app.config.get('CDC_LOG_PATH') or None
+        self._close_log()
+
+    # ------------------------------------------------------------------
+    # Pub/sub
+    # ------------------------------------------------------------------
+    def subscribe(self, callback=None, tables=None, maxlen=None):
+        """Daftarkan consumer; callback(events) dipanggil di thread yang commit, tanpa callback -> antrian"""
+        subscription = Subscription(self, tables, callback, maxlen or self.queue_size)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+            self._update_subscribed_tables()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers = tuple(item for item in self._subscribers if item is not subscription)
+            self._update_subscribed_tables()
+
+    def _update_subscribed_tables(self):
+        self._subscribed_tables = frozenset().union(*(item.tables for item in self._subscribers if item.tables))
+
+    def since(self, seq):
+        """Event dengan seq > `seq` dari ring buffer; return (events, lengkap?)"""
+        with self._lock:
+            recent = list(self._recent)
+            last = self._seq
+        events = [change for change in recent if change['seq'] > seq]
+        complete = seq >= last or (bool(recent) and recent[0]['seq'] <= seq + 1)
+        return events, complete
+
+    def publish(self, changes):
+        """Dipanggil setelah commit dengan perubahan yang terkumpul di session.info"""
+        started = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            self._tx += 1
+            events = []
+            for table, op, pk, columns, rows in changes:
+                self._seq += 1
+                change = {'seq': self._seq, 'tx': self._tx, 'ts': now, 'table': table, 'op': op,
+                          'pk': pk, 'columns': columns}
+                if rows is not None or pk is None:
+                    change['rows'] = rows
+                events.append(change)
+            published = [change for change in events if change['table'] in self.tables] if self.enabled else []
+            self._recent.extend(published)
+            if self.log_path and published:
+                self._append_log(published)
+            subscribers = self._subscribers
+
+        for subscription in subscribers:
+            try:
+                subscription._deliver(events if subscription.tables is not None else published)
+            except Exception:
+                self.stats['callback_errors'] += 1
+                logger.exception('change stream subscriber failed')
+
+        counts = {}
+        for change in events:
+            key = (change['table'], change['op'])
+            counts[key] = counts.get(key, 0) + 1
+        for key, count in counts.items():
+            CDC_EVENTS.inc(key, count)
+        elapsed = time.perf_counter() - started
+        CDC_PUBLISH_DURATION.observe((), elapsed)
+        self.stats['commits'] += 1
+        self.stats['events'] += len(events)
+        self.stats['publish_s'] += elapsed
+        return events
+
+    def status(self):
+        stats = dict(self.stats)
+        stats['avg_publish_us'] = round(stats['publish_s'] / stats['commits'] * 1e6, 1) if stats['commits'] else None
+        stats['publish_s'] = round(stats['publish_s'], 4)
+        return {
+            'enabled': self.enabled,
+            'tables': sorted(self.tables),
+            'seq': self._seq,
+            'buffered': len(self._recent),
+            'log_path': self.log_path,
+            'subscribers': [{'tables': sorted(item.tables) if item.tables else None, 'callback': item.callback is not None,
+                             'pending': item.pending(), 'dropped': item.dropped} for item in self._subscribers],
+            'stats': stats
+        }
+
+    # ------------------------------------------------------------------
+    # Log append-only
+    # ------------------------------------------------------------------
+    def _append_log(self, events):
+        pid = os.getpid()
+        data = ''.join(json.dumps({**change, 'pid': pid}, separators=(',', ':'), default=str) + '\n'
+                       for change in events).encode('utf-8')
+        try:
+            os.write(self._log_file(), data)
+            self.stats['log_bytes'] += len(data)
+        except OSError as e:
+            self.stats['log_errors'] += 1
+            logger.error('change log write failed', extra={'path': self.log_path, 'error': str(e)})
+            self._close_log()
+
+    def _log_file(self):
+        now = time.monotonic()
+        if self._log_fd is not None and now - self._log_checked >= LOG_CHECK_INTERVAL:
+            self._log_checked = now
+            try:
+                rotated = os.stat(self.log_path).st_ino != self._log_inode
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                self._close_log()
+        if self._log_fd is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._log_inode = os.fstat(self._log_fd).st_ino
+            self._log_checked = now
+        return self._log_fd
+
+    def _close_log(self):
+        if self._log_fd is not None:
+            try:
+                os.close(self._log_fd)
+            except OSError:
+                pass
+        self._log_fd = None
+
+
+def read_log(path, offset=0, limit=1000):
+    """Baca log CDC mulai byte `offset` (consumer durable); return (events, offset berikutnya)"""
+    events = []
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while len(events) < limit:
+                line = f.readline()
+                if not line.endswith(b'\n'):  # baris terakhir belum selesai ditulis
+                    break
+                offset += len(line)
+                events.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return events, offset
+
+
+change_stream = ChangeStream()
+
+
+# ----------------------------------------------------------------------
+# Capture
+# ----------------------------------------------------------------------
+_column_names = {}  # mapper -> {attribute key: nama kolom}
+
+
+def _columns_of(mapper):
+    names = _column_names.get(mapper)
+    if names is None:
+        names = _column_names[mapper] = {prop.key: prop.columns[0].name for prop in mapper.column_attrs
+                                         if prop.columns[0].table is mapper.local_table}
+    return names
+
+
+def _pk_of(mapper, target):
+    pk = mapper.primary_key_from_instance(target)
+    return pk[0] if len(pk) == 1 else list(pk)
+
+
+def _record(session, table, op, pk, columns=None, rows=None):
+    """Simpan perubahan ke session.info; perubahan baris yang sama digabung"""
+    changes = session.info.get('cdc_changes')
+    if changes is None:
+        changes = session.info['cdc_changes'] = {}
+    if pk is None:
+        changes[(table, None, len(changes))] = (table, op, None, columns, rows)
+        return
+    key = (table, str(pk))
+    previous = changes.get(key)
+    if previous is None:
+        changes[key] = (table, op, pk, columns, rows)
+    elif op == 'delete':
+        if previous[1] == 'insert':
+            del changes[key]
+        else:
+            changes[key] = (table, 'delete', pk, None, None)
+    elif op == 'update' and previous[1] == 'update':
+        changes[key] = (table, 'update', pk, sorted(set(previous[3] or ()) | set(columns or ())), None)
+    elif op == 'insert' and previous[1] == 'delete':
+        changes[key] = (table, 'update', pk, None, None)  # delete lalu insert ulang pk yang sama
+
+
+def _tracked(table_name):
+    return (change_stream.enabled and table_name in change_stream.tables) or table_name in change_stream._subscribed_tables
+
+
+@event.listens_for(Mapper, 'after_insert')
+def _capture_insert(mapper, connection, target):
+    table = mapper.local_table.name
+    if _tracked(table):
+        session = inspect(target).session
+        if session is not None:
+            _record(session, table, 'insert', _pk_of(mapper, target))
+
+
+@event.listens_for(Mapper, 'after_update')
+def _capture_update(mapper, connection, target):
+    table = mapper.local_table.name
+    if not _tracked(table):
+        return
+    state = inspect(target)
+    if state.session is None:
+        return
+    # committed_state = nilai lama atribut yang di-set (NO_VALUE kalau belum ter-load -> dianggap berubah);
+    # dibanding langsung dengan state.dict, jauh lebih murah dari attribute history
+    names = _columns_of(mapper)
+    current = state.dict
+    columns = sorted(names[key] for key, old in state.committed_state.items()
+                     if key in names and old != current.get(key))
+    if columns:
+        _record(state.session, table, 'update', _pk_of(mapper, target), columns)
+
+
+@event.listens_for(Mapper, 'after_delete')
+def _capture_delete(mapper, connection, target):
+    table = mapper.local_table.name
+    if _tracked(table):
+        session = inspect(target).session
+        if session is not None:
+            _record(session, table, 'delete', _pk_of(mapper, target))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _capture_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    statement = orm_execute_state.statement
+    table = statement.table
+    if not _tracked(table.name):
+        return
+    op = 'insert' if orm_execute_state.is_insert else 'update' if orm_execute_state.is_update else 'delete'
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, dict):
+        parameters = [parameters] if parameters else None
+    primary_key = [column.name for column in table.primary_key]
+
+    # .values(...) belum punya accessor publik; executemany tanpa .values -> key parameter
+    values = getattr(statement, '_values', None)
+    if values:
+        columns = sorted(getattr(key, 'name', key) for key in values)
+    elif parameters and op != 'delete':
+        columns = sorted(name for name in parameters[0] if name not in primary_key)
+    else:
+        columns = None
+    if op == 'insert':
+        columns = None
+
+    session = orm_execute_state.session
+    if parameters and len(primary_key) == 1 and all(primary_key[0] in row for row in parameters):
+        for row in parameters:
+            _record(session, table.name, op, row[primary_key[0]], columns)
+    else:
+        # Jumlah baris hanya pasti untuk insert; update/delete ber-WHERE bisa kena berapa pun
+        _record(session, table.name, op, None, columns, len(parameters) if parameters and op == 'insert' else None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    changes = session.info.pop('cdc_changes', None)
+    if changes:
+        change_stream.publish(changes.values())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('cdc_changes', None)
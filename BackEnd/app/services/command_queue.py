@@ -0,0 +1,349 @@
+"""
+Antrian command per robot untuk endpoint kontrol.
+
+- Command ID monotonic (global), dikembalikan langsung ke HTTP caller.
+- Stop-and-wait: tiap robot hanya punya satu command in-flight; command
+  berikutnya menunggu ack. Selama menunggu, `move` yang belum terkirim
+  di-coalesce (move terbaru menggantikan yang lama).
+- `stop` mengosongkan antrian dan langsung dikirim paling depan.
+- Delivery lewat SocketIO ke room `robot_<id>`; kalau tidak ada robot/simulator
+  yang terhubung dan loopback aktif, command di-ack secara lokal (simulasi).
+- Latency enqueue -> ack dicatat per robot.
+"""
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from app.services.operation_log import operation_log
+
+ACK_TIMEOUT_S = 5.0
+MAX_ATTEMPTS = 3
+LATENCY_SAMPLES = 1024
+COMMAND_HISTORY = 10000
+MOVE_BATTERY_DRAIN = 1
+
+logger = logging.getLogger(__name__)
+
+
+class Command:
+    __slots__ = ('command_id', 'robot_id', 'action', 'params', 'status', 'enqueued_at',
+                 'delivered_at', 'acked_at', 'attempts', 'superseded_by', 'result')
+
+    def __init__(self, command_id, robot_id, action, params):
+        self.command_id = command_id
+        self.robot_id = robot_id
+        self.action = action
+        self.params = params or {}
+        self.status = 'queued'  # queued, delivered, acked, failed, superseded, cancelled, timeout
+        self.enqueued_at = time.monotonic()
+        self.delivered_at = None
+        self.acked_at = None
+        self.attempts = 0
+        self.superseded_by = None
+        self.result = None
+
+    def payload(self):
+        return {
+            'command_id': self.command_id,
+            'robot_id': self.robot_id,
+            'action': self.action,
+            'params': self.params
+        }
+
+    def to_dict(self):
+        return {
+            **self.payload(),
+            'status': self.status,
+            'attempts': self.attempts,
+            'superseded_by': self.superseded_by,
+            'latency_ms': round((self.acked_at - self.enqueued_at) * 1000, 3) if self.acked_at else None,
+            'result': self.result
+        }
+
+
+class LatencyStats:
+    """Sampel latency enqueue -> ack terakhir per robot"""
+
+    def __init__(self, size=LATENCY_SAMPLES):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def to_dict(self):
+        if not self.samples:
+            return {'count': self.count}
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+        return {
+            'count': self.count,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+            'max_ms': round(ordered[-1] * 1000, 3),
+            'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3)
+        }
+
+
+class RobotCommandQueue:
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._pending = {}      # robot_id -> deque[Command]
+        self._in_flight = {}    # robot_id -> Command
+        self._commands = {}     # command_id -> Command (riwayat terbatas)
+        self._history = deque()
+        self._latency = {}      # robot_id -> LatencyStats
+        self._connected = set()
+        self._cond = threading.Condition()
+        self._app = None
+        self._socketio = None
+        self._worker = None
+        self._running = False
+        self.loopback = True
+        self.ack_timeout = ACK_TIMEOUT_S
+
+    def init_app(self, app, socketio):
+        self._app = app
+        self._socketio = socketio
+        self.loopback = app.config.get('ROBOT_COMMAND_LOOPBACK', True)
+        self.ack_timeout = app.config.get('ROBOT_COMMAND_ACK_TIMEOUT', ACK_TIMEOUT_S)
+
+    def _ensure_worker(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._worker = self._socketio.start_background_task(self._dispatch_loop)
+
+    # ------------------------------------------------------------------
+    # API untuk route
+    # ------------------------------------------------------------------
+    def enqueue(self, robot_id, action, params=None):
+        with self._cond:
+            command = Command(next(self._ids), robot_id, action, params)
+            queue = self._pending.setdefault(robot_id, deque())
+
+            if action == 'stop':
+                # Stop membatalkan semua command yang belum terkirim
+                for old in queue:
+                    old.status = 'cancelled'
+                    old.superseded_by = command.command_id
+                queue.clear()
+                queue.append(command)
+            elif action == 'move':
+                for i, old in enumerate(queue):
+                    if old.action == 'move':
+                        # Move terbaru menggantikan slot move lama yang belum terkirim
+                        old.status = 'superseded'
+                        old.superseded_by = command.command_id
+                        queue[i] = command
+                        break
+                else:
+                    queue.append(command)
+            else:
+                queue.append(command)
+
+            self._remember(command)
+            self._cond.notify()
+
+        self._ensure_worker()
+        return command
+
+    def get(self, command_id):
+        with self._cond:
+            return self._commands.get(command_id)
+
+    def latency(self, robot_id=None):
+        with self._cond:
+            if robot_id is not None:
+                stats = self._latency.get(robot_id)
+                return stats.to_dict() if stats else {'count': 0}
+            return {robot_id: stats.to_dict() for robot_id, stats in self._latency.items()}
+
+    def queue_depth(self, robot_id):
+        with self._cond:
+            return len(self._pending.get(robot_id, ())) + (1 if robot_id in self._in_flight else 0)
+
+    # ------------------------------------------------------------------
+    # API untuk SocketIO handler
+    # ------------------------------------------------------------------
+    def robot_connected(self, robot_id):
+        with self._cond:
+            self._connected.add(robot_id)
+            # Kirim ulang command in-flight setelah reconnect
+            command = self._in_flight.get(robot_id)
+            if command:
+                command.delivered_at = None
+            self._cond.notify()
+        self._ensure_worker()
+
+    def robot_disconnected(self, robot_id):
+        with self._cond:
+            self._connected.discard(robot_id)
+
+    def ack(self, command_id, ok=True, result=None):
+        """Tandai command selesai. Return Command kalau valid, None kalau tidak dikenal/duplikat"""
+        with self._cond:
+            command = self._commands.get(command_id)
+            if not command or self._in_flight.get(command.robot_id) is not command:
+                return None
+            command.acked_at = time.monotonic()
+            command.status = 'acked' if ok else 'failed'
+            command.result = result
+            del self._in_flight[command.robot_id]
+            self._latency.setdefault(command.robot_id, LatencyStats()).add(command.acked_at - command.enqueued_at)
+            self._cond.notify()
+
+        operation_log.record('command_ack', robot_id=command.robot_id,
+                             parameters={'command_id': command.command_id, 'action': command.action},
+                             results={'status': command.status, 'latency_ms': command.to_dict()['latency_ms'],
+                                      'result': result})
+        return command
+
+    # ------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------
+    def _remember(self, command):
+        self._commands[command.command_id] = command
+        self._history.append(command.command_id)
+        while len(self._history) > COMMAND_HISTORY:
+            old_id = self._history.popleft()
+            old = self._commands.get(old_id)
+            if old and old.status not in ('queued', 'delivered'):
+                del self._commands[old_id]
+            elif old:
+                self._history.append(old_id)
+                break
+
+    def _next_deliveries(self):
+        """Ambil command yang siap dikirim (dipanggil dengan lock)"""
+        now = time.monotonic()
+        ready = []
+        for robot_id, command in list(self._in_flight.items()):
+            if command.delivered_at is None or now - command.delivered_at > self.ack_timeout:
+                if command.attempts >= MAX_ATTEMPTS:
+                    command.status = 'timeout'
+                    del self._in_flight[robot_id]
+                    continue
+                ready.append(command)
+
+        for robot_id, queue in self._pending.items():
+            if queue and robot_id not in self._in_flight:
+                command = queue.popleft()
+                self._in_flight[robot_id] = command
+                ready.append(command)
+
+        for command in ready:
+            command.delivered_at = now
+            command.attempts += 1
+            command.status = 'delivered'
+        return ready
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                ready = self._next_deliveries()
+                if not ready:
+                    self._cond.wait(timeout=self.ack_timeout / 2)
+                    continue
+                loopback = [c for c in ready if self.loopback and c.robot_id not in self._connected]
+                remote = [c for c in ready if c not in loopback]
+
+            for command in remote:
+                try:
+                    self._socketio.emit('robot_command', command.payload(), to=f'robot_{command.robot_id}')
+                except Exception:
+                    # Tidak terkirim -> dikirim ulang setelah ack timeout (sampai MAX_ATTEMPTS)
+                    logger.exception('robot command emit failed', extra={'command_id': command.command_id})
+
+            for command in loopback:
+                # Simulasi eksekusi lokal: langsung ack tanpa robot fisik
+                if self.ack(command.command_id, ok=True) is not None:
+                    self._apply_loopback(command)
+
+    def _apply_loopback(self, command):
+        """Error DB (mis. database is locked) hanya menggagalkan command ini, dispatcher tetap jalan"""
+        from app import db
+
+        with self._app.app_context():
+            try:
+                apply_command_result(command)
+            except Exception as e:
+                with self._cond:
+                    command.status = 'failed'
+                    command.result = {'error': str(e)}
+                logger.warning('robot command result not applied',
+                               extra={'command_id': command.command_id, 'robot_id': command.robot_id,
+                                      'error': str(e)})
+            finally:
+                db.session.remove()
+
+
+command_queue = RobotCommandQueue()
+
+
+def _state_number(value, name, low, high):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) \
+            or not low <= value <= high:
+        raise ValueError(f'{name} must be a number between {low} and {high}')
+    return value
+
+
+def parse_robot_state(state):
+    """Validasi `state` dari robot_ack -> {battery?, position?}; ValueError kalau tipe/range salah"""
+    if state is None:
+        return {}
+    if not isinstance(state, dict):
+        raise ValueError('state must be an object')
+    parsed = {}
+    if state.get('battery') is not None:
+        parsed['battery'] = int(_state_number(state['battery'], 'battery', 0, 100))
+    if state.get('position') is not None:
+        position = state['position']
+        if not isinstance(position, dict):
+            raise ValueError('position must be an object')
+        parsed['position'] = {
+            'latitude': _state_number(position.get('latitude'), 'latitude', -90, 90),
+            'longitude': _state_number(position.get('longitude'), 'longitude', -180, 180)
+        }
+        if position.get('depth') is not None:
+            parsed['position']['depth'] = _state_number(position['depth'], 'depth', 0, 11000)
+    return parsed
+
+
+def apply_command_result(command, state=None):
+    """Terapkan efek command yang sudah di-ack ke tabel robot; state sudah lewat parse_robot_state"""
+    from app import db
+    from app.models.robot import Robot
+
+    if command.status != 'acked':
+        return
+    try:
+        robot = Robot.query.get(command.robot_id)
+        if not robot:
+            return
+        if command.action == 'start':
+            robot.status = 'active'
+        elif command.action == 'stop':
+            robot.status = 'offline'
+        elif command.action == 'move' and command.params.get('speed'):
+            robot.battery_lvl = max(0, (robot.battery_lvl or 0) - MOVE_BATTERY_DRAIN)
+
+        state = state or {}
+        if 'battery' in state:
+            robot.battery_lvl = state['battery']
+        if 'position' in state:
+            robot.current_position = state['position']
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
@@ -0,0 +1,472 @@
+"""
+Scheduler assignment misi `planned` ke robot di seluruh fleet.
+
+Cost matrix (robot x mission) disimpan di NumPy dan di-update per baris/kolom
+setiap kali state robot, misi, maintenance atau booking berubah (lewat mapper
+event, diterapkan setelah commit), jadi re-plan tidak membangun ulang matrix
+dari nol. Assignment dihitung greedy dari k kandidat termurah per misi,
+dengan constraint satu robot tidak boleh punya dua misi yang waktunya overlap.
+Misi yang sudah di-assign (`assigned`) memblok window-nya di robot tersebut;
+robot dengan misi `active` tidak ikut di-assign sama sekali.
+"""
+import math
+import threading
+from datetime import datetime
+import numpy as np
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from flask import current_app
+from app import db
+from app.models.booking import Booking
+from app.models.mission import Maintenance, Mission
+from app.models.robot import Robot
+from app.services.route_planner import AreaError, parse_area
+from app.utils.geo import EARTH_RADIUS_M, position_latlon
+
+UNAVAILABLE_ROBOT_STATUSES = ('maintenance',)
+BLOCKING_BOOKING_STATUSES = ('confirmed', 'active')
+BLOCKING_MAINTENANCE_STATUSES = ('scheduled', 'in_progress')
+ASSIGNED_MISSION_STATUS = 'assigned'
+BLOCKING_MISSION_STATUSES = (ASSIGNED_MISSION_STATUS, 'active')
+DEFAULT_MISSION_HOURS = 4
+DEFAULT_MISSION_DISTANCE_M = 5000.0
+MAINTENANCE_DEFAULT_HOURS = 24
+BATTERY_COST_WEIGHT = 5.0  # km ekuivalen untuk robot dengan baterai 0%
+CANDIDATES_PER_MISSION = 8
+
+
+def _ts(value):
+    return value.timestamp() if value else None
+
+
+def _mission_window(start_time, end_time):
+    start = _ts(start_time) or datetime.utcnow().timestamp()
+    end = _ts(end_time) or start + DEFAULT_MISSION_HOURS * 3600
+    return start, end
+
+
+def _mission_point(area_coords, fallback=None):
+    if area_coords:
+        try:
+            polygon = parse_area(area_coords)
+            return tuple(polygon.mean(axis=0))
+        except (AreaError, TypeError, ValueError, IndexError):
+            pass
+    return fallback
+
+
+def _distance_m(lat, lon, lats, lons):
+    """Jarak haversine vectorized dari satu titik ke array titik"""
+    phi1, phi2 = np.radians(lat), np.radians(lats)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + \
+        np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class FleetScheduler:
+
+    def __init__(self, full_charge_range_m=20000.0, battery_reserve=0.2):
+        self.full_charge_range_m = full_charge_range_m
+        self.battery_reserve = battery_reserve
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self):
+        self.robots = {}     # robot_id -> dict(lat, lon, battery, available)
+        self.missions = {}   # mission_id -> dict(lat, lon, start, end, distance_m)
+        self.blocked = {}    # robot_id -> {key: (start, end)} maintenance / booking
+        self._robot_ids = []
+        self._mission_ids = []
+        self._robot_pos = {}
+        self._mission_pos = {}
+        self._cost = np.empty((0, 0))
+
+    # ------------------------------------------------------------------
+    # Sinkronisasi state
+    # ------------------------------------------------------------------
+    def load(self):
+        """Bangun state awal dari database (butuh app context)"""
+        with self._lock:
+            self._reset()
+            self.full_charge_range_m = current_app.config['ROBOT_FULL_CHARGE_RANGE_M']
+            self.battery_reserve = current_app.config['ROUTE_BATTERY_RESERVE']
+            now = datetime.utcnow()
+
+            for robot in Robot.query.all():
+                self._set_robot(robot.robot_id, robot.current_position, robot.battery_lvl, robot.status)
+
+            for maint in Maintenance.query.filter(
+                Maintenance.status.in_(BLOCKING_MAINTENANCE_STATUSES)
+            ).all():
+                self._set_maintenance(maint.maint_id, maint.robot_id, maint.schedule_dt, maint.status)
+
+            for booking in Booking.query.filter(
+                Booking.robot_id.isnot(None),
+                Booking.status.in_(BLOCKING_BOOKING_STATUSES),
+                (Booking.end_date.is_(None)) | (Booking.end_date >= now)
+            ).all():
+                self._set_booking(booking.booking_id, booking.robot_id, booking.start_date,
+                                  booking.end_date, booking.status)
+
+            for mission in Mission.query.filter(
+                Mission.status.in_(('planned',) + BLOCKING_MISSION_STATUSES)
+            ).all():
+                self._set_mission(mission.mission_id, mission.area_coords, mission.start_time,
+                                  mission.end_time, mission.planned_route, mission.robot_id, mission.status)
+            self._build_matrix()
+            self._loaded = True
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _build_matrix(self):
+        """Hitung seluruh cost matrix sekaligus (broadcast robot x mission)"""
+        self._robot_ids = list(self.robots)
+        self._robot_pos = {robot_id: i for i, robot_id in enumerate(self._robot_ids)}
+        self._mission_ids = list(self.missions)
+        self._mission_pos = {mission_id: i for i, mission_id in enumerate(self._mission_ids)}
+        if not self._robot_ids or not self._mission_ids:
+            self._cost = np.full((len(self._robot_ids), len(self._mission_ids)), np.inf)
+            return
+
+        r_lat, r_lon, battery, available = self._robot_arrays()
+        m_lat, m_lon, m_dist, m_start, m_end = self._mission_arrays(self._mission_ids)
+        self._cost = self._costs(r_lat[:, None], r_lon[:, None], battery[:, None], available[:, None],
+                                 m_lat[None, :], m_lon[None, :], m_dist[None, :])
+        for robot_id in self.blocked:
+            row = self._robot_pos.get(robot_id)
+            if row is not None:
+                self._cost[row, self._blocked_mask(robot_id, m_start, m_end)] = np.inf
+
+    def _robot_arrays(self):
+        states = [self.robots[robot_id] for robot_id in self._robot_ids]
+        lats = np.array([s['lat'] if s['lat'] is not None else np.nan for s in states])
+        lons = np.array([s['lon'] if s['lon'] is not None else np.nan for s in states])
+        battery = np.array([s['battery'] for s in states], dtype=np.float64)
+        available = np.array([s['available'] for s in states], dtype=bool)
+        return lats, lons, battery, available
+
+    def _set_robot(self, robot_id, position, battery, status):
+        latlon = position_latlon(position)
+        self.robots[robot_id] = {
+            'lat': latlon[0] if latlon else None,
+            'lon': latlon[1] if latlon else None,
+            'battery': battery or 0,
+            'available': status not in UNAVAILABLE_ROBOT_STATUSES
+        }
+        if not self._loaded:
+            return
+        if robot_id not in self._robot_pos:
+            self._robot_pos[robot_id] = len(self._robot_ids)
+            self._robot_ids.append(robot_id)
+            self._cost = np.vstack([self._cost, np.full((1, self._cost.shape[1]), np.inf)])
+        self._update_row(robot_id)
+
+    def _remove_robot(self, robot_id):
+        # Baris matrix tetap ada (index stabil), robot ditandai tidak tersedia
+        self.blocked.pop(robot_id, None)
+        if robot_id in self._robot_pos:
+            self.robots[robot_id] = {'lat': None, 'lon': None, 'battery': 0, 'available': False}
+            self._cost[self._robot_pos[robot_id], :] = np.inf
+
+    def _set_block(self, robot_id, key, window):
+        """Pasang/hapus block `key` di robot_id; robot lain yang sebelumnya memegang key ikut di-refresh"""
+        for owner, blocks in self.blocked.items():
+            if owner != robot_id and blocks.pop(key, None) is not None \
+                    and self._loaded and owner in self._robot_pos:
+                self._update_row(owner)
+        if not robot_id:
+            return
+        blocks = self.blocked.setdefault(robot_id, {})
+        if window is None:
+            blocks.pop(key, None)
+        else:
+            blocks[key] = window
+        if self._loaded and robot_id in self._robot_pos:
+            self._update_row(robot_id)
+
+    def _set_maintenance(self, maint_id, robot_id, schedule_dt, status):
+        window = None
+        if status in BLOCKING_MAINTENANCE_STATUSES:
+            start = _ts(schedule_dt) or datetime.utcnow().timestamp()
+            window = (start, start + MAINTENANCE_DEFAULT_HOURS * 3600)
+        self._set_block(robot_id, ('maintenance', maint_id), window)
+
+    def _set_booking(self, booking_id, robot_id, start_date, end_date, status):
+        window = None
+        if robot_id and status in BLOCKING_BOOKING_STATUSES:
+            start = _ts(start_date)
+            end = _ts(end_date) or math.inf
+            window = (start, end)
+        self._set_block(robot_id, ('booking', booking_id), window)
+
+    def _set_mission_block(self, mission_id, robot_id, start_time, end_time, status):
+        """Misi assigned memblok window-nya, misi active memblok robot sepenuhnya"""
+        window = None
+        if robot_id and status == ASSIGNED_MISSION_STATUS:
+            window = _mission_window(start_time, end_time)
+        elif robot_id and status in BLOCKING_MISSION_STATUSES:
+            window = (-math.inf, math.inf)
+        self._set_block(robot_id, ('mission', mission_id), window)
+
+    def _set_mission(self, mission_id, area_coords, start_time, end_time, planned_route, robot_id, status):
+        self._set_mission_block(mission_id, robot_id, start_time, end_time, status)
+        if status != 'planned':
+            self._remove_mission(mission_id)
+            return
+
+        fallback = None
+        robot = self.robots.get(robot_id)
+        if robot and robot['lat'] is not None:
+            fallback = (robot['lat'], robot['lon'])
+        point = _mission_point(area_coords, fallback)
+        start, end = _mission_window(start_time, end_time)
+        distance = DEFAULT_MISSION_DISTANCE_M
+        if isinstance(planned_route, dict) and planned_route.get('distance_m'):
+            distance = float(planned_route['distance_m'])
+
+        self.missions[mission_id] = {
+            'lat': point[0] if point else None,
+            'lon': point[1] if point else None,
+            'start': start,
+            'end': end,
+            'distance_m': distance
+        }
+        if not self._loaded:
+            return
+        if mission_id not in self._mission_pos:
+            self._mission_pos[mission_id] = len(self._mission_ids)
+            self._mission_ids.append(mission_id)
+            self._cost = np.hstack([self._cost, np.full((self._cost.shape[0], 1), np.inf)])
+        self._update_column(mission_id)
+
+    def _remove_mission(self, mission_id):
+        self.missions.pop(mission_id, None)
+        col = self._mission_pos.pop(mission_id, None)
+        if col is None:
+            return
+        # Swap-remove kolom terakhir ke posisi yang dihapus
+        last = len(self._mission_ids) - 1
+        if col != last:
+            moved = self._mission_ids[last]
+            self._mission_ids[col] = moved
+            self._mission_pos[moved] = col
+            self._cost[:, col] = self._cost[:, last]
+        self._mission_ids.pop()
+        self._cost = self._cost[:, :last]
+
+    # ------------------------------------------------------------------
+    # Cost matrix
+    # ------------------------------------------------------------------
+    def _costs(self, r_lat, r_lon, battery, available, m_lat, m_lon, m_distance):
+        """Cost & feasibility vectorized (broadcast robot x mission)"""
+        with np.errstate(invalid='ignore'):
+            travel = _distance_m(r_lat, r_lon, m_lat, m_lon)
+        travel = np.where(np.isnan(travel), 0.0, travel)  # posisi tidak diketahui: anggap di lokasi
+        required = (2 * travel + m_distance) / self.full_charge_range_m * 100 + self.battery_reserve * 100
+        cost = travel / 1000 + BATTERY_COST_WEIGHT * (100 - battery) / 100
+        feasible = available & (battery >= required)
+        return np.where(feasible, cost, np.inf)
+
+    def _blocked_mask(self, robot_id, starts, ends):
+        mask = np.zeros(len(starts), dtype=bool)
+        for block_start, block_end in self.blocked.get(robot_id, {}).values():
+            mask |= (starts < block_end) & (block_start < ends)
+        return mask
+
+    def _mission_arrays(self, mission_ids):
+        states = [self.missions[mission_id] for mission_id in mission_ids]
+        return (
+            np.array([s['lat'] if s['lat'] is not None else np.nan for s in states]),
+            np.array([s['lon'] if s['lon'] is not None else np.nan for s in states]),
+            np.array([s['distance_m'] for s in states]),
+            np.array([s['start'] for s in states]),
+            np.array([s['end'] for s in states])
+        )
+
+    def _update_row(self, robot_id):
+        row = self._robot_pos[robot_id]
+        if not self._mission_ids:
+            return
+        robot = self.robots[robot_id]
+        m_lat, m_lon, m_dist, m_start, m_end = self._mission_arrays(self._mission_ids)
+        r_lat = robot['lat'] if robot['lat'] is not None else np.nan
+        r_lon = robot['lon'] if robot['lon'] is not None else np.nan
+        costs = self._costs(r_lat, r_lon, robot['battery'], robot['available'], m_lat, m_lon, m_dist)
+        costs[self._blocked_mask(robot_id, m_start, m_end)] = np.inf
+        self._cost[row, :] = costs
+
+    def _update_column(self, mission_id):
+        col = self._mission_pos[mission_id]
+        if not self._robot_ids:
+            return
+        mission = self.missions[mission_id]
+        r_lat, r_lon, battery, available = self._robot_arrays()
+        m_lat = mission['lat'] if mission['lat'] is not None else np.nan
+        m_lon = mission['lon'] if mission['lon'] is not None else np.nan
+        costs = self._costs(r_lat, r_lon, battery, available, m_lat, m_lon, mission['distance_m'])
+        for robot_id, blocks in self.blocked.items():
+            row = self._robot_pos.get(robot_id)
+            if row is None:
+                continue
+            for block_start, block_end in blocks.values():
+                if mission['start'] < block_end and block_start < mission['end']:
+                    costs[row] = np.inf
+                    break
+        self._cost[:, col] = costs
+
+    # ------------------------------------------------------------------
+    # Assignment
+    # ------------------------------------------------------------------
+    def plan(self):
+        """
+        Assign misi ke robot. Return (assignments, unassigned) dengan
+        assignments = [{'mission_id', 'robot_id', 'cost'}].
+        """
+        with self._lock:
+            self.ensure_loaded()
+            n_robots, n_missions = self._cost.shape
+            if not n_robots or not n_missions:
+                return [], list(self._mission_ids)
+
+            cost = self._cost
+            k = min(CANDIDATES_PER_MISSION, n_robots)
+            if k < n_robots:
+                candidates = np.argpartition(cost, k - 1, axis=0)[:k, :]
+            else:
+                candidates = np.broadcast_to(np.arange(n_robots)[:, None], (n_robots, n_missions))
+            candidate_cost = np.take_along_axis(cost, candidates, axis=0)
+
+            cols = np.broadcast_to(np.arange(n_missions), candidates.shape).ravel()
+            rows = candidates.ravel()
+            values = candidate_cost.ravel()
+            finite = np.isfinite(values)
+            order = np.argsort(values[finite], kind='stable')
+            pairs = zip(rows[finite][order], cols[finite][order], values[finite][order])
+
+            _, _, _, starts, ends = self._mission_arrays(self._mission_ids)
+            schedule = {}  # row -> [(start, end)]
+            assigned = {}  # col -> (row, cost)
+
+            def _try_assign(row, col, value):
+                for s, e in schedule.get(row, ()):
+                    if starts[col] < e and s < ends[col]:
+                        return False
+                schedule.setdefault(row, []).append((starts[col], ends[col]))
+                assigned[col] = (row, value)
+                return True
+
+            for row, col, value in pairs:
+                if col not in assigned:
+                    _try_assign(int(row), int(col), float(value))
+
+            # Fallback: misi yang semua k kandidatnya bentrok, coba seluruh robot
+            if k < n_robots:
+                for col in range(n_missions):
+                    if col in assigned or not np.isfinite(cost[:, col]).any():
+                        continue
+                    for row in np.argsort(cost[:, col]):
+                        if not np.isfinite(cost[row, col]):
+                            break
+                        if _try_assign(int(row), col, float(cost[row, col])):
+                            break
+
+            assignments = [
+                {
+                    'mission_id': self._mission_ids[col],
+                    'robot_id': self._robot_ids[row],
+                    'cost': round(value, 3)
+                }
+                for col, (row, value) in sorted(assigned.items())
+            ]
+            unassigned = [self._mission_ids[col] for col in range(n_missions) if col not in assigned]
+            return assignments, unassigned
+
+    # ------------------------------------------------------------------
+    # Perubahan incremental (dipanggil setelah commit)
+    # ------------------------------------------------------------------
+    def apply_changes(self, changes):
+        with self._lock:
+            if not self._loaded:
+                return
+            for kind, key, values in changes:
+                if kind == 'robot':
+                    if values is None:
+                        self._remove_robot(key)
+                    else:
+                        self._set_robot(key, *values)
+                elif kind == 'mission':
+                    if values is None:
+                        self._set_mission_block(key, None, None, None, None)
+                        self._remove_mission(key)
+                    else:
+                        self._set_mission(key, *values)
+                elif kind == 'maintenance':
+                    self._set_maintenance(key, *values)
+                elif kind == 'booking':
+                    self._set_booking(key, *values)
+
+
+fleet_scheduler = FleetScheduler()
+
+
+def _snapshot(target, deleted=False):
+    if isinstance(target, Robot):
+        values = None if deleted else (target.current_position, target.battery_lvl, target.status)
+        return 'robot', target.robot_id, values
+    if isinstance(target, Mission):
+        values = None if deleted else (target.area_coords, target.start_time, target.end_time,
+                                       target.planned_route, target.robot_id, target.status)
+        return 'mission', target.mission_id, values
+    if isinstance(target, Maintenance):
+        status = None if deleted else target.status
+        return 'maintenance', target.maint_id, (target.robot_id, target.schedule_dt, status)
+    if isinstance(target, Booking):
+        status = None if deleted else target.status
+        return 'booking', target.booking_id, (target.robot_id, target.start_date, target.end_date, status)
+    return None
+
+
+def _queue_change(target, deleted=False):
+    session = inspect(target).session
+    change = _snapshot(target, deleted)
+    if session is not None and change is not None:
+        session.info.setdefault('fleet_scheduler_changes', []).append(change)
+
+
+for _model in (Robot, Mission, Maintenance, Booking):
+    event.listen(_model, 'after_insert', lambda mapper, connection, target: _queue_change(target))
+    event.listen(_model, 'after_update', lambda mapper, connection, target: _queue_change(target))
+    event.listen(_model, 'after_delete', lambda mapper, connection, target: _queue_change(target, True))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_scheduler_changes(session):
+    changes = session.info.pop('fleet_scheduler_changes', None)
+    if changes:
+        fleet_scheduler.apply_changes(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_scheduler_changes(session):
+    session.info.pop('fleet_scheduler_changes', None)
+
+
+def apply_assignments(assignments):
+    """
+    Simpan hasil assignment: Mission.robot_id + status `assigned` lewat ORM (mapper event
+    CDC/cube/scheduler ikut jalan, updated_at ter-update). Misi yang sudah tidak `planned`
+    saat commit dilewati. Return jumlah misi yang benar-benar di-assign.
+    """
+    if not assignments:
+        return 0
+    robot_for = {item['mission_id']: item['robot_id'] for item in assignments}
+    missions = Mission.query.filter(Mission.mission_id.in_(robot_for), Mission.status == 'planned')\
+        .with_for_update().all()
+    for mission in missions:
+        mission.robot_id = robot_for[mission.mission_id]
+        mission.status = ASSIGNED_MISSION_STATUS
+    db.session.commit()
+    return len(missions)
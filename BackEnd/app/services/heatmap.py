@@ -0,0 +1,270 @@
+"""
+Heatmap density waste berbasis tile z/x/y.
+
+Setiap insert `Waste` langsung meng-upsert agregat (count, total_weight) ke
+`waste_density_cell` pada zoom BASE_ZOOM di transaksi yang sama. Tile di-render
+dari agregat tersebut (bukan dari raw rows) dan hasil serialisasinya di-cache;
+setelah commit, hanya tile yang menutupi cell yang tersentuh yang di-invalidate.
+"""
+import json
+import threading
+from collections import OrderedDict
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models.waste import Waste, WasteDensityCell
+from app.utils.geo import latlon_to_tile, position_latlon, tile_to_latlon
+from app.utils.sql import upsert
+
+BASE_ZOOM = WasteDensityCell.BASE_ZOOM
+TILE_BINS_LOG2 = 5  # 32 x 32 bin per tile
+MAX_CACHED_TILES = 4096
+UPSERT_BATCH = 500  # batas jumlah bound parameter per statement
+
+_cell_table = WasteDensityCell.__table__
+
+
+class TileCache:
+    """Cache LRU tile yang sudah di-render, dengan index per (z, x, y) untuk invalidasi"""
+
+    def __init__(self, max_entries=MAX_CACHED_TILES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> bytes
+        self._by_tile = {}             # (z, x, y) -> set(key)
+        self._zooms = {}               # z -> jumlah entry
+        self._generation = 0           # naik setiap invalidasi
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key, payload, generation=None):
+        with self._lock:
+            # Jangan cache hasil render yang dimulai sebelum invalidasi terakhir
+            if generation is not None and generation != self._generation:
+                return
+            if key not in self._entries:
+                self._by_tile.setdefault(key[:3], set()).add(key)
+                self._zooms[key[0]] = self._zooms.get(key[0], 0) + 1
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+
+    def _forget(self, key):
+        keys = self._by_tile.get(key[:3])
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self._by_tile[key[:3]]
+        self._zooms[key[0]] -= 1
+        if not self._zooms[key[0]]:
+            del self._zooms[key[0]]
+
+    def invalidate_cells(self, cells):
+        """Hapus semua tile cache yang menutupi salah satu cell BASE_ZOOM"""
+        with self._lock:
+            self._generation += 1
+            for zoom in list(self._zooms):
+                shift = BASE_ZOOM - zoom
+                for cell_x, cell_y in {(x >> shift, y >> shift) for x, y in cells}:
+                    for key in self._by_tile.pop((zoom, cell_x, cell_y), ()):
+                        del self._entries[key]
+                        self._zooms[zoom] -= 1
+                if not self._zooms[zoom]:
+                    del self._zooms[zoom]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_tile.clear()
+            self._zooms.clear()
+
+
+tile_cache = TileCache()
+
+
+def _cell_row(waste_type, location, weight, detected_at):
+    latlon = position_latlon(location)
+    if not latlon or detected_at is None:
+        return None
+    cell_x, cell_y = latlon_to_tile(latlon[0], latlon[1], BASE_ZOOM)
+    return {
+        'cell_x': cell_x,
+        'cell_y': cell_y,
+        'waste_type': waste_type,
+        'day': detected_at.date(),
+        'count': 1,
+        'total_weight': weight or 0
+    }
+
+
+def _increment_stmt(dialect_name, rows):
+    return upsert(
+        dialect_name, _cell_table, rows,
+        index_elements=['cell_x', 'cell_y', 'waste_type', 'day'],
+        set_=lambda excluded: {
+            'count': _cell_table.c.count + excluded.count,
+            'total_weight': _cell_table.c.total_weight + excluded.total_weight,
+            'updated_at': func.now()
+        }
+    )
+
+
+@event.listens_for(Waste, 'after_insert')
+def _aggregate_inserted_waste(mapper, connection, target):
+    row = _cell_row(target.waste_type, target.location, target.weight, target.detected_at)
+    if row is None:
+        return
+    connection.execute(_increment_stmt(connection.dialect.name, [row]))
+
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('heatmap_touched_cells', set()).add((row['cell_x'], row['cell_y']))
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_touched_tiles(session):
+    touched = session.info.pop('heatmap_touched_cells', None)
+    if touched:
+        tile_cache.invalidate_cells(touched)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_touched_tiles(session):
+    session.info.pop('heatmap_touched_cells', None)
+
+
+def _window_filters(query, waste_type=None, start=None, end=None):
+    if waste_type:
+        query = query.where(_cell_table.c.waste_type == waste_type)
+    if start:
+        query = query.where(_cell_table.c.day >= start)
+    if end:
+        query = query.where(_cell_table.c.day <= end)
+    return query
+
+
+def render_tile(z, x, y, waste_type=None, start=None, end=None):
+    """Render tile z/x/y menjadi JSON bytes (dari cache kalau ada)"""
+    key = (z, x, y, waste_type, start, end)
+    payload = tile_cache.get(key)
+    if payload is not None:
+        return payload
+    generation = tile_cache.generation
+
+    shift = BASE_ZOOM - z
+    bins_log2 = min(TILE_BINS_LOG2, shift)
+    bin_shift = shift - bins_log2
+    bins = 1 << bins_log2
+
+    min_x, min_y = x << shift, y << shift
+    max_x, max_y = ((x + 1) << shift) - 1, ((y + 1) << shift) - 1
+
+    bin_x = ((_cell_table.c.cell_x - min_x) // (1 << bin_shift)).label('bin_x')
+    bin_y = ((_cell_table.c.cell_y - min_y) // (1 << bin_shift)).label('bin_y')
+    query = select(
+        bin_x, bin_y,
+        func.sum(_cell_table.c.count),
+        func.sum(_cell_table.c.total_weight)
+    ).where(
+        _cell_table.c.cell_x.between(min_x, max_x),
+        _cell_table.c.cell_y.between(min_y, max_y)
+    ).group_by(bin_x, bin_y)
+    query = _window_filters(query, waste_type, start, end)
+
+    cells = [
+        [int(bx), int(by), int(count), round(float(weight or 0), 2)]
+        for bx, by, count, weight in db.session.execute(query)
+    ]
+    north, west = tile_to_latlon(x, y, z)
+    south, east = tile_to_latlon(x + 1, y + 1, z)
+
+    payload = json.dumps({
+        'z': z,
+        'x': x,
+        'y': y,
+        'bins': bins,
+        'bounds': {'north': north, 'west': west, 'south': south, 'east': east},
+        'waste_type': waste_type,
+        'start': start.isoformat() if start else None,
+        'end': end.isoformat() if end else None,
+        'max_count': max((cell[2] for cell in cells), default=0),
+        'cells': cells  # [bin_x, bin_y, count, total_weight]
+    }, separators=(',', ':')).encode('utf-8')
+
+    tile_cache.put(key, payload, generation)
+    return payload
+
+
+def density_cells(min_lat, min_lon, max_lat, max_lon, waste_type=None, start=None, end=None):
+    """
+    Agregat density pada resolusi BASE_ZOOM di dalam bounding box.
+    Return list (latitude, longitude, count, total_weight) per pusat cell.
+    """
+    min_x, min_y = latlon_to_tile(max_lat, min_lon, BASE_ZOOM)
+    max_x, max_y = latlon_to_tile(min_lat, max_lon, BASE_ZOOM)
+
+    query = select(
+        _cell_table.c.cell_x, _cell_table.c.cell_y,
+        func.sum(_cell_table.c.count),
+        func.sum(_cell_table.c.total_weight)
+    ).where(
+        _cell_table.c.cell_x.between(min_x, max_x),
+        _cell_table.c.cell_y.between(min_y, max_y)
+    ).group_by(_cell_table.c.cell_x, _cell_table.c.cell_y)
+    query = _window_filters(query, waste_type, start, end)
+
+    result = []
+    for cell_x, cell_y, count, weight in db.session.execute(query):
+        latitude, longitude = tile_to_latlon(cell_x + 0.5, cell_y + 0.5, BASE_ZOOM)
+        result.append((latitude, longitude, int(count), float(weight or 0)))
+    return result
+
+
+def rebuild_density(batch_size=5000):
+    """
+    Hitung ulang seluruh agregat dari tabel waste.
+    Dipakai setelah bulk insert yang melewati ORM (mapper event tidak jalan).
+    """
+    connection = db.session.connection()
+    dialect_name = connection.dialect.name
+    connection.execute(_cell_table.delete())
+
+    waste_table = Waste.__table__
+    rows = db.session.execute(
+        select(waste_table.c.waste_type, waste_table.c.location,
+               waste_table.c.weight, waste_table.c.detected_at)
+        .execution_options(yield_per=batch_size)
+    )
+
+    totals = {}
+    for waste_type, location, weight, detected_at in rows:
+        row = _cell_row(waste_type, location, weight, detected_at)
+        if row is None:
+            continue
+        key = (row['cell_x'], row['cell_y'], row['waste_type'], row['day'])
+        entry = totals.get(key)
+        if entry:
+            entry['count'] += 1
+            entry['total_weight'] += row['total_weight']
+        else:
+            totals[key] = row
+
+    pending = list(totals.values())
+    for i in range(0, len(pending), UPSERT_BATCH):
+        connection.execute(_increment_stmt(dialect_name, pending[i:i + UPSERT_BATCH]))
+
+    db.session.commit()
+    tile_cache.clear()
+    return len(pending)
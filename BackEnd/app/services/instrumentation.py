@@ -0,0 +1,233 @@
+"""
+Instrumentasi per request: wall time, jumlah & durasi query DB (engine event),
+waktu serialisasi JSON dan ukuran response, diekspos sebagai histogram
+Prometheus di `/metrics`.
+
+Profil on-demand: admin mengirim header `X-Profile: 1` (cProfile) atau
+`X-Profile: pyinstrument` (kalau terpasang); hasil disimpan dan id-nya
+dikembalikan di header `X-Profile-Id`.
+"""
+import cProfile
+import io
+import itertools
+import pstats
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import g, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import COUNT_BUCKETS, SIZE_BUCKETS, Registry
+
+try:
+    from pyinstrument import Profiler as PyInstrumentProfiler
+except ImportError:  # pragma: no cover - optional
+    PyInstrumentProfiler = None
+
+MAX_PROFILES = 50
+PROFILE_TOP_FUNCTIONS = 40
+
+registry = Registry()
+REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds', 'Request wall time', ('endpoint', 'method'))
+REQUESTS_TOTAL = registry.counter(
+    'http_requests_total', 'Requests by status code', ('endpoint', 'method', 'status'))
+DB_QUERIES = registry.histogram(
+    'db_queries_per_request', 'SQL statements per request', ('endpoint',), COUNT_BUCKETS)
+DB_DURATION = registry.histogram(
+    'db_query_duration_seconds_per_request', 'Total SQL time per request', ('endpoint',))
+SERIALIZATION_DURATION = registry.histogram(
+    'serialization_duration_seconds', 'JSON serialization time per request', ('endpoint',))
+RESPONSE_SIZE = registry.histogram(
+    'http_response_size_bytes', 'Response body size', ('endpoint',), SIZE_BUCKETS)
+
+# State request yang sedang berjalan di thread ini (None di luar request)
+_local = threading.local()
+
+
+class RequestState:
+    __slots__ = ('endpoint', 'method', 'started', 'queries', 'db_time', 'serialization_time')
+
+    def __init__(self, endpoint, method):
+        self.endpoint = endpoint
+        self.method = method
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+
+
+def current_request_state():
+    return getattr(_local, 'state', None)
+
+
+# ----------------------------------------------------------------------
+# SQL: semua engine (termasuk bind tambahan) lewat event di class Engine
+# ----------------------------------------------------------------------
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, 'state', None) is not None:
+        conn.info.setdefault('instrumentation_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    state = getattr(_local, 'state', None)
+    stack = conn.info.get('instrumentation_started')
+    if state is None or not stack:
+        return
+    state.queries += 1
+    state.db_time += time.perf_counter() - stack.pop()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider default + catat waktu serialisasi ke request state"""
+
+    def response(self, *args, **kwargs):
+        state = getattr(_local, 'state', None)
+        if state is None:
+            return super().response(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            state.serialization_time += time.perf_counter() - started
+
+
+class ProfileStore:
+    """LRU hasil profil on-demand"""
+
+    def __init__(self, max_entries=MAX_PROFILES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, **entry):
+        with self._lock:
+            profile_id = next(self._ids)
+            entry['profile_id'] = profile_id
+            entry['created_at'] = datetime.utcnow().isoformat()
+            self._entries[profile_id] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._entries.get(profile_id)
+
+    def list(self):
+        with self._lock:
+            return [{k: v for k, v in entry.items() if k != 'output'} for entry in reversed(self._entries.values())]
+
+
+profile_store = ProfileStore()
+
+
+def _is_admin():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    from app.models.user import User
+
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        return False
+    user = User.query.get(int(user_id)) if user_id else None
+    return bool(user and user.role and user.role.role_name == 'admin')
+
+
+def _start_profile(mode):
+    if mode == 'pyinstrument' and PyInstrumentProfiler is not None:
+        profiler = PyInstrumentProfiler()
+        profiler.start()
+        return 'pyinstrument', profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return 'cprofile', profiler
+
+
+def _finish_profile(kind, profiler):
+    if kind == 'pyinstrument':
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+class Instrumentation:
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.profile_header = 'X-Profile'
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.profile_header = app.config.get('PROFILE_HEADER', 'X-Profile')
+        self._profile_environ_key = 'HTTP_' + self.profile_header.upper().replace('-', '_')
+        self._series = {}  # (endpoint, method) -> series histogram yang sudah di-resolve
+        if not self.enabled:
+            return
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        rule = request.url_rule.rule if request.url_rule else 'unmatched'
+        _local.state = RequestState(rule, request.method)
+
+        mode = request.environ.get(self._profile_environ_key)
+        if mode and _is_admin():
+            g.instrumentation_profile = _start_profile(mode)
+
+    def _after_request(self, response):
+        state = getattr(_local, 'state', None)
+        if state is None:
+            return response
+
+        profile = g.pop('instrumentation_profile', None)
+        if profile is not None:
+            output = _finish_profile(*profile)
+            response.headers['X-Profile-Id'] = str(profile_store.add(
+                kind=profile[0], endpoint=state.endpoint, method=state.method, path=request.full_path,
+                duration_ms=round((time.perf_counter() - state.started) * 1000, 3), queries=state.queries,
+                output=output
+            ))
+
+        key = (state.endpoint, state.method)
+        series = self._series.get(key)
+        if series is None:
+            endpoint = (state.endpoint,)
+            series = self._series[key] = (
+                REQUEST_DURATION.series(key), DB_QUERIES.series(endpoint), DB_DURATION.series(endpoint),
+                SERIALIZATION_DURATION.series(endpoint), RESPONSE_SIZE.series(endpoint)
+            )
+        duration = time.perf_counter() - state.started
+        size = response.calculate_content_length()
+
+        # Satu acquire untuk semua metric request ini
+        with registry.lock:
+            REQUEST_DURATION.observe_series(series[0], duration)
+            DB_QUERIES.observe_series(series[1], state.queries)
+            DB_DURATION.observe_series(series[2], state.db_time)
+            SERIALIZATION_DURATION.observe_series(series[3], state.serialization_time)
+            if size is not None:
+                RESPONSE_SIZE.observe_series(series[4], size)
+        REQUESTS_TOTAL.inc((state.endpoint, state.method, str(response.status_code)))
+        return response
+
+    def _teardown_request(self, exc=None):
+        _local.state = None
+
+
+instrumentation = Instrumentation()
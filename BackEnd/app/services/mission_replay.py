@@ -0,0 +1,362 @@
+"""
+Replay timeline misi dari telemetry yang tersimpan.
+
+Tiga stream per misi -- `sensor_data`, `ml_decision`, `operation_log` -- dibaca
+terurut (timestamp, id) per halaman `REPLAY_FETCH_ROWS` baris (keyset di index
+(mission_id, timestamp)) lalu digabung dengan k-way merge (`heapq.merge`) menjadi
+satu timeline. Timestamp sama diurutkan sensor, decision, operation. Setiap event
+membawa `offset` (posisi di timeline) dan `ms` (milidetik sejak event pertama).
+
+Seek: saat misi pertama kali diakses, satu scan kolom (timestamp, id) ketiga stream
+membangun index sparse: setiap `REPLAY_INDEX_STRIDE` event dicatat waktu event dan
+cursor tiap stream (baris terakhir sebelum offset itu). Seek ke waktu/offset = bisect
+index, lanjutkan ketiga stream dari cursor checkpoint, buang paling banyak satu stride
+event -- biaya seek tidak bergantung panjang misi. Index di-cache LRU per worker; misi
+yang belum selesai dibangun ulang setelah `REPLAY_INDEX_TTL` detik (event setelah
+checkpoint terakhir tetap ikut ter-stream).
+
+Playback: event dikelompokkan per frame `FRAME_S` dan ditahan sampai waktunya menurut
+`speed` (0 = secepatnya); jeda di misi yang lebih panjang dari `max_gap` detik dipadatkan.
+"""
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+from operator import itemgetter
+
+import numpy as np
+from sqlalchemy import and_, or_, select
+
+from app.models.mission import MLDecision, Mission, OperationLog, SensorData
+
+FINISHED_STATUSES = ('completed', 'cancelled')
+FRAME_S = 0.05
+FIRST_PAGE_ROWS = 64
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+Source = namedtuple('Source', 'name table pk columns')
+MissionIndex = namedtuple('MissionIndex', 'mission_id origin end total counts offsets times cursors '
+                                          'stride finished built_at build_ms')
+
+_sensor, _decision, _operation = SensorData.__table__, MLDecision.__table__, OperationLog.__table__
+# Urutan = rank saat timestamp sama
+SOURCES = (
+    Source('sensor', _sensor, _sensor.c.id, [
+        _sensor.c.id, _sensor.c.robot_id, _sensor.c.timestamp, _sensor.c.latitude, _sensor.c.longitude,
+        _sensor.c.depth, _sensor.c.temperature, _sensor.c.ph, _sensor.c.water_quality, _sensor.c.battery_level,
+        _sensor.c.speed, _sensor.c.waste_detected]),
+    Source('decision', _decision, _decision.c.id, [
+        _decision.c.id, _decision.c.robot_id, _decision.c.timestamp, _decision.c.sensor_data_id,
+        _decision.c.ai_model_id, _decision.c.velocity, _decision.c.turn_direction,
+        _decision.c.waste_collector_status, _decision.c.navigation_mode, _decision.c.target_position,
+        _decision.c.confidence_score, _decision.c.reward_value]),
+    Source('operation', _operation, _operation.c.log_id, [
+        _operation.c.log_id, _operation.c.robot_id, _operation.c.timestamp, _operation.c.action_type,
+        _operation.c.parameters, _operation.c.results]),
+)
+_RAW_COLUMNS = (_sensor.c.camera_data, _sensor.c.lidar_data)
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def check_playback(speed, max_gap=None):
+    """Validasi parameter frames() sebelum stream dimulai (frames() generator, error-nya baru muncul di tengah)"""
+    if not math.isfinite(speed) or speed < 0:
+        raise ReplayError('speed must be a finite, non-negative number')
+    if max_gap is not None and (not math.isfinite(max_gap) or max_gap < 0):
+        raise ReplayError('max_gap must be a finite, non-negative number')
+
+
+def _micros(values):
+    return np.array(values, dtype='datetime64[us]').astype(np.int64)
+
+
+def _data(row):
+    data = {}
+    for key, value in row._mapping.items():
+        if key == 'timestamp':
+            continue
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[key] = value
+    return data
+
+
+class MissionReplay:
+
+    def __init__(self):
+        self.stride = 500
+        self.fetch_rows = 1000
+        self.cache_size = 64
+        self.ttl = 30.0
+        self.max_gap = 5.0
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+        self._building = {}  # mission_id -> Lock, supaya satu misi tidak di-index dua kali bersamaan
+        self.stats = {'index_builds': 0, 'index_hits': 0, 'replays': 0, 'seeks': 0, 'events': 0,
+                      'last_build_ms': None, 'last_first_event_ms': None}
+
+    def init_app(self, app):
+        self.stride = app.config.get('REPLAY_INDEX_STRIDE', 500)
+        self.fetch_rows = app.config.get('REPLAY_FETCH_ROWS', 1000)
+        self.cache_size = app.config.get('REPLAY_INDEX_CACHE', 64)
+        self.ttl = app.config.get('REPLAY_INDEX_TTL', 30.0)
+        self.max_gap = app.config.get('REPLAY_MAX_GAP', 5.0)
+
+    # ------------------------------------------------------------------
+    # Index sparse waktu -> offset
+    # ------------------------------------------------------------------
+    def index(self, mission_id, engine=None):
+        """Index misi dari cache (dibangun saat pertama diakses / kedaluwarsa)"""
+        with self._lock:
+            index = self._indexes.get(mission_id)
+            if index is not None and self._fresh(index):
+                self._indexes.move_to_end(mission_id)
+                self.stats['index_hits'] += 1
+                return index
+            building = self._building.setdefault(mission_id, threading.Lock())
+        with building:
+            with self._lock:
+                index = self._indexes.get(mission_id)
+                if index is not None and self._fresh(index):
+                    return index
+            index = self._build(mission_id, engine)
+            with self._lock:
+                self._indexes[mission_id] = index
+                self._indexes.move_to_end(mission_id)
+                while len(self._indexes) > self.cache_size:
+                    self._indexes.popitem(last=False)
+                self._building.pop(mission_id, None)
+        return index
+
+    def invalidate(self, mission_id=None):
+        with self._lock:
+            if mission_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(mission_id, None)
+
+    def _fresh(self, index):
+        return index.finished or time.monotonic() - index.built_at < self.ttl
+
+    def _build(self, mission_id, engine):
+        """Satu scan (timestamp, id) per stream; urutan merge = lexsort (timestamp, rank, id)"""
+        from app import db
+
+        started = time.perf_counter()
+        engine = engine or db.engine
+        with engine.connect() as conn:
+            status = conn.execute(select(Mission.__table__.c.status)
+                                  .where(Mission.__table__.c.mission_id == mission_id)).scalar()
+            if status is None:
+                raise ReplayError(f'Mission {mission_id} not found')
+            streams = []
+            for source in SOURCES:
+                table = source.table
+                rows = conn.execute(
+                    select(table.c.timestamp, source.pk)
+                    .where(table.c.mission_id == mission_id, table.c.timestamp.is_not(None))
+                    .order_by(table.c.timestamp, source.pk)
+                ).all()
+                streams.append(rows)
+
+        counts = [len(rows) for rows in streams]
+        total = sum(counts)
+        micros = np.concatenate([_micros([row[0] for row in rows]) for rows in streams]) if total \
+            else np.zeros(0, dtype=np.int64)
+        ranks = np.repeat(np.arange(len(SOURCES)), counts)
+        ids = np.concatenate([np.array([row[1] for row in rows], dtype=np.int64) for rows in streams]) if total \
+            else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((ids, ranks, micros))
+
+        offsets = np.arange(0, total, self.stride)
+        # Jumlah baris tiap stream sebelum setiap checkpoint -> cursor = baris terakhir sebelum offset itu
+        before = [np.concatenate(([0], np.cumsum(ranks[order] == rank)))[offsets] for rank in range(len(SOURCES))]
+        cursors = []
+        for k in range(len(offsets)):
+            cursor = []
+            for rank, rows in enumerate(streams):
+                count = int(before[rank][k])
+                cursor.append(tuple(rows[count - 1]) if count else None)
+            cursors.append(tuple(cursor))
+        times = micros[order][offsets]
+
+        self.stats['index_builds'] += 1
+        build_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.stats['last_build_ms'] = build_ms
+        return MissionIndex(
+            mission_id=mission_id,
+            origin=int(micros[order[0]]) if total else None,
+            end=int(micros[order[-1]]) if total else None,
+            total=total,
+            counts=dict(zip((source.name for source in SOURCES), counts)),
+            offsets=offsets,
+            times=times,
+            cursors=cursors,
+            stride=self.stride,
+            finished=status in FINISHED_STATUSES,
+            built_at=time.monotonic(),
+            build_ms=build_ms
+        )
+
+    def summary(self, mission_id, engine=None):
+        index = self.index(mission_id, engine)
+        return {
+            'mission_id': mission_id,
+            'events': index.total,
+            'sources': index.counts,
+            'start': (EPOCH + timedelta(microseconds=index.origin)).isoformat() if index.total else None,
+            'end': (EPOCH + timedelta(microseconds=index.end)).isoformat() if index.total else None,
+            'duration_s': round((index.end - index.origin) / 1e6, 3) if index.total else 0,
+            'checkpoints': len(index.offsets),
+            'stride': index.stride,
+            'finished': index.finished,
+            'build_ms': index.build_ms
+        }
+
+    # ------------------------------------------------------------------
+    # Timeline
+    # ------------------------------------------------------------------
+    def events(self, mission_id, at=None, offset=None, limit=None, raw=False, engine=None):
+        """
+        Timeline misi mulai `at` (detik sejak event pertama) atau `offset`; validasi + index
+        langsung, event di-generate lazily. Event: {offset, ms, timestamp, source, data}
+        """
+        from app import db
+
+        if at is not None and offset is not None:
+            raise ReplayError('Use either at or offset, not both')
+        if at is not None and not math.isfinite(at):
+            raise ReplayError('at must be a finite number')
+        if (at is not None and at < 0) or (offset is not None and offset < 0):
+            raise ReplayError('at/offset must not be negative')
+        engine = engine or db.engine
+        index = self.index(mission_id, engine)
+        self.stats['replays'] += 1
+        return self._iterate(index, engine, at, offset, limit, raw)
+
+    def _iterate(self, index, engine, at, offset, limit, raw):
+        if not index.total:
+            return
+        started = time.perf_counter()
+        # Checkpoint terakhir yang pasti sebelum titik seek
+        target = index.origin + int(at * 1e6) if at is not None else None
+        if target is not None:
+            checkpoint = max(0, bisect_left(index.times, target) - 1)
+        elif offset is not None:
+            checkpoint = min(offset // index.stride, len(index.offsets) - 1)
+        else:
+            checkpoint = 0
+        position = int(index.offsets[checkpoint])
+        if at or offset:
+            self.stats['seeks'] += 1
+
+        streams = [self._stream(engine, source, index.mission_id, after, raw)
+                   for source, after in zip(SOURCES, index.cursors[checkpoint])]
+        emitted = 0
+        for timestamp, rank, _, row in heapq.merge(*streams, key=itemgetter(0, 1, 2)):
+            micros = (timestamp - EPOCH) // _MICROSECOND
+            if not emitted:
+                if (offset is not None and position < offset) or (target is not None and micros < target):
+                    position += 1
+                    continue
+                self.stats['last_first_event_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            yield {
+                'offset': position,
+                'ms': round((micros - index.origin) / 1000, 3),
+                'timestamp': timestamp.isoformat(),
+                'source': SOURCES[rank].name,
+                'data': _data(row)
+            }
+            position += 1
+            emitted += 1
+            self.stats['events'] += 1
+            if limit is not None and emitted >= limit:
+                return
+
+    def _stream(self, engine, source, mission_id, after, raw):
+        """
+        Satu stream terurut (timestamp, id), dibaca per halaman keyset; koneksi hanya dipegang per halaman.
+        Halaman mulai kecil lalu dobel sampai `fetch_rows`, supaya event pertama setelah seek cepat keluar.
+        """
+        table, pk = source.table, source.pk
+        rank = SOURCES.index(source)
+        columns = source.columns + list(_RAW_COLUMNS) if raw and source.name == 'sensor' else source.columns
+        page = min(FIRST_PAGE_ROWS, self.fetch_rows)
+        while True:
+            query = select(*columns).where(table.c.mission_id == mission_id, table.c.timestamp.is_not(None))
+            if after is not None:
+                # `>=` terpisah supaya planner memakai range di index (mission_id, timestamp); OR saja tidak
+                query = query.where(table.c.timestamp >= after[0], or_(table.c.timestamp > after[0],
+                                        and_(table.c.timestamp == after[0], pk > after[1])))
+            query = query.order_by(table.c.timestamp, pk).limit(page)
+            with engine.connect() as conn:
+                rows = conn.execute(query).all()
+            for row in rows:
+                yield row.timestamp, rank, row._mapping[pk.name], row
+            if len(rows) < page:
+                return
+            after = (rows[-1].timestamp, rows[-1]._mapping[pk.name])
+            page = min(page * 2, self.fetch_rows)
+
+    # ------------------------------------------------------------------
+    # Playback
+    # ------------------------------------------------------------------
+    def frames(self, events, speed=1.0, max_gap=None, sleep=time.sleep, max_frame=500):
+        """
+        Kelompokkan event per frame dan tahan sampai waktunya (waktu misi / speed).
+        speed 0 = tanpa jeda (frame berisi paling banyak `max_frame` event).
+        """
+        max_gap = self.max_gap if max_gap is None else max_gap
+        frame = []
+        clock = None  # waktu wall (monotonic) untuk posisi virtual 0
+        frame_due = None
+        previous_ms = None
+        virtual_ms = 0.0  # posisi misi setelah jeda panjang dipadatkan
+        for item in events:
+            if previous_ms is not None:
+                gap = item['ms'] - previous_ms
+                virtual_ms += min(gap, max_gap * 1000) if max_gap else gap
+            previous_ms = item['ms']
+            if speed:
+                if clock is None:
+                    clock = time.monotonic() - virtual_ms / 1000 / speed
+                due = clock + virtual_ms / 1000 / speed
+                if frame and due - frame_due >= FRAME_S or len(frame) >= max_frame:
+                    wait = frame_due - time.monotonic()
+                    if wait > 0:
+                        sleep(wait)
+                    yield frame
+                    frame = []
+                if not frame:
+                    frame_due = due
+            elif len(frame) >= max_frame:
+                yield frame
+                frame = []
+            frame.append(item)
+        if frame:
+            if speed:
+                wait = frame_due - time.monotonic()
+                if wait > 0:
+                    sleep(wait)
+            yield frame
+
+    def status(self):
+        with self._lock:
+            cached = [{'mission_id': index.mission_id, 'events': index.total, 'checkpoints': len(index.offsets),
+                       'finished': index.finished, 'age_s': round(time.monotonic() - index.built_at, 1)}
+                      for index in self._indexes.values()]
+        return {'stride': self.stride, 'fetch_rows': self.fetch_rows, 'cache_size': self.cache_size,
+                'cached': cached, 'stats': dict(self.stats)}
+
+
+mission_replay = MissionReplay()
@@ -0,0 +1,286 @@
+"""
+Write-behind untuk OperationLog (audit trail aksi robot).
+
+- `record()` hanya menaruh baris ke buffer di memori; request kontrol tidak
+  menunggu commit log.
+- Thread flusher menulis buffer secara bulk (satu INSERT executemany per batch)
+  saat jumlah baris mencapai `OPERATION_LOG_FLUSH_ROWS` atau setiap
+  `OPERATION_LOG_FLUSH_INTERVAL_MS`. Di SQLite insert lewat write queue (single writer).
+- Database tidak tersedia: batch ditulis ke file append-only (JSON lines,
+  `OPERATION_LOG_SPILL_PATH`) dan di-replay ke database pada flush berikutnya
+  yang berhasil. Buffer penuh juga langsung ke file, jadi tidak ada baris yang dibuang.
+  Timeout write queue bukan kegagalan pasti (item masih bisa commit), jadi flusher
+  menunggu hasil akhirnya dan hanya me-spill batch yang benar-benar gagal; kalau tidak,
+  replay spill akan menduplikasi baris.
+- Saat proses berhenti (atexit) buffer di-drain.
+
+File spill dipakai bersama oleh semua worker (lock `flock`); worker mana pun yang
+flush berikutnya akan me-replay-nya. Baris yang ditolak database (mis. FK robot
+yang sudah dihapus) dibuang dengan log error.
+"""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from app.services.write_queue import write_queue
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ('mission_id', 'robot_id', 'timestamp', 'action_type', 'parameters', 'results', 'created_at')
+
+
+class OperationLogSink:
+
+    def __init__(self):
+        self.enabled = True
+        self.flush_rows = 500
+        self.flush_interval = 1.0
+        self.max_pending = 100000
+        self.spill_path = None
+        self._app = None
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self.stats = {'recorded': 0, 'flushed': 0, 'batches': 0, 'spilled': 0, 'replayed': 0, 'rejected': 0}
+
+    def init_app(self, app):
+        self._app = app
+        self.enabled = app.config.get('OPERATION_LOG_BUFFER_ENABLED', True)
+        self.flush_rows = app.config.get('OPERATION_LOG_FLUSH_ROWS', 500)
+        self.flush_interval = app.config.get('OPERATION_LOG_FLUSH_INTERVAL_MS', 1000) / 1000.0
+        self.max_pending = app.config.get('OPERATION_LOG_MAX_PENDING', 100000)
+        self.spill_path = app.config.get('OPERATION_LOG_SPILL_PATH') or \
+            os.path.join(app.instance_path, 'operation_log.spill.jsonl')
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def record(self, action_type, robot_id=None, mission_id=None, parameters=None, results=None):
+        now = datetime.utcnow()
+        row = {
+            'mission_id': mission_id,
+            'robot_id': robot_id,
+            'timestamp': now,
+            'action_type': action_type,
+            'parameters': parameters,
+            'results': results,
+            'created_at': now
+        }
+        self.stats['recorded'] += 1
+
+        if not self.enabled:
+            self._flush_batch([row])
+            return
+
+        with self._cond:
+            if len(self._buffer) >= self.max_pending:
+                overflow = True
+            else:
+                overflow = False
+                self._buffer.append(row)
+                if len(self._buffer) >= self.flush_rows:
+                    self._cond.notify()
+        if overflow:
+            self._spill([row])
+        self._ensure_flusher()
+
+    def pending(self):
+        return len(self._buffer)
+
+    def spilled_pending(self):
+        return self.spill_path is not None and os.path.exists(self.spill_path)
+
+    def flush(self):
+        """Tulis semua isi buffer sekarang (dipakai flusher, shutdown dan test)"""
+        while True:
+            with self._cond:
+                batch = [self._buffer.popleft() for _ in range(min(self.flush_rows, len(self._buffer)))]
+            if not batch:
+                break
+            self._flush_batch(batch)
+
+    def shutdown(self, timeout=10.0):
+        """Drain buffer lalu hentikan thread flusher"""
+        thread = self._thread
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        if self._buffer:
+            with self._app.app_context():
+                self.flush()
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'pending': self.pending(),
+            'spill_file': self.spill_path if self.spilled_pending() else None,
+            'stats': dict(self.stats)
+        }
+
+    # ------------------------------------------------------------------
+    # Flusher thread
+    # ------------------------------------------------------------------
+    def _ensure_flusher(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._flush_loop, name='operation-log', daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _flush_loop(self):
+        with self._app.app_context():
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.flush_interval
+                    while not self._stopping and len(self._buffer) < self.flush_rows:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    stopping = self._stopping
+
+                try:
+                    if self.spilled_pending():
+                        self._replay_spill()
+                    self.flush()
+                except Exception:
+                    logger.exception('operation log flusher error')
+                if stopping:
+                    break
+
+    def _flush_batch(self, rows):
+        try:
+            self._insert(rows)
+        except IntegrityError:
+            self._insert_each(rows)
+        except DBAPIError as e:
+            logger.warning('operation log flush failed, spilling to file',
+                           extra={'rows': len(rows), 'error': str(e)})
+            self._spill(rows)
+            return
+        self.stats['batches'] += 1
+
+    def _insert(self, rows):
+        from app.models.mission import OperationLog
+
+        table = OperationLog.__table__
+
+        def fn(session):
+            session.execute(insert(table), rows)
+
+        if not write_queue.enabled:
+            write_queue.run(fn, rows=len(rows))
+        else:
+            future = write_queue.submit(fn, rows=len(rows))
+            while True:
+                try:
+                    future.result(timeout=write_queue.timeout)
+                    break
+                except TimeoutError:
+                    logger.warning('operation log batch still queued', extra={'rows': len(rows),
+                                                                            'depth': write_queue.depth()})
+                    if self._stopping:
+                        # Shutdown: batch tetap di write queue (di-drain saat write queue berhenti), tidak di-spill
+                        return
+        self.stats['flushed'] += len(rows)
+
+    def _insert_each(self, rows, spill=True):
+        for row in rows:
+            try:
+                self._insert([row])
+            except IntegrityError as e:
+                self.stats['rejected'] += 1
+                logger.error('operation log row rejected',
+                             extra={'action_type': row['action_type'], 'robot_id': row['robot_id'], 'error': str(e)})
+            except DBAPIError:
+                if not spill:
+                    raise
+                self._spill([row])
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def _spill_locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+        with self._spill_lock, open(self.spill_path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def _dump(rows, f):
+        for row in rows:
+            f.write(json.dumps({**row, 'timestamp': row['timestamp'].isoformat(),
+                                'created_at': row['created_at'].isoformat()}) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _spill(self, rows):
+        with self._spill_locked(), open(self.spill_path, 'a', encoding='utf-8') as f:
+            self._dump(rows, f)
+        self.stats['spilled'] += len(rows)
+
+    def _replay_spill(self):
+        """Pindahkan isi file spill ke database; sisa yang gagal ditulis ulang ke file"""
+        with self._spill_locked():
+            try:
+                with open(self.spill_path, encoding='utf-8') as f:
+                    rows = [json.loads(line) for line in f if line.strip()]
+            except FileNotFoundError:
+                return
+            for row in rows:
+                row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+                row['created_at'] = datetime.fromisoformat(row['created_at'])
+                for column in _COLUMNS:
+                    row.setdefault(column, None)
+
+            done = 0
+            try:
+                while done < len(rows):
+                    chunk = rows[done:done + self.flush_rows]
+                    try:
+                        self._insert(chunk)
+                    except IntegrityError:
+                        # Per baris: `done` maju per baris yang sudah masuk/ditolak, supaya kalau
+                        # DB gagal di tengah chunk, baris yang sudah masuk tidak ditulis ulang ke file
+                        for row in chunk:
+                            self._insert_each([row], spill=False)
+                            done += 1
+                        continue
+                    done += len(chunk)
+            except DBAPIError as e:
+                logger.warning('operation log replay failed', extra={'rows': len(rows) - done, 'error': str(e)})
+            finally:
+                self.stats['replayed'] += done
+                if done < len(rows):
+                    with open(self.spill_path + '.tmp', 'w', encoding='utf-8') as f:
+                        self._dump(rows[done:], f)
+                    os.replace(self.spill_path + '.tmp', self.spill_path)
+                else:
+                    os.remove(self.spill_path)
+
+
+operation_log = OperationLogSink()
@@ -0,0 +1,460 @@
+"""
+Pipeline pembayaran booking.
+
+- `create_payment()` (request thread) hanya menyimpan Payment `pending` dengan
+  transaction_id acak. Idempotency key (header `Idempotency-Key`) unik per booking:
+  request yang diulang mengembalikan payment yang sama, tidak membuat duplikat.
+- Worker thread mengambil payment dari antrian per batch dan mengirim satu
+  `charge_batch` ke gateway (satu round-trip per batch); status -> `processing`.
+- Gateway mengirim hasil lewat webhook (`POST /api/payments/webhook`, HMAC SHA-256).
+  `apply_outcomes()` menulis hasil secara set-based dan meng-confirm booking yang lunas.
+- Reconciler berkala menanyakan status payment `processing` yang webhook-nya belum
+  datang (satu `status_batch` per batch) dan mengirim ulang payment `pending` yang
+  tertinggal (mis. proses mati sebelum submit). Gateway idempotent per transaction_id,
+  jadi pengiriman ulang tidak menagih dua kali.
+- `LocalGateway` adalah stand-in di proses yang sama (latency, settle async, failure
+  rate, webhook yang hilang) untuk development dan benchmark.
+
+PAYMENT_PROCESSING=sync memproses di request thread (menunggu settle), untuk perbandingan.
+Semua update status bersyarat (`status IN ('pending', 'processing')`), jadi webhook,
+reconciler dan worker boleh datang dalam urutan apa pun.
+"""
+import hashlib
+import heapq
+import hmac
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.booking import Booking, Payment
+from app.services.booking_lifecycle import transition_bookings
+from app.services.write_queue import write_queue
+from app.utils.sql import upsert
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('pending', 'processing')
+FINAL_EVENTS = ('succeeded', 'failed')
+RECONCILE_BATCH = 500
+IN_BATCH = 5000
+
+_payment = Payment.__table__
+_booking = Booking.__table__
+
+
+def new_transaction_id():
+    return f'TXN-{uuid.uuid4().hex[:20].upper()}'
+
+
+def create_payment(session, booking, method, idempotency_key=None):
+    """
+    Buat payment pending untuk booking (idempotent per booking + key; commit oleh caller).
+    Return (Payment, outcome) dengan outcome 'created', 'replayed' atau 'conflict'
+    (booking sudah punya payment aktif/lunas atau tidak sedang menunggu pembayaran).
+    Dua request bersamaan dengan key berbeda: index unik `uq_payment_active_booking`
+    menolak insert kedua -> session di-rollback dan outcome 'conflict'.
+    """
+    payments = session.execute(
+        select(Payment).where(Payment.booking_id == booking.booking_id).order_by(Payment.payment_id)
+    ).scalars().all()
+    if idempotency_key is None:
+        # Tanpa key: satu percobaan per booking, percobaan baru hanya setelah yang lama gagal
+        idempotency_key = f"auto-{sum(1 for payment in payments if payment.status == 'failed')}"
+
+    for payment in payments:
+        if payment.idempotency_key == idempotency_key:
+            return payment, 'replayed'
+    active = next((payment for payment in payments if payment.status not in ('failed', 'refunded')), None)
+    if active is not None or booking.status != 'pending':
+        return active, 'conflict'
+
+    now = datetime.utcnow()
+    try:
+        result = session.execute(upsert(
+            session.get_bind().dialect.name, _payment, [{
+                'booking_id': booking.booking_id,
+                'amount': booking.total_cost,
+                'method': method,
+                'status': 'pending',
+                'transaction_id': new_transaction_id(),
+                'idempotency_key': idempotency_key,
+                'attempts': 0,
+                'created_at': now,
+                'updated_at': now
+            }],
+            index_elements=['booking_id', 'idempotency_key']
+        ))
+    except IntegrityError:
+        booking_id = booking.booking_id
+        session.rollback()
+        payments = session.execute(
+            select(Payment).where(Payment.booking_id == booking_id).order_by(Payment.payment_id)
+        ).scalars().all()
+        for payment in payments:
+            if payment.idempotency_key == idempotency_key:
+                return payment, 'replayed'
+        return next((payment for payment in payments if payment.status not in ('failed', 'refunded')), None), \
+            'conflict'
+    payment = session.execute(
+        select(Payment).where(Payment.booking_id == booking.booking_id, Payment.idempotency_key == idempotency_key)
+    ).scalar_one()
+    # rowcount 0: request lain dengan key yang sama menang duluan
+    return payment, 'created' if result.rowcount == 1 else 'replayed'
+
+
+def _chunks(values, size=IN_BATCH):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def apply_outcomes(session, events):
+    """
+    Terapkan hasil gateway (event succeeded/failed) secara set-based: update payment
+    yang masih terbuka, lalu confirm booking pending yang payment-nya lunas.
+    Return jumlah payment yang berubah status.
+    """
+    now = datetime.utcnow()
+    succeeded = [{'b_txn': e['transaction_id'], 'b_ref': e.get('reference')}
+                 for e in events if e.get('status') == 'succeeded']
+    failed = [{'b_txn': e['transaction_id'], 'b_ref': e.get('reference'), 'b_reason': e.get('reason')}
+              for e in events if e.get('status') == 'failed']
+    # OR, bukan IN: parameter IN (expanding) tidak bisa dipakai dengan executemany
+    is_open = or_(*(_payment.c.status == status for status in OPEN_STATUSES))
+    reference = func.coalesce(bindparam('b_ref'), _payment.c.gateway_reference)
+    changed = 0
+
+    if succeeded:
+        changed += session.execute(
+            update(_payment).where(_payment.c.transaction_id == bindparam('b_txn'), is_open)
+            .values(status='completed', paid_at=now, gateway_reference=reference, updated_at=now),
+            succeeded
+        ).rowcount
+    if failed:
+        changed += session.execute(
+            update(_payment).where(_payment.c.transaction_id == bindparam('b_txn'), is_open)
+            .values(status='failed', failure_reason=bindparam('b_reason'), gateway_reference=reference,
+                    updated_at=now),
+            failed
+        ).rowcount
+
+    for chunk in _chunks([row['b_txn'] for row in succeeded]):
+        paid = select(_payment.c.booking_id).where(_payment.c.transaction_id.in_(chunk),
+                                                   _payment.c.status == 'completed')
+        transition_bookings(session, and_(_booking.c.booking_id.in_(paid), _booking.c.status == 'pending'),
+                            'confirmed', now)
+    return max(changed, 0)
+
+
+class GatewayError(RuntimeError):
+    pass
+
+
+class LocalGateway:
+    """
+    Stand-in payment gateway di proses yang sama. Setiap panggilan = satu round-trip
+    (`latency`); charge selesai (settle) setelah `settle_delay` lalu dikirim sebagai
+    webhook lewat `notify(events)`. Charge idempotent per transaction_id.
+    """
+
+    def __init__(self, latency=0.2, settle_delay=0.5, failure_rate=0.0, webhook_drop_rate=0.0, notify=None,
+                 seed=None):
+        self.latency = latency
+        self.settle_delay = settle_delay
+        self.failure_rate = failure_rate
+        self.webhook_drop_rate = webhook_drop_rate
+        self.notify = notify
+        self._charges = {}
+        self._due = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._rng = random.Random(seed)
+
+    def charge_batch(self, charges):
+        """charges: list dict transaction_id/amount/method -> list event status 'processing'"""
+        time.sleep(self.latency)
+        results = []
+        with self._cond:
+            for charge in charges:
+                transaction_id = charge['transaction_id']
+                entry = self._charges.get(transaction_id)
+                if entry is None:
+                    declined = self._rng.random() < self.failure_rate
+                    entry = self._charges[transaction_id] = {
+                        'reference': f'gw_{uuid.uuid4().hex[:16]}',
+                        'status': 'processing',
+                        'outcome': 'failed' if declined else 'succeeded',
+                        'reason': 'card_declined' if declined else None
+                    }
+                    heapq.heappush(self._due, (time.monotonic() + self.settle_delay, transaction_id))
+                results.append(self._event(transaction_id))
+            self._cond.notify_all()
+        self._ensure_settler()
+        return results
+
+    def status_batch(self, transaction_ids):
+        """Status banyak charge dalam satu round-trip ('unknown' kalau tidak pernah diterima)"""
+        time.sleep(self.latency)
+        with self._cond:
+            return [self._event(transaction_id) for transaction_id in transaction_ids]
+
+    def wait_settled(self, transaction_id, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._charges.get(transaction_id, {}).get('status') == 'processing':
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise GatewayError(f'charge {transaction_id} not settled after {timeout}s')
+                self._cond.wait(remaining)
+            return self._event(transaction_id)
+
+    def _event(self, transaction_id):
+        entry = self._charges.get(transaction_id)
+        if entry is None:
+            return {'transaction_id': transaction_id, 'status': 'unknown'}
+        return {'transaction_id': transaction_id, 'reference': entry['reference'], 'status': entry['status'],
+                'reason': entry['reason'] if entry['status'] == 'failed' else None}
+
+    def _ensure_settler(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._settle_loop, name='payment-gateway', daemon=True)
+                self._thread.start()
+
+    def _settle_loop(self):
+        while True:
+            with self._cond:
+                while not self._due or self._due[0][0] > time.monotonic():
+                    self._cond.wait(self._due[0][0] - time.monotonic() if self._due else None)
+                now = time.monotonic()
+                events = []
+                while self._due and self._due[0][0] <= now:
+                    _, transaction_id = heapq.heappop(self._due)
+                    entry = self._charges[transaction_id]
+                    entry['status'] = entry['outcome']
+                    if self._rng.random() >= self.webhook_drop_rate:
+                        events.append(self._event(transaction_id))
+                self._cond.notify_all()
+
+            if events and self.notify is not None:
+                try:
+                    self.notify(events)
+                except Exception:
+                    logger.exception('payment webhook delivery failed', extra={'events': len(events)})
+
+
+class PaymentProcessor:
+
+    def __init__(self):
+        self.mode = 'async'
+        self.workers = 4
+        self.batch_size = 50
+        self.batch_wait = 0.02
+        self.reconcile_interval = 30.0
+        self.reconcile_after = timedelta(seconds=10)
+        self.webhook_secret = None  # None: webhook HTTP ditolak (503)
+        self.gateway = LocalGateway(notify=self._deliver_webhook)
+        self._app = None
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'batches': 0, 'charged': 0, 'webhook_events': 0, 'completed': 0,
+                      'reconciled': 0, 'resubmitted': 0, 'errors': 0}
+
+    def init_app(self, app):
+        self._app = app
+        self.mode = app.config.get('PAYMENT_PROCESSING', 'async')
+        self.workers = app.config.get('PAYMENT_WORKERS', 4)
+        self.batch_size = app.config.get('PAYMENT_BATCH_SIZE', 50)
+        self.batch_wait = app.config.get('PAYMENT_BATCH_WAIT_MS', 20) / 1000.0
+        self.reconcile_interval = app.config.get('PAYMENT_RECONCILE_INTERVAL', 30.0)
+        self.reconcile_after = timedelta(seconds=app.config.get('PAYMENT_RECONCILE_AFTER', 10.0))
+        # Sengaja tanpa fallback ke SECRET_KEY (default-nya publik, signature bisa dipalsukan)
+        secret = app.config.get('PAYMENT_WEBHOOK_SECRET')
+        self.webhook_secret = secret.encode('utf-8') if secret else None
+        self.gateway = LocalGateway(
+            latency=app.config.get('PAYMENT_GATEWAY_LATENCY_MS', 200) / 1000.0,
+            settle_delay=app.config.get('PAYMENT_GATEWAY_SETTLE_MS', 500) / 1000.0,
+            failure_rate=app.config.get('PAYMENT_GATEWAY_FAILURE_RATE', 0.0),
+            webhook_drop_rate=app.config.get('PAYMENT_GATEWAY_WEBHOOK_DROP_RATE', 0.0),
+            # Mode sync: hasil ditulis oleh request itu sendiri
+            notify=self._deliver_webhook if self.mode != 'sync' else None
+        )
+        # Worker + reconciler jalan sejak request pertama, jadi payment pending sisa restart ikut dikirim ulang
+        app.before_request(self._ensure_workers)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def submit(self, payment_ids):
+        """Antrikan payment pending untuk di-charge (panggil setelah commit)"""
+        for payment_id in payment_ids:
+            self._queue.put(payment_id)
+        self.stats['submitted'] += len(payment_ids)
+        self._ensure_workers()
+
+    def process_now(self, session, payment):
+        """Mode sync: charge + tunggu settle di thread caller, hasil ditulis di session caller (commit oleh caller)"""
+        self.gateway.charge_batch([self._charge_request(payment)])
+        event = self.gateway.wait_settled(payment.transaction_id)
+        payment.attempts = (payment.attempts or 0) + 1
+        session.flush()
+        apply_outcomes(session, [event])
+        session.expire(payment)
+        session.expire(payment.booking)
+        self.stats['charged'] += 1
+
+    def sign(self, body):
+        return hmac.new(self.webhook_secret, body, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, body, signature):
+        return bool(self.webhook_secret) and bool(signature) and hmac.compare_digest(self.sign(body), signature)
+
+    def handle_events(self, events):
+        """Terapkan event webhook (list dict); return jumlah payment yang berubah status"""
+        events = [event for event in events
+                  if isinstance(event, dict) and event.get('transaction_id') and event.get('status') in FINAL_EVENTS]
+        if not events:
+            return 0
+        changed = write_queue.run(lambda session: apply_outcomes(session, events), rows=len(events))
+        self.stats['webhook_events'] += len(events)
+        self.stats['completed'] += changed or 0
+        return changed
+
+    def reconcile(self):
+        """Satu putaran rekonsiliasi: status_batch untuk payment processing yang basi, submit ulang yang pending"""
+        from app import db
+
+        cutoff = datetime.utcnow() - self.reconcile_after
+        try:
+            stale = db.session.execute(
+                select(_payment.c.payment_id, _payment.c.transaction_id, _payment.c.status)
+                .where(_payment.c.status.in_(OPEN_STATUSES), _payment.c.updated_at < cutoff)
+                .order_by(_payment.c.updated_at).limit(RECONCILE_BATCH)
+            ).all()
+        finally:
+            db.session.remove()
+
+        pending = [row.payment_id for row in stale if row.status == 'pending']
+        processing = [row.transaction_id for row in stale if row.status == 'processing']
+        settled = []
+        if processing:
+            statuses = self.gateway.status_batch(processing)
+            settled = [event for event in statuses if event['status'] in FINAL_EVENTS]
+            # Gateway tidak mengenal charge-nya (mis. gateway restart): kembali ke pending
+            lost = [{'b_txn': event['transaction_id']} for event in statuses if event['status'] == 'unknown']
+            if settled:
+                self.stats['completed'] += write_queue.run(
+                    lambda session: apply_outcomes(session, settled), rows=len(settled)) or 0
+            if lost:
+                write_queue.run(lambda session: session.execute(
+                    update(_payment).where(_payment.c.transaction_id == bindparam('b_txn'),
+                                           _payment.c.status == 'processing')
+                    .values(status='pending', updated_at=datetime.utcnow()), lost
+                ), rows=len(lost))
+        if pending:
+            self.submit(pending)
+        self.stats['reconciled'] += len(settled)
+        self.stats['resubmitted'] += len(pending)
+        return {'settled': len(settled), 'resubmitted': len(pending)}
+
+    def status(self):
+        return {
+            'mode': self.mode,
+            'queued': self._queue.qsize(),
+            'workers': len(self._threads),
+            'stats': dict(self.stats)
+        }
+
+    # ------------------------------------------------------------------
+    # Worker + reconciler thread
+    # ------------------------------------------------------------------
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._lock:
+            if not self._threads:
+                for index in range(self.workers):
+                    thread = threading.Thread(target=self._worker_loop, name=f'payment-worker-{index}', daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+                if self.reconcile_interval > 0:
+                    thread = threading.Thread(target=self._reconcile_loop, name='payment-reconciler', daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker_loop(self):
+        with self._app.app_context():
+            while True:
+                batch = self._next_batch()
+                try:
+                    self._charge(batch)
+                except Exception:
+                    # Tetap pending; reconciler mengirim ulang
+                    self.stats['errors'] += 1
+                    logger.exception('payment charge batch failed', extra={'payments': len(batch)})
+
+    @staticmethod
+    def _charge_request(payment):
+        return {'transaction_id': payment.transaction_id, 'amount': float(payment.amount), 'method': payment.method}
+
+    def _charge(self, payment_ids):
+        from app import db
+
+        try:
+            payments = db.session.execute(
+                select(_payment.c.payment_id, _payment.c.transaction_id, _payment.c.amount, _payment.c.method)
+                .where(_payment.c.payment_id.in_(set(payment_ids)), _payment.c.status == 'pending')
+            ).all()
+        finally:
+            db.session.remove()
+        if not payments:
+            return
+
+        results = self.gateway.charge_batch([self._charge_request(payment) for payment in payments])
+        now = datetime.utcnow()
+        params = [{'b_txn': result['transaction_id'], 'b_ref': result.get('reference')} for result in results]
+        write_queue.run(lambda session: session.execute(
+            update(_payment).where(_payment.c.transaction_id == bindparam('b_txn'), _payment.c.status == 'pending')
+            .values(status='processing', gateway_reference=bindparam('b_ref'), attempts=_payment.c.attempts + 1,
+                    updated_at=now), params
+        ), rows=len(params))
+        self.stats['batches'] += 1
+        self.stats['charged'] += len(params)
+
+    def _reconcile_loop(self):
+        with self._app.app_context():
+            while True:
+                time.sleep(self.reconcile_interval)
+                try:
+                    self.reconcile()
+                except Exception:
+                    self.stats['errors'] += 1
+                    logger.exception('payment reconcile failed')
+
+    def _deliver_webhook(self, events):
+        """Webhook LocalGateway dikirim in-process; gateway asli lewat POST /api/payments/webhook"""
+        with self._app.app_context():
+            self.handle_events(events)
+
+
+payment_processor = PaymentProcessor()
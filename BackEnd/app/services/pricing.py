@@ -0,0 +1,254 @@
+"""
+Harga sewa robot dinamis.
+
+Tarif harian = tarif dasar per model x multiplier musim (per bulan) x multiplier
+utilisasi fleet (fraksi robot model tersebut yang sudah dibooking pada hari itu).
+Total sewa = jumlah tarif harian x (1 - diskon tier durasi).
+
+Tabel tarif dihitung di depan untuk semua model sekaligus (satu query agregat
+booking confirmed/active) sebagai array NumPy tarif harian + prefix sum per model,
+mulai `RENTAL_PRICING_LOOKBACK_DAYS` hari lalu sampai `RENTAL_PRICING_HORIZON_DAYS` ke depan.
+Quote satu rentang = lookup dict model + dua index prefix sum; banyak rentang
+sekaligus (kalender booking) di-vectorize dengan fancy indexing. Tabel di-invalidate
+lewat change stream setelah commit yang mengubah booking (termasuk UPDATE Core di
+payment / booking lifecycle) atau menambah/menghapus robot / mengganti model_type
+(dibangun ulang paling sering sekali per `MIN_REBUILD_S`) dan kedaluwarsa setelah
+`RENTAL_PRICING_TTL` detik.
+"""
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.models.booking import Booking
+from app.models.robot import Robot
+from app.services.change_stream import change_stream
+
+DEFAULT_DAILY_RATE = 1500000
+BASE_DAILY_RATES = {'CleanBot': 1500000, 'Vision AI': 2000000}
+# Musim hujan (Nov-Mar) sampah laut lebih banyak -> permintaan naik; kemarau lebih murah
+SEASON_MULTIPLIERS = np.array([1.15, 1.15, 1.10, 1.0, 1.0, 0.95, 0.95, 0.95, 0.95, 1.0, 1.10, 1.15])
+# (utilisasi minimum, multiplier)
+UTILISATION_TIERS = ((0.0, 1.0), (0.5, 1.1), (0.8, 1.25), (0.95, 1.4))
+# (durasi minimum hari, diskon)
+DURATION_TIERS = ((1, 0.0), (3, 0.05), (7, 0.10), (14, 0.15), (30, 0.20))
+BLOCKING_STATUSES = ('confirmed', 'active')
+PRICING_LOOKBACK_DAYS = 31
+MIN_REBUILD_S = 5.0
+MAX_QUOTE_RANGES = 1000
+MAX_RENTAL_DAYS = 3650
+
+RateTable = namedtuple('RateTable', 'base_rate daily cumsum utilisation')
+RateTables = namedtuple('RateTables', 'origin days models built_at')
+
+_util_thresholds = np.array([tier[0] for tier in UTILISATION_TIERS])
+_util_multipliers = np.array([tier[1] for tier in UTILISATION_TIERS])
+_duration_thresholds = np.array([tier[0] for tier in DURATION_TIERS])
+_duration_discounts = np.array([tier[1] for tier in DURATION_TIERS])
+
+
+class PricingError(ValueError):
+    pass
+
+
+def _ordinal(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+def parse_duration(value):
+    """duration_days dari JSON -> int 1..MAX_RENTAL_DAYS; pecahan (1.5) ditolak, bukan dibulatkan"""
+    try:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        days = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise PricingError('duration_days must be a whole number of days') from None
+    if not 1 <= days <= MAX_RENTAL_DAYS:
+        raise PricingError(f'duration_days must be between 1 and {MAX_RENTAL_DAYS}')
+    return days
+
+
+def parse_count(value):
+    """Jumlah rentang quote dari JSON -> int 1..MAX_QUOTE_RANGES"""
+    try:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        count = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise PricingError('count must be a whole number') from None
+    if not 1 <= count <= MAX_QUOTE_RANGES:
+        raise PricingError(f'count must be between 1 and {MAX_QUOTE_RANGES}')
+    return count
+
+
+def duration_discount(days):
+    """Diskon tier durasi (array atau skalar)"""
+    return _duration_discounts[np.searchsorted(_duration_thresholds, days, side='right') - 1]
+
+
+class PricingEngine:
+
+    def __init__(self):
+        self.base_rates = dict(BASE_DAILY_RATES)
+        self.default_rate = DEFAULT_DAILY_RATE
+        self.horizon_days = 400
+        self.lookback_days = PRICING_LOOKBACK_DAYS
+        self.ttl = 300.0
+        self._tables = None
+        self._stale = False
+        self._subscription = None
+        self._lock = threading.Lock()
+        self.stats = {'builds': 0, 'quotes': 0, 'last_build_ms': None}
+
+    def init_app(self, app):
+        self.base_rates = {**BASE_DAILY_RATES, **(app.config.get('RENTAL_BASE_RATES') or {})}
+        self.default_rate = app.config.get('RENTAL_DEFAULT_DAILY_RATE', DEFAULT_DAILY_RATE)
+        self.horizon_days = app.config.get('RENTAL_PRICING_HORIZON_DAYS', 400)
+        self.lookback_days = app.config.get('RENTAL_PRICING_LOOKBACK_DAYS', PRICING_LOOKBACK_DAYS)
+        self.ttl = app.config.get('RENTAL_PRICING_TTL', 300.0)
+        if self._subscription is None:
+            self._subscription = change_stream.subscribe(callback=self._on_changes, tables=('booking', 'robot'))
+        self.invalidate()
+
+    # ------------------------------------------------------------------
+    # Quote
+    # ------------------------------------------------------------------
+    def quote(self, model_type, start_date, duration_days):
+        """Quote satu rentang sewa; return dict harga"""
+        return self.quote_many(model_type, [start_date], [duration_days])[0]
+
+    def quote_many(self, model_type, start_dates, durations):
+        """Quote banyak rentang sekaligus (vectorized); start_dates: list date/datetime, durations: hari bulat"""
+        if len(start_dates) > MAX_QUOTE_RANGES:
+            raise PricingError(f'At most {MAX_QUOTE_RANGES} ranges per quote')
+        tables = self.tables()
+        table = self._table_for(tables, model_type)
+
+        starts = np.fromiter((_ordinal(value) for value in start_dates), dtype=np.int64, count=len(start_dates))
+        days = np.fromiter((parse_duration(value) for value in durations), dtype=np.int64, count=len(durations))
+        first = starts - tables.origin
+        last = first + days
+        if first.size and (first.min() < 0 or last.max() > tables.days):
+            raise PricingError('Rental dates are outside the pricing horizon')
+
+        base_total = table.cumsum[last] - table.cumsum[first]
+        discount = duration_discount(days)
+        total = np.round(base_total * (1 - discount), 2)
+        self.stats['quotes'] += len(starts)
+        return [{
+            'start_date': date.fromordinal(int(start)).isoformat(),
+            'duration_days': int(n),
+            'base_total': round(float(base), 2),
+            'discount_rate': float(rate),
+            'total_cost': float(cost),
+            'daily_average': round(float(cost) / int(n), 2)
+        } for start, n, base, rate, cost in zip(starts, days, base_total, discount, total)]
+
+    def daily_rates(self, model_type, start_date, days):
+        """Tarif harian per tanggal (untuk kalender); return list (tanggal, tarif, utilisasi)"""
+        tables = self.tables()
+        table = self._table_for(tables, model_type)
+        first = _ordinal(start_date) - tables.origin
+        if first < 0 or first + days > tables.days:
+            raise PricingError('Rental dates are outside the pricing horizon')
+        return [(date.fromordinal(tables.origin + i).isoformat(), round(float(table.daily[i]), 2),
+                 round(float(table.utilisation[i]), 3)) for i in range(first, first + days)]
+
+    # ------------------------------------------------------------------
+    # Tabel tarif
+    # ------------------------------------------------------------------
+    def tables(self):
+        tables = self._tables
+        if tables is not None:
+            age = time.monotonic() - tables.built_at
+            if age < self.ttl and (not self._stale or age < MIN_REBUILD_S) \
+                    and tables.origin == date.today().toordinal() - self.lookback_days:
+                return tables
+        with self._lock:
+            if self._tables is tables:
+                self._stale = False
+                self._tables = self._build()
+            return self._tables
+
+    def invalidate(self):
+        self._stale = True
+
+    def _on_changes(self, events):
+        # Update robot lain (baterai, posisi, status dari telemetry) tidak mengubah tarif
+        if any(change['table'] == 'booking' or change['op'] != 'update' or 'model_type' in (change['columns'] or ())
+               for change in events):
+            self.invalidate()
+
+    def status(self):
+        tables = self._tables
+        return {
+            'models': sorted(tables.models) if tables else [],
+            'origin': date.fromordinal(tables.origin).isoformat() if tables else None,
+            'days': tables.days if tables else None,
+            'age_s': round(time.monotonic() - tables.built_at, 1) if tables else None,
+            'stale': self._stale,
+            'stats': dict(self.stats)
+        }
+
+    def _table_for(self, tables, model_type):
+        table = tables.models.get(model_type)
+        if table is None:
+            # Model tanpa robot: tarif dasar x musim, tanpa utilisasi
+            table = self._rate_table(self.base_rates.get(model_type, self.default_rate),
+                                     tables.origin, np.zeros(tables.days))
+        return table
+
+    def _rate_table(self, base_rate, origin, utilisation):
+        calendar = np.arange(origin, origin + len(utilisation)) - date(1970, 1, 1).toordinal()
+        months = calendar.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12
+        tier = np.searchsorted(_util_thresholds, utilisation, side='right') - 1
+        daily = base_rate * SEASON_MULTIPLIERS[months] * _util_multipliers[tier]
+        cumsum = np.concatenate(([0.0], np.cumsum(daily)))
+        return RateTable(base_rate, daily, cumsum, utilisation)
+
+    def _build(self):
+        """Bangun tabel tarif semua model: satu query jumlah robot + satu query booking di horizon"""
+        from app import db
+
+        started = time.perf_counter()
+        origin = date.today().toordinal() - self.lookback_days
+        days = self.lookback_days + self.horizon_days
+        window_start = datetime.combine(date.fromordinal(origin), datetime.min.time())
+        window_end = datetime.combine(date.fromordinal(origin + days), datetime.min.time())
+
+        robots = dict(db.session.execute(
+            select(Robot.model_type, func.count()).group_by(Robot.model_type)
+        ).all())
+        bookings = db.session.execute(
+            select(Robot.model_type, Booking.start_date, Booking.end_date)
+            .join(Robot, Robot.robot_id == Booking.robot_id)
+            .where(Booking.status.in_(BLOCKING_STATUSES), Booking.start_date < window_end,
+                   (Booking.end_date.is_(None)) | (Booking.end_date >= window_start))
+        ).all()
+
+        # Robot-hari terbooking per model: difference array lalu cumsum
+        booked = {model: np.zeros(days + 1) for model in robots}
+        for model, start, end in bookings:
+            first = max(_ordinal(start) - origin, 0)
+            last = min(_ordinal(end) - origin if end else days, days)
+            if last > first:
+                booked[model][first] += 1
+                booked[model][last] -= 1
+
+        models = {}
+        for model in set(robots) | set(self.base_rates):
+            count = robots.get(model, 0)
+            utilisation = np.clip(np.cumsum(booked[model])[:days] / count, 0, 1) if count else np.zeros(days)
+            models[model] = self._rate_table(self.base_rates.get(model, self.default_rate), origin, utilisation)
+
+        self.stats['builds'] += 1
+        self.stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return RateTables(origin, days, models, time.monotonic())
+
+
+pricing_engine = PricingEngine()
@@ -0,0 +1,253 @@
+"""
+Routing baca ke read replica.
+
+- Endpoint read-only diberi decorator `@read_replica`; SELECT di request tersebut
+  dijalankan di salah satu replica yang sehat (round-robin), write tetap ke primary.
+- Lag diukur dengan heartbeat: primary meng-update `replication_heartbeat` setiap
+  `REPLICA_HEARTBEAT_INTERVAL` detik, replica dibaca untuk melihat heartbeat terakhir
+  yang sudah ter-replikasi. Replica dengan lag > `REPLICA_MAX_LAG` (atau error) dilewati.
+- Read-your-writes: setelah user melakukan write (request non-GET yang sukses),
+  replica baru dipakai untuk user itu kalau heartbeat di replica lebih baru dari
+  write terakhirnya. Waktu write dikirim ke client (header `X-Last-Write` + cookie
+  `last_write`) dan dibaca lagi dari request berikutnya, jadi tetap berlaku walau
+  request itu jatuh ke worker lain; catatan per worker hanya cadangan untuk client
+  yang tidak mengirim balik keduanya.
+
+Lokal: dua file SQLite + `python replica_sync.py` sebagai pengganti replikasi.
+"""
+import itertools
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, insert, select, update
+
+from app.utils.database import configure_sqlite, engine_options
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_ID = 1
+MAX_TRACKED_USERS = 100000
+READ_SOURCE_HEADER = 'X-Read-Source'
+LAST_WRITE_HEADER = 'X-Last-Write'
+LAST_WRITE_COOKIE = 'last_write'
+
+
+class Replica:
+
+    def __init__(self, name, url, engine):
+        self.name = name
+        self.url = url
+        self.engine = engine
+        self.healthy = False
+        self.lag = None
+        self.last_beat = None
+        self.error = None
+        self.checked_at = None
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'url': self.engine.url.render_as_string(hide_password=True),
+            'healthy': self.healthy,
+            'lag_seconds': round(self.lag, 3) if self.lag is not None else None,
+            'last_heartbeat': self.last_beat.isoformat() if self.last_beat else None,
+            'error': self.error,
+            'checked_at': self.checked_at.isoformat() if self.checked_at else None
+        }
+
+
+class ReplicaRouter:
+
+    def __init__(self):
+        self.replicas = []
+        self.primary = None
+        self.max_lag = 5.0
+        self.interval = 1.0
+        self._rr = itertools.count()
+        self._last_write = {}  # user_id -> datetime (UTC) write terakhir
+        self._lock = threading.Lock()
+        self._monitor = None
+        self.stats = {'replica_reads': 0, 'primary_reads': 0, 'sticky_primary': 0}
+
+    def init_app(self, app):
+        from app import db
+
+        urls = [url.strip() for url in (app.config.get('REPLICA_DATABASE_URLS') or '').split(',') if url.strip()]
+        self.max_lag = app.config.get('REPLICA_MAX_LAG', 5.0)
+        self.interval = app.config.get('REPLICA_HEARTBEAT_INTERVAL', 1.0)
+        self.replicas = []
+        for index, url in enumerate(urls):
+            engine = create_engine(url, **engine_options({**app.config, 'SQLALCHEMY_DATABASE_URI': url}))
+            configure_sqlite(engine, app.config)
+            self.replicas.append(Replica(f'replica-{index}', url, engine))
+        if not self.replicas:
+            return
+
+        with app.app_context():
+            self.primary = db.engine
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def choose(self, user_id=None, last_write=None):
+        """Replica untuk request baca ini, atau None (primary); last_write = waktu write dari client"""
+        recorded = self._last_write.get(user_id) if user_id is not None else None
+        if recorded is not None and (last_write is None or recorded > last_write):
+            last_write = recorded
+        candidates = [replica for replica in self.replicas if replica.healthy]
+        if last_write is not None:
+            fresh = [replica for replica in candidates if replica.last_beat and replica.last_beat >= last_write]
+            if candidates and not fresh:
+                self.stats['sticky_primary'] += 1
+            candidates = fresh
+        if not candidates:
+            self.stats['primary_reads'] += 1
+            return None
+        self.stats['replica_reads'] += 1
+        return candidates[next(self._rr) % len(candidates)]
+
+    def engine_for(self, clause):
+        if not self.replicas or not has_request_context() or not getattr(clause, 'is_select', False):
+            return None
+        replica = g.get('read_replica')
+        return replica.engine if replica else None
+
+    def record_write(self, user_id, at=None):
+        with self._lock:
+            if len(self._last_write) >= MAX_TRACKED_USERS:
+                self._last_write.clear()
+            self._last_write[user_id] = at or datetime.utcnow()
+
+    def _after_request(self, response):
+        replica = g.get('read_replica')
+        if g.get('read_replica_route'):
+            response.headers[READ_SOURCE_HEADER] = replica.name if replica else 'primary'
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            at = datetime.utcnow()
+            user_id = _current_user_id()
+            if user_id is not None:
+                self.record_write(user_id, at)
+            # Setelah max_lag + satu heartbeat, replica yang masih sehat pasti sudah melewati write ini
+            response.headers[LAST_WRITE_HEADER] = at.isoformat()
+            response.set_cookie(LAST_WRITE_COOKIE, at.isoformat(), max_age=math.ceil(self.max_lag + self.interval),
+                                httponly=True, samesite='Lax')
+        return response
+
+    # ------------------------------------------------------------------
+    # Heartbeat + lag probe
+    # ------------------------------------------------------------------
+    def _before_request(self):
+        # g bisa dipakai ulang kalau app context sudah di-push di luar request
+        g.pop('read_replica', None)
+        g.pop('read_replica_route', None)
+        self._ensure_monitor()
+
+    def _ensure_monitor(self):
+        if self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is None:
+                self._monitor = threading.Thread(target=self._monitor_loop, name='replica-monitor', daemon=True)
+                self._monitor.start()
+
+    def _monitor_loop(self):
+        while True:
+            started = time.monotonic()
+            self.beat()
+            self.probe()
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def beat(self):
+        from app.models.replication import ReplicationHeartbeat
+
+        table = ReplicationHeartbeat.__table__
+        now = datetime.utcnow()
+        try:
+            with self.primary.begin() as conn:
+                updated = conn.execute(update(table).where(table.c.id == HEARTBEAT_ID).values(beat_at=now)).rowcount
+                if not updated:
+                    conn.execute(insert(table).values(id=HEARTBEAT_ID, beat_at=now))
+        except Exception as e:
+            logger.warning('replication heartbeat failed', extra={'error': str(e)})
+
+    def probe(self):
+        from app.models.replication import ReplicationHeartbeat
+
+        table = ReplicationHeartbeat.__table__
+        for replica in self.replicas:
+            replica.checked_at = datetime.utcnow()
+            try:
+                with replica.engine.connect() as conn:
+                    beat = conn.execute(select(table.c.beat_at).where(table.c.id == HEARTBEAT_ID)).scalar()
+            except Exception as e:
+                replica.healthy, replica.error = False, str(e)
+                continue
+            replica.error = None
+            replica.last_beat = beat
+            replica.lag = (replica.checked_at - beat).total_seconds() if beat else None
+            replica.healthy = replica.lag is not None and replica.lag <= self.max_lag
+
+    def status(self):
+        return {
+            'max_lag_seconds': self.max_lag,
+            'heartbeat_interval_seconds': self.interval,
+            'replicas': [replica.to_dict() for replica in self.replicas],
+            'tracked_writers': len(self._last_write),
+            'stats': dict(self.stats)
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy yang mengarahkan SELECT di endpoint @read_replica ke replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            engine = replica_router.engine_for(clause)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _current_user_id():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _client_last_write():
+    """Waktu write terakhir yang dikirim balik client (header atau cookie), UTC naive, atau None"""
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return None
+    try:
+        at = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return at.astimezone(timezone.utc).replace(tzinfo=None) if at.tzinfo else at
+
+
+def read_replica(f):
+    """Decorator endpoint read-only: baca dari replica (dipilih sekali per request)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if replica_router.replicas:
+            g.read_replica_route = True
+            g.read_replica = replica_router.choose(_current_user_id(), _client_last_write())
+        return f(*args, **kwargs)
+    return decorated_function
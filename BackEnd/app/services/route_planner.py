@@ -0,0 +1,426 @@
+"""
+Route planner misi di atas grid density waste.
+
+Alur:
+1. Area misi (polygon lat/lon) diproyeksikan ke meter lokal (equirectangular).
+2. Boustrophedon decomposition: polygon di-scan per lane (spacing = resolusi),
+   run per lane digabung menjadi cell yang masing-masing di-sweep bolak-balik.
+3. Hotspot: agregat density di-bin ke blok, blok teratas diurutkan dengan
+   greedy nearest-neighbour + 2-opt.
+4. Path = hotspot dulu, lalu coverage sweep, dipotong sesuai budget baterai
+   (termasuk jarak kembali ke titik start).
+
+Semua operasi grid di-vectorize dengan NumPy; loop Python hanya per lane/cell.
+"""
+import math
+import numpy as np
+from app.utils.geo import EARTH_RADIUS_M, position_latlon
+
+DEFAULT_RESOLUTION_M = 5.0
+DEFAULT_HOTSPOT_BLOCK_M = 50.0
+DEFAULT_MAX_HOTSPOTS = 200
+DEFAULT_FULL_CHARGE_RANGE_M = 20000.0
+DEFAULT_BATTERY_RESERVE = 0.2
+MAX_WINDOW_DAYS = 3650  # window density waste paling lama (hari)
+MIN_RESOLUTION_M = 1.0  # resolusi grid / blok hotspot terkecil
+MAX_GRID_CELLS = 2000000  # cell bounding box area per grid (resolusi dan blok hotspot)
+MAX_HOTSPOTS = 500  # matriks jarak 2-opt n x n
+
+
+class AreaError(ValueError):
+    pass
+
+
+def parse_area(area_coords):
+    """
+    Normalisasi Mission.area_coords menjadi array polygon [[lat, lon], ...].
+    Format yang diterima:
+      - {'polygon': [[lat, lon], ...]} atau {'polygon': [{latitude, longitude}, ...]}
+      - [[lat, lon], ...] / [{latitude, longitude}, ...]
+      - {'min_lat', 'min_lon', 'max_lat', 'max_lon'}
+    """
+    if isinstance(area_coords, dict):
+        if 'polygon' in area_coords:
+            area_coords = area_coords['polygon']
+        elif all(k in area_coords for k in ('min_lat', 'min_lon', 'max_lat', 'max_lon')):
+            min_lat, min_lon = float(area_coords['min_lat']), float(area_coords['min_lon'])
+            max_lat, max_lon = float(area_coords['max_lat']), float(area_coords['max_lon'])
+            area_coords = [[min_lat, min_lon], [min_lat, max_lon], [max_lat, max_lon], [max_lat, min_lon]]
+        else:
+            raise AreaError('area_coords must contain a polygon or a bounding box')
+
+    if not isinstance(area_coords, (list, tuple)):
+        raise AreaError('area_coords must contain a polygon or a bounding box')
+
+    points = []
+    for point in area_coords:
+        if isinstance(point, dict):
+            latlon = position_latlon(point)
+            if not latlon:
+                raise AreaError('Polygon points need latitude and longitude')
+            points.append(latlon)
+        else:
+            points.append((float(point[0]), float(point[1])))
+
+    if len(points) > 1 and points[0] == points[-1]:
+        points = points[:-1]
+    if len(points) < 3:
+        raise AreaError('Polygon needs at least 3 points')
+    return np.asarray(points, dtype=np.float64)
+
+
+class LocalProjection:
+    """Proyeksi equirectangular lat/lon <-> meter di sekitar titik origin"""
+
+    def __init__(self, origin_lat, origin_lon):
+        self.origin_lat = origin_lat
+        self.origin_lon = origin_lon
+        self.m_per_deg_lat = math.radians(1) * EARTH_RADIUS_M
+        self.m_per_deg_lon = self.m_per_deg_lat * math.cos(math.radians(origin_lat))
+
+    def to_xy(self, latlon):
+        latlon = np.asarray(latlon, dtype=np.float64)
+        x = (latlon[..., 1] - self.origin_lon) * self.m_per_deg_lon
+        y = (latlon[..., 0] - self.origin_lat) * self.m_per_deg_lat
+        return np.stack([x, y], axis=-1)
+
+    def to_latlon(self, xy):
+        xy = np.asarray(xy, dtype=np.float64)
+        lat = xy[..., 1] / self.m_per_deg_lat + self.origin_lat
+        lon = xy[..., 0] / self.m_per_deg_lon + self.origin_lon
+        return np.stack([lat, lon], axis=-1)
+
+
+def _scanline_crossings(polygon_xy, ys):
+    """
+    Titik potong edge polygon dengan garis horizontal y = ys[i].
+    Return array (len(ys), E) terurut per baris, kolom kosong = +inf.
+    """
+    x1, y1 = polygon_xy[:, 0], polygon_xy[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    yy = ys[:, None]
+    crosses = ((y1 <= yy) & (yy < y2)) | ((y2 <= yy) & (yy < y1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (yy - y1) / (y2 - y1)
+        xs = np.where(crosses, x1 + t * (x2 - x1), np.inf)
+    xs.sort(axis=1)
+    return xs
+
+
+def _lane_runs(crossings):
+    """Pasangkan crossing (masuk, keluar) per lane -> list of arrays (n_runs, 2)"""
+    if crossings.shape[1] % 2:
+        crossings = np.hstack([crossings, np.full((crossings.shape[0], 1), np.inf)])
+    starts, ends = crossings[:, 0::2], crossings[:, 1::2]
+    valid = np.isfinite(starts) & np.isfinite(ends) & (ends > starts)
+    return [np.stack([starts[i][valid[i]], ends[i][valid[i]]], axis=1) for i in range(len(crossings))]
+
+
+def inside_mask(polygon_xy, xs, ys):
+    """Mask (len(ys), len(xs)) titik grid di dalam polygon (even-odd rule)"""
+    crossings = _scanline_crossings(polygon_xy, ys)
+    n_rows, n_edges = crossings.shape
+    span = (np.max(np.abs(xs)) + 1.0) * 4.0
+    offsets = np.arange(n_rows, dtype=np.float64)[:, None] * span
+    keys = np.where(np.isfinite(crossings), np.clip(crossings, -span / 2, span / 2), span / 2) + offsets
+    queries = xs[None, :] + offsets
+    counts = np.searchsorted(keys.ravel(), queries.ravel(), side='right').reshape(n_rows, len(xs))
+    counts -= (np.arange(n_rows) * n_edges)[:, None]
+    # Crossing "kosong" diletakkan di +span/2 sehingga tidak pernah terhitung
+    return (counts % 2) == 1
+
+
+def _decompose_cells(lane_ys, runs_per_lane):
+    """
+    Boustrophedon decomposition: gabungkan run yang overlap 1-1 pada lane
+    berurutan menjadi satu cell. Return list cell = [(y, x_start, x_end), ...].
+    """
+    cells = []
+    open_cells = []  # [(cell_index, last_run)]
+    for y, runs in zip(lane_ys, runs_per_lane):
+        next_open = []
+        overlaps_run = [[] for _ in range(len(runs))]
+        overlaps_cell = [[] for _ in range(len(open_cells))]
+        for ci, (_, last) in enumerate(open_cells):
+            for ri, run in enumerate(runs):
+                if run[0] < last[1] and last[0] < run[1]:
+                    overlaps_run[ri].append(ci)
+                    overlaps_cell[ci].append(ri)
+
+        for ri, run in enumerate(runs):
+            candidates = overlaps_run[ri]
+            if len(candidates) == 1 and len(overlaps_cell[candidates[0]]) == 1:
+                cell_index = open_cells[candidates[0]][0]
+            else:
+                cell_index = len(cells)
+                cells.append([])
+            cells[cell_index].append((y, run[0], run[1]))
+            next_open.append((cell_index, run))
+        open_cells = next_open
+    return cells
+
+
+def _sweep_cell(cell, current):
+    """Waypoint sweep bolak-balik untuk satu cell, mulai dari ujung terdekat"""
+    lanes = np.asarray(cell, dtype=np.float64)
+    candidates = [
+        (lanes, False), (lanes, True),
+        (lanes[::-1], False), (lanes[::-1], True)
+    ]
+    best = None
+    for ordered, flip in candidates:
+        first = ordered[0]
+        entry = (first[2], first[0]) if flip else (first[1], first[0])
+        distance = math.hypot(entry[0] - current[0], entry[1] - current[1])
+        if best is None or distance < best[0]:
+            best = (distance, ordered, flip)
+
+    _, ordered, flip = best
+    n = len(ordered)
+    reverse = (np.arange(n) % 2 == 1) ^ flip
+    x_from = np.where(reverse, ordered[:, 2], ordered[:, 1])
+    x_to = np.where(reverse, ordered[:, 1], ordered[:, 2])
+    points = np.empty((n * 2, 2))
+    points[0::2, 0], points[0::2, 1] = x_from, ordered[:, 0]
+    points[1::2, 0], points[1::2, 1] = x_to, ordered[:, 0]
+    return points
+
+
+def coverage_path(polygon_xy, lane_spacing, start_xy):
+    """Boustrophedon coverage path -> (waypoints (N, 2), total sweep length)"""
+    min_y, max_y = polygon_xy[:, 1].min(), polygon_xy[:, 1].max()
+    lane_ys = np.arange(min_y + lane_spacing / 2, max_y, lane_spacing)
+    if not len(lane_ys):
+        return np.empty((0, 2)), 0.0
+
+    runs_per_lane = _lane_runs(_scanline_crossings(polygon_xy, lane_ys))
+    cells = [cell for cell in _decompose_cells(lane_ys, runs_per_lane) if cell]
+
+    # Urutkan cell secara greedy dari posisi sekarang
+    segments = []
+    current = start_xy
+    remaining = list(range(len(cells)))
+    anchors = np.array([[cells[i][0][1], cells[i][0][0]] for i in remaining]) if cells else np.empty((0, 2))
+    while remaining:
+        distances = np.hypot(anchors[remaining, 0] - current[0], anchors[remaining, 1] - current[1])
+        index = remaining.pop(int(np.argmin(distances)))
+        points = _sweep_cell(cells[index], current)
+        segments.append(points)
+        current = points[-1]
+
+    sweep_length = float(sum(end - start for runs in runs_per_lane for start, end in runs))
+    return (np.vstack(segments) if segments else np.empty((0, 2))), sweep_length
+
+
+def select_hotspots(points_xy, weights, polygon_xy, block_m, max_hotspots):
+    """Bin density ke blok block_m, ambil blok teratas di dalam polygon -> (xy, weight)"""
+    if not len(points_xy):
+        return np.empty((0, 2)), np.empty(0)
+
+    min_xy = polygon_xy.min(axis=0)
+    max_xy = polygon_xy.max(axis=0)
+    n_bx = max(1, int(math.ceil((max_xy[0] - min_xy[0]) / block_m)))
+    n_by = max(1, int(math.ceil((max_xy[1] - min_xy[1]) / block_m)))
+
+    bx = np.floor((points_xy[:, 0] - min_xy[0]) / block_m).astype(np.int64)
+    by = np.floor((points_xy[:, 1] - min_xy[1]) / block_m).astype(np.int64)
+    keep = (bx >= 0) & (bx < n_bx) & (by >= 0) & (by < n_by)
+    bx, by, w, pts = bx[keep], by[keep], weights[keep], points_xy[keep]
+    if not len(w):
+        return np.empty((0, 2)), np.empty(0)
+
+    flat = by * n_bx + bx
+    total = np.bincount(flat, weights=w, minlength=n_bx * n_by)
+    cx = np.bincount(flat, weights=w * pts[:, 0], minlength=n_bx * n_by)
+    cy = np.bincount(flat, weights=w * pts[:, 1], minlength=n_bx * n_by)
+
+    occupied = np.nonzero(total > 0)[0]
+    centroids = np.stack([cx[occupied] / total[occupied], cy[occupied] / total[occupied]], axis=1)
+
+    # Hanya centroid yang benar-benar di dalam polygon (bukan di daratan)
+    inside = np.zeros(len(occupied), dtype=bool)
+    order = np.argsort(centroids[:, 1])
+    ys = centroids[order, 1]
+    crossings = _scanline_crossings(polygon_xy, ys)
+    xs = centroids[order, 0][:, None]
+    inside[order] = ((crossings < xs).sum(axis=1) % 2) == 1
+
+    occupied, centroids = occupied[inside], centroids[inside]
+    if len(occupied) > max_hotspots:
+        top = np.argpartition(-total[occupied], max_hotspots - 1)[:max_hotspots]
+        occupied, centroids = occupied[top], centroids[top]
+    return centroids, total[occupied]
+
+
+def order_hotspots(points, start_xy, max_two_opt_rounds=50):
+    """Urutan kunjungan hotspot: greedy nearest-neighbour lalu perbaikan 2-opt"""
+    n = len(points)
+    if n <= 1:
+        return np.arange(n)
+
+    nodes = np.vstack([start_xy[None, :], points])
+    dist = np.hypot(nodes[:, None, 0] - nodes[None, :, 0], nodes[:, None, 1] - nodes[None, :, 1])
+
+    visited = np.zeros(n + 1, dtype=bool)
+    visited[0] = True
+    tour = [0]
+    for _ in range(n):
+        row = np.where(visited, np.inf, dist[tour[-1]])
+        nxt = int(np.argmin(row))
+        visited[nxt] = True
+        tour.append(nxt)
+    tour = np.asarray(tour)
+
+    # 2-opt pada path terbuka (start tetap di depan)
+    for _ in range(max_two_opt_rounds):
+        improved = False
+        for i in range(1, n):
+            a, b = tour[i - 1], tour[i]
+            c = tour[i + 1:]
+            d = np.append(tour[i + 2:], -1)
+            d_cost = np.where(d >= 0, dist[c, np.maximum(d, 0)], 0.0)
+            d_new = np.where(d >= 0, dist[b, np.maximum(d, 0)], 0.0)
+            delta = dist[a, c] + d_new - dist[a, b] - d_cost
+            if len(delta) and delta.min() < -1e-9:
+                j = i + 1 + int(np.argmin(delta))
+                tour[i:j + 1] = tour[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+
+    return tour[1:] - 1
+
+
+def _truncate_to_budget(path, start_xy, budget_m):
+    """Potong path sehingga jarak tempuh + jarak kembali ke start <= budget"""
+    if not len(path):
+        return path, 0.0, False
+    full = np.vstack([start_xy[None, :], path])
+    steps = np.hypot(np.diff(full[:, 0]), np.diff(full[:, 1]))
+    travelled = np.cumsum(steps)
+    back = np.hypot(path[:, 0] - start_xy[0], path[:, 1] - start_xy[1])
+    feasible = np.nonzero(travelled + back <= budget_m)[0]
+    if not len(feasible):
+        return path[:0], 0.0, True
+    last = feasible[-1]
+    return path[:last + 1], float(travelled[last] + back[last]), last + 1 < len(path)
+
+
+def battery_budget_m(battery_lvl, full_charge_range_m=DEFAULT_FULL_CHARGE_RANGE_M,
+                     reserve=DEFAULT_BATTERY_RESERVE):
+    """Jarak tempuh maksimum (meter) dari level baterai, menyisakan reserve"""
+    usable = max(0.0, (battery_lvl or 0) / 100.0 - reserve)
+    return usable * full_charge_range_m
+
+
+def check_grid(polygon_xy, cell_m, name):
+    """AreaError kalau grid cell_m di atas bounding box polygon melebihi MAX_GRID_CELLS"""
+    width, height = polygon_xy.max(axis=0) - polygon_xy.min(axis=0)
+    cells = math.ceil(width / cell_m) * math.ceil(height / cell_m)
+    if cells > MAX_GRID_CELLS:
+        raise AreaError(f'{name}={cell_m:g} gives {cells} grid cells over the mission area '
+                        f'(max {MAX_GRID_CELLS}); use a coarser {name}')
+
+
+def plan_route(polygon_latlon, density_points, battery_lvl, start_latlon=None,
+               resolution_m=DEFAULT_RESOLUTION_M, hotspot_block_m=DEFAULT_HOTSPOT_BLOCK_M,
+               max_hotspots=DEFAULT_MAX_HOTSPOTS, full_charge_range_m=DEFAULT_FULL_CHARGE_RANGE_M,
+               battery_reserve=DEFAULT_BATTERY_RESERVE):
+    """
+    Rencanakan rute collection + coverage.
+
+    density_points: array-like (N, 3) berisi [lat, lon, weight].
+    Return dict siap di-serialize (waypoints lat/lon + statistik).
+    """
+    polygon_latlon = np.asarray(polygon_latlon, dtype=np.float64)
+    origin = polygon_latlon.mean(axis=0)
+    projection = LocalProjection(origin[0], origin[1])
+    polygon_xy = projection.to_xy(polygon_latlon)
+
+    start_xy = projection.to_xy(np.asarray(start_latlon)) if start_latlon is not None \
+        else polygon_xy.mean(axis=0)
+    check_grid(polygon_xy, resolution_m, 'resolution_m')
+    check_grid(polygon_xy, hotspot_block_m, 'hotspot_block_m')
+
+    # Area dari grid 5m
+    min_xy, max_xy = polygon_xy.min(axis=0), polygon_xy.max(axis=0)
+    xs = np.arange(min_xy[0] + resolution_m / 2, max_xy[0], resolution_m)
+    ys = np.arange(min_xy[1] + resolution_m / 2, max_xy[1], resolution_m)
+    area_cells = int(inside_mask(polygon_xy, xs, ys).sum()) if len(xs) and len(ys) else 0
+
+    # Hotspot collection
+    density_points = np.asarray(density_points, dtype=np.float64).reshape(-1, 3)
+    points_xy = projection.to_xy(density_points[:, :2]) if len(density_points) else np.empty((0, 2))
+    hotspots, hotspot_weights = select_hotspots(
+        points_xy, density_points[:, 2], polygon_xy, hotspot_block_m, max_hotspots
+    )
+    order = order_hotspots(hotspots, start_xy)
+    hotspots, hotspot_weights = hotspots[order], hotspot_weights[order]
+
+    # Coverage sweep, mulai dari hotspot terakhir
+    sweep_start = hotspots[-1] if len(hotspots) else start_xy
+    sweep, sweep_length = coverage_path(polygon_xy, resolution_m, sweep_start)
+
+    path = np.vstack([hotspots, sweep]) if len(hotspots) else sweep
+    kinds = np.array(['hotspot'] * len(hotspots) + ['sweep'] * len(sweep))
+
+    budget = battery_budget_m(battery_lvl, full_charge_range_m, battery_reserve)
+    planned, distance, truncated = _truncate_to_budget(path, start_xy, budget)
+    kinds = kinds[:len(planned)]
+
+    planned_sweep = planned[kinds == 'sweep']
+    covered = float(np.abs(np.diff(planned_sweep[:, 0]))[0::2].sum()) if len(planned_sweep) > 1 else 0.0
+
+    waypoints_latlon = projection.to_latlon(planned) if len(planned) else np.empty((0, 2))
+    start_latlon_out = projection.to_latlon(start_xy)
+    waypoints = [
+        {'latitude': round(float(lat), 7), 'longitude': round(float(lon), 7), 'kind': str(kind)}
+        for (lat, lon), kind in zip(waypoints_latlon, kinds)
+    ]
+    if len(planned):
+        waypoints.append({
+            'latitude': round(float(start_latlon_out[0]), 7),
+            'longitude': round(float(start_latlon_out[1]), 7),
+            'kind': 'return'
+        })
+
+    planned_hotspots = int((kinds == 'hotspot').sum())
+    return {
+        'waypoints': waypoints,
+        'distance_m': round(distance, 1),
+        'budget_m': round(budget, 1),
+        'truncated': bool(truncated),
+        'area_km2': round(area_cells * resolution_m * resolution_m / 1e6, 4),
+        'resolution_m': resolution_m,
+        'hotspots_total': int(len(hotspots)),
+        'hotspots_planned': planned_hotspots,
+        'waste_weight_targeted': round(float(hotspot_weights[:planned_hotspots].sum()), 2),
+        'coverage_ratio': round(covered / sweep_length, 4) if sweep_length else 0.0
+    }
+
+
+def plan_mission(mission, robot=None, waste_type=None, window_days=None, **options):
+    """Rencanakan rute untuk Mission memakai agregat density waste di area misi"""
+    from datetime import date, timedelta
+    from flask import current_app
+    from app.services.heatmap import density_cells
+
+    if not mission.area_coords:
+        raise AreaError('Mission has no area_coords')
+    polygon = parse_area(mission.area_coords)
+    robot = robot or mission.robot
+
+    min_lat, min_lon = polygon.min(axis=0)
+    max_lat, max_lon = polygon.max(axis=0)
+    start = date.today() - timedelta(days=window_days - 1) if window_days else None
+    cells = density_cells(min_lat, min_lon, max_lat, max_lon, waste_type=waste_type, start=start)
+    density = np.array([[lat, lon, weight] for lat, lon, _, weight in cells]).reshape(-1, 3)
+
+    options.setdefault('full_charge_range_m', current_app.config['ROBOT_FULL_CHARGE_RANGE_M'])
+    options.setdefault('battery_reserve', current_app.config['ROUTE_BATTERY_RESERVE'])
+    return plan_route(
+        polygon, density,
+        battery_lvl=robot.battery_lvl if robot else 100,
+        start_latlon=position_latlon(robot.current_position) if robot else None,
+        **options
+    )
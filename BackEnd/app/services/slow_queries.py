@@ -0,0 +1,237 @@
+"""
+Slow query log.
+
+Statement yang lebih lama dari `SLOW_QUERY_THRESHOLD_MS` dicatat per fingerprint
+(SQL yang dinormalisasi: literal/parameter -> ?, IN list dan VALUES batch
+di-collapse) bersama bentuk parameter, route pemanggil dan frame kode aplikasi.
+Untuk kemunculan pertama tiap fingerprint, plan di-capture:
+`EXPLAIN QUERY PLAN` (SQLite) atau `EXPLAIN (ANALYZE, FORMAT JSON)` (PostgreSQL;
+ANALYZE hanya untuk SELECT supaya DML tidak dieksekusi ulang), di dalam savepoint yang
+selalu di-rollback supaya transaksi request tidak terpengaruh.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.instrumentation import current_request_state
+
+logger = logging.getLogger('app.slow_query')
+
+MAX_FINGERPRINTS = 500
+MAX_ROUTES_PER_FINGERPRINT = 10
+EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?(?![\w$])')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|:\w+|\$\d+|\?')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUES_BATCH = re.compile(r'(\([?+,\s]+\))(?:\s*,\s*\([?+,\s]+\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(statement):
+    sql = _STRING.sub('?', statement)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(?+)', sql)
+    sql = _VALUES_BATCH.sub(r'\1+', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def is_parameter_list(parameters, executemany):
+    """executemany sungguhan (insertmanyvalues juga men-set flag ini tapi parameternya satu tuple datar)"""
+    return bool(executemany and parameters and isinstance(parameters, (list, tuple))
+                and isinstance(parameters[0], (list, tuple, dict)))
+
+
+def parameter_shape(parameters, executemany):
+    """Tipe parameter tanpa nilainya (tidak membocorkan data)"""
+    if is_parameter_list(parameters, executemany):
+        rows = list(parameters or [])
+        return {'executemany': len(rows), 'row': parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+
+def application_frame():
+    """Frame terdalam di kode aplikasi (bukan library / modul ini)"""
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(APP_DIR) and filename != _THIS_FILE and 'site-packages' not in filename:
+            return f'{os.path.relpath(filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class SlowQueryLog:
+
+    def __init__(self):
+        self.threshold = 0.1
+        self.explain = True
+        self.enabled = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        self.threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100) / 1000.0
+        self.explain = app.config.get('SLOW_QUERY_EXPLAIN', True)
+        self.enabled = app.config.get('SLOW_QUERY_LOG_ENABLED', True)
+
+    # ------------------------------------------------------------------
+    # Engine events
+    # ------------------------------------------------------------------
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_slow_query_started', None)
+        if started is None or getattr(self._local, 'explaining', False):
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            self.record(conn, statement, parameters, executemany, elapsed)
+
+    # ------------------------------------------------------------------
+    def record(self, conn, statement, parameters, executemany, elapsed):
+        normalized = normalize_sql(statement)
+        key = fingerprint(normalized)
+        state = current_request_state()
+        route = f'{state.method} {state.endpoint}' if state else 'background'
+        elapsed_ms = elapsed * 1000
+
+        with self._lock:
+            entry = self._stats.get(key)
+            first = entry is None
+            if first:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    return
+                entry = self._stats[key] = {
+                    'fingerprint': key,
+                    'normalized': normalized,
+                    'parameter_shape': parameter_shape(parameters, executemany),
+                    'frame': application_frame(),
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'min_ms': None,
+                    'first_seen': datetime.utcnow().isoformat(),
+                    'last_seen': None,
+                    'routes': Counter(),
+                    'plan': None
+                }
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['min_ms'] = elapsed_ms if entry['min_ms'] is None else min(entry['min_ms'], elapsed_ms)
+            entry['last_seen'] = datetime.utcnow().isoformat()
+            if route in entry['routes'] or len(entry['routes']) < MAX_ROUTES_PER_FINGERPRINT:
+                entry['routes'][route] += 1
+
+        logger.warning('slow query', extra={
+            'fingerprint': key, 'duration_ms': round(elapsed_ms, 3), 'sql': normalized[:500],
+            'route': route, 'frame': entry['frame']
+        })
+
+        if first and self.explain:
+            plan = self.capture_plan(conn, statement, parameters, executemany)
+            with self._lock:
+                entry['plan'] = plan
+
+    def capture_plan(self, conn, statement, parameters, executemany):
+        verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ''
+        if verb not in EXPLAINABLE:
+            return None
+        dialect = conn.dialect.name
+        if is_parameter_list(parameters, executemany):
+            parameters = parameters[0]
+
+        if dialect == 'sqlite':
+            prefix = 'EXPLAIN QUERY PLAN '
+        elif dialect == 'postgresql':
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' if verb in ('select', 'with') else 'EXPLAIN (FORMAT JSON) '
+        else:
+            prefix = 'EXPLAIN '
+
+        # Cursor DBAPI langsung: tidak memicu engine event lagi. EXPLAIN berjalan di transaksi request,
+        # jadi dibungkus savepoint: efek EXPLAIN ANALYZE dan error (transaksi PostgreSQL aborted) di-rollback
+        self._local.explaining = True
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            try:
+                if parameters:
+                    cursor.execute(prefix + statement, parameters)
+                else:
+                    cursor.execute(prefix + statement)
+                rows = cursor.fetchall()
+            except Exception as e:
+                return {'error': str(e)}
+            finally:
+                cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+                cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        except Exception as e:
+            return {'error': str(e)}
+        finally:
+            cursor.close()
+            self._local.explaining = False
+
+        if dialect == 'sqlite':
+            return {'dialect': dialect, 'plan': [row[-1] for row in rows]}
+        return {'dialect': dialect, 'plan': [row[0] for row in rows]}
+
+    # ------------------------------------------------------------------
+    # Query untuk admin
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _public(entry, with_plan):
+        data = {key: value for key, value in entry.items() if key not in ('routes', 'plan')}
+        data['total_ms'] = round(entry['total_ms'], 3)
+        data['max_ms'] = round(entry['max_ms'], 3)
+        data['min_ms'] = round(entry['min_ms'], 3) if entry['min_ms'] is not None else None
+        data['mean_ms'] = round(entry['total_ms'] / entry['count'], 3) if entry['count'] else None
+        data['routes'] = dict(entry['routes'].most_common())
+        if with_plan:
+            data['plan'] = entry['plan']
+        return data
+
+    def summary(self, sort='total_ms', limit=50):
+        with self._lock:
+            entries = [self._public(entry, False) for entry in self._stats.values()]
+        entries.sort(key=lambda entry: entry.get(sort) or 0, reverse=True)
+        return entries[:limit]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._stats.get(key)
+            return self._public(entry, True) if entry else None
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+event.listen(Engine, 'before_cursor_execute', slow_query_log.before_execute)
+event.listen(Engine, 'after_cursor_execute', slow_query_log.after_execute)
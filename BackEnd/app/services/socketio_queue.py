@@ -0,0 +1,87 @@
+"""
+Message queue lokal untuk SocketIO multi-worker di satu host (pengganti Redis).
+
+`SOCKETIO_MESSAGE_QUEUE=local:///tmp/sealen-socketio`: setiap worker bind satu
+Unix datagram socket di direktori tersebut; publish = kirim ke semua socket lain
+di direktori (socket worker yang sudah mati dibersihkan). Untuk lebih dari satu
+host gunakan `redis://...` / `amqp://...` (ditangani langsung oleh Flask-SocketIO).
+"""
+import atexit
+import errno
+import json
+import logging
+import os
+import socket
+
+from socketio import PubSubManager
+
+logger = logging.getLogger(__name__)
+
+SCHEME = 'local://'
+MAX_DATAGRAM = 65536
+
+
+def client_manager(url, channel='flask-socketio'):
+    """Manager untuk URL `local://`; None untuk URL lain (Redis/Kombu via Flask-SocketIO)"""
+    if not url or not url.startswith(SCHEME):
+        return None
+    return LocalSocketManager(url[len(SCHEME):] or '/tmp/sealen-socketio', channel=channel)
+
+
+class LocalSocketManager(PubSubManager):
+    name = 'local'
+
+    def __init__(self, directory, channel='flask-socketio', write_only=False, logger=None):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('local:// message queue requires Unix domain sockets')
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.directory = os.path.join(directory, channel)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f'{self.host_id}.sock')
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)  # worker yang macet tidak boleh memblokir publisher
+        self._receiver = None
+
+    def initialize(self):
+        if not self.write_only:
+            self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._receiver.bind(self.path)
+            atexit.register(self._cleanup)
+        super().initialize()
+
+    def _cleanup(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _peers(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names
+                if name.endswith('.sock') and os.path.join(self.directory, name) != self.path]
+
+    def _publish(self, data):
+        message = json.dumps(data).encode()
+        if len(message) > MAX_DATAGRAM:
+            logger.error('SocketIO message too large for local queue', extra={'size': len(message)})
+            return
+        for peer in self._peers():
+            try:
+                self._sender.sendto(message, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker sudah berhenti; socket file-nya tertinggal
+                try:
+                    os.unlink(peer)
+                except OSError:
+                    pass
+            except OSError as e:
+                if e.errno not in (errno.EAGAIN, errno.ENOBUFS):
+                    raise
+                logger.warning('SocketIO local queue full, message dropped', extra={'peer': peer})
+
+    def _listen(self):
+        while True:
+            yield self._receiver.recv(MAX_DATAGRAM)
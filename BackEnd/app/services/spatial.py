@@ -0,0 +1,195 @@
+"""
+Spatial index untuk waste detections dan posisi robot.
+
+- Waste: kolom `geohash` (B-tree index). Query bbox/radius diterjemahkan menjadi
+  beberapa range scan prefix geohash, lalu difilter exact di Python.
+- Robot: grid in-memory (cell geohash) untuk posisi live. Perubahan
+  `current_position` dikumpulkan per session saat flush dan baru diterapkan
+  setelah commit (rollback membuangnya).
+"""
+import threading
+from sqlalchemy import and_, or_, event, inspect
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models.robot import Robot
+from app.models.waste import Waste
+from app.utils.geo import (
+    PREFIX_UPPER_BOUND, covering_cells, encode_geohash, haversine_m,
+    in_bbox, position_latlon, radius_bbox
+)
+
+ROBOT_GRID_PRECISION = 6  # ~1.2km x 0.6km per cell
+
+
+def _geohash_prefix_filter(column, cells):
+    return or_(*[and_(column >= cell, column < cell + PREFIX_UPPER_BOUND) for cell in cells])
+
+
+def query_waste_in_bbox(min_lat, min_lon, max_lat, max_lon, limit=1000, collected=None):
+    """Waste di dalam bounding box"""
+    cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+    query = Waste.query.filter(_geohash_prefix_filter(Waste.geohash, cells))
+    if collected is not None:
+        query = query.filter(Waste.collected == collected)
+
+    results = []
+    for waste in query.yield_per(1000):
+        latlon = position_latlon(waste.location)
+        if latlon and in_bbox(latlon[0], latlon[1], min_lat, min_lon, max_lat, max_lon):
+            results.append(waste)
+            if limit and len(results) >= limit:
+                break
+    return results
+
+
+def query_waste_nearby(latitude, longitude, radius_m, limit=1000, collected=None):
+    """Waste dalam radius_m meter, diurutkan dari yang terdekat -> [(waste, distance_m)]"""
+    min_lat, min_lon, max_lat, max_lon = radius_bbox(latitude, longitude, radius_m)
+    cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+    query = Waste.query.filter(_geohash_prefix_filter(Waste.geohash, cells))
+    if collected is not None:
+        query = query.filter(Waste.collected == collected)
+
+    results = []
+    for waste in query.yield_per(1000):
+        latlon = position_latlon(waste.location)
+        if not latlon:
+            continue
+        distance = haversine_m(latitude, longitude, latlon[0], latlon[1])
+        if distance <= radius_m:
+            results.append((waste, distance))
+
+    results.sort(key=lambda item: item[1])
+    return results[:limit] if limit else results
+
+
+class RobotPositionIndex:
+    """Grid in-memory posisi live robot, keyed by geohash cell"""
+
+    def __init__(self, precision=ROBOT_GRID_PRECISION):
+        self.precision = precision
+        self._cells = {}      # cell -> set(robot_id)
+        self._positions = {}  # robot_id -> (lat, lon, cell)
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def ensure_loaded(self):
+        """Load posisi awal dari database (sekali, butuh app context)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.session.query(Robot.robot_id, Robot.current_position)\
+                .filter(Robot.geohash.isnot(None)).all()
+            for robot_id, position in rows:
+                self._set(robot_id, position_latlon(position))
+            self._loaded = True
+
+    def reset(self):
+        with self._lock:
+            self._cells.clear()
+            self._positions.clear()
+            self._loaded = False
+
+    def update(self, robot_id, position):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._set(robot_id, position_latlon(position))
+
+    def remove(self, robot_id):
+        with self._lock:
+            self._set(robot_id, None)
+
+    def _set(self, robot_id, latlon):
+        previous = self._positions.pop(robot_id, None)
+        if previous:
+            members = self._cells.get(previous[2])
+            if members:
+                members.discard(robot_id)
+                if not members:
+                    del self._cells[previous[2]]
+        if latlon:
+            cell = encode_geohash(latlon[0], latlon[1], self.precision)
+            self._positions[robot_id] = (latlon[0], latlon[1], cell)
+            self._cells.setdefault(cell, set()).add(robot_id)
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        cells = covering_cells(min_lat, min_lon, max_lat, max_lon, max_precision=self.precision)
+        for prefix in cells:
+            if len(prefix) == self.precision:
+                yield from self._cells.get(prefix, ())
+            else:
+                for cell, members in self._cells.items():
+                    if cell.startswith(prefix):
+                        yield from members
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """robot_id di dalam bounding box"""
+        self.ensure_loaded()
+        with self._lock:
+            return sorted(
+                robot_id for robot_id in set(self._candidates(min_lat, min_lon, max_lat, max_lon))
+                if in_bbox(self._positions[robot_id][0], self._positions[robot_id][1],
+                           min_lat, min_lon, max_lat, max_lon)
+            )
+
+    def nearby(self, latitude, longitude, radius_m):
+        """[(robot_id, distance_m)] dalam radius, terdekat dulu"""
+        self.ensure_loaded()
+        min_lat, min_lon, max_lat, max_lon = radius_bbox(latitude, longitude, radius_m)
+        with self._lock:
+            results = []
+            for robot_id in set(self._candidates(min_lat, min_lon, max_lat, max_lon)):
+                lat, lon, _ = self._positions[robot_id]
+                distance = haversine_m(latitude, longitude, lat, lon)
+                if distance <= radius_m:
+                    results.append((robot_id, distance))
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def position(self, robot_id):
+        self.ensure_loaded()
+        with self._lock:
+            entry = self._positions.get(robot_id)
+        return (entry[0], entry[1]) if entry else None
+
+
+robot_index = RobotPositionIndex()
+
+
+def _pending_positions(target):
+    session = object_session(target)
+    return session.info.setdefault('robot_positions', {}) if session is not None else None
+
+
+@event.listens_for(Robot, 'after_insert')
+@event.listens_for(Robot, 'after_update')
+def _robot_position_changed(mapper, connection, target):
+    if inspect(target).attrs.current_position.history.has_changes():
+        pending = _pending_positions(target)
+        if pending is not None:
+            pending[target.robot_id] = target.current_position
+
+
+@event.listens_for(Robot, 'after_delete')
+def _robot_deleted(mapper, connection, target):
+    pending = _pending_positions(target)
+    if pending is not None:
+        pending[target.robot_id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_robot_positions(session):
+    pending = session.info.pop('robot_positions', None)
+    for robot_id, position in (pending or {}).items():
+        if position is None:
+            robot_index.remove(robot_id)
+        else:
+            robot_index.update(robot_id, position)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_robot_positions(session):
+    session.info.pop('robot_positions', None)
@@ -0,0 +1,235 @@
+"""
+Logging terstruktur (JSON per baris) yang tidak memblokir thread request.
+
+- Thread request hanya memfilter dan memasukkan record ke queue terbatas
+  (`put_nowait`; kalau penuh record di-drop dan dihitung), formatting + write
+  ke stdout dilakukan thread `QueueListener`.
+- Correlation ID per request: header `X-Request-ID` (atau uuid baru), ikut di
+  setiap record dan dikembalikan di response.
+- Sampling untuk event volume tinggi (access log `app.request`): record dengan
+  `extra={'sampled': True}` hanya diteruskan dengan probabilitas `LOG_SAMPLE_RATE`.
+- Error di-rate-limit per (logger, template pesan) dengan token bucket; jumlah
+  record yang di-suppress dilaporkan di record berikutnya yang lolos.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from app.services.instrumentation import current_request_state
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+MAX_REQUEST_ID_LENGTH = 64
+
+# Atribut standar LogRecord; sisanya dianggap field `extra`
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id', 'endpoint', 'sampled'}
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+_local = threading.local()
+logger = logging.getLogger('app')
+access_logger = logging.getLogger('app.request')
+
+
+def current_request_id():
+    return getattr(_local, 'request_id', None)
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            data['request_id'] = request_id
+            data['endpoint'] = getattr(record, 'endpoint', None)
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith('_'):
+                data[key] = value
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        elif record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Tempel correlation ID + endpoint di thread pemanggil (sebelum masuk queue)"""
+
+    def filter(self, record):
+        record.request_id = getattr(_local, 'request_id', None)
+        state = current_request_state()
+        record.endpoint = state.endpoint if state else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, 'sampled', False) and record.levelno < logging.WARNING:
+            if random.random() >= self.rate:
+                return False
+            record.sample_rate = self.rate
+        return True
+
+
+class ErrorRateLimitFilter(logging.Filter):
+    """Token bucket per (logger, template) untuk level >= ERROR"""
+
+    MAX_KEYS = 1000
+
+    def __init__(self, per_second, burst):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self._buckets = {}  # key -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.ERROR:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler dengan queue terbatas; record di-drop (dan dihitung) kalau penuh"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Pesan + traceback dirender di sini (frame tidak boleh dibawa ke thread lain),
+        # tapi traceback tetap field terpisah, bukan digabung ke msg seperti default
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogging:
+
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self.enabled = False
+
+    def init_app(self, app):
+        self.enabled = app.config.get('LOG_ENABLED', True)
+        self.sample_rate = app.config.get('LOG_SAMPLE_RATE', 0.1)
+        self.log_requests = app.config.get('LOG_REQUESTS', True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+        if not self.enabled:
+            logger.setLevel(logging.CRITICAL + 1)
+            logger.propagate = False
+            return
+        if self.handler is not None:
+            return  # sudah dikonfigurasi oleh app sebelumnya di proses ini
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if app.config.get('LOG_FORMAT', 'json') == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'))
+
+        self.handler = NonBlockingQueueHandler(queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000)))
+        self.handler.addFilter(ContextFilter())
+        self.handler.addFilter(SamplingFilter(self.sample_rate))
+        self.handler.addFilter(ErrorRateLimitFilter(
+            app.config.get('LOG_ERROR_RATE', 5.0), app.config.get('LOG_ERROR_BURST', 20)))
+
+        logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+        logger.addHandler(self.handler)
+        logger.propagate = False
+
+        self.listener = QueueListener(self.handler.queue, stream_handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    # ------------------------------------------------------------------
+    def _before_request(self):
+        request_id = request.headers.get(REQUEST_ID_HEADER)
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+        _local.request_id = request_id
+        g.request_started = time.perf_counter()
+
+    def _after_request(self, response):
+        request_id = getattr(_local, 'request_id', None)
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        if self.log_requests and self.enabled:
+            started = g.get('request_started')
+            level = logging.ERROR if response.status_code >= 500 else logging.INFO
+            access_logger.log(level, 'request', extra={
+                'sampled': True,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 3) if started else None
+            })
+        return response
+
+    def _teardown_request(self, exc=None):
+        _local.request_id = None
+
+    @property
+    def dropped(self):
+        return self.handler.dropped if self.handler else 0
+
+
+structured_logging = StructuredLogging()
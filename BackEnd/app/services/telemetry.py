@@ -0,0 +1,172 @@
+"""
+Ingest telemetry robot secara batch.
+
+Satu request membawa sampel dari banyak robot (gateway / simulator). Sampel
+di-insert ke `sensor_data` dengan satu executemany; state terakhir tiap robot
+(baterai, posisi) di-update lewat ORM supaya geohash dan robot index ikut
+ter-update. Deteksi waste yang membawa `mission_id` disimpan juga ke tabel waste.
+Parsing dilakukan di thread request; write lewat `write_queue` (single writer).
+"""
+import math
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from app.models.mission import SensorData
+from app.models.robot import Robot
+from app.models.waste import Waste
+from app.services.write_queue import write_queue
+
+MAX_BATCH = 5000
+
+SENSOR_FIELDS = ('latitude', 'longitude', 'depth', 'temperature', 'ph',
+                 'water_quality', 'battery_level', 'speed')
+# Range per field (batas kolom Numeric(5, 2) = +-999.99); di luar range sampel ditolak
+SENSOR_RANGES = {
+    'latitude': (-90, 90),
+    'longitude': (-180, 180),
+    'depth': (0, 999.99),
+    'temperature': (-999.99, 999.99),
+    'ph': (0, 14),
+    'water_quality': (-999.99, 999.99),
+    'battery_level': (0, 100),
+    'speed': (0, 999.99),
+}
+
+
+class TelemetryError(ValueError):
+    pass
+
+
+def _timestamp(value, default):
+    """Epoch detik atau ISO 8601 -> datetime UTC naive (offset dikonversi ke UTC)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f'not a timestamp: {value!r}')
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value)
+    timestamp = datetime.fromisoformat(str(value))
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _number(value, bounds=None):
+    """Angka opsional dari JSON; selain None/int/float berhingga (termasuk bool, string) atau di luar bounds ditolak"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f'not a number: {value!r}')
+    if bounds is not None and not bounds[0] <= value <= bounds[1]:
+        raise ValueError(f'{value!r} outside {bounds}')
+    return value
+
+
+def _detections(value, mission_id, row, timestamp):
+    """waste_detected: list of dict; bentuk lain membuat sampel ditolak"""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(detection, dict) for detection in value):
+        raise ValueError('waste_detected must be a list of objects')
+    if not mission_id:
+        return []
+    return [{
+        'mission_id': mission_id,
+        'waste_type': str(detection.get('waste_type') or 'unknown'),
+        'weight': _number(detection.get('weight'), (0, 99999999.99)) or 0,
+        'location': {
+            'latitude': _number(detection.get('latitude', row['latitude']), SENSOR_RANGES['latitude']),
+            'longitude': _number(detection.get('longitude', row['longitude']), SENSOR_RANGES['longitude'])
+        },
+        'detected_at': timestamp
+    } for detection in value]
+
+
+def _parse(samples, now):
+    """
+    Validasi + bentuk baris sensor_data (tanpa akses DB). Return (rows, wastes, rejected).
+    Sampel yang tidak valid dihitung di `rejected`, tidak menggagalkan batch.
+    """
+    rows = []
+    wastes = []  # (row index, kwargs Waste)
+    rejected = 0
+    for sample in samples:
+        if not isinstance(sample, dict) or sample.get('robot_id') is None:
+            rejected += 1
+            continue
+        try:
+            robot_id = int(sample['robot_id'])
+            timestamp = _timestamp(sample.get('ts'), now)
+            row = {field: _number(sample.get(field), SENSOR_RANGES[field]) for field in SENSOR_FIELDS}
+            mission_id = int(sample['mission_id']) if sample.get('mission_id') is not None else None
+            detections = _detections(sample.get('waste_detected'), mission_id, row, timestamp)
+        except (TypeError, ValueError, OverflowError):
+            rejected += 1
+            continue
+
+        row.update({
+            'robot_id': robot_id,
+            'mission_id': mission_id,
+            'timestamp': timestamp,
+            'waste_detected': sample.get('waste_detected')
+        })
+        rows.append(row)
+        wastes.extend((len(rows) - 1, detection) for detection in detections)
+    return rows, wastes, rejected
+
+
+def _write(session, rows, wastes):
+    """Dijalankan writer (atau inline): buang sampel robot yang tidak dikenal, insert, update state robot"""
+    robot_ids = {row['robot_id'] for row in rows}
+    robots = {
+        robot.robot_id: robot
+        for robot in session.query(Robot).filter(Robot.robot_id.in_(robot_ids)).all()
+    } if robot_ids else {}
+
+    accepted = [row for row in rows if row['robot_id'] in robots]
+    if accepted:
+        session.execute(insert(SensorData), accepted)
+
+    latest = {}
+    for row in accepted:
+        previous = latest.get(row['robot_id'])
+        if previous is None or previous['timestamp'] <= row['timestamp']:
+            latest[row['robot_id']] = row
+
+    for robot_id, row in latest.items():
+        robot = robots[robot_id]
+        if row['battery_level'] is not None:
+            robot.battery_lvl = int(row['battery_level'])
+        if row['latitude'] is not None and row['longitude'] is not None:
+            robot.current_position = {
+                'latitude': row['latitude'],
+                'longitude': row['longitude'],
+                'depth': row['depth']
+            }
+
+    waste_rows = [Waste(**kwargs) for index, kwargs in wastes if rows[index]['robot_id'] in robots]
+    if waste_rows:
+        session.add_all(waste_rows)
+
+    return {
+        'accepted': len(accepted),
+        'rejected': len(rows) - len(accepted),
+        'robots': len(latest),
+        'wastes': len(waste_rows)
+    }
+
+
+def ingest_samples(samples):
+    """Simpan batch sampel telemetry. Return dict accepted/rejected/wastes"""
+    if not isinstance(samples, list):
+        raise TelemetryError('samples must be a list')
+    if len(samples) > MAX_BATCH:
+        raise TelemetryError(f'batch too large (max {MAX_BATCH} samples)')
+
+    rows, wastes, rejected = _parse(samples, datetime.utcnow())
+    if not rows:
+        return {'accepted': 0, 'rejected': rejected, 'robots': 0, 'wastes': 0}
+
+    # Lewat single writer (SQLite): banyak request digabung dalam satu transaksi
+    result = write_queue.run(lambda session: _write(session, rows, wastes), rows=len(rows))
+    result['rejected'] += rejected
+    return result
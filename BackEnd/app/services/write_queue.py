@@ -0,0 +1,206 @@
+"""
+Single-writer queue: write volume tinggi dijalankan satu thread writer yang
+menggabungkan banyak item ke satu transaksi (group commit), sehingga di SQLite
+hanya ada satu writer (tidak ada rebutan lock / busy retry) dan satu fsync
+dipakai bersama. Reader tetap berjalan paralel di koneksi lain (WAL).
+
+Item adalah callable `fn(session)` yang dijalankan di session ORM milik writer
+(event mapper/session seperti spatial index dan heatmap tetap jalan). Caller
+menunggu sampai transaksi batch-nya commit. Kalau batch gagal, item diulang
+satu per satu supaya hanya item yang salah yang menerima exception; karena itu
+fn harus bisa diulang (buat objek ORM baru di setiap pemanggilan).
+
+Untuk database selain file SQLite (atau WRITE_QUEUE_ENABLED=false), `run()`
+langsung menjalankan fn di `db.session` caller lalu commit.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.utils.database import is_sqlite_memory
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteQueueTimeout(RuntimeError):
+    pass
+
+
+class _Item:
+    __slots__ = ('fn', 'rows', 'future', 'enqueued_at')
+
+    def __init__(self, fn, rows):
+        self.fn = fn
+        self.rows = rows
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class WriteQueue:
+
+    def __init__(self):
+        self.enabled = False
+        self.max_batch = 256
+        self.max_rows = 20000
+        self.max_delay = 0.002
+        self.timeout = 30.0
+        self._app = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'items': 0, 'rows': 0, 'replayed_batches': 0, 'failed_items': 0}
+
+    def init_app(self, app):
+        self._app = app
+        enabled = app.config.get('WRITE_QUEUE_ENABLED')
+        if enabled is None or enabled == '':
+            uri = app.config['SQLALCHEMY_DATABASE_URI']
+            self.enabled = uri.startswith('sqlite') and not is_sqlite_memory(uri)
+        else:
+            self.enabled = str(enabled).lower() in ('1', 'true', 'yes')
+        self.max_batch = app.config.get('WRITE_QUEUE_MAX_BATCH', 256)
+        self.max_rows = app.config.get('WRITE_QUEUE_MAX_ROWS', 20000)
+        self.max_delay = app.config.get('WRITE_QUEUE_MAX_DELAY_MS', 2) / 1000.0
+        self.timeout = app.config.get('WRITE_QUEUE_TIMEOUT', 30)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def submit(self, fn, rows=1):
+        """Antrikan fn(session); return Future (hasil fn setelah commit)"""
+        item = _Item(fn, rows)
+        self._ensure_writer()
+        self._queue.put(item)
+        return item.future
+
+    def run(self, fn, rows=1):
+        """Jalankan fn(session) dan commit; blocking sampai selesai"""
+        if not self.enabled:
+            from app import db
+            try:
+                result = fn(db.session)
+                db.session.commit()
+                return result
+            except Exception:
+                db.session.rollback()
+                raise
+
+        future = self.submit(fn, rows)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            raise WriteQueueTimeout(f'write not committed within {self.timeout}s') from e
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def shutdown(self, timeout=10.0):
+        """Drain: item yang sudah diantrikan tetap ditulis sebelum thread berhenti"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer_loop, name='write-queue', daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _next_batch(self):
+        """Blok sampai ada item, lalu kumpulkan item berikutnya sampai max_batch/max_rows/max_delay"""
+        first = self._queue.get()
+        if first is _STOP:
+            return None, True
+        batch, rows = [first], first.rows
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch and rows < self.max_rows:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            rows += item.rows
+        return batch, False
+
+    def _writer_loop(self):
+        from app import db
+
+        with self._app.app_context():
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if batch:
+                    self._write(db.session, batch)
+            # Drain sisa antrian setelah stop
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    leftover.append(item)
+            if leftover:
+                self._write(db.session, leftover)
+            db.session.remove()
+
+    def _write(self, session, batch):
+        results = []
+        try:
+            with session.no_autoflush:
+                for item in batch:
+                    results.append(item.fn(session))
+            session.commit()
+        except Exception:
+            session.rollback()
+            self._replay(session, batch)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['items'] += len(batch)
+        self.stats['rows'] += sum(item.rows for item in batch)
+        for item, result in zip(batch, results):
+            item.future.set_result(result)
+
+    def _replay(self, session, batch):
+        """Batch gagal: ulang per item, masing-masing dengan transaksinya sendiri"""
+        self.stats['replayed_batches'] += 1
+        for item in batch:
+            try:
+                result = item.fn(session)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.stats['failed_items'] += 1
+                logger.warning('write queue item failed', extra={'error': str(e)})
+                item.future.set_exception(e)
+            else:
+                self.stats['batches'] += 1
+                self.stats['items'] += 1
+                self.stats['rows'] += item.rows
+                item.future.set_result(result)
+
+
+write_queue = WriteQueue()
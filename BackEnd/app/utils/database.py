@@ -0,0 +1,86 @@
+"""
+Opsi engine SQLAlchemy dari config: ukuran pool, overflow, recycle, pre-ping,
+dan profil PRAGMA SQLite yang di-set lewat event `connect`.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Profil PRAGMA SQLite (SQLITE_PROFILE); override per pragma lewat SQLITE_PRAGMAS="name=value,..."
+SQLITE_PROFILES = {
+    # Edge box: WAL (reader tidak memblokir writer), fsync hanya saat checkpoint
+    # (commit terakhir bisa hilang saat mati listrik, database tetap konsisten)
+    'edge': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # KiB (negatif) -> 64 MB per koneksi
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,
+    },
+    # WAL tapi fsync setiap commit
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16 * 1024,
+    },
+    # Default SQLite (rollback journal)
+    'none': {},
+}
+
+
+def is_sqlite_memory(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS sesuai dialect; nilai eksplisit di config tidak ditimpa"""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if url.get_backend_name() == 'sqlite':
+        if is_sqlite_memory(url):
+            return options  # StaticPool dari Flask-SQLAlchemy, tidak ada pool yang bisa diatur
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('timeout', config.get('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000.0)
+        options['connect_args'] = connect_args
+    else:
+        # Pre-ping hanya berguna untuk server DB (koneksi bisa diputus dari sisi server)
+        options.setdefault('pool_pre_ping', config.get('SQLALCHEMY_POOL_PRE_PING', True))
+
+    options.setdefault('pool_size', config.get('SQLALCHEMY_POOL_SIZE', 5))
+    options.setdefault('max_overflow', config.get('SQLALCHEMY_MAX_OVERFLOW', 10))
+    options.setdefault('pool_recycle', config.get('SQLALCHEMY_POOL_RECYCLE', 1800))
+    options.setdefault('pool_timeout', config.get('SQLALCHEMY_POOL_TIMEOUT', 30))
+    return options
+
+
+def sqlite_pragmas(config):
+    """PRAGMA (urutan berarti: journal_mode dulu) dari profil + override + busy timeout"""
+    profile = config.get('SQLITE_PROFILE', 'edge')
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f'Unknown SQLITE_PROFILE {profile!r} (choose from {", ".join(SQLITE_PROFILES)})')
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for item in (config.get('SQLITE_PRAGMAS') or '').split(','):
+        if '=' in item:
+            name, value = item.split('=', 1)
+            pragmas[name.strip()] = value.strip()
+    pragmas['busy_timeout'] = int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    return pragmas
+
+
+def configure_sqlite(engine, config):
+    """Terapkan profil PRAGMA ke setiap koneksi baru (file database saja)"""
+    if engine.dialect.name != 'sqlite' or is_sqlite_memory(engine.url):
+        return
+
+    statements = [f'PRAGMA {name}={value}' for name, value in sqlite_pragmas(config).items()]
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
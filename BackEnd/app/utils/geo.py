@@ -0,0 +1,187 @@
+import json
+import math
+
+# Geohash base32 alphabet (tanpa a, i, l, o)
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE_MAP = {c: i for i, c in enumerate(_BASE32)}
+
+# Karakter setelah 'z' dalam urutan ASCII, dipakai sebagai batas atas range query prefix.
+# Hanya benar kalau kolom dibandingkan per byte: lihat GEOHASH_COLLATION
+PREFIX_UPPER_BOUND = '{'
+# Collation byte-order untuk kolom geohash di PostgreSQL (collation locale mengurutkan '{'
+# sebelum huruf/angka sehingga range prefix salah). SQLite sudah BINARY secara default.
+GEOHASH_COLLATION = 'C'
+
+GEOHASH_PRECISION = 9  # ~4.8m x 4.8m per cell
+EARTH_RADIUS_M = 6371008.8
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode koordinat menjadi geohash string"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def decode_geohash_bbox(geohash):
+    """Decode geohash menjadi bounding box (min_lat, min_lon, max_lat, max_lon)"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    even = True
+
+    for char in geohash:
+        value = _DECODE_MAP[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                if bit:
+                    lon_lo = mid
+                else:
+                    lon_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lon_lo, lat_hi, lon_hi
+
+
+def cell_size_degrees(precision):
+    """Ukuran cell geohash (lat_deg, lon_deg) untuk precision tertentu"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Jarak great-circle dalam meter"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(latitude, longitude, radius_m):
+    """Bounding box yang melingkupi lingkaran radius_m di sekitar titik"""
+    d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    d_lon = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+    return (
+        max(-90.0, latitude - d_lat),
+        max(-180.0, longitude - d_lon),
+        min(90.0, latitude + d_lat),
+        min(180.0, longitude + d_lon)
+    )
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon, max_cells=32, max_precision=GEOHASH_PRECISION):
+    """
+    Cari set geohash prefix yang menutupi bounding box.
+    Precision dipilih setinggi mungkin selama jumlah cell <= max_cells,
+    sehingga setiap prefix menjadi satu range scan pada index B-tree.
+    """
+    best = None
+    for precision in range(1, max_precision + 1):
+        lat_step, lon_step = cell_size_degrees(precision)
+        rows = int(math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step)) + 1
+        cols = int(math.floor(max_lon / lon_step) - math.floor(min_lon / lon_step)) + 1
+        if rows * cols > max_cells:
+            break
+        best = precision
+
+    if best is None:
+        best = 1
+
+    lat_step, lon_step = cell_size_degrees(best)
+    cells = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            cells.add(encode_geohash(lat, lon, best))
+            if lon >= max_lon:
+                break
+            lon = min(lon + lon_step, max_lon)
+        if lat >= max_lat:
+            break
+        lat = min(lat + lat_step, max_lat)
+
+    return sorted(cells)
+
+
+def position_latlon(position):
+    """Ambil (latitude, longitude) dari dict position JSON, atau None"""
+    if isinstance(position, str):
+        try:
+            position = json.loads(position)
+        except ValueError:
+            return None
+    if not isinstance(position, dict):
+        return None
+    latitude = position.get('latitude')
+    longitude = position.get('longitude')
+    if latitude is None or longitude is None:
+        return None
+    try:
+        return float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+
+
+def in_bbox(latitude, longitude, min_lat, min_lon, max_lat, max_lon):
+    return min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon
+
+
+def latlon_to_tile(latitude, longitude, zoom):
+    """Koordinat -> index tile slippy map (x, y) pada zoom tertentu"""
+    latitude = max(min(latitude, 85.05112878), -85.05112878)
+    n = 1 << zoom
+    x = int((longitude + 180.0) / 360.0 * n)
+    lat_rad = math.radians(latitude)
+    y = int((1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_to_latlon(x, y, zoom):
+    """Pojok kiri-atas (north-west) tile -> (latitude, longitude)"""
+    n = 1 << zoom
+    longitude = x / n * 360.0 - 180.0
+    latitude = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return latitude, longitude
@@ -0,0 +1,30 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Select
+
+
+def upsert(dialect_name, table, rows, index_elements, set_=None):
+    """
+    Build statement INSERT ... ON CONFLICT untuk SQLite dan PostgreSQL.
+
+    rows berupa list dict, Select (INSERT ... SELECT; label kolom = nama kolom
+    tabel, dan Select harus punya WHERE supaya SQLite tidak salah parse ON CONFLICT),
+    atau None (parameter diberikan saat execute -> executemany, statement cukup di-compile sekali).
+    set_ adalah callable(excluded) -> dict kolom yang di-update saat konflik,
+    contoh: lambda excluded: {'count': table.c.count + excluded.count}.
+    Kalau None, baris yang konflik diabaikan (ON CONFLICT DO NOTHING).
+    """
+    if dialect_name == 'postgresql':
+        stmt = postgresql.insert(table)
+    elif dialect_name == 'sqlite':
+        stmt = sqlite.insert(table)
+    else:
+        raise NotImplementedError(f'Upsert is not supported for dialect {dialect_name}')
+
+    if isinstance(rows, Select):
+        stmt = stmt.from_select([column.name for column in rows.selected_columns], rows)
+    elif rows is not None:
+        stmt = stmt.values(rows)
+
+    if set_ is None:
+        return stmt.on_conflict_do_nothing(index_elements=index_elements)
+    return stmt.on_conflict_do_update(index_elements=index_elements, set_=set_(stmt.excluded))
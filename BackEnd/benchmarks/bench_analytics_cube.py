@@ -0,0 +1,211 @@
+"""
+Benchmark cube analitik: query dashboard dari cube NumPy vs scan ad-hoc tabel sumber.
+
+Database SQLite file baru diisi `--bookings` booking (beserta payment) dan
+`--missions` misi tersebar `--years` tahun ke belakang. Diukur: rebuild penuh,
+refresh incremental setelah `--changes` booking berubah, sinkron cube ke memori,
+lalu latency query roll-up (revenue per lokasi per bulan, utilisasi per model per
+minggu, ...) dibanding GROUP BY langsung ke booking/payment/mission.
+Run: python benchmarks/bench_analytics_cube.py [--bookings 200000] [--missions 50000] [--years 3] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CHUNK = 20000
+MODELS = ('CleanBot', 'Vision AI')
+LOCATIONS = ('Teluk Jakarta', 'Bali', 'Lombok', 'Kepulauan Seribu', 'Surabaya')
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+        ANALYTICS_CUBE_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(args):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking, Payment
+    from app.models.mission import Mission
+    from app.models.robot import Robot
+    from app.models.user import Role, User
+
+    role = Role(role_name='customer')
+    db.session.add(role)
+    db.session.flush()
+    db.session.add(User(username='bench', email='bench@x', password='x', full_name='bench', role_id=role.role_id))
+    db.session.execute(insert(Robot.__table__), [{
+        'robot_name': f'r{i}', 'model_type': MODELS[i % len(MODELS)], 'location': LOCATIONS[i % len(LOCATIONS)],
+        'status': 'active'
+    } for i in range(args.robots)])
+    db.session.commit()
+
+    rng = np.random.default_rng(args.seed)
+    now = datetime.utcnow()
+    loaded = now - timedelta(hours=1)  # data historis: di luar overlap watermark refresh
+    span = args.years * 365
+    statuses = np.array(['confirmed', 'active', 'completed', 'completed', 'cancelled'])
+    for offset in range(0, args.bookings, CHUNK):
+        n = min(CHUNK, args.bookings - offset)
+        starts = rng.uniform(-span, 0, n)
+        durations = rng.integers(1, 10, n)
+        picked = statuses[rng.integers(0, len(statuses), n)]
+        robots = rng.integers(1, args.robots + 1, n)
+        db.session.execute(insert(Booking.__table__), [{
+            'user_id': 1, 'robot_id': int(robot), 'booking_type': 'rental',
+            'start_date': now + timedelta(days=float(start)), 'end_date': now + timedelta(days=float(start) + int(days)),
+            'duration_days': int(days), 'location': LOCATIONS[int(robot) % len(LOCATIONS)], 'status': str(status),
+            'total_cost': 1500000 * int(days), 'created_at': loaded, 'updated_at': loaded
+        } for start, days, status, robot in zip(starts, durations, picked, robots)])
+        db.session.execute(insert(Payment.__table__), [{
+            'booking_id': offset + i + 1, 'amount': 1500000 * int(days), 'method': 'e-wallet', 'status': 'completed',
+            'paid_at': now + timedelta(days=float(start)), 'created_at': loaded, 'updated_at': loaded
+        } for i, (start, days, status) in enumerate(zip(starts, durations, picked)) if status != 'cancelled'])
+    for offset in range(0, args.missions, CHUNK):
+        n = min(CHUNK, args.missions - offset)
+        starts = rng.uniform(-span, 0, n)
+        db.session.execute(insert(Mission.__table__), [{
+            'robot_id': int(rng.integers(1, args.robots + 1)), 'name': 'bench', 'status': 'completed',
+            'start_time': now + timedelta(days=float(start)), 'end_time': now + timedelta(days=float(start), hours=3),
+            'area_covered': 1.2, 'waste_collected': 15, 'created_at': loaded, 'updated_at': loaded
+        } for start in starts])
+    db.session.commit()
+
+
+def baseline_queries():
+    """Dashboard yang sama langsung ke tabel sumber (GROUP BY per request)"""
+    from sqlalchemy import func, select
+    from app import db
+    from app.models.booking import Booking, Payment
+    from app.models.mission import Mission
+    from app.models.robot import Robot
+
+    month = func.strftime('%Y-%m', Payment.paid_at)
+    week = func.strftime('%Y-%W', Booking.start_date)
+    return {
+        'revenue per location per month': lambda: db.session.execute(
+            select(Booking.location, month, func.sum(Payment.amount)).join(Booking, Booking.booking_id == Payment.booking_id)
+            .where(Payment.status == 'completed').group_by(Booking.location, month)).all(),
+        'booked days per model per week': lambda: db.session.execute(
+            select(Robot.model_type, week, func.sum(Booking.duration_days)).join(Robot, Robot.robot_id == Booking.robot_id)
+            .where(Booking.status.in_(('confirmed', 'active', 'completed'))).group_by(Robot.model_type, week)).all(),
+        'missions per robot': lambda: db.session.execute(
+            select(Mission.robot_id, func.count(), func.sum(Mission.waste_collected)).group_by(Mission.robot_id)).all(),
+    }
+
+
+def cube_queries(cube):
+    last_year = date.today() - timedelta(days=365)
+    return {
+        'revenue per location per month': lambda: cube.query(group_by=['location'], grain='month',
+                                                              measures=['revenue']),
+        'booked days per model per week': lambda: cube.query(group_by=['model_type'], grain='week',
+                                                             measures=['booked_days']),
+        'missions per robot': lambda: cube.query(group_by=['robot_id'], measures=['missions', 'waste_collected'],
+                                                 filters={'booking_type': ['mission']}),
+        'utilisation per model (last year)': lambda: cube.query(group_by=['model_type'], start=last_year,
+                                                               measures=['booked_days']),
+    }
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analytics cube: NumPy roll-up vs ad-hoc GROUP BY over source tables')
+    parser.add_argument('--bookings', type=int, default=200000)
+    parser.add_argument('--missions', type=int, default=50000)
+    parser.add_argument('--robots', type=int, default=200)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--changes', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    os.environ.setdefault('LOG_ENABLED', 'false')
+    os.environ.setdefault('SLOW_QUERY_LOG_ENABLED', 'false')
+    from sqlalchemy import select, update
+    from app import db
+    from app.models.booking import Booking
+    from app.services.analytics_cube import analytics_cube
+
+    with tempfile.TemporaryDirectory(prefix='bench_cube_') as tmpdir:
+        app = make_app('sqlite:///' + os.path.join(tmpdir, 'cube.db'))
+        with app.app_context():
+            populate(args)
+            db.session.remove()
+
+            full = analytics_cube.refresh(full=True)
+            # Perubahan realistis: booking 30 hari terakhir dibatalkan
+            recent = db.session.scalars(
+                select(Booking.booking_id).where(Booking.start_date >= datetime.utcnow() - timedelta(days=30))
+                .limit(args.changes)
+            ).all()
+            db.session.execute(update(Booking).where(Booking.booking_id.in_(recent))
+                               .values(status='cancelled', updated_at=datetime.utcnow()))
+            db.session.commit()
+            db.session.remove()
+            incremental = analytics_cube.refresh(full=False)
+
+            queries = {}
+            baseline = baseline_queries()
+            for name, fn in cube_queries(analytics_cube).items():
+                queries[name] = {'cube_ms': round(timed(fn, args.repeat), 2)}
+                if name in baseline:
+                    queries[name]['baseline_ms'] = round(timed(baseline[name], args.repeat), 2)
+            db.session.remove()
+            status = analytics_cube.status()
+
+    output = {
+        'bookings': args.bookings,
+        'missions': args.missions,
+        'years': args.years,
+        'cells': status['cells'],
+        'cube_memory_mb': round(status['memory_bytes'] / 1e6, 1),
+        'full_rebuild': full,
+        'incremental_refresh': incremental,
+        'queries': queries
+    }
+    if args.json:
+        print(json.dumps(output, indent=2))
+        return 0
+
+    print(f"bookings={args.bookings} missions={args.missions} years={args.years} cells={output['cells']} "
+          f"({output['cube_memory_mb']} MB)")
+    print(f"full rebuild        {full['elapsed_ms']:>10.1f} ms  ({full['days']} days, {full['cells_written']} cells)")
+    print(f"incremental refresh {incremental['elapsed_ms']:>10.1f} ms  ({len(recent)} bookings changed, "
+          f"{incremental['days']} days, {incremental['cells_written']} cells)")
+    print(f"{'query':<36}{'cube ms':>10}{'scan ms':>10}")
+    for name, row in queries.items():
+        baseline_ms = f"{row['baseline_ms']:>10.2f}" if 'baseline_ms' in row else f"{'-':>10}"
+        print(f"{name:<36}{row['cube_ms']:>10.2f}{baseline_ms}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Benchmark tick scheduler lifecycle booking terhadap ukuran tabel booking.
+
+Untuk setiap ukuran tabel (subprocess terpisah), database SQLite file baru diisi
+N booking (sebagian besar transisinya jauh di masa depan) ditambah `--due`
+booking yang jatuh tempo.
+Diukur: durasi satu tick (index `next_transition_at`) vs scan baseline yang
+mencari kandidat transisi dari status + tanggal tanpa kolom jadwal.
+Run: python benchmarks/bench_booking_lifecycle.py [--sizes 10000,100000,300000] [--due 1000] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CHUNK = 20000
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(size, due, seed):
+    """Isi tabel booking: `size` booking masa depan + `due` booking confirmed yang sudah mulai"""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+    from app.models.robot import Robot
+    from app.models.user import Role, User
+    from app.services.booking_lifecycle import refresh_next_transitions
+
+    role = Role(role_name='customer')
+    db.session.add(role)
+    db.session.flush()
+    db.session.add(User(username='bench', email='bench@x', password='x', full_name='bench', role_id=role.role_id))
+    db.session.add_all([Robot(robot_name=f'r{i}', status='active') for i in range(50)])
+    db.session.commit()
+
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    statuses = np.array(['confirmed', 'active', 'completed', 'cancelled'])
+    for offset in range(0, size, CHUNK):
+        n = min(CHUNK, size - offset)
+        # Masa depan: mulai 30-365 hari lagi; yang jatuh tempo dipilih terpisah di bawah
+        start_days = rng.uniform(30, 365, n)
+        picked = statuses[rng.integers(0, len(statuses), n)]
+        db.session.execute(insert(Booking.__table__), [{
+            'user_id': 1, 'robot_id': int(rng.integers(1, 51)), 'booking_type': 'rental',
+            'start_date': now + timedelta(days=float(start)), 'end_date': now + timedelta(days=float(start) + 3),
+            'duration_days': 3, 'status': str(status), 'total_cost': 4500000, 'created_at': now, 'updated_at': now
+        } for start, status in zip(start_days, picked)])
+    # Booking confirmed yang sudah mulai (jatuh tempo menjadi active)
+    db.session.execute(insert(Booking.__table__), [{
+        'user_id': 1, 'robot_id': int(rng.integers(1, 51)), 'booking_type': 'rental',
+        'start_date': now - timedelta(hours=1), 'end_date': now + timedelta(days=2), 'duration_days': 2,
+        'status': 'confirmed', 'total_cost': 3000000, 'created_at': now, 'updated_at': now
+    } for _ in range(due)])
+    refresh_next_transitions(db.session)
+    db.session.commit()
+
+
+def baseline_scan(now):
+    """Cari kandidat transisi tanpa kolom jadwal: filter status + tanggal (tanpa index komposit)"""
+    from sqlalchemy import and_, or_, select
+    from app import db
+    from app.models.booking import Booking
+
+    table = Booking.__table__
+    return len(db.session.execute(
+        select(table.c.booking_id, table.c.status).where(or_(
+            and_(table.c.status == 'confirmed', table.c.booking_type == 'rental', table.c.start_date <= now),
+            and_(table.c.status == 'active', table.c.end_date <= now)
+        ))
+    ).all())
+
+
+def run_size(args):
+    """Dijalankan di subprocess untuk satu ukuran tabel"""
+    from app import db
+    from app.services.booking_lifecycle import booking_lifecycle
+
+    size = args.size
+    app = make_app(args.database_url)
+    with app.app_context():
+        started = time.perf_counter()
+        populate(size, args.due, args.seed)
+        populate_s = time.perf_counter() - started
+        now = datetime.utcnow()
+
+        started = time.perf_counter()
+        candidates = baseline_scan(now)
+        scan_ms = (time.perf_counter() - started) * 1000
+        db.session.remove()
+
+        booking_lifecycle.batch_size = args.batch
+        started = time.perf_counter()
+        transitions = booking_lifecycle.tick(now)
+        tick_ms = (time.perf_counter() - started) * 1000
+
+        # Tick kedua: tidak ada yang jatuh tempo lagi
+        started = time.perf_counter()
+        booking_lifecycle.tick(now)
+        idle_ms = (time.perf_counter() - started) * 1000
+        db.session.remove()
+
+    output = {
+        'bookings': size + args.due,
+        'due': args.due,
+        'populate_s': round(populate_s, 2),
+        'baseline_scan_ms': round(scan_ms, 2),
+        'baseline_candidates': candidates,
+        'tick_ms': round(tick_ms, 2),
+        'transitions': transitions,
+        'idle_tick_ms': round(idle_ms, 3)
+    }
+    with open(args.result, 'w') as f:
+        json.dump(output, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Booking lifecycle tick cost vs table size')
+    parser.add_argument('--sizes', default='10000,100000,300000')
+    parser.add_argument('--due', type=int, default=1000)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size:
+        return run_size(args)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench_lifecycle_') as tmpdir:
+        for size in (int(value) for value in args.sizes.split(',')):
+            result_path = os.path.join(tmpdir, f'{size}.json')
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), '--size', str(size),
+                '--database-url', 'sqlite:///' + os.path.join(tmpdir, f'bookings_{size}.db'),
+                '--result', result_path, '--due', str(args.due), '--batch', str(args.batch), '--seed', str(args.seed)
+            ], env=dict(os.environ, LOG_ENABLED='false', SLOW_QUERY_LOG_ENABLED='false'), check=True)
+            with open(result_path) as f:
+                results.append(json.load(f))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"due={args.due} batch={args.batch}")
+    print(f"{'bookings':>10}{'scan ms':>10}{'tick ms':>10}{'idle ms':>10}{'moved':>8}")
+    for row in results:
+        print(f"{row['bookings']:>10}{row['baseline_scan_ms']:>10.2f}{row['tick_ms']:>10.2f}"
+              f"{row['idle_tick_ms']:>10.3f}{row['transitions']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Benchmark overhead change data capture per commit.
+
+Database SQLite file baru diisi `--robots` robot. Tiga workload commit dijalankan
+bergantian (per ronde) dalam beberapa mode: CDC mati, CDC tanpa subscriber,
+CDC + subscriber (callback + antrian yang di-drain thread lain), CDC + log
+append-only. Diukur: latency commit per workload (rata-rata, p50, p99) dan
+selisihnya terhadap mode mati, plus biaya publish per commit dari status stream.
+Run: python benchmarks/bench_cdc.py [--commits 4000] [--rounds 8] [--batch 100] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ('off', 'on', 'subscribers', 'log')
+WORKLOADS = ('robot_update', 'booking_insert', 'telemetry_batch')
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+        ANALYTICS_CUBE_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(robots):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.robot import Robot
+    from app.models.user import Role, User
+
+    role = Role(role_name='customer')
+    db.session.add(role)
+    db.session.flush()
+    db.session.add(User(username='bench', email='bench@x', password='x', full_name='bench', role_id=role.role_id))
+    db.session.execute(insert(Robot.__table__), [{'robot_name': f'r{i}', 'status': 'active'} for i in range(robots)])
+    db.session.commit()
+
+
+def workloads(args, rng):
+    """Satu commit per pemanggilan"""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+    from app.models.mission import SensorData
+    from app.models.robot import Robot
+
+    def robot_update():
+        robot = db.session.get(Robot, int(rng.integers(1, args.robots + 1)))
+        robot.battery_lvl = int(rng.integers(0, 101))
+        robot.status = 'active' if robot.status != 'active' else 'idle'
+        db.session.commit()
+
+    def booking_insert():
+        now = datetime.utcnow()
+        db.session.add(Booking(user_id=1, robot_id=int(rng.integers(1, args.robots + 1)), booking_type='rental',
+                               start_date=now, end_date=now, duration_days=1, status='pending',
+                               total_cost=1500000))
+        db.session.commit()
+
+    def telemetry_batch():
+        now = datetime.utcnow()
+        db.session.execute(insert(SensorData), [{
+            'robot_id': int(robot), 'timestamp': now, 'battery_level': 80, 'latitude': -6.1, 'longitude': 106.8
+        } for robot in rng.integers(1, args.robots + 1, args.batch)])
+        db.session.commit()
+
+    return {'robot_update': robot_update, 'booking_insert': booking_insert, 'telemetry_batch': telemetry_batch}
+
+
+def set_mode(stream, mode, log_path, state):
+    stream.enabled = mode != 'off'
+    stream.log_path = log_path if mode == 'log' else None
+    stream._close_log()
+    for subscription in state.pop('subscriptions', []):
+        subscription.close()
+    if mode == 'subscribers':
+        received = state.setdefault('received', [0])
+        queue = stream.subscribe()
+        callback = stream.subscribe(callback=lambda events: received.__setitem__(0, received[0] + len(events)),
+                                    tables=['robot', 'booking'])
+        state['subscriptions'] = [queue, callback]
+
+        def drain():
+            while queue in stream._subscribers:
+                received[0] += len(queue.get(timeout=0.1))
+
+        threading.Thread(target=drain, daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Change data capture overhead per commit')
+    parser.add_argument('--commits', type=int, default=4000, help='commit per workload per mode')
+    parser.add_argument('--rounds', type=int, default=8)
+    parser.add_argument('--robots', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=100, help='baris sensor_data per commit telemetry')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    from app import db
+    from app.services.change_stream import change_stream
+
+    rng = np.random.default_rng(args.seed)
+    timings = {(mode, name): [] for mode in MODES for name in WORKLOADS}
+    publish = {}
+    with tempfile.TemporaryDirectory(prefix='bench_cdc_') as tmpdir:
+        app = make_app('sqlite:///' + os.path.join(tmpdir, 'cdc.db'))
+        log_path = os.path.join(tmpdir, 'cdc.jsonl')
+        state = {}
+        with app.app_context():
+            populate(args.robots)
+            calls = workloads(args, rng)
+            per_round = max(1, args.commits // args.rounds)
+            for round_ in range(args.rounds):
+                # Urutan mode digeser tiap ronde: tabel terus tumbuh, jangan sampai satu mode selalu terakhir
+                for mode in MODES[round_ % len(MODES):] + MODES[:round_ % len(MODES)]:
+                    set_mode(change_stream, mode, log_path, state)
+                    before = dict(change_stream.stats)
+                    for name in WORKLOADS:
+                        call = calls[name]
+                        samples = timings[(mode, name)]
+                        for _ in range(per_round):
+                            started = time.perf_counter()
+                            call()
+                            samples.append(time.perf_counter() - started)
+                    commits = change_stream.stats['commits'] - before['commits']
+                    seconds = change_stream.stats['publish_s'] - before['publish_s']
+                    total = publish.setdefault(mode, [0, 0.0])
+                    total[0] += commits
+                    total[1] += seconds
+            set_mode(change_stream, 'off', log_path, state)
+            db.session.remove()
+            log_bytes = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+            status = change_stream.status()
+
+    results = {}
+    for name in WORKLOADS:
+        baseline = float(np.mean(timings[('off', name)]))
+        results[name] = {}
+        for mode in MODES:
+            samples = np.array(timings[(mode, name)]) * 1e6
+            results[name][mode] = {
+                'mean_us': round(float(samples.mean()), 1),
+                'p50_us': round(float(np.percentile(samples, 50)), 1),
+                'p99_us': round(float(np.percentile(samples, 99)), 1),
+                'overhead_us': round(float(samples.mean()) - baseline * 1e6, 1)
+            }
+    output = {
+        'commits_per_mode': per_round * args.rounds,
+        'telemetry_batch': args.batch,
+        'workloads': results,
+        'publish_us_per_commit': {mode: round(seconds / commits * 1e6, 1) for mode, (commits, seconds) in
+                                  publish.items() if commits},
+        'events': status['stats']['events'],
+        'subscriber_events': state.get('received', [0])[0],
+        'log_bytes': log_bytes
+    }
+    if args.json:
+        print(json.dumps(output, indent=2))
+        return 0
+
+    print(f"commits per workload per mode={output['commits_per_mode']} telemetry batch={args.batch} "
+          f"events={output['events']} log={log_bytes / 1e6:.1f} MB")
+    print(f"{'workload':<18}{'mode':<13}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'overhead':>10}")
+    for name, modes in results.items():
+        for mode, row in modes.items():
+            print(f"{name:<18}{mode:<13}{row['mean_us']:>10.1f}{row['p50_us']:>10.1f}{row['p99_us']:>10.1f}"
+                  f"{row['overhead_us']:>10.1f}")
+    print('publish per commit: ' + ', '.join(f'{mode} {value} us'
+                                             for mode, value in output['publish_us_per_commit'].items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Benchmark export laporan bookings: streaming (server-side cursor per chunk ke
+CSV / CSV gzip / Parquet) vs baseline ORM (`Booking.query.all()` + to_dict + JSON).
+
+Database SQLite file diisi sekali (`--rows` booking), lalu setiap konfigurasi
+dijalankan di subprocess terpisah supaya peak RSS (ru_maxrss) tiap export
+bisa dibandingkan. Diukur: durasi, baris/detik, ukuran output, kenaikan peak RSS.
+Default `--sqlite-pragmas` mematikan mmap dan mengecilkan page cache SQLite supaya
+halaman file database yang terbaca tidak ikut terhitung di RSS.
+Run: python benchmarks/bench_exports.py [--rows 300000] [--configs orm-json,csv,csv-gzip,parquet] [--json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CONFIGS = {
+    'orm-json': None,
+    'csv': ('csv', None),
+    'csv-gzip': ('csv', 'gzip'),
+    'parquet': ('parquet', 'snappy'),
+}
+CHUNK = 20000
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(rows, seed):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+    from app.models.robot import Robot
+    from app.models.user import Role, User
+
+    role = Role(role_name='customer')
+    db.session.add(role)
+    db.session.flush()
+    db.session.add(User(username='bench', email='bench@x', password='x', full_name='bench', role_id=role.role_id))
+    db.session.add_all([Robot(robot_name=f'r{i}', status='active') for i in range(50)])
+    db.session.commit()
+
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    statuses = np.array(['pending', 'confirmed', 'active', 'completed', 'cancelled'])
+    for offset in range(0, rows, CHUNK):
+        n = min(CHUNK, rows - offset)
+        start_days = rng.uniform(-365, 0, n)
+        picked = statuses[rng.integers(0, len(statuses), n)]
+        db.session.execute(insert(Booking.__table__), [{
+            'user_id': 1, 'robot_id': int(rng.integers(1, 51)), 'booking_type': 'rental',
+            'start_date': now + timedelta(days=float(start)), 'end_date': now + timedelta(days=float(start) + 3),
+            'duration_days': 3, 'location': 'Teluk Jakarta', 'status': str(status), 'total_cost': 4500000,
+            'created_at': now + timedelta(days=float(start)), 'updated_at': now
+        } for start, status in zip(start_days, picked)])
+    db.session.commit()
+
+
+def run_config(args):
+    """Dijalankan di subprocess untuk satu konfigurasi"""
+    from app import db
+    from app.models.booking import Booking
+    from app.services.exports import Export
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        if args.config == 'populate':
+            populate(args.rows, args.seed)
+            return 0
+
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        size = rows = 0
+        if CONFIGS[args.config] is None:
+            bookings = Booking.query.order_by(Booking.booking_id).all()
+            rows = len(bookings)
+            size = len(json.dumps({'bookings': [booking.to_dict() for booking in bookings]}).encode())
+        else:
+            fmt, compression = CONFIGS[args.config]
+            export = Export('bookings', fmt=fmt, compression=compression, engine=db.engine,
+                            chunk_rows=args.chunk_rows)
+            for data in export:
+                size += len(data)
+            rows = args.rows
+        seconds = time.perf_counter() - started
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    output = {
+        'config': args.config,
+        'rows': rows,
+        'seconds': round(seconds, 2),
+        'rows_per_s': round(rows / seconds),
+        'output_mb': round(size / 1e6, 1),
+        'peak_rss_delta_mb': round((peak_rss - baseline_rss) / 1024, 1)
+    }
+    with open(args.result, 'w') as f:
+        json.dump(output, f)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report export: streamed CSV/Parquet vs ORM load + JSON')
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--configs', default=','.join(CONFIGS))
+    parser.add_argument('--chunk-rows', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sqlite-pragmas', default='mmap_size=0,cache_size=-2000')
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        return run_config(args)
+
+    env = dict(os.environ, LOG_ENABLED='false', SLOW_QUERY_LOG_ENABLED='false', SQLITE_PRAGMAS=args.sqlite_pragmas)
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench_exports_') as tmpdir:
+        database_url = 'sqlite:///' + os.path.join(tmpdir, 'exports.db')
+        common = ['--database-url', database_url, '--rows', str(args.rows), '--seed', str(args.seed),
+                  '--chunk-rows', str(args.chunk_rows)]
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--config', 'populate', *common],
+                       env=env, check=True)
+        for name in args.configs.split(','):
+            result_path = os.path.join(tmpdir, f'{name}.json')
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--config', name, '--result', result_path,
+                            *common], env=env, check=True)
+            with open(result_path) as f:
+                results.append(json.load(f))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"rows={args.rows} chunk={args.chunk_rows}")
+    print(f"{'config':<10}{'seconds':>9}{'rows/s':>10}{'output MB':>11}{'peak RSS +MB':>14}")
+    for row in results:
+        print(f"{row['config']:<10}{row['seconds']:>9.2f}{row['rows_per_s']:>10}{row['output_mb']:>11.1f}"
+              f"{row['peak_rss_delta_mb']:>14.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+Benchmark HTTP in-process: app dijalankan di proses yang sama dengan database
+seeded, lalu workload terskrip dijalankan dengan konkurensi (thread + test client).
+Run: python benchmarks/bench_http.py [--scale small] [--workloads all] [--concurrency 8]
+                                     [--requests 400] [--database-url URL]
+                                     [--output result.json] [--compare baseline.json]
+
+Output JSON per workload per endpoint: throughput, p50/p95/p99 dan queries per request
+(termasuk statement write queue milik request), untuk dibandingkan antar commit (--compare).
+Endpoint dengan error atau worker yang berhenti membuat run gagal (exit 1) dan tidak
+dibandingkan kecepatannya. Scheduler latar belakang (booking lifecycle, cube, reconciler
+payment) dimatikan; booking dibuat relatif ke NOW dataset seed.
+
+Database di-drop lalu di-seed ulang: --database-url hanya diterima kalau nama
+database-nya mengandung `bench` (mis. postgresql://.../sealen_bench) atau file SQLite
+di direktori temporary.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.services.pricing import PRICING_LOOKBACK_DAYS  # noqa: E402
+from app.services.write_queue import write_queue  # noqa: E402
+from benchmarks.fixtures import NOW, PASSWORD, SCALES, seed_database  # noqa: E402
+from simulator.fleet import Fleet  # noqa: E402
+
+
+class QueryCounter:
+    """
+    Hitung statement SQL per request. Request test client berjalan di thread pemanggil;
+    statement item write queue yang diantrikan request dihitung ke request itu walau
+    dieksekusi di thread writer. Statement thread lain (flush operation log, worker
+    payment) masuk `background`.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.background = 0
+
+    def attach(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+        submit = write_queue.submit
+
+        def counted_submit(fn, rows=1):
+            box = getattr(self._local, 'box', None)
+            if box is None:
+                return submit(fn, rows)
+
+            def owned(session):
+                self._local.owner = box
+                try:
+                    return fn(session)
+                finally:
+                    self._local.owner = None
+            return submit(owned, rows)
+
+        write_queue.submit = counted_submit
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        box = getattr(self._local, 'owner', None) or getattr(self._local, 'box', None)
+        if box is None:
+            with self._lock:
+                self.background += 1
+        else:
+            box[0] += 1
+
+    def reset(self):
+        self._local.box = [0]
+
+    @property
+    def count(self):
+        return self._local.box[0]
+
+
+class Recorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def add(self, label, seconds, queries, ok):
+        with self._lock:
+            row = self.endpoints.setdefault(label, {'latency': [], 'queries': [], 'errors': 0})
+            row['latency'].append(seconds)
+            row['queries'].append(queries)
+            if not ok:
+                row['errors'] += 1
+
+    def summary(self, elapsed):
+        result = {}
+        for label, row in sorted(self.endpoints.items()):
+            latency = np.asarray(row['latency']) * 1000
+            queries = np.asarray(row['queries'])
+            p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+            result[label] = {
+                'requests': int(len(latency)),
+                'errors': row['errors'],
+                'throughput_rps': round(len(latency) / elapsed, 1),
+                'p50_ms': round(float(p50), 2),
+                'p95_ms': round(float(p95), 2),
+                'p99_ms': round(float(p99), 2),
+                'max_ms': round(float(latency.max()), 2),
+                'queries_per_request': round(float(queries.mean()), 2),
+                'queries_max': int(queries.max())
+            }
+        return result
+
+
+class Session:
+    """State satu worker: test client, token, RNG"""
+
+    def __init__(self, bench, worker):
+        self.bench = bench
+        self.worker = worker
+        self.client = bench.app.test_client()
+        self.rng = np.random.default_rng([bench.seed, worker])
+        self.recorder = None
+        self.fleet = None
+
+    def call(self, label, method, path, role=None, expected=(200, 201, 202), **kwargs):
+        headers = kwargs.pop('headers', {})
+        if role:
+            headers['Authorization'] = f'Bearer {self.bench.tokens[role]}'
+        counter = self.bench.queries
+        counter.reset()
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.recorder.add(label, elapsed, counter.count, response.status_code in expected)
+        return response
+
+
+# ----------------------------------------------------------------------
+# Workloads: satu fungsi = satu request per iterasi
+# ----------------------------------------------------------------------
+def login_storm(session, i):
+    customer = int(session.rng.integers(0, session.bench.dataset['customer_count']))
+    session.call('POST /api/auth/login', 'POST', '/api/auth/login',
+                 json={'email': f'customer{customer}@bench.local', 'password': PASSWORD})
+
+
+DASHBOARD_PATHS = ('/api/dashboard/overview', '/api/dashboard/robots/status',
+                   '/api/dashboard/activity-log', '/api/dashboard/bookings')
+
+
+def dashboard_polling(session, i):
+    path = DASHBOARD_PATHS[i % len(DASHBOARD_PATHS)]
+    session.call(f'GET {path}', 'GET', path, role='admin')
+
+
+def fleet_status(session, i):
+    if i % 2 == 0:
+        session.call('GET /api/robots', 'GET', '/api/robots', role='operator')
+    else:
+        robot_id = int(session.rng.choice(session.bench.dataset['robot_ids']))
+        session.call('GET /api/robots/<id>/status', 'GET', f'/api/robots/{robot_id}/status', role='operator')
+
+
+def bookings(session, i):
+    if i % 4 == 3:
+        robot_id = int(session.rng.choice(session.bench.dataset['robot_ids']))
+        session.call('POST /api/bookings', 'POST', '/api/bookings', role='customer', json={
+            'booking_type': 'rental', 'robot_id': robot_id, 'duration_days': int(session.rng.integers(1, 7)),
+            # Relatif ke NOW dataset supaya bentrok dengan booking seed; lookback tarif diperpanjang ke NOW
+            'start_date': f'{(NOW + timedelta(days=7 + i % 30)).date()}T08:00:00'
+        })
+    else:
+        session.call('GET /api/bookings', 'GET', '/api/bookings', role='customer')
+
+
+def telemetry_ingest(session, i):
+    bench = session.bench
+    if session.fleet is None:
+        robot_ids = bench.dataset['robot_ids']
+        chosen = session.rng.choice(robot_ids, size=min(bench.telemetry_batch, len(robot_ids)), replace=False)
+        session.fleet = Fleet(chosen.tolist(), seed=[bench.seed, session.worker])
+    session.fleet.step(0.1)
+    samples = session.fleet.samples(1768478400 + i * 0.1, 0.1)
+    session.call('POST /api/robots/telemetry', 'POST', '/api/robots/telemetry', role='operator',
+                 json={'samples': samples})
+
+
+WORKLOADS = {
+    'login_storm': login_storm,
+    'dashboard_polling': dashboard_polling,
+    'fleet_status': fleet_status,
+    'bookings': bookings,
+    'telemetry_ingest': telemetry_ingest,
+}
+
+
+class Benchmark:
+
+    def __init__(self, database_url, scale, seed, telemetry_batch=100):
+        self.seed = seed
+        self.telemetry_batch = telemetry_batch
+
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = database_url
+            TESTING = True
+            # Scheduler latar belakang mati supaya tidak ikut terukur
+            BOOKING_SCHEDULER_ENABLED = False
+            ANALYTICS_CUBE_ENABLED = False
+            PAYMENT_RECONCILE_INTERVAL = 0
+            RENTAL_PRICING_LOOKBACK_DAYS = max(PRICING_LOOKBACK_DAYS, (date.today() - NOW.date()).days + 1)
+
+        if not is_bench_database(database_url):
+            raise ValueError(f'Refusing to drop non-benchmark database {make_url(database_url)!r}')
+        self.app = create_app(BenchConfig)
+        self.queries = QueryCounter()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            self.dataset = seed_database(scale, seed=seed)
+            self.dataset['seed_seconds'] = round(time.perf_counter() - started, 2)
+            self.queries.attach(db.engine)
+            self.dialect = db.engine.dialect.name
+
+        # Token dibuat sebelum pengukuran supaya bcrypt hanya terukur di login_storm
+        client = self.app.test_client()
+        self.tokens = {}
+        for role, email in (('admin', 'admin@bench.local'), ('operator', 'operator0@bench.local'),
+                            ('customer', 'customer0@bench.local')):
+            response = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+            self.tokens[role] = response.get_json()['access_token']
+
+    def run(self, name, concurrency, requests):
+        workload = WORKLOADS[name]
+        recorder = Recorder()
+        per_worker = max(1, requests // concurrency)
+        barrier = threading.Barrier(concurrency + 1)
+        errors = []
+
+        def worker(index):
+            session = Session(self, index)
+            session.recorder = recorder
+            barrier.wait()
+            try:
+                for i in range(per_worker):
+                    workload(session, i)
+            except Exception as e:  # pragma: no cover
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        background = self.queries.background
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        background = self.queries.background - background
+
+        total = sum(len(row['latency']) for row in recorder.endpoints.values())
+        return {
+            'concurrency': concurrency,
+            'requests': total,
+            'elapsed_s': round(elapsed, 3),
+            'throughput_rps': round(total / elapsed, 1),
+            'worker_errors': errors,
+            'background_queries': background,
+            'endpoints': recorder.summary(elapsed)
+        }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def is_bench_database(database_url):
+    """drop_all() hanya boleh ke database yang jelas khusus benchmark atau file SQLite temporary"""
+    url = make_url(database_url)
+    name = url.database or ''
+    if url.get_backend_name() == 'sqlite' and name not in ('', ':memory:'):
+        path = os.path.realpath(name)
+        if os.path.commonpath([path, os.path.realpath(tempfile.gettempdir())]) == \
+                os.path.realpath(tempfile.gettempdir()):
+            return True
+    return name in ('', ':memory:') or 'bench' in os.path.basename(name).lower()
+
+
+def failures(result):
+    """Endpoint dengan error atau worker yang berhenti: angka latency/throughput-nya tidak bisa dipercaya"""
+    errors = []
+    for name, workload in result['workloads'].items():
+        errors += [f"{name} {label}: {row['errors']}/{row['requests']} errors"
+                   for label, row in workload['endpoints'].items() if row['errors']]
+        errors += [f"{name}: worker error {error}" for error in workload.get('worker_errors', ())]
+    return errors
+
+
+def compare(current, baseline, threshold):
+    """
+    Daftar regresi: p95 naik > threshold, throughput turun > threshold, queries/request naik.
+    Endpoint yang error di salah satu run dilaporkan, bukan dibandingkan.
+    """
+    regressions = []
+    for name, workload in current['workloads'].items():
+        base_workload = baseline.get('workloads', {}).get(name)
+        if not base_workload:
+            continue
+        for label, row in workload['endpoints'].items():
+            base = base_workload['endpoints'].get(label)
+            if not base:
+                continue
+            if row['errors'] or base.get('errors'):
+                regressions.append(f"{name} {label}: not comparable, errors {base.get('errors', 0)} -> "
+                                   f"{row['errors']}")
+                continue
+            if row['p95_ms'] > base['p95_ms'] * (1 + threshold):
+                regressions.append(f"{name} {label}: p95 {base['p95_ms']} -> {row['p95_ms']} ms")
+            if row['throughput_rps'] < base['throughput_rps'] * (1 - threshold):
+                regressions.append(f"{name} {label}: throughput {base['throughput_rps']} -> {row['throughput_rps']} rps")
+            if row['queries_per_request'] > base['queries_per_request']:
+                regressions.append(f"{name} {label}: queries/request {base['queries_per_request']} -> "
+                                   f"{row['queries_per_request']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-process HTTP benchmark')
+    parser.add_argument('--database-url', help='Default: SQLite file sementara; nama database harus mengandung "bench"')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workloads', default='all', help='Comma separated: ' + ','.join(WORKLOADS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400, help='Request per workload')
+    parser.add_argument('--login-requests', type=int, default=64, help='Request login_storm (bcrypt mahal)')
+    parser.add_argument('--telemetry-batch', type=int, default=100)
+    parser.add_argument('--output', help='Tulis hasil JSON ke file')
+    parser.add_argument('--compare', help='Baseline JSON untuk deteksi regresi')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Toleransi regresi (fraksi)')
+    parser.add_argument('--json', action='store_true', help='Output JSON ke stdout')
+    args = parser.parse_args()
+
+    names = list(WORKLOADS) if args.workloads == 'all' else args.workloads.split(',')
+    tmpdir = None
+    database_url = args.database_url
+    if database_url and not is_bench_database(database_url):
+        parser.error('--database-url is dropped and re-seeded; use a database whose name contains "bench"')
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory(prefix='bench_http_')
+        database_url = 'sqlite:///' + os.path.join(tmpdir.name, 'bench.db')
+
+    bench = Benchmark(database_url, args.scale, args.seed, args.telemetry_batch)
+    result = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'dialect': bench.dialect,
+            'scale': args.scale,
+            'seed': args.seed,
+            'rows': bench.dataset['rows'],
+            'seed_seconds': bench.dataset['seed_seconds']
+        },
+        'workloads': {}
+    }
+    for name in names:
+        requests = args.login_requests if name == 'login_storm' else args.requests
+        result['workloads'][name] = bench.run(name, args.concurrency, requests)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    errors = failures(result)
+    result['errors'] = errors
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        result['regressions'] = regressions
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"revision={result['meta']['revision']} dialect={bench.dialect} scale={args.scale} "
+              f"rows={result['meta']['rows']}")
+        print(f"{'workload':<18}{'endpoint':<36}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}{'err':>5}")
+        for name, workload in result['workloads'].items():
+            for label, row in workload['endpoints'].items():
+                print(f"{name:<18}{label:<36}{row['throughput_rps']:>8.1f}{row['p50_ms']:>9.1f}"
+                      f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['queries_per_request']:>7.1f}{row['errors']:>5}")
+        for line in errors:
+            print(f'ERRORS {line}')
+        for line in regressions:
+            print(f'REGRESSION {line}')
+
+    if tmpdir:
+        tmpdir.cleanup()
+    return 1 if regressions or errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
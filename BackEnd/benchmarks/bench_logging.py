@@ -0,0 +1,130 @@
+"""
+Benchmark latency request dengan logging off / sync / queue.
+
+- off:   LOG_ENABLED=false
+- sync:  handler JSON langsung di thread request (perilaku print() lama)
+- queue: pipeline default (QueueHandler + background writer)
+
+Setiap mode dijalankan di subprocess terpisah (konfigurasi logging global per proses)
+dengan workload dari bench_http. Sink stdout bisa diperlambat (`--sink-latency-ms`)
+untuk mensimulasikan konsumen log yang tertinggal (pipe / docker logs).
+Run: python benchmarks/bench_logging.py [--modes off,sync,queue] [--sink-latency-ms 0.2]
+                                        [--sample-rate 1.0] [--concurrency 8] [--requests 400]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ('off', 'sync', 'queue')
+
+
+class SlowSink:
+    """File sink dengan latency per write"""
+
+    def __init__(self, path, latency):
+        self._file = open(path, 'w')
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, data):
+        if self.latency:
+            time.sleep(self.latency)
+        self.writes += 1
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+
+def run_mode(args):
+    """Dijalankan di subprocess: env LOG_* sudah di-set sebelum import app"""
+    sink = SlowSink(args.sink, args.sink_latency_ms / 1000.0)
+    sys.stdout = sink
+
+    from benchmarks.bench_http import Benchmark
+    from app.services.structured_logging import ContextFilter, JsonFormatter, SamplingFilter, structured_logging
+
+    bench = Benchmark(args.database_url, args.scale, args.seed)
+    if args.mode == 'sync':
+        app_logger = logging.getLogger('app')
+        structured_logging.shutdown()
+        app_logger.removeHandler(structured_logging.handler)
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(ContextFilter())
+        handler.addFilter(SamplingFilter(args.sample_rate))
+        app_logger.addHandler(handler)
+
+    result = {'mode': args.mode, 'workloads': {}}
+    for name in args.workloads.split(','):
+        result['workloads'][name] = bench.run(name, args.concurrency, args.requests)
+    structured_logging.shutdown()
+    result['sink_writes'] = sink.writes
+    result['dropped'] = structured_logging.dropped
+    with open(args.result, 'w') as f:
+        json.dump(result, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Request latency with logging off/sync/queue')
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--workloads', default='fleet_status,dashboard_polling')
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--sample-rate', type=float, default=1.0, help='LOG_SAMPLE_RATE access log')
+    parser.add_argument('--sink-latency-ms', type=float, default=0.2, help='Latency per write ke stdout')
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--sink', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        return run_mode(args)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench_logging_') as tmpdir:
+        for mode in args.modes.split(','):
+            env = dict(os.environ, LOG_ENABLED='false' if mode == 'off' else 'true',
+                       LOG_SAMPLE_RATE=str(args.sample_rate), LOG_LEVEL='INFO')
+            result_path = os.path.join(tmpdir, f'{mode}.json')
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), '--mode', mode,
+                '--database-url', 'sqlite:///' + os.path.join(tmpdir, f'{mode}.db'),
+                '--sink', os.path.join(tmpdir, f'{mode}.log'), '--result', result_path,
+                '--workloads', args.workloads, '--scale', args.scale, '--seed', str(args.seed),
+                '--concurrency', str(args.concurrency), '--requests', str(args.requests),
+                '--sample-rate', str(args.sample_rate), '--sink-latency-ms', str(args.sink_latency_ms)
+            ], env=env, check=True)
+            with open(result_path) as f:
+                results[mode] = json.load(f)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"sink latency={args.sink_latency_ms}ms sample_rate={args.sample_rate} concurrency={args.concurrency}")
+    print(f"{'mode':<7}{'endpoint':<36}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for mode, result in results.items():
+        for workload in result['workloads'].values():
+            for label, row in workload['endpoints'].items():
+                print(f"{mode:<7}{label:<36}{row['throughput_rps']:>8.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+                      f"{row['p99_ms']:>9.2f}")
+        print(f"{mode:<7}log lines={result['sink_writes']} dropped={result['dropped']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
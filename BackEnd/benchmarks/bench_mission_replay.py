@@ -0,0 +1,189 @@
+"""
+Benchmark replay timeline misi: seek lewat index sparse vs OFFSET, throughput k-way merge.
+
+Database SQLite file baru diisi satu misi `--hours` jam (sensor_data `--hz` Hz,
+ml_decision `--decision-hz` Hz, operation_log setiap `--log-every` detik) ditambah
+`--other-missions` misi lain dengan volume yang sama. Diukur: build index seek (cold),
+latency sampai event pertama saat seek ke beberapa posisi dibanding UNION ALL ...
+ORDER BY ... OFFSET (tanpa payload, jadi baseline ini malah lebih ringan), dan
+throughput merge penuh (speed 0) dibanding satu query UNION ALL terurut.
+Run: python benchmarks/bench_mission_replay.py [--hours 4] [--hz 10] [--other-missions 3] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CHUNK = 20000
+POSITIONS = (0.0, 0.25, 0.5, 0.75, 0.99)
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+        ANALYTICS_CUBE_ENABLED = False
+        CDC_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(args):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.mission import MLDecision, Mission, OperationLog, SensorData
+    from app.models.robot import Robot
+
+    rng = np.random.default_rng(args.seed)
+    db.session.execute(insert(Robot.__table__), [{'robot_name': 'r1', 'status': 'active'}])
+    missions = args.other_missions + 1
+    db.session.execute(insert(Mission.__table__), [{'robot_id': 1, 'name': f'm{i}', 'status': 'completed'}
+                                                   for i in range(missions)])
+    seconds = args.hours * 3600
+    streams = (
+        (SensorData, args.hz, lambda t: {'battery_level': int(100 - t / seconds * 60), 'latitude': -6.1,
+                                         'longitude': 106.8, 'depth': 1.2, 'speed': 1.4}),
+        (MLDecision, args.decision_hz, lambda t: {'velocity': 1.5, 'turn_direction': 12.5,
+                                                  'navigation_mode': 'auto', 'confidence_score': 0.93}),
+        (OperationLog, 1 / args.log_every, lambda t: {'action_type': 'waypoint', 'parameters': {'t': round(t, 1)}}),
+    )
+    rows = 0
+    # Misi diselang-seling per jam supaya baris misi target tersebar di tabel (seperti data sungguhan)
+    for hour in range(args.hours):
+        for mission_id in range(1, missions + 1):
+            origin = datetime(2026, 1, 1) + timedelta(days=mission_id)
+            for model, hz, fields in streams:
+                n = int(3600 * hz)
+                offsets = np.sort(hour * 3600 + rng.uniform(0, 3600, n))
+                for start in range(0, n, CHUNK):
+                    db.session.execute(insert(model.__table__), [{
+                        'robot_id': 1, 'mission_id': mission_id, 'timestamp': origin + timedelta(seconds=float(t)),
+                        **fields(float(t))
+                    } for t in offsets[start:start + CHUNK]])
+                rows += n
+    db.session.commit()
+    return rows
+
+
+def offset_query(mission_id):
+    """Baseline tanpa index seek: timeline = UNION ALL terurut, seek = OFFSET"""
+    from sqlalchemy import literal, select, union_all
+    from app.models.mission import MLDecision, OperationLog, SensorData
+
+    parts = [select(model.timestamp.label('timestamp'), literal(rank).label('rank'), pk.label('id'))
+             .where(model.mission_id == mission_id)
+             for rank, (model, pk) in enumerate(((SensorData, SensorData.id), (MLDecision, MLDecision.id),
+                                                 (OperationLog, OperationLog.log_id)))]
+    timeline = union_all(*parts).subquery()
+    return select(timeline).order_by(timeline.c.timestamp, timeline.c.rank, timeline.c.id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mission replay: sparse seek index vs OFFSET, k-way merge throughput')
+    parser.add_argument('--hours', type=int, default=4)
+    parser.add_argument('--hz', type=float, default=10, help='frekuensi sensor_data')
+    parser.add_argument('--decision-hz', type=float, default=2)
+    parser.add_argument('--log-every', type=float, default=10, help='detik antar operation_log')
+    parser.add_argument('--other-missions', type=int, default=3)
+    parser.add_argument('--stride', type=int, default=500)
+    parser.add_argument('--window', type=int, default=200, help='event yang dibaca setelah seek')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    os.environ.setdefault('LOG_ENABLED', 'false')
+    os.environ.setdefault('SLOW_QUERY_LOG_ENABLED', 'false')
+    from app import db
+    from app.services.mission_replay import mission_replay
+
+    mission_id = 1
+    with tempfile.TemporaryDirectory(prefix='bench_replay_') as tmpdir:
+        app = make_app('sqlite:///' + os.path.join(tmpdir, 'replay.db'))
+        with app.app_context():
+            started = time.perf_counter()
+            rows = populate(args)
+            populate_s = time.perf_counter() - started
+            db.session.remove()
+
+            mission_replay.stride = args.stride
+            mission_replay.invalidate()
+            index = mission_replay.index(mission_id)
+            duration = (index.end - index.origin) / 1e6
+
+            seeks = {}
+            baseline = offset_query(mission_id)
+            for position in POSITIONS:
+                at = duration * position
+                offset = int(index.total * position)
+                seek_ms, window_ms, offset_ms = [], [], []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    events = mission_replay.events(mission_id, at=at, limit=args.window)
+                    next(events, None)
+                    seek_ms.append((time.perf_counter() - started) * 1000)
+                    for _ in events:
+                        pass
+                    window_ms.append((time.perf_counter() - started) * 1000)
+
+                    started = time.perf_counter()
+                    with db.engine.connect() as conn:
+                        conn.execute(baseline.offset(offset).limit(args.window)).all()
+                    offset_ms.append((time.perf_counter() - started) * 1000)
+                seeks[f'{position:.0%}'] = {'first_event_ms': round(min(seek_ms), 2),
+                                            'window_ms': round(min(window_ms), 2),
+                                            'offset_ms': round(min(offset_ms), 2)}
+
+            started = time.perf_counter()
+            merged = sum(1 for _ in mission_replay.events(mission_id))
+            merge_s = time.perf_counter() - started
+            started = time.perf_counter()
+            with db.engine.connect() as conn:
+                scanned = len(conn.execute(baseline).all())
+            scan_s = time.perf_counter() - started
+            assert merged == scanned == index.total
+
+    output = {
+        'rows': rows,
+        'populate_s': round(populate_s, 1),
+        'mission_events': index.total,
+        'mission_hours': round(duration / 3600, 2),
+        'sources': index.counts,
+        'index_build_ms': index.build_ms,
+        'checkpoints': len(index.offsets),
+        'seek': seeks,
+        'merge_events_per_s': round(merged / merge_s),
+        'merge_s': round(merge_s, 2),
+        'union_scan_s': round(scan_s, 2)
+    }
+    if args.json:
+        print(json.dumps(output, indent=2))
+        return 0
+
+    print(f"rows={rows} mission events={index.total} ({output['mission_hours']} h) sources={index.counts}")
+    print(f"index build {index.build_ms:.1f} ms, {output['checkpoints']} checkpoints (stride {args.stride})")
+    print(f"{'seek to':<10}{'first event ms':>16}{f'{args.window} events ms':>16}{'OFFSET ms':>12}")
+    for position, row in seeks.items():
+        print(f"{position:<10}{row['first_event_ms']:>16.2f}{row['window_ms']:>16.2f}{row['offset_ms']:>12.2f}")
+    print(f"full merge {merged} events in {merge_s:.2f} s ({output['merge_events_per_s']} events/s, with payload); "
+          f"UNION ALL scan (timestamp, id only) {scan_s:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
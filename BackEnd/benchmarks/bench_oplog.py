@@ -0,0 +1,136 @@
+"""
+Benchmark latency endpoint kontrol robot dengan audit log OperationLog
+ditulis sinkron (commit di dalam request) vs write-behind buffer.
+
+Setiap konfigurasi dijalankan di subprocess dengan database SQLite file baru;
+beberapa thread client mengirim POST /api/robots/<id>/control/stop.
+Run: python benchmarks/bench_oplog.py [--configs sync,buffered] [--requests 2000]
+                                      [--threads 4] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CONFIGS = {
+    'sync': {'OPERATION_LOG_BUFFER_ENABLED': 'false'},
+    'buffered': {'OPERATION_LOG_BUFFER_ENABLED': 'true'},
+}
+
+
+def run_config(args):
+    """Dijalankan di subprocess; env OPERATION_LOG_* sudah di-set"""
+    from benchmarks.bench_http import Benchmark
+    from app import db
+    from app.models.mission import OperationLog
+    from app.services.operation_log import operation_log
+
+    bench = Benchmark(args.database_url, args.scale, args.seed)
+    robot_ids = bench.dataset['robot_ids']
+    with bench.app.app_context():
+        logs_before = OperationLog.query.count()
+    per_thread = args.requests // args.threads
+    barrier = threading.Barrier(args.threads + 1)
+    lock = threading.Lock()
+    latencies, errors = [], [0]
+
+    def client(index):
+        http = bench.app.test_client()
+        headers = {'Authorization': f"Bearer {bench.tokens['operator']}"}
+        rng = np.random.default_rng([args.seed, index])
+        local = []
+        barrier.wait()
+        for robot_id in rng.choice(robot_ids, per_thread):
+            started = time.perf_counter()
+            response = http.post(f'/api/robots/{int(robot_id)}/control/stop', headers=headers)
+            local.append(time.perf_counter() - started)
+            errors[0] += response.status_code != 202
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    operation_log.shutdown()
+
+    with bench.app.app_context():
+        db.session.remove()
+        logs_written = OperationLog.query.count() - logs_before
+
+    data = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    output = {
+        'config': args.config,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'logs_written': logs_written,
+        'operation_log': operation_log.stats
+    }
+    with open(args.result, 'w') as f:
+        json.dump(output, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Control endpoint latency: sync vs write-behind OperationLog')
+    parser.add_argument('--configs', default=','.join(CONFIGS))
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        return run_config(args)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench_oplog_') as tmpdir:
+        for name in args.configs.split(','):
+            env = dict(os.environ, LOG_ENABLED='false', SLOW_QUERY_LOG_ENABLED='false',
+                       OPERATION_LOG_SPILL_PATH=os.path.join(tmpdir, f'{name}.spill.jsonl'), **CONFIGS[name])
+            result_path = os.path.join(tmpdir, f'{name}.json')
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), '--config', name,
+                '--database-url', 'sqlite:///' + os.path.join(tmpdir, f'{name}.db'), '--result', result_path,
+                '--requests', str(args.requests), '--threads', str(args.threads),
+                '--scale', args.scale, '--seed', str(args.seed)
+            ], env=env, check=True)
+            with open(result_path) as f:
+                results[name] = json.load(f)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"requests={args.requests} threads={args.threads}")
+    print(f"{'config':<10}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}{'logs':>8}")
+    for name, row in results.items():
+        print(f"{name:<10}{row['rps']:>9.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+              f"{row['errors']:>6}{row['logs_written']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Benchmark pipeline pembayaran di bawah latency gateway: sync (request menunggu
+charge + settle) vs async (request langsung 202, charge di worker per batch,
+hasil lewat webhook).
+
+Setiap konfigurasi dijalankan di subprocess dengan database SQLite file baru.
+Booking pending dibuat langsung di database; beberapa thread client mengirim
+POST /api/bookings/<id>/payment (satu per booking), lalu ditunggu sampai semua
+payment selesai (booking confirmed).
+Run: python benchmarks/bench_payments.py [--configs sync,async] [--payments 400]
+                                         [--threads 8] [--latency-ms 200] [--settle-ms 300] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CONFIGS = {
+    'sync': {'PAYMENT_PROCESSING': 'sync'},
+    'async': {'PAYMENT_PROCESSING': 'async'},
+}
+
+
+def create_bookings(count):
+    from datetime import datetime
+    from sqlalchemy import insert, select
+    from app import db
+    from app.models.booking import Booking
+    from app.models.user import User
+
+    user_id = db.session.execute(select(User.user_id).where(User.email == 'customer0@bench.local')).scalar_one()
+    now = datetime.utcnow()
+    marker = uuid.uuid4().hex[:8]
+    db.session.execute(insert(Booking.__table__), [{
+        'user_id': user_id, 'booking_type': 'purchase', 'start_date': now, 'status': 'pending',
+        'total_cost': 1500000, 'location': f'bench-{marker}', 'created_at': now, 'updated_at': now
+    } for _ in range(count)])
+    db.session.commit()
+    return db.session.execute(
+        select(Booking.booking_id).where(Booking.location == f'bench-{marker}').order_by(Booking.booking_id)
+    ).scalars().all()
+
+
+def run_config(args):
+    """Dijalankan di subprocess; env PAYMENT_* sudah di-set"""
+    from benchmarks.bench_http import Benchmark
+    from sqlalchemy import func, select
+    from app import db
+    from app.models.booking import Booking
+    from app.services.payments import payment_processor
+
+    bench = Benchmark(args.database_url, args.scale, args.seed)
+    with bench.app.app_context():
+        booking_ids = create_bookings(args.payments)
+        db.session.remove()
+    chunks = np.array_split(np.asarray(booking_ids), args.threads)
+    barrier = threading.Barrier(args.threads + 1)
+    lock = threading.Lock()
+    latencies, errors = [], [0]
+
+    def client(chunk):
+        http = bench.app.test_client()
+        headers = {'Authorization': f"Bearer {bench.tokens['customer']}"}
+        local = []
+        barrier.wait()
+        for booking_id in chunk:
+            started = time.perf_counter()
+            response = http.post(f'/api/bookings/{int(booking_id)}/payment', json={'method': 'e-wallet'},
+                                 headers={**headers, 'Idempotency-Key': f'bench-{int(booking_id)}'})
+            local.append(time.perf_counter() - started)
+            errors[0] += response.status_code not in (201, 202)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    accepted = time.perf_counter() - started
+
+    # Tunggu sampai semua booking confirmed (async: worker + webhook)
+    confirmed = 0
+    with bench.app.app_context():
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            confirmed = db.session.execute(
+                select(func.count()).select_from(Booking)
+                .where(Booking.booking_id.in_(booking_ids), Booking.status == 'confirmed')
+            ).scalar()
+            db.session.remove()
+            if confirmed == len(booking_ids):
+                break
+            time.sleep(0.05)
+    settled = time.perf_counter() - started
+
+    data = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    output = {
+        'config': args.config,
+        'payments': len(latencies),
+        'errors': errors[0],
+        'request_rps': round(len(latencies) / accepted, 1),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'confirmed': confirmed,
+        'settled_s': round(settled, 2),
+        'settled_per_s': round(confirmed / settled, 1),
+        'processor': payment_processor.stats
+    }
+    with open(args.result, 'w') as f:
+        json.dump(output, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Payment throughput under gateway latency: sync vs async pipeline')
+    parser.add_argument('--configs', default=','.join(CONFIGS))
+    parser.add_argument('--payments', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=200, help='Latency per round-trip gateway')
+    parser.add_argument('--settle-ms', type=float, default=300, help='Waktu sampai charge selesai')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        return run_config(args)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench_payments_') as tmpdir:
+        for name in args.configs.split(','):
+            env = dict(os.environ, LOG_ENABLED='false', SLOW_QUERY_LOG_ENABLED='false',
+                       PAYMENT_GATEWAY_LATENCY_MS=str(args.latency_ms), PAYMENT_GATEWAY_SETTLE_MS=str(args.settle_ms),
+                       OPERATION_LOG_SPILL_PATH=os.path.join(tmpdir, 'oplog.spill.jsonl'), **CONFIGS[name])
+            result_path = os.path.join(tmpdir, f'{name}.json')
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), '--config', name,
+                '--database-url', 'sqlite:///' + os.path.join(tmpdir, f'{name}.db'), '--result', result_path,
+                '--payments', str(args.payments), '--threads', str(args.threads), '--timeout', str(args.timeout),
+                '--scale', args.scale, '--seed', str(args.seed)
+            ], env=env, check=True)
+            with open(result_path) as f:
+                results[name] = json.load(f)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"payments={args.payments} threads={args.threads} gateway latency={args.latency_ms}ms "
+          f"settle={args.settle_ms}ms")
+    print(f"{'config':<8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}{'settled/s':>11}{'done':>7}")
+    for name, row in results.items():
+        print(f"{name:<8}{row['request_rps']:>9.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+              f"{row['errors']:>6}{row['settled_per_s']:>11.1f}{row['confirmed']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
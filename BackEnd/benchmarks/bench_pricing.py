@@ -0,0 +1,171 @@
+"""
+Benchmark quote harga sewa: tabel tarif precomputed (prefix sum per model/hari)
+vs baseline yang menghitung utilisasi fleet dengan query per hari untuk setiap quote.
+
+Database SQLite file baru diisi `--robots` robot (dua model) dan `--bookings`
+booking confirmed/active tersebar di horizon harga. Diukur: durasi build tabel,
+quote tunggal, quote kalender (`--calendar` tanggal mulai dalam satu panggilan
+vectorized) dan baseline per quote.
+Run: python benchmarks/bench_pricing.py [--bookings 50000] [--robots 200] [--quotes 2000] [--calendar 365] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+MODELS = ('CleanBot', 'Vision AI')
+
+
+def make_app(database_url):
+    from app import create_app, db
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        TESTING = True
+        BOOKING_SCHEDULER_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def populate(robots, bookings, seed):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+    from app.models.robot import Robot
+    from app.models.user import Role, User
+
+    role = Role(role_name='customer')
+    db.session.add(role)
+    db.session.flush()
+    db.session.add(User(username='bench', email='bench@x', password='x', full_name='bench', role_id=role.role_id))
+    db.session.execute(insert(Robot.__table__), [
+        {'robot_name': f'r{i}', 'model_type': MODELS[i % len(MODELS)], 'status': 'active'} for i in range(robots)
+    ])
+
+    rng = np.random.default_rng(seed)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    starts = rng.integers(-20, 360, bookings)
+    durations = rng.integers(1, 15, bookings)
+    db.session.execute(insert(Booking.__table__), [{
+        'user_id': 1, 'robot_id': int(rng.integers(1, robots + 1)), 'booking_type': 'rental',
+        'start_date': today + timedelta(days=int(start)), 'end_date': today + timedelta(days=int(start + n)),
+        'duration_days': int(n), 'status': 'confirmed' if start > 0 else 'active', 'total_cost': 1500000 * int(n),
+        'created_at': today, 'updated_at': today
+    } for start, n in zip(starts, durations)])
+    db.session.commit()
+    return today
+
+
+def baseline_quote(engine, model_type, start, days, robot_count):
+    """Tanpa tabel: satu COUNT booking yang overlap per hari sewa"""
+    from sqlalchemy import func, select
+    from app import db
+    from app.models.booking import Booking
+    from app.models.robot import Robot
+    from app.services.pricing import SEASON_MULTIPLIERS, _util_multipliers, _util_thresholds, duration_discount
+
+    base_rate = engine.base_rates.get(model_type, engine.default_rate)
+    total = 0.0
+    for i in range(days):
+        day = start + timedelta(days=i)
+        booked = db.session.execute(
+            select(func.count()).select_from(Booking).join(Robot, Robot.robot_id == Booking.robot_id)
+            .where(Robot.model_type == model_type, Booking.status.in_(('confirmed', 'active')),
+                   Booking.start_date < day + timedelta(days=1), Booking.end_date > day)
+        ).scalar()
+        tier = np.searchsorted(_util_thresholds, min(booked / robot_count, 1), side='right') - 1
+        total += base_rate * SEASON_MULTIPLIERS[day.month - 1] * _util_multipliers[tier]
+    return round(total * (1 - duration_discount(days)), 2)
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rental quote cost: precomputed rate tables vs per-day queries')
+    parser.add_argument('--bookings', type=int, default=50000)
+    parser.add_argument('--robots', type=int, default=200)
+    parser.add_argument('--quotes', type=int, default=2000)
+    parser.add_argument('--baseline-quotes', type=int, default=20)
+    parser.add_argument('--calendar', type=int, default=365, help='Jumlah tanggal mulai per quote kalender')
+    parser.add_argument('--duration', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    os.environ.setdefault('LOG_ENABLED', 'false')
+    os.environ.setdefault('SLOW_QUERY_LOG_ENABLED', 'false')
+    from app import db
+    from app.services.pricing import pricing_engine
+
+    with tempfile.TemporaryDirectory(prefix='bench_pricing_') as tmpdir:
+        app = make_app('sqlite:///' + os.path.join(tmpdir, 'pricing.db'))
+        with app.app_context():
+            today = populate(args.robots, args.bookings, args.seed)
+            rng = np.random.default_rng(args.seed)
+            offsets = rng.integers(0, 300, args.quotes)
+
+            build_s, _ = timed(lambda: pricing_engine._build(), 3)
+            pricing_engine.tables()
+
+            started = time.perf_counter()
+            quotes = [pricing_engine.quote(MODELS[i % 2], today + timedelta(days=int(offset)), args.duration)
+                      for i, offset in enumerate(offsets)]
+            quote_s = (time.perf_counter() - started) / args.quotes
+
+            calendar_starts = [today + timedelta(days=i) for i in range(args.calendar)]
+            calendar_s, _ = timed(lambda: pricing_engine.quote_many(
+                MODELS[0], calendar_starts, [args.duration] * args.calendar), 20)
+
+            robot_count = args.robots // len(MODELS)
+            started = time.perf_counter()
+            mismatches = 0
+            for i, offset in enumerate(offsets[:args.baseline_quotes]):
+                expected = baseline_quote(pricing_engine, MODELS[i % 2], today + timedelta(days=int(offset)),
+                                          args.duration, robot_count)
+                mismatches += abs(expected - quotes[i]['total_cost']) > 0.01
+            baseline_s = (time.perf_counter() - started) / args.baseline_quotes
+            db.session.remove()
+
+    output = {
+        'bookings': args.bookings,
+        'robots': args.robots,
+        'build_ms': round(build_s * 1000, 2),
+        'quote_us': round(quote_s * 1e6, 1),
+        'calendar_ranges': args.calendar,
+        'calendar_ms': round(calendar_s * 1000, 2),
+        'baseline_quote_ms': round(baseline_s * 1000, 2),
+        'baseline_mismatches': int(mismatches),
+        'speedup': round(baseline_s / quote_s, 1)
+    }
+    if args.json:
+        print(json.dumps(output, indent=2))
+        return 0
+
+    print(f"bookings={args.bookings} robots={args.robots} duration={args.duration}d")
+    print(f"table build            {output['build_ms']:>10.2f} ms")
+    print(f"quote (table)          {output['quote_us']:>10.1f} us")
+    print(f"calendar x{args.calendar:<12}{output['calendar_ms']:>10.2f} ms")
+    print(f"quote (per-day query)  {output['baseline_quote_ms']:>10.2f} ms  ({output['speedup']}x slower)")
+    print(f"baseline mismatches    {output['baseline_mismatches']:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
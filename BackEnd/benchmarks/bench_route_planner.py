@@ -0,0 +1,120 @@
+"""
+Benchmark route planner pada beberapa teluk sintetis.
+Run: python benchmarks/bench_route_planner.py [--resolution 5] [--repeat 5] [--json]
+
+Target: area 10 km2 pada resolusi 5 m < 1 detik di satu core.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.services.route_planner import LocalProjection, plan_route  # noqa: E402
+
+ORIGIN = (-6.10, 106.80)  # Teluk Jakarta
+
+
+def square_bay(side_m):
+    return np.array([[0, 0], [side_m, 0], [side_m, side_m], [0, side_m]], dtype=np.float64)
+
+
+def crescent_bay(radius_m, width_m, n=120):
+    """Teluk berbentuk bulan sabit (concave)"""
+    angles = np.linspace(np.pi * 0.1, np.pi * 0.9, n)
+    outer = np.stack([np.cos(angles), np.sin(angles)], axis=1) * radius_m
+    inner = np.stack([np.cos(angles[::-1]), np.sin(angles[::-1])], axis=1) * (radius_m - width_m)
+    return np.vstack([outer, inner]) + radius_m
+
+
+def inlet_bay(side_m, inlets=5, depth_ratio=0.4):
+    """Garis pantai bergerigi: beberapa tanjung menjorok ke dalam area"""
+    points = [[0, 0], [side_m, 0], [side_m, side_m]]
+    step = side_m / (inlets * 2)
+    for i in range(inlets * 2):
+        x = side_m - (i + 1) * step
+        y = side_m * (1 - depth_ratio) if i % 2 == 0 else side_m
+        points.append([x, y])
+    points.append([0, side_m])
+    return np.asarray(points, dtype=np.float64)
+
+
+def synthetic_density(polygon_xy, clusters, points_per_cluster, rng):
+    """Cluster gaussian waste di sekitar titik acak dalam bounding box polygon"""
+    min_xy, max_xy = polygon_xy.min(axis=0), polygon_xy.max(axis=0)
+    centers = rng.uniform(min_xy, max_xy, size=(clusters, 2))
+    spread = rng.uniform(30, 300, size=clusters)
+    points = np.repeat(centers, points_per_cluster, axis=0) + \
+        rng.normal(size=(clusters * points_per_cluster, 2)) * np.repeat(spread, points_per_cluster)[:, None]
+    weights = rng.exponential(1.5, size=len(points))
+    return points, weights
+
+
+BAYS = {
+    'square_10km2': lambda: square_bay(np.sqrt(10e6)),
+    'crescent_10km2': lambda: crescent_bay(3600, 1200),
+    'inlets_10km2': lambda: inlet_bay(3650),
+    'square_1km2': lambda: square_bay(1000),
+}
+
+
+def run(resolution_m, repeat, battery_lvl, seed):
+    projection = LocalProjection(*ORIGIN)
+    results = []
+    for name, build in BAYS.items():
+        rng = np.random.default_rng(seed)
+        polygon_xy = build()
+        points_xy, weights = synthetic_density(polygon_xy, clusters=40, points_per_cluster=250, rng=rng)
+
+        polygon_latlon = projection.to_latlon(polygon_xy)
+        density = np.column_stack([projection.to_latlon(points_xy), weights])
+
+        timings = []
+        plan = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            plan = plan_route(polygon_latlon, density, battery_lvl, resolution_m=resolution_m)
+            timings.append(time.perf_counter() - started)
+
+        results.append({
+            'bay': name,
+            'area_km2': plan['area_km2'],
+            'resolution_m': resolution_m,
+            'density_points': int(len(density)),
+            'waypoints': len(plan['waypoints']),
+            'hotspots_planned': plan['hotspots_planned'],
+            'distance_m': plan['distance_m'],
+            'coverage_ratio': plan['coverage_ratio'],
+            'best_ms': round(min(timings) * 1000, 2),
+            'median_ms': round(float(np.median(timings)) * 1000, 2),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route planner benchmark')
+    parser.add_argument('--resolution', type=float, default=5.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--battery', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+    args = parser.parse_args()
+
+    results = run(args.resolution, args.repeat, args.battery, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'bay':<16}{'km2':>8}{'waypoints':>11}{'hotspots':>10}{'best ms':>10}{'median ms':>11}")
+    for row in results:
+        print(f"{row['bay']:<16}{row['area_km2']:>8.2f}{row['waypoints']:>11}"
+              f"{row['hotspots_planned']:>10}{row['best_ms']:>10.1f}{row['median_ms']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark read/write concurrent di SQLite: ingest telemetry (writer) dan polling
+dashboard / status robot (reader) berjalan bersamaan.
+
+Konfigurasi yang dibandingkan (masing-masing di subprocess, database file baru):
+- baseline:  SQLITE_PROFILE=none (rollback journal, synchronous FULL), tanpa write queue
+- profile:   SQLITE_PROFILE=edge (WAL, synchronous NORMAL, mmap, cache), tanpa write queue
+- queue:     profil edge + single-writer batching queue
+Run: python benchmarks/bench_sqlite.py [--configs baseline,profile,queue] [--duration 10]
+                                       [--writers 8] [--readers 8] [--batch 50] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+CONFIGS = {
+    'baseline': {'SQLITE_PROFILE': 'none', 'WRITE_QUEUE_ENABLED': 'false'},
+    'profile': {'SQLITE_PROFILE': 'edge', 'WRITE_QUEUE_ENABLED': 'false'},
+    'queue': {'SQLITE_PROFILE': 'edge', 'WRITE_QUEUE_ENABLED': 'true'},
+}
+READ_PATHS = ('/api/dashboard/overview', '/api/dashboard/robots/status', '/api/robots/{robot_id}/status',
+              '/api/robots/{robot_id}/telemetry?limit=20')
+
+
+def percentiles(values):
+    if not values:
+        return {'count': 0}
+    data = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {'count': int(len(data)), 'p50_ms': round(float(p50), 2), 'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2), 'max_ms': round(float(data.max()), 2)}
+
+
+def run_config(args):
+    """Dijalankan di subprocess; env SQLITE_* / WRITE_QUEUE_* sudah di-set"""
+    from benchmarks.bench_http import Benchmark
+    from app.services.write_queue import write_queue
+
+    bench = Benchmark(args.database_url, args.scale, args.seed)
+    robot_ids = bench.dataset['robot_ids']
+    stop = threading.Event()
+    barrier = threading.Barrier(args.writers + args.readers + 1)
+    lock = threading.Lock()
+    result = {'write': [], 'read': [], 'write_errors': 0, 'read_errors': 0, 'samples': 0}
+
+    def writer(index):
+        client = bench.app.test_client()
+        headers = {'Authorization': f"Bearer {bench.tokens['operator']}"}
+        rng = np.random.default_rng([args.seed, index])
+        latencies, errors, samples, tick = [], 0, 0, 0
+        barrier.wait()
+        while not stop.is_set():
+            batch = [{
+                'robot_id': int(robot_id), 'ts': 1767000000 + tick * 0.1 + index * 1e-3,
+                'battery_level': float(rng.uniform(20, 100)), 'latitude': float(rng.uniform(-6.2, -6.0)),
+                'longitude': float(rng.uniform(106.7, 106.9)), 'temperature': 28.0
+            } for robot_id in rng.choice(robot_ids, args.batch)]
+            tick += 1
+            started = time.perf_counter()
+            response = client.post('/api/robots/telemetry', json={'samples': batch}, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code == 201:
+                samples += response.get_json()['accepted']
+            else:
+                errors += 1
+        with lock:
+            result['write'].extend(latencies)
+            result['write_errors'] += errors
+            result['samples'] += samples
+
+    def reader(index):
+        client = bench.app.test_client()
+        headers = {'Authorization': f"Bearer {bench.tokens['admin']}"}
+        rng = np.random.default_rng([args.seed, 1000 + index])
+        latencies, errors, i = [], 0, 0
+        barrier.wait()
+        while not stop.is_set():
+            path = READ_PATHS[i % len(READ_PATHS)].format(robot_id=int(rng.choice(robot_ids)))
+            i += 1
+            started = time.perf_counter()
+            response = client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != 200
+        with lock:
+            result['read'].extend(latencies)
+            result['read_errors'] += errors
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    write_queue.shutdown()
+
+    output = {
+        'config': args.config,
+        'elapsed_s': round(elapsed, 2),
+        'samples_per_s': round(result['samples'] / elapsed, 1),
+        'write_rps': round(len(result['write']) / elapsed, 1),
+        'read_rps': round(len(result['read']) / elapsed, 1),
+        'write': percentiles(result['write']),
+        'read': percentiles(result['read']),
+        'write_errors': result['write_errors'],
+        'read_errors': result['read_errors'],
+        'write_queue': dict(write_queue.stats) if write_queue.enabled else None
+    }
+    with open(args.result, 'w') as f:
+        json.dump(output, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite concurrent read/write benchmark')
+    parser.add_argument('--configs', default=','.join(CONFIGS))
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--batch', type=int, default=50, help='Sampel per request telemetry')
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    # internal (subprocess)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        return run_config(args)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench_sqlite_') as tmpdir:
+        for name in args.configs.split(','):
+            env = dict(os.environ, LOG_ENABLED='false', SLOW_QUERY_LOG_ENABLED='false', **CONFIGS[name])
+            result_path = os.path.join(tmpdir, f'{name}.json')
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), '--config', name,
+                '--database-url', 'sqlite:///' + os.path.join(tmpdir, f'{name}.db'), '--result', result_path,
+                '--duration', str(args.duration), '--writers', str(args.writers), '--readers', str(args.readers),
+                '--batch', str(args.batch), '--scale', args.scale, '--seed', str(args.seed)
+            ], env=env, check=True)
+            with open(result_path) as f:
+                results[name] = json.load(f)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"writers={args.writers} readers={args.readers} batch={args.batch} duration={args.duration}s")
+    print(f"{'config':<10}{'samples/s':>11}{'w p50':>9}{'w p95':>9}{'r rps':>8}{'r p50':>9}{'r p95':>9}"
+          f"{'w err':>7}{'r err':>7}")
+    for name, row in results.items():
+        print(f"{name:<10}{row['samples_per_s']:>11.1f}{row['write'].get('p50_ms', 0):>9.2f}"
+              f"{row['write'].get('p95_ms', 0):>9.2f}{row['read_rps']:>8.1f}{row['read'].get('p50_ms', 0):>9.2f}"
+              f"{row['read'].get('p95_ms', 0):>9.2f}{row['write_errors']:>7}{row['read_errors']:>7}")
+        if row['write_queue']:
+            stats = row['write_queue']
+            print(f"{'':<10}write queue: {stats['items']} items in {stats['batches']} transactions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
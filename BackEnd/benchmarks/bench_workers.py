@@ -0,0 +1,218 @@
+"""
+Benchmark scaling gunicorn 1 -> N worker dengan HTTP sungguhan (keep-alive).
+
+Database di-seed sekali (datagen), lalu untuk setiap jumlah worker server
+dijalankan dengan gunicorn.conf.py dan dibebani client closed-loop dari
+beberapa proses (thread per proses) selama --duration detik.
+Run: python benchmarks/bench_workers.py [--workers 1,2,4] [--duration 10]
+                                        [--client-procs 2] [--client-threads 8]
+                                        [--mix read|mixed] [--database-url URL] [--json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from simulator.client import HttpClient  # noqa: E402
+
+READ_PATHS = ('/api/robots', '/api/robots/{robot_id}/status', '/api/dashboard/overview',
+              '/api/dashboard/robots/status')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def seed(database_url, scale, seed_value):
+    from app import create_app, db
+    from app.config import Config
+    from benchmarks.bench_http import is_bench_database
+    from benchmarks.fixtures import seed_database
+
+    if not is_bench_database(database_url):
+        raise SystemExit('--database-url is dropped and re-seeded; use a database whose name contains "bench"')
+
+    class SeedConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        LOG_ENABLED = False
+
+    app = create_app(SeedConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        return seed_database(scale, seed=seed_value)
+
+
+class Server:
+    """gunicorn di subprocess; stop() mengirim SIGTERM (graceful)"""
+
+    def __init__(self, workers, database_url, worker_class=None, threads=None):
+        self.port = free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        env = dict(os.environ, DATABASE_URL=database_url, WEB_CONCURRENCY=str(workers),
+                   GUNICORN_BIND=f'127.0.0.1:{self.port}', LOG_REQUESTS='false', LOG_LEVEL='WARNING')
+        if worker_class:
+            env['GUNICORN_WORKER_CLASS'] = worker_class
+        if threads:
+            env['GUNICORN_THREADS'] = str(threads)
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def wait_ready(self, timeout=60):
+        client = HttpClient(self.base_url, timeout=5)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with {self.process.returncode}')
+            try:
+                client.request('GET', '/api/robots')  # 401 pun berarti server sudah melayani
+                return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError('gunicorn not ready')
+
+    def stop(self):
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def client_process(base_url, tokens, robot_ids, mix, threads, duration, warmup, seed_value):
+    """Closed-loop load dari satu proses; return (latencies ms setelah warmup, errors)"""
+    import threading
+
+    results = []
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def run(index):
+        rng = np.random.default_rng([seed_value, index])
+        client = HttpClient(base_url)
+        latencies, errors, i = [], 0, 0
+        while True:
+            now = time.monotonic()
+            if now - start > warmup + duration:
+                break
+            if mix == 'mixed' and i % 4 == 3:
+                client.token = tokens['operator']
+                robot_id = int(rng.choice(robot_ids))
+                method, path = 'POST', '/api/robots/telemetry'
+                payload = {'samples': [{'robot_id': robot_id, 'battery_level': 80, 'latitude': -6.1, 'longitude': 106.8}]}
+            else:
+                client.token = tokens['admin']
+                method = 'GET'
+                path = READ_PATHS[i % len(READ_PATHS)].format(robot_id=int(rng.choice(robot_ids)))
+                payload = None
+            i += 1
+            try:
+                status = client.request(method, path, payload)[0]
+            except OSError:
+                status = 0
+            elapsed = time.monotonic() - now
+            if now - start >= warmup:
+                latencies.append(elapsed * 1000)
+                errors += status not in (200, 201, 202)
+        with lock:
+            results.append((latencies, errors))
+
+    workers = [threading.Thread(target=run, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [latency for latencies, _ in results for latency in latencies], sum(errors for _, errors in results)
+
+
+def run_step(workers, args, database_url, dataset):
+    server = Server(workers, database_url, args.worker_class, args.threads)
+    try:
+        server.wait_ready()
+        tokens = {}
+        for role, email in (('admin', 'admin@bench.local'), ('operator', 'operator0@bench.local')):
+            client = HttpClient(server.base_url)
+            client.login(email, 'bench123')
+            tokens[role] = client.token
+
+        jobs = [(server.base_url, tokens, dataset['robot_ids'], args.mix, args.client_threads, args.duration,
+                 args.warmup, args.seed + index) for index in range(args.client_procs)]
+        with multiprocessing.Pool(args.client_procs) as pool:
+            outputs = pool.starmap(client_process, jobs)
+    finally:
+        server.stop()
+
+    latency = np.asarray([value for values, _ in outputs for value in values])
+    errors = sum(errors for _, errors in outputs)
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99]) if len(latency) else (0, 0, 0)
+    return {
+        'workers': workers,
+        'requests': int(len(latency)),
+        'errors': int(errors),
+        'throughput_rps': round(len(latency) / args.duration, 1),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='gunicorn worker scaling benchmark')
+    parser.add_argument('--workers', default='1,2,4', help='Comma separated jumlah worker')
+    parser.add_argument('--worker-class', help='Override GUNICORN_WORKER_CLASS')
+    parser.add_argument('--threads', type=int, help='Override GUNICORN_THREADS (gthread)')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--client-procs', type=int, default=2)
+    parser.add_argument('--client-threads', type=int, default=8)
+    parser.add_argument('--mix', choices=('read', 'mixed'), default='read')
+    parser.add_argument('--scale', default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='Default: SQLite file sementara (di-seed)')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    tmpdir = None
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory(prefix='bench_workers_')
+        database_url = 'sqlite:///' + os.path.join(tmpdir.name, 'bench.db')
+    dataset = seed(database_url, args.scale, args.seed)
+
+    steps = [run_step(int(workers), args, database_url, dataset) for workers in args.workers.split(',')]
+    base = steps[0]['throughput_rps'] or 1
+    for step in steps:
+        step['speedup'] = round(step['throughput_rps'] / base, 2)
+
+    if args.json:
+        print(json.dumps({'cpus': os.cpu_count(), 'mix': args.mix, 'steps': steps}, indent=2))
+    else:
+        print(f"cpus={os.cpu_count()} mix={args.mix} clients={args.client_procs}x{args.client_threads} "
+              f"duration={args.duration}s")
+        print(f"{'workers':>8}{'rps':>10}{'speedup':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}")
+        for step in steps:
+            print(f"{step['workers']:>8}{step['throughput_rps']:>10.1f}{step['speedup']:>9.2f}{step['p50_ms']:>9.2f}"
+                  f"{step['p95_ms']:>9.2f}{step['p99_ms']:>9.2f}{step['errors']:>6}")
+
+    if tmpdir:
+        tmpdir.cleanup()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Dataset seeded untuk benchmark (deterministik per seed), dibuat dengan datagen.
+"""
+from datetime import datetime
+
+from datagen import PRESETS, generate
+
+PASSWORD = 'bench123'
+EMAIL_DOMAIN = 'bench.local'
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+
+SCALES = PRESETS
+
+
+def seed_database(scale='small', seed=42, now=None, jobs=4):
+    """Isi database kosong lewat datagen. Return ringkasan (id robot, jumlah customer, baris per tabel)"""
+    sizes = SCALES[scale] if isinstance(scale, str) else scale
+    result = generate(sizes, seed=seed, now=now or NOW, jobs=jobs, email_domain=EMAIL_DOMAIN, password=PASSWORD)
+    return {
+        'scale': scale if isinstance(scale, str) else 'custom',
+        'seed': seed,
+        'robot_ids': result['robot_ids'],
+        'customer_count': len(result['customer_ids']),
+        'rows': {table: row['rows'] for table, row in sorted(result['tables'].items())}
+    }
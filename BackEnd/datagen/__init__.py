@@ -0,0 +1,9 @@
+"""
+Generator dataset sintetis skala besar (armada ribuan robot, jutaan baris
+telemetry) untuk performance test.
+
+Run: python -m datagen --preset 10m --jobs 4
+"""
+from datagen.loader import PRESETS, DatasetExistsError, estimate_rows, generate
+
+__all__ = ['PRESETS', 'DatasetExistsError', 'estimate_rows', 'generate']
@@ -0,0 +1,382 @@
+"""
+Generator baris per tabel, vectorized dengan NumPy.
+
+Semua primary key yang dirujuk tabel lain (user, robot, mission, sensor_data,
+booking) ditentukan di depan oleh `Plan`, jadi tiap tabel anak bisa dibuat
+independen dan paralel. RNG diturunkan dari (seed, tabel, chunk) sehingga hasil
+identik berapa pun jumlah job dan urutan eksekusinya.
+"""
+import json
+import math
+
+import numpy as np
+
+CENTER = (-6.10, 106.80)  # Teluk Jakarta
+BAY_RADIUS_M = 8000.0
+METERS_PER_DEG_LAT = 111320.0
+
+WASTE_TYPES = ('plastic', 'organic', 'metal', 'glass', 'other')
+WASTE_TYPE_P = (0.55, 0.2, 0.1, 0.05, 0.1)
+ROBOT_STATUSES = ('active', 'offline', 'charging', 'maintenance')
+ROBOT_STATUS_P = (0.5, 0.3, 0.15, 0.05)
+OPERATION_ACTIONS = ('navigate', 'waste_collected', 'obstacle_avoided', 'battery_check')
+PAYMENT_METHODS = ('credit-card', 'e-wallet', 'bank-transfer')
+
+OPERATION_LOGS_PER_MISSION = 8
+ML_DECISION_EVERY = 5          # satu keputusan ML per 5 sampel sensor
+WASTE_PER_MISSION = 6.0        # rata-rata (Poisson)
+BOOKING_OVERLAP_P = 0.08       # fraksi booking yang sengaja overlap dengan sebelumnya
+RENTAL_PRICE_PER_DAY = 1500000
+MISSION_CHUNK = 5000
+
+TABLE_KEYS = {
+    'users': 1, 'robot': 2, 'mission': 3, 'sensor_data': 4, 'ml_decision': 5,
+    'operation_log': 6, 'waste': 7, 'booking': 8, 'payment': 9, 'user_certification_progress': 10,
+}
+
+_BASE32 = np.array(list('0123456789bcdefghjkmnpqrstuvwxyz'))
+_LON_SCALE = METERS_PER_DEG_LAT * math.cos(math.radians(CENTER[0]))
+
+
+def rng_for(seed, table, chunk=0):
+    return np.random.default_rng([seed, TABLE_KEYS[table], chunk])
+
+
+def format_datetimes(values):
+    """datetime64 array -> list string 'YYYY-MM-DD HH:MM:SS.ffffff' (format DateTime SQLAlchemy)"""
+    strings = np.datetime_as_string(np.asarray(values).astype('datetime64[us]'), unit='us').tolist()
+    return [s.replace('T', ' ') for s in strings]
+
+
+def geohash_array(lat, lon, precision=9):
+    """Versi vectorized dari app.utils.geo.encode_geohash"""
+    bits = precision * 5
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lon_q = np.clip(np.floor((np.asarray(lon) + 180.0) / 360.0 * (1 << lon_bits)), 0, (1 << lon_bits) - 1).astype(np.int64)
+    lat_q = np.clip(np.floor((np.asarray(lat) + 90.0) / 180.0 * (1 << lat_bits)), 0, (1 << lat_bits) - 1).astype(np.int64)
+
+    code = np.zeros(len(lon_q), dtype=np.int64)
+    for i in range(bits):
+        if i % 2 == 0:
+            bit = (lon_q >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (lat_q >> (lat_bits - 1 - i // 2)) & 1
+        code = (code << 1) | bit
+
+    chars = _BASE32[np.stack([(code >> (5 * (precision - 1 - j))) & 31 for j in range(precision)])]
+    return [''.join(row) for row in chars.T.tolist()]
+
+
+def offset_latlon(lat, lon, dx_m, dy_m):
+    return lat + dy_m / METERS_PER_DEG_LAT, lon + dx_m / _LON_SCALE
+
+
+def json_points(lat, lon):
+    return [json.dumps({'latitude': a, 'longitude': b}) for a, b in zip(lat.tolist(), lon.tolist())]
+
+
+class Plan:
+    """Ukuran dataset, id awal tiap tabel dan array mission yang dipakai bersama"""
+
+    def __init__(self, sizes, seed, now, start_ids, role_ids, module_ids, email_domain, password_hash):
+        self.sizes = sizes
+        self.seed = seed
+        self.now = np.datetime64(now, 'us')
+        self.start_ids = start_ids
+        self.role_ids = role_ids
+        self.module_ids = module_ids
+        self.email_domain = email_domain
+        self.password_hash = password_hash
+
+        self.operators = sizes.get('operators', 5)
+        self.first_customer_id = start_ids['users'] + 1 + self.operators
+        self.customer_ids = np.arange(sizes['customers']) + self.first_customer_id
+        self.robot_ids = np.arange(sizes['robots']) + start_ids['robot']
+
+        rng = rng_for(seed, 'robot')
+        n = sizes['robots']
+        self.robot_lat, self.robot_lon = offset_latlon(
+            CENTER[0], CENTER[1],
+            rng.uniform(-BAY_RADIUS_M, BAY_RADIUS_M, n), rng.uniform(-BAY_RADIUS_M, BAY_RADIUS_M, n)
+        )
+        self.robot_status = rng.choice(len(ROBOT_STATUSES), size=n, p=ROBOT_STATUS_P)
+        self.robot_battery = rng.integers(10, 101, size=n)
+
+        self._build_missions()
+
+    def _build_missions(self):
+        sizes = self.sizes
+        rng = rng_for(self.seed, 'mission')
+        per_robot = sizes['missions_per_robot']
+        n = sizes['robots'] * per_robot
+        window_us = int(sizes['days'] * 86400e6)
+
+        offsets = np.sort(rng.integers(0, window_us, size=(sizes['robots'], per_robot)), axis=1).ravel()
+        self.mission_ids = np.arange(n) + self.start_ids['mission']
+        self.mission_robot = np.repeat(self.robot_ids, per_robot)
+        self.mission_start = self.now - np.timedelta64(window_us, 'us') + offsets.astype('timedelta64[us]')
+        self.mission_duration_s = rng.uniform(3600, 4 * 3600, size=n)
+        self.mission_end = self.mission_start + (self.mission_duration_s * 1e6).astype('timedelta64[us]')
+        robot_index = np.repeat(np.arange(sizes['robots']), per_robot)
+        self.mission_lat, self.mission_lon = offset_latlon(
+            self.robot_lat[robot_index], self.robot_lon[robot_index],
+            rng.normal(0, 500, size=n), rng.normal(0, 500, size=n)
+        )
+        self.mission_battery = rng.uniform(60, 100, size=n)
+
+    @property
+    def mission_count(self):
+        return len(self.mission_ids)
+
+    def mission_chunks(self):
+        for chunk, start in enumerate(range(0, self.mission_count, MISSION_CHUNK)):
+            yield chunk, slice(start, min(start + MISSION_CHUNK, self.mission_count))
+
+    def sample_times(self, missions):
+        """Timestamp sampel sensor (missions x samples_per_mission)"""
+        per_mission = self.sizes['samples_per_mission']
+        step_us = (self.mission_duration_s[missions] * 1e6 / per_mission).astype(np.int64)
+        ticks = np.arange(per_mission, dtype=np.int64)
+        return self.mission_start[missions][:, None] + (step_us[:, None] * ticks).astype('timedelta64[us]')
+
+
+# ----------------------------------------------------------------------
+# Tabel. Tiap generator yield (columns, rows) per chunk.
+# ----------------------------------------------------------------------
+def users(plan):
+    created = format_datetimes([plan.now])[0]
+    start = plan.start_ids['users']
+    rows = [(start, 'admin', f'admin@{plan.email_domain}', plan.password_hash, 'Admin',
+             plan.role_ids['admin'], False, created)]
+    for i in range(plan.operators):
+        rows.append((start + 1 + i, f'operator{i}', f'operator{i}@{plan.email_domain}', plan.password_hash,
+                     f'Operator {i}', plan.role_ids['operator'], True, created))
+    for i, user_id in enumerate(plan.customer_ids.tolist()):
+        rows.append((user_id, f'customer{i}', f'customer{i}@{plan.email_domain}', plan.password_hash,
+                     f'Customer {i}', plan.role_ids['customer'], False, created))
+    yield ('user_id', 'username', 'email', 'password', 'full_name', 'role_id', 'is_certified', 'created_at'), rows
+
+
+def robots(plan):
+    columns = ('robot_id', 'robot_name', 'model_type', 'status', 'battery_lvl', 'location',
+               'current_position', 'geohash', 'created_at')
+    created = format_datetimes([plan.now])[0]
+    lat, lon = np.round(plan.robot_lat, 7), np.round(plan.robot_lon, 7)
+    rows = list(zip(
+        plan.robot_ids.tolist(),
+        [f'robot-{robot_id:06d}' for robot_id in plan.robot_ids.tolist()],
+        [('CleanBot', 'Vision AI')[i % 2] for i in range(len(plan.robot_ids))],
+        [ROBOT_STATUSES[s] for s in plan.robot_status.tolist()],
+        plan.robot_battery.tolist(),
+        ['Teluk Jakarta'] * len(plan.robot_ids),
+        json_points(lat, lon),
+        geohash_array(lat, lon),
+        [created] * len(plan.robot_ids)
+    ))
+    yield columns, rows
+
+
+def missions(plan):
+    columns = ('mission_id', 'robot_id', 'name', 'start_time', 'end_time', 'status',
+               'area_covered', 'waste_collected', 'created_at', 'updated_at')
+    rng = rng_for(plan.seed, 'mission', 1)
+    n = plan.mission_count
+    status = np.where(plan.mission_end < plan.now, 'completed', 'active')
+    area = np.round(plan.mission_duration_s / 3600 * rng.uniform(0.2, 0.6, size=n), 2)
+    waste = np.round(rng.gamma(2.0, 6.0, size=n), 2)
+    start, end = format_datetimes(plan.mission_start), format_datetimes(plan.mission_end)
+    rows = list(zip(
+        plan.mission_ids.tolist(), plan.mission_robot.tolist(),
+        [f'Mission {mission_id}' for mission_id in plan.mission_ids.tolist()],
+        start, end, status.tolist(), area.tolist(), waste.tolist(), start, end
+    ))
+    yield columns, rows
+
+
+def sensor_data(plan):
+    columns = ('id', 'robot_id', 'mission_id', 'timestamp', 'latitude', 'longitude', 'depth',
+               'temperature', 'ph', 'water_quality', 'battery_level', 'speed')
+    per_mission = plan.sizes['samples_per_mission']
+    for chunk, missions in plan.mission_chunks():
+        rng = rng_for(plan.seed, 'sensor_data', chunk)
+        m = missions.stop - missions.start
+        shape = (m, per_mission)
+
+        # Random walk per mission dari titik awal mission
+        steps = rng.normal(0, 4.0, size=(m, per_mission, 2)).cumsum(axis=1)
+        lat, lon = offset_latlon(plan.mission_lat[missions][:, None], plan.mission_lon[missions][:, None],
+                                 steps[..., 0], steps[..., 1])
+        progress = np.arange(per_mission) / per_mission
+        battery = plan.mission_battery[missions][:, None] - progress * rng.uniform(10, 40, size=(m, 1))
+        temperature = 28.5 + rng.normal(0, 0.4, size=shape)
+        ph = 8.1 + rng.normal(0, 0.05, size=shape)
+        quality = 80 + rng.normal(0, 3, size=shape)
+        depth = np.abs(rng.normal(1.5, 0.5, size=shape))
+        speed = np.abs(rng.normal(1.2, 0.3, size=shape))
+
+        ids = plan.start_ids['sensor_data'] + missions.start * per_mission + np.arange(m * per_mission)
+        rows = list(zip(
+            ids.tolist(),
+            np.repeat(plan.mission_robot[missions], per_mission).tolist(),
+            np.repeat(plan.mission_ids[missions], per_mission).tolist(),
+            format_datetimes(plan.sample_times(missions).ravel()),
+            np.round(lat, 7).ravel().tolist(), np.round(lon, 7).ravel().tolist(),
+            np.round(depth, 2).ravel().tolist(), np.round(temperature, 2).ravel().tolist(),
+            np.round(ph, 2).ravel().tolist(), np.round(quality, 2).ravel().tolist(),
+            battery.astype(np.int64).ravel().tolist(), np.round(speed, 2).ravel().tolist()
+        ))
+        yield columns, rows
+
+
+def ml_decisions(plan):
+    columns = ('robot_id', 'mission_id', 'sensor_data_id', 'timestamp', 'velocity', 'turn_direction',
+               'waste_collector_status', 'navigation_mode', 'confidence_score', 'reward_value')
+    per_mission = plan.sizes['samples_per_mission']
+    picks = np.arange(0, per_mission, ML_DECISION_EVERY)
+    k = len(picks)
+    for chunk, missions in plan.mission_chunks():
+        rng = rng_for(plan.seed, 'ml_decision', chunk)
+        m = missions.stop - missions.start
+        n = m * k
+        sensor_ids = (plan.start_ids['sensor_data'] + (missions.start + np.arange(m))[:, None] * per_mission
+                      + picks[None, :])
+        collector = np.array(['idle', 'collecting', 'full'])[rng.choice(3, size=n, p=(0.5, 0.45, 0.05))]
+        mode = np.array(['coverage', 'hotspot', 'return'])[rng.choice(3, size=n, p=(0.6, 0.3, 0.1))]
+        rows = list(zip(
+            np.repeat(plan.mission_robot[missions], k).tolist(),
+            np.repeat(plan.mission_ids[missions], k).tolist(),
+            sensor_ids.ravel().tolist(),
+            format_datetimes(plan.sample_times(missions)[:, picks].ravel()),
+            np.round(rng.normal(1.2, 0.3, size=n), 2).tolist(),
+            np.round(rng.normal(0, 25, size=n), 2).tolist(),
+            collector.tolist(), mode.tolist(),
+            np.round(rng.beta(8, 2, size=n), 4).tolist(),
+            np.round(rng.normal(0.5, 0.2, size=n), 4).tolist()
+        ))
+        yield columns, rows
+
+
+def operation_logs(plan):
+    columns = ('mission_id', 'robot_id', 'timestamp', 'action_type', 'created_at')
+    k = OPERATION_LOGS_PER_MISSION
+    for chunk, missions in plan.mission_chunks():
+        rng = rng_for(plan.seed, 'operation_log', chunk)
+        m = missions.stop - missions.start
+        actions = np.array(OPERATION_ACTIONS)[rng.integers(0, len(OPERATION_ACTIONS), size=(m, k))]
+        actions[:, 0] = 'mission_start'
+        actions[:, -1] = 'mission_complete'
+        fractions = np.sort(rng.uniform(0, 1, size=(m, k)), axis=1)
+        fractions[:, 0], fractions[:, -1] = 0.0, 1.0
+        offsets = (fractions * plan.mission_duration_s[missions][:, None] * 1e6).astype('timedelta64[us]')
+        timestamps = format_datetimes((plan.mission_start[missions][:, None] + offsets).ravel())
+        rows = list(zip(
+            np.repeat(plan.mission_ids[missions], k).tolist(),
+            np.repeat(plan.mission_robot[missions], k).tolist(),
+            timestamps, actions.ravel().tolist(), timestamps
+        ))
+        yield columns, rows
+
+
+def wastes(plan):
+    columns = ('mission_id', 'waste_type', 'weight', 'location', 'geohash', 'detected_at',
+               'collected', 'collected_at', 'created_at')
+    for chunk, missions in plan.mission_chunks():
+        rng = rng_for(plan.seed, 'waste', chunk)
+        counts = rng.poisson(WASTE_PER_MISSION, size=missions.stop - missions.start)
+        index = np.repeat(np.arange(missions.start, missions.stop), counts)
+        n = len(index)
+        lat, lon = offset_latlon(plan.mission_lat[index], plan.mission_lon[index],
+                                 rng.normal(0, 200, size=n), rng.normal(0, 200, size=n))
+        lat, lon = np.round(lat, 7), np.round(lon, 7)
+        detected = plan.mission_start[index] + \
+            (rng.uniform(0, 1, size=n) * plan.mission_duration_s[index] * 1e6).astype('timedelta64[us]')
+        collected = rng.uniform(size=n) < 0.85
+        collected_at = detected + (rng.uniform(60, 1800, size=n) * 1e6).astype('timedelta64[us]')
+        detected_str = format_datetimes(detected)
+        collected_str = format_datetimes(collected_at)
+        rows = list(zip(
+            plan.mission_ids[index].tolist(),
+            np.array(WASTE_TYPES)[rng.choice(len(WASTE_TYPES), size=n, p=WASTE_TYPE_P)].tolist(),
+            np.round(rng.lognormal(-0.5, 0.8, size=n) + 0.05, 2).tolist(),
+            json_points(lat, lon), geohash_array(lat, lon), detected_str, collected.tolist(),
+            [value if flag else None for value, flag in zip(collected_str, collected.tolist())],
+            detected_str
+        ))
+        yield columns, rows
+
+
+def bookings_and_payments(plan):
+    """
+    Rental per robot berurutan dengan jeda acak; sebagian sengaja overlap dengan
+    booking sebelumnya (konflik) dan berstatus cancelled/pending.
+    Yield ('booking', columns, rows) dan ('payment', columns, rows).
+    """
+    rng = rng_for(plan.seed, 'booking')
+    robots_n = plan.sizes['robots']
+    per_robot = plan.sizes['bookings_per_robot']
+    if not per_robot or not len(plan.customer_ids):
+        return
+    shape = (robots_n, per_robot)
+    day_us = 86400e6
+
+    durations = rng.integers(1, 15, size=shape)
+    gaps = rng.exponential(plan.sizes['days'] / per_robot / 2, size=shape)
+    overlap = rng.uniform(size=shape) < BOOKING_OVERLAP_P
+    overlap[:, 0] = False
+    # Overlap: mulai sebelum booking sebelumnya selesai
+    gaps = np.where(overlap, -rng.uniform(0.2, 0.9, size=shape) * np.roll(durations, 1, axis=1), gaps)
+    advance = np.roll(durations, 1, axis=1).astype(np.float64)
+    advance[:, 0] = 0
+    start_days = np.cumsum(advance + gaps, axis=1) - plan.sizes['days']
+    starts = plan.now + (start_days * day_us).astype('timedelta64[us]')
+    ends = starts + (durations * day_us).astype('timedelta64[us]')
+    created = starts - (rng.exponential(7, size=shape) * day_us + 3600e6).astype('timedelta64[us]')
+
+    status = np.where(ends < plan.now, 'completed', np.where(starts <= plan.now, 'active', 'confirmed'))
+    status = np.where((status == 'confirmed') & (rng.uniform(size=shape) < 0.3), 'pending', status)
+    status = np.where((status == 'completed') & (rng.uniform(size=shape) < 0.05), 'cancelled', status)
+    status = np.where(overlap, np.where(rng.uniform(size=shape) < 0.7, 'cancelled', 'pending'), status)
+
+    n = robots_n * per_robot
+    booking_ids = np.arange(n) + plan.start_ids['booking']
+    users = rng.choice(plan.customer_ids, size=n)
+    start_str, end_str, created_str = format_datetimes(starts.ravel()), format_datetimes(ends.ravel()), \
+        format_datetimes(created.ravel())
+    cost = (durations * RENTAL_PRICE_PER_DAY).ravel()
+    status = status.ravel()
+
+    yield 'booking', ('booking_id', 'user_id', 'robot_id', 'booking_type', 'start_date', 'end_date',
+                      'duration_days', 'location', 'status', 'total_cost', 'created_at', 'updated_at'), list(zip(
+        booking_ids.tolist(), users.tolist(), np.repeat(plan.robot_ids, per_robot).tolist(),
+        ['rental'] * n, start_str, end_str, durations.ravel().tolist(), ['Teluk Jakarta'] * n,
+        status.tolist(), cost.tolist(), created_str, created_str
+    ))
+
+    paid = np.flatnonzero(np.isin(status, ('confirmed', 'active', 'completed')))
+    methods = np.array(PAYMENT_METHODS)[rng.integers(0, len(PAYMENT_METHODS), size=len(paid))]
+    yield 'payment', ('booking_id', 'amount', 'method', 'status', 'paid_at', 'transaction_id',
+                      'created_at'), list(zip(
+        booking_ids[paid].tolist(), cost[paid].tolist(), methods.tolist(), ['completed'] * len(paid),
+        [created_str[i] for i in paid.tolist()],
+        [f'TXN-{booking_id}' for booking_id in booking_ids[paid].tolist()],
+        [created_str[i] for i in paid.tolist()]
+    ))
+
+
+def certification_progress(plan):
+    columns = ('user_id', 'module_id', 'completed', 'completed_at', 'progress_percentage', 'created_at')
+    if not plan.module_ids or not len(plan.customer_ids):
+        return
+    rng = rng_for(plan.seed, 'user_certification_progress')
+    modules = len(plan.module_ids)
+    # Progress berurutan: modul selesai 0..k-1, modul k sebagian
+    done = rng.integers(0, modules + 1, size=len(plan.customer_ids))
+    created = format_datetimes([plan.now])[0]
+    rows = []
+    for user_id, k in zip(plan.customer_ids.tolist(), done.tolist()):
+        for j, module_id in enumerate(plan.module_ids):
+            if j < k:
+                rows.append((user_id, module_id, True, created, 100, created))
+            elif j == k:
+                rows.append((user_id, module_id, False, None, int(rng.integers(0, 100)), created))
+    yield columns, rows
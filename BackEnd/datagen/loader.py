@@ -0,0 +1,184 @@
+"""
+Orkestrasi generate + load: fase serial (user, robot, mission) lalu tabel
+besar paralel per tabel.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import func
+
+from app import db
+from app.models import (
+    Booking, CertificationModule, Mission, Robot, Role, SensorData, User
+)
+from app.utils.auth import hash_password
+from datagen import generators
+from datagen.writer import BulkWriter
+
+PRESETS = {
+    'small': {'robots': 50, 'customers': 50, 'missions_per_robot': 4, 'samples_per_mission': 25,
+              'bookings_per_robot': 4, 'days': 60},
+    'medium': {'robots': 500, 'customers': 500, 'missions_per_robot': 10, 'samples_per_mission': 40,
+               'bookings_per_robot': 10, 'days': 90},
+    'large': {'robots': 2000, 'customers': 5000, 'missions_per_robot': 20, 'samples_per_mission': 60,
+              'bookings_per_robot': 25, 'days': 180},
+    '10m': {'robots': 2000, 'customers': 10000, 'missions_per_robot': 50, 'samples_per_mission': 70,
+            'bookings_per_robot': 60, 'days': 365},
+}
+
+DEFAULT_MODULES = 6
+
+# (tabel, primary key) yang diisi dengan id eksplisit
+EXPLICIT_ID_TABLES = (
+    ('users', 'user_id'), ('robot', 'robot_id'), ('mission', 'mission_id'),
+    ('sensor_data', 'id'), ('booking', 'booking_id'),
+)
+
+
+class DatasetExistsError(RuntimeError):
+    pass
+
+
+def _next_id(column):
+    return (db.session.query(func.max(column)).scalar() or 0) + 1
+
+
+def _ensure_reference_rows():
+    """Role dan modul sertifikasi (kecil, lewat ORM)"""
+    roles = {role.role_name: role for role in Role.query.all()}
+    for name in ('admin', 'operator', 'customer'):
+        if name not in roles:
+            roles[name] = Role(role_name=name)
+            db.session.add(roles[name])
+
+    if CertificationModule.query.count() == 0:
+        db.session.add_all([
+            CertificationModule(module_number=i + 1, title=f'Module {i + 1}', duration_minutes=30, order_index=i + 1)
+            for i in range(DEFAULT_MODULES)
+        ])
+    db.session.commit()
+    module_ids = [row[0] for row in db.session.query(CertificationModule.id).order_by(CertificationModule.order_index)]
+    return {name: role.role_id for name, role in roles.items()}, module_ids
+
+
+def estimate_rows(sizes):
+    missions = sizes['robots'] * sizes['missions_per_robot']
+    samples = missions * sizes['samples_per_mission']
+    return {
+        'users': sizes['customers'] + 1 + sizes.get('operators', 5),
+        'robot': sizes['robots'],
+        'mission': missions,
+        'sensor_data': samples,
+        'ml_decision': missions * len(range(0, sizes['samples_per_mission'], generators.ML_DECISION_EVERY)),
+        'operation_log': missions * generators.OPERATION_LOGS_PER_MISSION,
+        'waste': int(missions * generators.WASTE_PER_MISSION),
+        'booking': sizes['robots'] * sizes['bookings_per_robot'],
+    }
+
+
+def generate(sizes, seed=42, now=None, jobs=4, email_domain='sealen.local', password='password123',
+             rebuild_density=True, log=None):
+    """
+    Generate dataset ke database aplikasi aktif (butuh app context).
+    Return ringkasan: baris & detik per tabel, total rows/s, id robot dan customer.
+    """
+    log = log or (lambda message: None)
+    now = now or datetime.utcnow().replace(microsecond=0)
+    writer = BulkWriter(db.engine)
+    if writer.in_memory:
+        jobs = 1  # tiap koneksi :memory: adalah database terpisah
+
+    if User.query.filter_by(email=f'admin@{email_domain}').first():
+        raise DatasetExistsError(f'dataset @{email_domain} already exists; use another --email-domain')
+
+    role_ids, module_ids = _ensure_reference_rows()
+    start_ids = {
+        'users': _next_id(User.user_id), 'robot': _next_id(Robot.robot_id), 'mission': _next_id(Mission.mission_id),
+        'sensor_data': _next_id(SensorData.id), 'booking': _next_id(Booking.booking_id),
+    }
+    db.session.commit()
+
+    started = time.perf_counter()
+    plan = generators.Plan(sizes, seed, now, start_ids, role_ids, module_ids, email_domain, hash_password(password))
+    stats = {}
+
+    def load(table, producer):
+        table_started = time.perf_counter()
+        count = 0
+        with writer.connect() as conn:
+            for columns, rows in producer(plan):
+                count += writer.write(conn, table, columns, rows)
+        stats[table] = {'rows': count, 'seconds': round(time.perf_counter() - table_started, 2)}
+        log(f'{table}: {count} rows in {stats[table]["seconds"]}s')
+
+    def load_bookings():
+        table_started = time.perf_counter()
+        counts = {'booking': 0, 'payment': 0}
+        with writer.connect() as conn:
+            for table, columns, rows in generators.bookings_and_payments(plan):
+                counts[table] += writer.write(conn, table, columns, rows)
+        seconds = round(time.perf_counter() - table_started, 2)
+        for table, count in counts.items():
+            stats[table] = {'rows': count, 'seconds': seconds}
+        log(f'booking/payment: {counts["booking"]}/{counts["payment"]} rows in {seconds}s')
+
+    # Fase 1: tabel induk (serial, urutan FK)
+    load('users', generators.users)
+    load('robot', generators.robots)
+    load('mission', generators.missions)
+
+    # Fase 2: tabel besar, paralel per tabel
+    tasks = [
+        (load, 'sensor_data', generators.sensor_data),
+        (load, 'ml_decision', generators.ml_decisions),
+        (load, 'operation_log', generators.operation_logs),
+        (load, 'waste', generators.wastes),
+        (load, 'user_certification_progress', generators.certification_progress),
+    ]
+    if jobs <= 1:
+        load_bookings()
+        for fn, *args in tasks:
+            fn(*args)
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(load_bookings)] + [executor.submit(fn, *args) for fn, *args in tasks]
+            for future in futures:
+                future.result()
+
+    writer.reset_sequences(EXPLICIT_ID_TABLES)
+    db.session.expire_all()
+
+    # Progress sertifikasi di-bulk load tanpa service: hitung ulang ringkasan per user
+    from app.services.certification import module_catalog, refresh_summary
+    refresh_summary(db.session)
+    db.session.commit()
+    module_catalog.invalidate()
+
+    # Booking di-bulk load tanpa mapper event: isi jadwal transisi status
+    from app.services.booking_lifecycle import refresh_next_transitions
+    refresh_next_transitions(db.session)
+    db.session.commit()
+
+    density_cells = None
+    if rebuild_density:
+        from app.services.heatmap import rebuild_density as rebuild
+        density_started = time.perf_counter()
+        density_cells = rebuild()
+        log(f'waste_density_cell: {density_cells} cells in {time.perf_counter() - density_started:.2f}s')
+
+    elapsed = time.perf_counter() - started
+    total = sum(row['rows'] for row in stats.values())
+    return {
+        'seed': seed,
+        'now': now.isoformat(),
+        'sizes': sizes,
+        'tables': stats,
+        'total_rows': total,
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round(total / elapsed, 1) if elapsed else None,
+        'density_cells': density_cells,
+        'robot_ids': plan.robot_ids.tolist(),
+        'customer_ids': plan.customer_ids.tolist(),
+        'email_domain': email_domain
+    }
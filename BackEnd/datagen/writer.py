@@ -0,0 +1,94 @@
+"""
+Bulk writer lewat koneksi DBAPI langsung (tanpa ORM / type processing).
+
+- PostgreSQL: COPY ... FROM STDIN (CSV)
+- Dialect lain: cursor.executemany per chunk
+SQLite hanya mengizinkan satu writer, jadi write di-serialize dengan lock;
+generate chunk berikutnya tetap berjalan paralel.
+"""
+import csv
+import io
+import threading
+from contextlib import contextmanager
+
+PARAM_MARKERS = {'qmark': '?', 'format': '%s', 'pyformat': '%s', 'numeric': None, 'named': None}
+
+
+class BulkWriter:
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self._quote = engine.dialect.identifier_preparer.quote
+        self._lock = threading.Lock() if self.dialect == 'sqlite' else None
+
+    @property
+    def in_memory(self):
+        return self.dialect == 'sqlite' and self.engine.url.database in (None, '', ':memory:')
+
+    @contextmanager
+    def connect(self):
+        """Koneksi DBAPI dari pool; SQLite pakai synchronous=OFF selama load lalu dikembalikan sebelum close"""
+        conn = self.engine.raw_connection()
+        synchronous = None
+        try:
+            if self.dialect == 'sqlite':
+                cursor = conn.cursor()
+                cursor.execute('PRAGMA synchronous')
+                synchronous = cursor.fetchone()[0]
+                cursor.execute('PRAGMA synchronous=OFF')
+                cursor.close()
+            yield conn
+        finally:
+            try:
+                if synchronous is not None:
+                    cursor = conn.cursor()
+                    cursor.execute(f'PRAGMA synchronous={int(synchronous)}')
+                    cursor.close()
+            finally:
+                conn.close()
+
+    def write(self, conn, table, columns, rows):
+        if not rows:
+            return 0
+        if self._lock:
+            with self._lock:
+                self._write(conn, table, columns, rows)
+        else:
+            self._write(conn, table, columns, rows)
+        return len(rows)
+
+    def _write(self, conn, table, columns, rows):
+        column_list = ', '.join(self._quote(column) for column in columns)
+        cursor = conn.cursor()
+        try:
+            if self.dialect == 'postgresql':
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(f'COPY {self._quote(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+            else:
+                marker = PARAM_MARKERS.get(self.engine.dialect.paramstyle)
+                if marker is None:
+                    raise NotImplementedError(f'paramstyle {self.engine.dialect.paramstyle} not supported')
+                placeholders = ', '.join([marker] * len(columns))
+                cursor.executemany(f'INSERT INTO {self._quote(table)} ({column_list}) VALUES ({placeholders})', rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def reset_sequences(self, tables):
+        """PostgreSQL: sinkronkan sequence setelah insert dengan id eksplisit"""
+        if self.dialect != 'postgresql':
+            return
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            for table, pk in tables:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), "
+                    f"COALESCE((SELECT MAX({self._quote(pk)}) FROM {self._quote(table)}), 1))"
+                )
+            conn.commit()
@@ -0,0 +1,49 @@
+"""
+Konfigurasi gunicorn (semua bisa di-override lewat env).
+
+  WEB_CONCURRENCY         jumlah worker proses (default: 1, lihat di bawah)
+  GUNICORN_WORKER_CLASS   gevent-websocket kalau terpasang (SocketIO websocket), selain itu gthread
+  GUNICORN_THREADS        thread per worker untuk gthread
+  GUNICORN_BIND           default 0.0.0.0:5010
+
+Default satu worker: beberapa service menyimpan state di memori proses dan hanya melihat
+commit dari worker-nya sendiri (robot_index, tile_cache, fleet_scheduler, antrian command
+robot). Naikkan WEB_CONCURRENCY hanya untuk instance yang tidak melayani endpoint itu
+(lihat README, bagian Production).
+
+Dengan lebih dari satu worker, SocketIO butuh message queue supaya emit dari satu
+worker sampai ke client di worker lain; default `local://` (Unix socket, satu host).
+Client SocketIO harus memakai transport websocket saja (gunicorn tidak punya sticky
+session untuk long-polling).
+"""
+import os
+
+
+def _worker_class():
+    try:
+        import geventwebsocket  # noqa: F401
+        return 'geventwebsocket.gunicorn.workers.GeventWebSocketWorker'
+    except ImportError:
+        return 'gthread'
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5010')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', _worker_class())
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recycle worker secara berkala (memory leak / fragmentasi); jitter supaya tidak serentak
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+# Tanpa preload: setiap worker membuat engine/pool sendiri (koneksi DB tidak ikut ter-fork)
+preload_app = False
+accesslog = None  # access log sudah ditulis aplikasi (LOG_REQUESTS)
+errorlog = '-'
+
+_async_mode = 'gevent' if 'gevent' in worker_class.lower() else 'eventlet' if 'eventlet' in worker_class else 'threading'
+raw_env = [f'SOCKETIO_ASYNC_MODE={_async_mode}']
+if workers > 1 and not os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+    raw_env.append('SOCKETIO_MESSAGE_QUEUE=local:///tmp/sealen-socketio')
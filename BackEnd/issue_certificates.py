@@ -0,0 +1,54 @@
+"""
+Terbitkan sertifikat untuk banyak user sekaligus (satu transaksi), mis. setelah
+sesi pelatihan. Input: file berisi satu email per baris (atau '-' untuk stdin).
+User yang sudah punya sertifikat aktif dengan tipe yang sama dilewati.
+
+Run: python issue_certificates.py emails.txt [--cert-type "Operator Certification"]
+                                              [--valid-days 365] [--dry-run]
+"""
+import argparse
+import sys
+
+from app import create_app, db
+from app.config import Config
+from app.services.certificates import CERT_TYPE, MAX_VALID_DAYS, issue_certificates, resolve_user_ids
+
+
+def read_emails(path):
+    f = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Issue certificates for a list of users in one transaction')
+    parser.add_argument('emails', help="File dengan satu email per baris ('-' untuk stdin)")
+    parser.add_argument('--cert-type', default=CERT_TYPE)
+    parser.add_argument('--valid-days', type=int, default=None, help='Masa berlaku (default: tanpa expiry)')
+    parser.add_argument('--dry-run', action='store_true', help='Rollback di akhir')
+    args = parser.parse_args()
+    if args.valid_days is not None and not 1 <= args.valid_days <= MAX_VALID_DAYS:
+        parser.error(f'--valid-days must be between 1 and {MAX_VALID_DAYS}')
+
+    emails = read_emails(args.emails)
+    app = create_app(Config)
+    with app.app_context():
+        user_ids = resolve_user_ids(db.session, emails)
+        certificates, skipped = issue_certificates(db.session, user_ids, args.cert_type, args.valid_days)
+        if args.dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+    print(f"emails={len(emails)} unknown={len(set(emails)) - len(user_ids)} "
+          f"issued={len(certificates)} skipped={skipped}{' (dry run)' if args.dry_run else ''}")
+    if certificates:
+        print(f"cert_number {certificates[0]['cert_number']} .. {certificates[-1]['cert_number']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Add geohash columns for spatial queries
+
+Revision ID: a3f1c9d2e7b4
+Revises: 486b167d3840
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.geo import encode_geohash, position_latlon
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c9d2e7b4'
+down_revision = '486b167d3840'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(table, pk, column):
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(f'SELECT {pk}, {column} FROM {table} WHERE {column} IS NOT NULL')).fetchall()
+    for row_id, position in rows:
+        latlon = position_latlon(position)
+        if latlon:
+            conn.execute(
+                sa.text(f'UPDATE {table} SET geohash = :geohash WHERE {pk} = :row_id'),
+                {'geohash': encode_geohash(*latlon), 'row_id': row_id}
+            )
+
+
+def upgrade():
+    with op.batch_alter_table('waste', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index(batch_op.f('ix_waste_geohash'), ['geohash'], unique=False)
+
+    with op.batch_alter_table('robot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index(batch_op.f('ix_robot_geohash'), ['geohash'], unique=False)
+
+    _backfill('waste', 'waste_id', 'location')
+    _backfill('robot', 'robot_id', 'current_position')
+
+
+def downgrade():
+    with op.batch_alter_table('robot', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_robot_geohash'))
+        batch_op.drop_column('geohash')
+
+    with op.batch_alter_table('waste', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_waste_geohash'))
+        batch_op.drop_column('geohash')
@@ -0,0 +1,52 @@
+"""Index updated_at sources of the analytics cube and add commit-ordered cell versions
+
+Revision ID: a6d3f9c1e842
+Revises: c2d7e9a4b136
+Create Date: 2026-10-19 17:20:11.418306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3f9c1e842'
+down_revision = 'c2d7e9a4b136'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('analytics_cube', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_analytics_cube_version'), ['version'], unique=False)
+
+    with op.batch_alter_table('analytics_cube_state', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_booking_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('mission', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mission_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mission', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mission_updated_at'))
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_updated_at'))
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_updated_at'))
+
+    with op.batch_alter_table('analytics_cube_state', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('analytics_cube', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_analytics_cube_version'))
+        batch_op.drop_column('version')
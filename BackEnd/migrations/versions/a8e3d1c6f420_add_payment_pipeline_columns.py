@@ -0,0 +1,36 @@
+"""Add payment idempotency and gateway columns
+
+Revision ID: a8e3d1c6f420
+Revises: f2c7a9e4b813
+Create Date: 2026-10-19 17:02:13.540982
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3d1c6f420'
+down_revision = 'f2c7a9e4b813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('idempotency_key', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('gateway_reference', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('failure_reason', sa.String(length=255), nullable=True))
+        batch_op.create_index(batch_op.f('ix_payment_gateway_reference'), ['gateway_reference'], unique=False)
+        batch_op.create_unique_constraint('unique_payment_idempotency', ['booking_id', 'idempotency_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_payment_idempotency', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_payment_gateway_reference'))
+        batch_op.drop_column('failure_reason')
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('gateway_reference')
+        batch_op.drop_column('idempotency_key')
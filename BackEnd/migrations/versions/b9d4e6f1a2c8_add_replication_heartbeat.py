@@ -0,0 +1,28 @@
+"""Add replication_heartbeat table
+
+Revision ID: b9d4e6f1a2c8
+Revises: e41d8f3b6a25
+Create Date: 2026-10-19 14:20:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4e6f1a2c8'
+down_revision = 'e41d8f3b6a25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('replication_heartbeat',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('beat_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('replication_heartbeat')
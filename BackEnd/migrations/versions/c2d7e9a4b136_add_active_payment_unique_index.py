@@ -0,0 +1,29 @@
+"""Allow at most one open or paid payment per booking
+
+Revision ID: c2d7e9a4b136
+Revises: f8a2c6e4d157
+Create Date: 2026-10-19 16:41:37.902215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d7e9a4b136'
+down_revision = 'f8a2c6e4d157'
+branch_labels = None
+depends_on = None
+
+ACTIVE = "status IN ('pending', 'processing', 'completed')"
+
+
+def upgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.create_index('uq_payment_active_booking', ['booking_id'], unique=True,
+                              sqlite_where=sa.text(ACTIVE), postgresql_where=sa.text(ACTIVE))
+
+
+def downgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_index('uq_payment_active_booking')
@@ -0,0 +1,41 @@
+"""Add booking.next_transition_at
+
+Revision ID: c3f6b8d2e517
+Revises: a8e3d1c6f420
+Create Date: 2026-10-19 17:48:55.207311
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f6b8d2e517'
+down_revision = 'a8e3d1c6f420'
+branch_labels = None
+depends_on = None
+
+# Booking pending yang sudah ada mendapat TTL default (BOOKING_PENDING_TTL_MINUTES) dari waktu migrasi
+PENDING_TTL = timedelta(minutes=60)
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_transition_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_booking_next_transition_at'), ['next_transition_at'], unique=False)
+
+    op.execute(sa.text("""
+        UPDATE booking SET next_transition_at = CASE
+            WHEN status = 'pending' THEN :pending_deadline
+            WHEN status = 'confirmed' AND booking_type = 'rental' THEN start_date
+            WHEN status = 'active' THEN end_date
+            ELSE NULL END
+    """).bindparams(pending_deadline=datetime.utcnow() + PENDING_TTL))
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_next_transition_at'))
+        batch_op.drop_column('next_transition_at')
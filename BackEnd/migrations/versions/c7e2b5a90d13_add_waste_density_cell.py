@@ -0,0 +1,40 @@
+"""Add waste_density_cell aggregate table
+
+Revision ID: c7e2b5a90d13
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-19 10:02:17.540921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2b5a90d13'
+down_revision = 'a3f1c9d2e7b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('waste_density_cell',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cell_x', sa.Integer(), nullable=False),
+    sa.Column('cell_y', sa.Integer(), nullable=False),
+    sa.Column('waste_type', sa.String(length=100), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total_weight', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cell_x', 'cell_y', 'waste_type', 'day', name='unique_density_cell')
+    )
+    with op.batch_alter_table('waste_density_cell', schema=None) as batch_op:
+        batch_op.create_index('ix_waste_density_cell_day', ['day'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('waste_density_cell', schema=None) as batch_op:
+        batch_op.drop_index('ix_waste_density_cell_day')
+
+    op.drop_table('waste_density_cell')
@@ -0,0 +1,50 @@
+"""Add user_certification_summary table
+
+Revision ID: d5a8c3f7e019
+Revises: b9d4e6f1a2c8
+Create Date: 2026-10-19 15:05:12.304417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a8c3f7e019'
+down_revision = 'b9d4e6f1a2c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_certification_summary',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('module_count', sa.Integer(), nullable=False),
+    sa.Column('completed_modules', sa.Integer(), nullable=False),
+    sa.Column('progress_sum', sa.Integer(), nullable=False),
+    sa.Column('overall_progress', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill dari progress yang sudah ada
+    op.execute("""
+        INSERT INTO user_certification_summary
+            (user_id, module_count, completed_modules, progress_sum, overall_progress, updated_at)
+        SELECT p.user_id,
+               (SELECT COUNT(*) FROM certification_module),
+               SUM(CASE WHEN p.completed THEN 1 ELSE 0 END),
+               COALESCE(SUM(p.progress_percentage), 0),
+               CASE WHEN (SELECT COUNT(*) FROM certification_module) > 0
+                    THEN COALESCE(SUM(p.progress_percentage), 0) / (SELECT COUNT(*) FROM certification_module)
+                    ELSE 0 END,
+               CURRENT_TIMESTAMP
+        FROM user_certification_progress p
+        JOIN certification_module m ON m.id = p.module_id
+        GROUP BY p.user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('user_certification_summary')
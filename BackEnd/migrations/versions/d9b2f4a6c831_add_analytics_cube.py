@@ -0,0 +1,56 @@
+"""Add analytics_cube and analytics_cube_state tables
+
+Revision ID: d9b2f4a6c831
+Revises: c3f6b8d2e517
+Create Date: 2026-10-19 14:51:54.658617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b2f4a6c831'
+down_revision = 'c3f6b8d2e517'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analytics_cube',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('robot_id', sa.Integer(), nullable=False),
+    sa.Column('model_type', sa.String(length=100), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('booking_type', sa.String(length=50), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('booked_days', sa.Float(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('missions', sa.Integer(), nullable=False),
+    sa.Column('mission_hours', sa.Float(), nullable=False),
+    sa.Column('area_covered', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('waste_collected', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'robot_id', 'model_type', 'location', 'booking_type', name='unique_cube_cell')
+    )
+    with op.batch_alter_table('analytics_cube', schema=None) as batch_op:
+        batch_op.create_index('ix_analytics_cube_day', ['day'], unique=False)
+        batch_op.create_index(batch_op.f('ix_analytics_cube_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('analytics_cube_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('watermark', sa.DateTime(), nullable=True),
+    sa.Column('rebuilt_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('analytics_cube_state')
+    with op.batch_alter_table('analytics_cube', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_analytics_cube_updated_at'))
+        batch_op.drop_index('ix_analytics_cube_day')
+
+    op.drop_table('analytics_cube')
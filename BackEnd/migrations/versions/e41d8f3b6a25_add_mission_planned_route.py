@@ -0,0 +1,26 @@
+"""Add mission.planned_route
+
+Revision ID: e41d8f3b6a25
+Revises: c7e2b5a90d13
+Create Date: 2026-10-19 11:20:03.671245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41d8f3b6a25'
+down_revision = 'c7e2b5a90d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('mission', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('planned_route', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('mission', schema=None) as batch_op:
+        batch_op.drop_column('planned_route')
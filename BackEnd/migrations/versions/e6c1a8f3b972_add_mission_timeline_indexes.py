@@ -0,0 +1,38 @@
+"""Add (mission_id, timestamp) indexes for mission timeline replay
+
+Revision ID: e6c1a8f3b972
+Revises: d9b2f4a6c831
+Create Date: 2026-10-19 15:22:41.318604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6c1a8f3b972'
+down_revision = 'd9b2f4a6c831'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sensor_data', schema=None) as batch_op:
+        batch_op.create_index('ix_sensor_data_mission_time', ['mission_id', 'timestamp'], unique=False)
+
+    with op.batch_alter_table('ml_decision', schema=None) as batch_op:
+        batch_op.create_index('ix_ml_decision_mission_time', ['mission_id', 'timestamp'], unique=False)
+
+    with op.batch_alter_table('operation_log', schema=None) as batch_op:
+        batch_op.create_index('ix_operation_log_mission_time', ['mission_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('operation_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_operation_log_mission_time')
+
+    with op.batch_alter_table('ml_decision', schema=None) as batch_op:
+        batch_op.drop_index('ix_ml_decision_mission_time')
+
+    with op.batch_alter_table('sensor_data', schema=None) as batch_op:
+        batch_op.drop_index('ix_sensor_data_mission_time')
@@ -0,0 +1,37 @@
+"""Add certificate_counter table and certificate.updated_at
+
+Revision ID: f2c7a9e4b813
+Revises: d5a8c3f7e019
+Create Date: 2026-10-19 16:20:41.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9e4b813'
+down_revision = 'd5a8c3f7e019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('certificate_counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    with op.batch_alter_table('certificate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_certificate_updated_at'), ['updated_at'], unique=False)
+
+    op.execute("UPDATE certificate SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+
+
+def downgrade():
+    with op.batch_alter_table('certificate', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_certificate_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    op.drop_table('certificate_counter')
@@ -0,0 +1,35 @@
+"""Use byte-order (C) collation for geohash columns on PostgreSQL
+
+Revision ID: f8a2c6e4d157
+Revises: e6c1a8f3b972
+Create Date: 2026-10-19 16:05:12.441027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a2c6e4d157'
+down_revision = 'e6c1a8f3b972'
+branch_labels = None
+depends_on = None
+
+TABLES = ('waste', 'robot')
+
+
+def upgrade():
+    # Range prefix geohash (>= cell, < cell || '{') butuh urutan byte; SQLite sudah BINARY
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'geohash', existing_type=sa.String(length=12),
+                        type_=sa.String(length=12, collation='C'), existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'geohash', existing_type=sa.String(length=12, collation='C'),
+                        type_=sa.String(length=12), existing_nullable=True)
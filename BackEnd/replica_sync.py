@@ -0,0 +1,63 @@
+"""
+Replikasi lokal untuk development: salin database SQLite primary ke satu atau
+lebih file replica secara berkala (sqlite3 backup API, konsisten per snapshot).
+--lag menahan setiap snapshot sekian detik sebelum diterapkan untuk mensimulasikan
+replica yang tertinggal.
+
+Run: python replica_sync.py instance/sealen.db instance/replica.db [--interval 1] [--lag 0]
+Lalu: REPLICA_DATABASE_URLS=sqlite:///instance/replica.db python run.py
+"""
+import argparse
+import collections
+import sqlite3
+import sys
+import time
+
+
+def snapshot(path):
+    source = sqlite3.connect(path)
+    copy = sqlite3.connect(':memory:')
+    try:
+        source.backup(copy)
+    finally:
+        source.close()
+    return copy
+
+
+def apply(copy, path):
+    target = sqlite3.connect(path, timeout=30)
+    try:
+        copy.backup(target)
+    finally:
+        target.close()
+        copy.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Copy a primary SQLite database to replica files')
+    parser.add_argument('primary')
+    parser.add_argument('replicas', nargs='+')
+    parser.add_argument('--interval', type=float, default=1.0, help='Detik antar snapshot')
+    parser.add_argument('--lag', type=float, default=0.0, help='Tunda penerapan snapshot (detik)')
+    parser.add_argument('--once', action='store_true', help='Satu kali salin (tanpa lag) lalu keluar')
+    args = parser.parse_args()
+
+    pending = collections.deque()
+    while True:
+        started = time.monotonic()
+        pending.append((started + (0.0 if args.once else args.lag), snapshot(args.primary)))
+        while pending and pending[0][0] <= time.monotonic():
+            _, copy = pending.popleft()
+            for path in args.replicas[1:]:
+                # snapshot yang sama untuk semua replica
+                clone = sqlite3.connect(':memory:')
+                copy.backup(clone)
+                apply(clone, path)
+            apply(copy, args.replicas[0])
+        if args.once:
+            return 0
+        time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""
+Simulator armada robot headless untuk load & latency test backend.
+
+Robot virtual di-step secara vectorized (NumPy) dan berbicara ke backend lewat
+endpoint asli: HTTP untuk telemetry (`POST /api/robots/telemetry`) dan SocketIO
+untuk command kontrol (`robot_join` / `robot_command` / `robot_ack`).
+
+Run: python -m simulator --robots 1000 --hz 10 --duration 30 --seed 42
+"""
+from simulator.client import BackendError, HttpClient, SocketLink
+from simulator.fleet import Fleet
+from simulator.runner import Simulator, provision_robots
+from simulator.stats import RunStats
+
+__all__ = ['BackendError', 'Fleet', 'HttpClient', 'RunStats', 'Simulator', 'SocketLink', 'provision_robots']
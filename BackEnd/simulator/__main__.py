@@ -0,0 +1,85 @@
+"""
+CLI simulator.
+Run: python -m simulator [--base-url http://localhost:5010] [--robots 1000] [--hz 10]
+                         [--duration 30] [--seed 42] [--socketio] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+
+from simulator.client import HttpClient
+from simulator.fleet import Fleet
+from simulator.runner import Simulator, provision_robots
+
+
+def parse_center(value):
+    lat, lon = (float(part) for part in value.split(','))
+    return lat, lon
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless multi-robot simulator')
+    parser.add_argument('--base-url', default=os.environ.get('SIM_BASE_URL', 'http://localhost:5010'))
+    parser.add_argument('--email', default=os.environ.get('SIM_EMAIL', 'admin@sealen.com'))
+    parser.add_argument('--password', default=os.environ.get('SIM_PASSWORD', 'admin123'))
+    parser.add_argument('--robots', type=int, default=100)
+    parser.add_argument('--hz', type=float, default=10.0)
+    parser.add_argument('--duration', type=float, default=10.0, help='Detik simulasi')
+    parser.add_argument('--ticks', type=int, help='Jumlah tick (override --duration)')
+    parser.add_argument('--seed', type=int, help='Seed untuk run reproducible')
+    parser.add_argument('--start-ts', type=float, help='Epoch timestamp tick pertama (default: sekarang)')
+    parser.add_argument('--center', type=parse_center, default=(-6.10, 106.80), help='lat,lon pusat area')
+    parser.add_argument('--radius-m', type=float, default=5000.0)
+    parser.add_argument('--batch-size', type=int, default=500, help='Sampel per request telemetry')
+    parser.add_argument('--workers', type=int, default=8, help='Koneksi HTTP paralel')
+    parser.add_argument('--socketio', action='store_true', help='Terima command lewat SocketIO')
+    parser.add_argument('--websocket-only', action='store_true', help='SocketIO tanpa long-polling (server multi-worker)')
+    parser.add_argument('--robot-token', default=os.environ.get('ROBOT_SOCKET_TOKEN'))
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+    args = parser.parse_args(argv)
+
+    client = HttpClient(args.base_url)
+    client.login(args.email, args.password)
+    robot_ids = provision_robots(client, args.robots)
+
+    fleet = Fleet(robot_ids, center=args.center, radius_m=args.radius_m, seed=args.seed)
+    simulator = Simulator(client, fleet, hz=args.hz, batch_size=args.batch_size,
+                          workers=args.workers, start_ts=args.start_ts)
+    if args.socketio:
+        simulator.attach_socket(args.base_url, args.robot_token, ['websocket'] if args.websocket_only else None)
+
+    try:
+        stats = simulator.run(duration=args.duration, ticks=args.ticks)
+    finally:
+        if simulator.socket is not None:
+            simulator.socket.close()
+
+    report = {
+        'robots': len(fleet),
+        'hz': args.hz,
+        'seed': args.seed,
+        'batch_size': args.batch_size,
+        'workers': args.workers,
+        **stats.to_dict()
+    }
+    if args.socketio:
+        report['command_latency'] = client.json('GET', '/api/robots/control/latency')['latency']
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"robots={report['robots']} hz={report['hz']} ticks={report['ticks']} "
+          f"late_ticks={report['late_ticks']} elapsed={report['elapsed_s']}s")
+    print(f"ingest: {report['samples_accepted']}/{report['samples_sent']} samples, "
+          f"{report['ingest_samples_per_s']} samples/s, {report['errors']} errors")
+    for name in ('request_latency', 'e2e_latency'):
+        row = report[name]
+        if row.get('count'):
+            print(f"{name:<16} p50={row['p50_ms']}ms p95={row['p95_ms']}ms p99={row['p99_ms']}ms max={row['max_ms']}ms")
+    return 0 if report['errors'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
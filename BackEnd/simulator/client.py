@@ -0,0 +1,107 @@
+"""
+Transport ke backend: HTTP (stdlib, keep-alive per thread) dan SocketIO (opsional).
+"""
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+
+
+class BackendError(RuntimeError):
+
+    def __init__(self, status, body):
+        super().__init__(f'HTTP {status}: {body}')
+        self.status = status
+        self.body = body
+
+
+class HttpClient:
+    """Client JSON minimal; satu koneksi persistent per thread"""
+
+    def __init__(self, base_url, timeout=30.0):
+        parts = urlsplit(base_url)
+        self.base_url = base_url.rstrip('/')
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.https = parts.scheme == 'https'
+        self.timeout = timeout
+        self.token = None
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method, path, payload=None):
+        """Return (status, parsed JSON body, bytes terkirim)"""
+        body = json.dumps(payload, separators=(',', ':')).encode() if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # Koneksi keep-alive ditutup server; buka ulang sekali
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+        data = json.loads(raw) if raw else None
+        return response.status, data, len(body or b'')
+
+    def json(self, method, path, payload=None, expected=(200, 201, 202)):
+        status, data, _ = self.request(method, path, payload)
+        if status not in expected:
+            raise BackendError(status, data)
+        return data
+
+    def login(self, email, password):
+        data = self.json('POST', '/api/auth/login', {'email': email, 'password': password})
+        self.token = data['access_token']
+        return data
+
+
+class SocketLink:
+    """Koneksi SocketIO gateway: join semua robot, terima `robot_command`, kirim `robot_ack`"""
+
+    def __init__(self, base_url, robot_ids, on_command, token=None, transports=None):
+        try:
+            import socketio
+        except ImportError as e:  # pragma: no cover
+            raise RuntimeError("SocketIO mode butuh 'python-socketio[client]'") from e
+
+        self.base_url = base_url
+        self.robot_ids = [int(robot_id) for robot_id in robot_ids]
+        self.token = token
+        # ['websocket'] untuk server multi-worker (tanpa sticky session untuk long-polling)
+        self.transports = transports
+        self.joined = threading.Event()
+        self.sio = socketio.Client(reconnection=True)
+        self.sio.on('connect', self._on_connect)
+        self.sio.on('robot_joined', lambda data: self.joined.set())
+        self.sio.on('robot_command', on_command)
+
+    def _on_connect(self):
+        self.sio.emit('robot_join', {'robot_ids': self.robot_ids, 'token': self.token})
+
+    def connect(self, timeout=10.0):
+        self.sio.connect(self.base_url, transports=self.transports)
+        if not self.joined.wait(timeout):
+            raise RuntimeError('robot_join tidak dikonfirmasi server')
+
+    def ack(self, command_id, ok=True, state=None):
+        self.sio.emit('robot_ack', {'command_id': command_id, 'ok': ok, 'state': state})
+
+    def close(self):
+        self.sio.disconnect()
@@ -0,0 +1,178 @@
+"""
+State armada robot virtual dalam array NumPy (satu baris per robot).
+
+Semua langkah simulasi vectorized; satu `step()` untuk 1000 robot hanya
+beberapa operasi array. Dengan seed yang sama dan jumlah tick yang sama,
+trajectory, baterai, noise sensor dan deteksi waste identik.
+"""
+import math
+
+import numpy as np
+
+METERS_PER_DEG_LAT = 111320.0
+
+WASTE_TYPES = ('plastic', 'organic', 'metal', 'glass', 'other')
+
+DIRECTIONS = {
+    'forward': 0.0,
+    'right': -math.pi / 2,
+    'backward': math.pi,
+    'left': math.pi / 2,
+}
+
+
+class Fleet:
+
+    def __init__(self, robot_ids, center=(-6.10, 106.80), radius_m=5000.0, seed=None,
+                 cruise_speed=1.5, turn_noise=0.15, waste_rate=0.02):
+        self.robot_ids = np.asarray(robot_ids, dtype=np.int64)
+        self.index = {int(robot_id): i for i, robot_id in enumerate(self.robot_ids)}
+        self.rng = np.random.default_rng(seed)
+        self.center = center
+        self.radius_m = float(radius_m)
+        self.cruise_speed = float(cruise_speed)
+        self.turn_noise = float(turn_noise)
+        self.waste_rate = float(waste_rate)  # deteksi per detik saat cruise
+
+        n = len(self.robot_ids)
+        self.xy = self.rng.uniform(-radius_m, radius_m, size=(n, 2))
+        self.heading = self.rng.uniform(0, 2 * math.pi, size=n)
+        self.speed = np.zeros(n)
+        self.target_speed = np.full(n, self.cruise_speed)
+        self.battery = self.rng.uniform(60, 100, size=n)
+        self.charging = np.zeros(n, dtype=bool)
+        self.depth = self.rng.uniform(0.5, 3.0, size=n)
+        self.mission_ids = [None] * n
+
+        self._lon_scale = METERS_PER_DEG_LAT * math.cos(math.radians(center[0]))
+
+    def __len__(self):
+        return len(self.robot_ids)
+
+    # ------------------------------------------------------------------
+    # Dynamics
+    # ------------------------------------------------------------------
+    def step(self, dt):
+        n = len(self.robot_ids)
+        rng = self.rng
+
+        self.heading += rng.normal(0.0, self.turn_noise * math.sqrt(dt), size=n)
+
+        target = np.where(self.charging, 0.0, self.target_speed)
+        self.speed += (target - self.speed) * min(1.0, dt / 2.0)
+
+        self.xy[:, 0] += self.speed * np.cos(self.heading) * dt
+        self.xy[:, 1] += self.speed * np.sin(self.heading) * dt
+
+        # Pantulkan robot yang keluar area
+        out_x = np.abs(self.xy[:, 0]) > self.radius_m
+        out_y = np.abs(self.xy[:, 1]) > self.radius_m
+        self.heading[out_x] = math.pi - self.heading[out_x]
+        self.heading[out_y] = -self.heading[out_y]
+        np.clip(self.xy, -self.radius_m, self.radius_m, out=self.xy)
+
+        # Baterai: idle drain + drain sebanding kecepatan, charge saat < 15%
+        self.battery -= (0.002 + 0.004 * self.speed) * dt
+        self.battery[self.charging] += 0.5 * dt
+        self.charging |= self.battery < 15
+        self.charging &= self.battery < 95
+        np.clip(self.battery, 0, 100, out=self.battery)
+
+        self.depth += rng.normal(0.0, 0.02 * math.sqrt(dt), size=n)
+        np.clip(self.depth, 0.2, 10.0, out=self.depth)
+
+    def detect_waste(self, dt):
+        """Return (indices, waste_type, weight) deteksi waste pada tick ini"""
+        rate = self.waste_rate * dt * (self.speed / self.cruise_speed)
+        hits = self.rng.poisson(rate)
+        indices = np.repeat(np.arange(len(hits)), hits)
+        types = self.rng.integers(0, len(WASTE_TYPES), size=len(indices))
+        weights = self.rng.exponential(0.8, size=len(indices)) + 0.05
+        return indices, types, weights
+
+    def latlon(self):
+        lat = self.center[0] + self.xy[:, 1] / METERS_PER_DEG_LAT
+        lon = self.center[1] + self.xy[:, 0] / self._lon_scale
+        return lat, lon
+
+    # ------------------------------------------------------------------
+    # Telemetry
+    # ------------------------------------------------------------------
+    def samples(self, ts, dt):
+        """Sampel telemetry semua robot untuk satu tick (list of dict, JSON-ready)"""
+        n = len(self.robot_ids)
+        rng = self.rng
+        lat, lon = self.latlon()
+        temperature = 28.5 + 0.8 * np.sin(self.xy[:, 0] / 900.0) + rng.normal(0, 0.1, size=n)
+        ph = 8.1 + rng.normal(0, 0.03, size=n)
+        water_quality = 80 + 5 * np.cos(self.xy[:, 1] / 1300.0) + rng.normal(0, 0.5, size=n)
+
+        detections = {}
+        indices, types, weights = self.detect_waste(dt)
+        for i, waste_type, weight in zip(indices.tolist(), types.tolist(), weights.tolist()):
+            detections.setdefault(i, []).append({
+                'waste_type': WASTE_TYPES[waste_type],
+                'weight': round(weight, 2),
+                'latitude': round(float(lat[i]), 7),
+                'longitude': round(float(lon[i]), 7)
+            })
+
+        columns = zip(
+            self.robot_ids.tolist(), np.round(lat, 7).tolist(), np.round(lon, 7).tolist(),
+            np.round(self.depth, 2).tolist(), np.round(temperature, 2).tolist(),
+            np.round(ph, 2).tolist(), np.round(water_quality, 2).tolist(),
+            self.battery.astype(np.int64).tolist(), np.round(self.speed, 2).tolist()
+        )
+        samples = []
+        for i, (robot_id, la, lo, depth, temp, p, quality, battery, speed) in enumerate(columns):
+            samples.append({
+                'robot_id': robot_id,
+                'mission_id': self.mission_ids[i],
+                'ts': ts,
+                'latitude': la,
+                'longitude': lo,
+                'depth': depth,
+                'temperature': temp,
+                'ph': p,
+                'water_quality': quality,
+                'battery_level': battery,
+                'speed': speed,
+                'waste_detected': detections.get(i)
+            })
+        return samples
+
+    # ------------------------------------------------------------------
+    # Commands dari backend
+    # ------------------------------------------------------------------
+    def apply_command(self, robot_id, action, params=None):
+        """Terapkan command ke satu robot. Return state untuk ack, None kalau robot tidak dikenal"""
+        i = self.index.get(int(robot_id))
+        if i is None:
+            return None
+        params = params or {}
+
+        if action == 'start':
+            self.target_speed[i] = self.cruise_speed
+        elif action == 'stop':
+            self.target_speed[i] = 0.0
+        elif action == 'move':
+            direction = params.get('direction')
+            if isinstance(direction, (int, float)):
+                self.heading[i] = math.radians(direction)
+            elif direction in DIRECTIONS:
+                self.heading[i] += DIRECTIONS[direction]
+            if params.get('speed') is not None:
+                self.target_speed[i] = max(0.0, float(params['speed']))
+
+        return self.state(i)
+
+    def state(self, i):
+        x, y = self.xy[i]
+        return {
+            'battery': int(self.battery[i]),
+            'position': {
+                'latitude': round(self.center[0] + float(y) / METERS_PER_DEG_LAT, 7),
+                'longitude': round(self.center[1] + float(x) / self._lon_scale, 7),
+                'depth': round(float(self.depth[i]), 2)
+            }
+        }
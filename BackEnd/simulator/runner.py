@@ -0,0 +1,115 @@
+"""
+Loop simulasi fixed-rate: step fleet, kirim telemetry batch lewat HTTP,
+terapkan command dari SocketIO, catat throughput/latency.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simulator.client import SocketLink
+from simulator.fleet import Fleet
+from simulator.stats import RunStats
+
+TELEMETRY_PATH = '/api/robots/telemetry'
+ROBOT_PREFIX = 'sim-'
+PROVISION_CHUNK = 500
+
+
+def provision_robots(client, count, prefix=ROBOT_PREFIX):
+    """Pastikan ada `count` robot simulator di backend. Return list robot_id (urut nama)"""
+    robots = client.json('GET', '/api/robots')['robots']
+    existing = sorted(
+        (robot for robot in robots if (robot['robot_name'] or '').startswith(prefix)),
+        key=lambda robot: robot['robot_name']
+    )
+    missing = [f'{prefix}{i:05d}' for i in range(len(existing), count)]
+    for start in range(0, len(missing), PROVISION_CHUNK):
+        chunk = missing[start:start + PROVISION_CHUNK]
+        created = client.json('POST', '/api/robots', {
+            'robots': [{'robot_name': name, 'model_type': 'Simulator', 'status': 'active'} for name in chunk]
+        })['robots']
+        existing.extend(created)
+    return [robot['robot_id'] for robot in existing[:count]]
+
+
+class Simulator:
+
+    def __init__(self, client, fleet: Fleet, hz=10.0, batch_size=500, workers=8,
+                 max_in_flight=None, start_ts=None, socket=None):
+        self.client = client
+        self.fleet = fleet
+        self.hz = float(hz)
+        self.period = 1.0 / self.hz
+        self.batch_size = int(batch_size)
+        self.workers = int(workers)
+        self.max_in_flight = max_in_flight or self.workers * 4
+        # Timestamp logis: start_ts + tick * period (tidak bergantung wall clock)
+        self.start_ts = start_ts if start_ts is not None else time.time()
+        self.socket = socket
+        self.commands = queue.Queue()
+        self.stats = RunStats()
+
+    def attach_socket(self, base_url, token=None, transports=None):
+        self.socket = SocketLink(base_url, self.fleet.robot_ids.tolist(), self._on_command, token, transports)
+        self.socket.connect()
+
+    def _on_command(self, data):
+        self.commands.put(data)
+
+    def _apply_commands(self):
+        # Command diterapkan di batas tick supaya state fleet hanya diubah satu thread
+        while True:
+            try:
+                data = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            state = self.fleet.apply_command(data['robot_id'], data['action'], data.get('params'))
+            self.socket.ack(data['command_id'], ok=state is not None, state=state)
+            self.stats.commands += 1
+
+    def _send(self, chunk, generated_at, slots):
+        started = time.perf_counter()
+        try:
+            status, data, nbytes = self.client.request('POST', TELEMETRY_PATH, {'samples': chunk})
+            done = time.perf_counter()
+            ok = status in (200, 201)
+            accepted = (data or {}).get('accepted', 0) if ok else 0
+            self.stats.record_request(done - started, done - generated_at, len(chunk), accepted, nbytes, ok)
+        except Exception:
+            done = time.perf_counter()
+            self.stats.record_request(done - started, done - generated_at, len(chunk), 0, 0, False)
+        finally:
+            slots.release()
+
+    def run(self, duration=None, ticks=None):
+        total_ticks = int(ticks if ticks is not None else round((duration or 10) * self.hz))
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        started = time.perf_counter()
+        next_tick = started
+        try:
+            for tick in range(total_ticks):
+                now = time.perf_counter()
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                    now = time.perf_counter()
+                self.stats.record_tick(now - next_tick, self.period)
+
+                if self.socket is not None:
+                    self._apply_commands()
+                self.fleet.step(self.period)
+                samples = self.fleet.samples(self.start_ts + tick * self.period, self.period)
+
+                generated_at = time.perf_counter()
+                for i in range(0, len(samples), self.batch_size):
+                    # Backpressure: tick berikutnya tertunda kalau server tidak mengejar
+                    slots.acquire()
+                    executor.submit(self._send, samples[i:i + self.batch_size], generated_at, slots)
+
+                next_tick += self.period
+        finally:
+            executor.shutdown(wait=True)
+            self.stats.elapsed = time.perf_counter() - started
+        return self.stats
@@ -0,0 +1,75 @@
+"""
+Statistik run simulator: throughput ingest dan latency end-to-end.
+"""
+import threading
+
+import numpy as np
+
+
+class RunStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = []   # detik, kirim -> response
+        self.e2e_latency = []       # detik, sampel dibuat (tick) -> response 2xx
+        self.requests = 0
+        self.errors = 0
+        self.samples_sent = 0
+        self.samples_accepted = 0
+        self.bytes_sent = 0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.max_tick_lag = 0.0
+        self.commands = 0
+        self.elapsed = 0.0
+
+    def record_request(self, latency, e2e, sent, accepted, nbytes, ok):
+        with self._lock:
+            self.requests += 1
+            self.samples_sent += sent
+            self.bytes_sent += nbytes
+            self.request_latency.append(latency)
+            if ok:
+                self.samples_accepted += accepted
+                self.e2e_latency.append(e2e)
+            else:
+                self.errors += 1
+
+    def record_tick(self, lag, period):
+        self.ticks += 1
+        if lag > period:
+            self.late_ticks += 1
+        self.max_tick_lag = max(self.max_tick_lag, lag)
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {'count': 0}
+        values = np.asarray(samples) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            'count': len(values),
+            'p50_ms': round(float(p50), 2),
+            'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2),
+            'max_ms': round(float(values.max()), 2),
+            'mean_ms': round(float(values.mean()), 2)
+        }
+
+    def to_dict(self):
+        elapsed = self.elapsed or 1e-9
+        return {
+            'elapsed_s': round(self.elapsed, 3),
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'max_tick_lag_ms': round(self.max_tick_lag * 1000, 2),
+            'requests': self.requests,
+            'errors': self.errors,
+            'samples_sent': self.samples_sent,
+            'samples_accepted': self.samples_accepted,
+            'ingest_samples_per_s': round(self.samples_accepted / elapsed, 1),
+            'ingest_mb_per_s': round(self.bytes_sent / elapsed / 1e6, 3),
+            'commands_handled': self.commands,
+            'request_latency': self._percentiles(self.request_latency),
+            'e2e_latency': self._percentiles(self.e2e_latency)
+        }
@@ -0,0 +1,8 @@
+"""
+Entry point production: gunicorn -c gunicorn.conf.py wsgi:app
+(run.py tetap untuk development dengan reloader).
+"""
+from app import create_app
+from app.config import Config
+
+app = create_app(Config)
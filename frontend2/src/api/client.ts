@@ -18,6 +18,11 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    // Read-your-writes: echo the last write time so reads skip lagging replicas on any worker
+    const lastWrite = sessionStorage.getItem("last_write");
+    if (lastWrite) {
+      config.headers["X-Last-Write"] = lastWrite;
+    }
     return config;
   },
   (error) => {
@@ -27,7 +32,13 @@ api.interceptors.request.use(
 
 // Response interceptor - Handle token refresh
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const lastWrite = response.headers["x-last-write"];
+    if (lastWrite) {
+      sessionStorage.setItem("last_write", lastWrite);
+    }
+    return response;
+  },
   async (error: AxiosError) => {
     const originalRequest = error.config as any;
 